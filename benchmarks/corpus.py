@@ -0,0 +1,185 @@
+"""
+Generate a reproducible corpus of photos with realistic EXIF metadata, to be
+used by the benchmark suite.
+
+The same seed always gives the same tree, the same pixels and the same
+metadata, so results can be compared across commits.
+
+Usage
+-----
+    python -m benchmarks.corpus OUTPUT_DIR [--count N] [--depth D] [--fanout F]
+        [--resolutions 1920x1280,6000x4000] [--formats jpg,png,tiff] [--seed S]
+"""
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import piexif
+from PIL import Image
+
+MODELS = [b"PENTAX K-50", b"PENTAX K-3 II", b"NIKON D750", b"Canon EOS 80D", b"ILCE-7M3"]
+EXPOSURE_TIMES = [(1, 4000), (1, 1000), (1, 250), (1, 125), (1, 60), (1, 15), (1, 2), (2, 1), (30, 1)]
+F_NUMBERS = [(14, 10), (18, 10), (28, 10), (40, 10), (56, 10), (80, 10), (110, 10), (160, 10)]
+ISOS = [100, 200, 400, 800, 1600, 3200, 6400, 12800]
+EXPOSURE_BIASES = [(-2, 1), (-1, 1), (-1, 3), (0, 1), (1, 3), (1, 1), (2, 1)]
+FOCAL_LENGTHS = [(18, 1), (35, 1), (50, 1), (85, 1), (135, 1), (300, 1)]
+FORMATS = {"jpg": "JPEG", "png": "PNG", "tiff": "TIFF"}
+
+
+@dataclass
+class CorpusSpec:
+    """
+    The parameters of a synthetic corpus.
+
+    Attributes
+    ----------
+    count : int
+        The number of photos.
+    depth : int
+        The number of directory levels below the root.
+    fanout : int
+        The number of subdirectories of every directory above the last level.
+    resolutions : tuple[tuple[int, int], ...]
+        The (width, height) of the photos, used in turn.
+    formats : tuple[str, ...]
+        The file formats of the photos ("jpg", "png" or "tiff"), used in turn.
+    seed : int
+        The seed of the pixels, the metadata and the file placement.
+    """
+
+    count: int = 50
+    depth: int = 2
+    fanout: int = 2
+    resolutions: tuple[tuple[int, int], ...] = ((1920, 1280),)
+    formats: tuple[str, ...] = ("jpg",)
+    seed: int = 0
+
+
+def parse_resolutions(value: str) -> tuple[tuple[int, int], ...]:
+    """
+    Parse a comma-separated list of resolutions such as "1920x1280,6000x4000".
+    """
+    return tuple(tuple(int(side) for side in item.lower().split("x")) for item in value.split(","))
+
+
+def directories(root: Path, depth: int, fanout: int) -> list[Path]:
+    """
+    Returns every directory of a tree of the given depth and fanout, the root
+    included, in breadth-first order.
+    """
+    levels = [[root]]
+    for level in range(depth):
+        levels.append([
+            parent / f"dir_{level + 1}_{i}" for parent in levels[-1] for i in range(fanout)
+        ])
+    return [directory for level in levels for directory in level]
+
+
+def random_exif(rng: np.random.Generator, index: int) -> bytes:
+    """
+    Returns the EXIF block of a photo, with randomly chosen but realistic
+    camera settings.
+    """
+    def pick(values):
+        return values[rng.integers(len(values))]
+
+    model = pick(MODELS)
+    seconds = 1_600_000_000 + index * 7 + int(rng.integers(0, 5))
+    timestamp = datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y:%m:%d %H:%M:%S").encode()
+    return piexif.dump({
+        "0th": {
+            piexif.ImageIFD.Make: model.split(b" ")[0],
+            piexif.ImageIFD.Model: model,
+        },
+        "Exif": {
+            piexif.ExifIFD.DateTimeOriginal: timestamp,
+            piexif.ExifIFD.ExposureTime: pick(EXPOSURE_TIMES),
+            piexif.ExifIFD.FNumber: pick(F_NUMBERS),
+            piexif.ExifIFD.ISOSpeedRatings: int(pick(ISOS)),
+            piexif.ExifIFD.ExposureBiasValue: pick(EXPOSURE_BIASES),
+            piexif.ExifIFD.FocalLength: pick(FOCAL_LENGTHS),
+        },
+    })
+
+
+def random_pixels(rng: np.random.Generator, width: int, height: int) -> np.ndarray:
+    """
+    Returns an RGB image made of smooth gradients and mild noise, which
+    compresses like a photo rather than like pure noise.
+    """
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    base = rng.uniform(0, 255, 3).astype(np.float32)
+    slope = rng.uniform(-128, 128, (2, 3)).astype(np.float32)
+    image = base + x[..., None] * slope[0] + y[..., None] * slope[1]
+    image += rng.normal(0, 6, (height, width, 1)).astype(np.float32)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def encode(pixels: np.ndarray, fmt: str, exif: bytes) -> bytes:
+    """
+    Encode the pixels in the given format, with the EXIF block.
+    """
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, FORMATS[fmt], exif=exif)
+    return buffer.getvalue()
+
+
+def generate_corpus(root: str, spec: CorpusSpec) -> list[Path]:
+    """
+    Write the corpus described by `spec` below `root`.
+
+    Parameters
+    ----------
+    root : str
+        The directory where the corpus is written. It is created if needed.
+    spec : CorpusSpec
+        The parameters of the corpus.
+
+    Returns
+    -------
+    list[Path]
+        The paths of the generated photos.
+    """
+    rng = np.random.default_rng(spec.seed)
+    tree = directories(Path(root), spec.depth, spec.fanout)
+    for directory in tree:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for index in range(spec.count):
+        width, height = spec.resolutions[index % len(spec.resolutions)]
+        fmt = spec.formats[index % len(spec.formats)]
+        directory = tree[int(rng.integers(len(tree)))]
+
+        path = directory / f"IMGP{index:05d}.{fmt}"
+        path.write_bytes(encode(random_pixels(rng, width, height), fmt, random_exif(rng, index)))
+        paths.append(path)
+
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir")
+    parser.add_argument("--count", type=int, default=CorpusSpec.count)
+    parser.add_argument("--depth", type=int, default=CorpusSpec.depth)
+    parser.add_argument("--fanout", type=int, default=CorpusSpec.fanout)
+    parser.add_argument("--resolutions", type=parse_resolutions, default=CorpusSpec.resolutions)
+    parser.add_argument("--formats", type=lambda value: tuple(value.split(",")), default=CorpusSpec.formats)
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    args = parser.parse_args()
+
+    spec = CorpusSpec(
+        count=args.count, depth=args.depth, fanout=args.fanout,
+        resolutions=args.resolutions, formats=args.formats, seed=args.seed
+    )
+    paths = generate_corpus(args.output_dir, spec)
+    print(f"Generated {len(paths)} photos in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
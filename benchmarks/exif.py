@@ -0,0 +1,57 @@
+"""
+Compare the full `exifread.process_file` parse against the header-only reader
+used by `File.photo_metadata`.
+
+Usage
+-----
+    python -m benchmarks.exif [image ...] [--repeat N]
+"""
+import argparse
+from pathlib import Path
+import time
+
+import exifread
+
+from src.metadata.exif import read_exif_tags
+from src.metadata.photo import PhotoMetadata
+
+DEFAULT_IMAGES = sorted(str(path) for path in Path("assets/images").glob("*.JPG"))
+
+
+def full_parse(path: str) -> PhotoMetadata:
+    with open(path, "rb") as f:
+        return PhotoMetadata.from_tags(exifread.process_file(f))
+
+
+def header_parse(path: str) -> PhotoMetadata:
+    with open(path, "rb") as f:
+        return PhotoMetadata.from_tags(read_exif_tags(f))
+
+
+def measure(func, paths: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            func(path)
+    return (time.perf_counter() - start) / (repeat * len(paths))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("images", nargs="*", default=DEFAULT_IMAGES)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for path in args.images:
+        if full_parse(path) != header_parse(path):
+            raise SystemExit(f"Metadata mismatch for {path}")
+
+    full = measure(full_parse, args.images, args.repeat)
+    header = measure(header_parse, args.images, args.repeat)
+    print(f"exifread.process_file : {full * 1000:8.3f} ms/file")
+    print(f"read_exif_tags        : {header * 1000:8.3f} ms/file")
+    print(f"speedup               : {full / header:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
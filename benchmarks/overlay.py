@@ -0,0 +1,99 @@
+"""
+Compare the ROI-only overlay of `Processor.draw_metadata_overlay` against the
+former full-frame blend (copy the whole image, fill the box, blend every pixel),
+with its layout cache cold (text measured for every image) and warm (the
+cached layout reused).
+
+Usage
+-----
+    python -m benchmarks.overlay [--width W] [--height H] [--repeat N]
+"""
+import argparse
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from src.core.overlay import overlay_layout
+from src.core.processor import Processor
+
+LINES = ["Exposure: 1/250", "Aperture: 5.6f", "ISO: 200", "EV: 0"]
+
+
+def full_frame_overlay(image: np.ndarray, lines: list[str]) -> None:
+    _, w, _ = image.shape
+    font = cv2.FONT_HERSHEY_DUPLEX
+    font_scale = max(0.8, w / 1000)
+    thickness = max(2, w // 800)
+    line_height = int(40 * font_scale)
+    padding_internal = int(15 * font_scale)
+    padding_external = int(30 * font_scale)
+
+    sizes = [cv2.getTextSize(line, font, font_scale, thickness)[0] for line in lines]
+    text_width = max(size[0] for size in sizes)
+    text_height = len(lines) * line_height
+
+    x, y = padding_external, padding_external + sizes[0][1]
+    top_left = (x - padding_internal, y - sizes[0][1] - padding_internal)
+    bottom_right = (
+        x + text_width + padding_internal,
+        y + text_height - (line_height - sizes[0][1]) + padding_internal
+    )
+
+    overlay = image.copy()
+    cv2.rectangle(overlay, top_left, bottom_right, (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.5, image, 0.5, 0, image)
+    cv2.rectangle(image, top_left, bottom_right, (255, 255, 255), max(3, int((4 * font_scale)/2)))
+    for i, line in enumerate(lines):
+        cv2.putText(image, line, (x, y + i * line_height), font, font_scale, (255, 255, 255), thickness)
+
+
+def measure(func, image: np.ndarray, repeat: int) -> tuple[float, int]:
+    elapsed = 0.0
+    for _ in range(repeat):
+        frame = image.copy()
+        start = time.perf_counter()
+        func(frame, LINES)
+        elapsed += time.perf_counter() - start
+
+    frame = image.copy()
+    tracemalloc.start()
+    func(frame, LINES)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / repeat, peak
+
+
+def cold_overlay(image: np.ndarray, lines: list[str]) -> None:
+    overlay_layout.cache_clear()
+    Processor.draw_metadata_overlay(image, lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    image = np.random.default_rng(0).integers(0, 256, (args.height, args.width, 3), dtype=np.uint8)
+
+    expected, actual = image.copy(), image.copy()
+    full_frame_overlay(expected, LINES)
+    Processor.draw_metadata_overlay(actual, LINES)
+    if not np.array_equal(expected, actual):
+        raise SystemExit("Overlay output differs from the full-frame blend")
+
+    full_time, full_peak = measure(full_frame_overlay, image, args.repeat)
+    cold_time, cold_peak = measure(cold_overlay, image, args.repeat)
+    roi_time, roi_peak = measure(Processor.draw_metadata_overlay, image, args.repeat)
+    print(f"image                 : {args.width}x{args.height}")
+    print(f"full-frame blend      : {full_time * 1000:8.3f} ms/image, peak {full_peak / 2**20:8.2f} MiB")
+    print(f"ROI blend, cold cache : {cold_time * 1000:8.3f} ms/image, peak {cold_peak / 2**20:8.2f} MiB")
+    print(f"ROI blend, warm cache : {roi_time * 1000:8.3f} ms/image, peak {roi_peak / 2**20:8.2f} MiB")
+    print(f"speedup               : {full_time / roi_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
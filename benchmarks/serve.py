@@ -0,0 +1,121 @@
+"""
+Measure the throughput and latency of the annotation service: a server is
+started in-process on a free port, and concurrent clients send the same
+photos over HTTP. Requests rejected because the queue is full are retried
+after the delay the server asks for, and counted.
+
+With `--cli`, the time to name a single photo by starting `main.py naming`
+is measured too, as the per-photo cost the service avoids.
+
+Usage
+-----
+    python -m benchmarks.serve [image ...] [--requests N] [--clients C]
+        [--workers W] [--batch_size B] [--endpoint metadata|annotate] [--cli K]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+
+from src.cli.serve import build_server
+from src.core.service import AnnotationService
+
+DEFAULT_IMAGES = sorted(str(path) for path in Path("assets/images").glob("*.JPG"))
+
+
+def send(session: requests.Session, url: str, name: str, data: bytes) -> tuple[float, int]:
+    """
+    Send a photo until it is accepted, and return the latency of the
+    request and the number of times it was rejected.
+    """
+    rejected, start = 0, time.perf_counter()
+    while True:
+        response = session.post(url, params={"filename": name}, data=data, timeout=120)
+        if response.status_code != 503:
+            response.raise_for_status()
+            return time.perf_counter() - start, rejected
+        rejected += 1
+        time.sleep(float(response.headers.get("Retry-After", 1)) / 10)
+
+
+def cli_seconds(image: str, runs: int) -> float:
+    """
+    Returns the mean seconds taken by `main.py naming` to name one photo in a new process.
+    """
+    elapsed = 0.0
+    for _ in range(runs):
+        directory = tempfile.mkdtemp()
+        try:
+            shutil.copy(image, directory)
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "main.py", "naming", directory, f"--output_dir={directory}/out"],
+                check=True, capture_output=True
+            )
+            elapsed += time.perf_counter() - start
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    return elapsed / runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("images", nargs="*", default=DEFAULT_IMAGES)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--queue_depth", type=int, default=64)
+    parser.add_argument("--endpoint", choices=("metadata", "annotate"), default="metadata")
+    parser.add_argument("--cli", type=int, default=0, help="number of CLI runs to time (0 to skip)")
+    args = parser.parse_args()
+
+    # One log line per request would be measured too.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    photos = [(Path(path).name, Path(path).read_bytes()) for path in args.images]
+    service = AnnotationService(workers=args.workers, batch_size=args.batch_size, queue_depth=args.queue_depth)
+    with service:
+        server = build_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/{args.endpoint}"
+        sessions = threading.local()
+
+        def request(index: int) -> tuple[float, int]:
+            if not hasattr(sessions, "session"):
+                sessions.session = requests.Session()
+            return send(sessions.session, url, *photos[index % len(photos)])
+
+        request(0)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            measures = list(clients.map(request, range(args.requests)))
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+        stats = service.stats()
+
+    latencies = np.array([latency for latency, _ in measures]) * 1000
+    print(
+        f"{args.requests} requests to /{args.endpoint}, {args.clients} clients, {args.workers} workers, "
+        f"batches of up to {args.batch_size}\n"
+        f"  throughput : {args.requests / elapsed:8.1f} photos/s\n"
+        f"  latency    : p50 {np.percentile(latencies, 50):.1f} ms, p95 {np.percentile(latencies, 95):.1f} ms, "
+        f"p99 {np.percentile(latencies, 99):.1f} ms\n"
+        f"  batches    : {stats['batches']} ({stats['requests'] / max(stats['batches'], 1):.1f} photos per batch)\n"
+        f"  rejected   : {sum(rejected for _, rejected in measures)} (503, retried)"
+    )
+    if args.cli:
+        print(f"  CLI        : {cli_seconds(args.images[0], args.cli) * 1000:8.1f} ms per photo (one process per photo)")
+
+
+if __name__ == "__main__":
+    main()
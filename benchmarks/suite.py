@@ -0,0 +1,211 @@
+"""
+Time every stage of a naming run (scan, EXIF parse, decode, overlay, encode,
+write) and the end-to-end `naming` command on a synthetic corpus, and write
+the results as JSON so they can be compared across commits.
+
+Usage
+-----
+    python -m benchmarks.suite [--count N] [--depth D] [--fanout F]
+        [--resolutions 1920x1280,6000x4000] [--formats jpg,png,tiff] [--seed S]
+        [--repeat R] [--corpus DIR] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.corpus import CorpusSpec, generate_corpus, parse_resolutions
+from src.cli.naming import naming
+from src.common.enums import EncoderBackend
+from src.core.encoder import encode_jpeg
+from src.core.processor import Processor
+from src.data.scanner import Scanner
+
+# piexif only reads EXIF from JPEG and TIFF data.
+EXIF_CONTAINERS = (b"\xff\xd8", b"II", b"MM")
+LINES = ["Exposure: 1/250", "Aperture: 5.6f", "ISO: 200", "EV: 0"]
+
+
+def git_commit() -> str | None:
+    """
+    Returns the commit the benchmark runs on, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_stages(corpus: str, workdir: str) -> dict[str, float]:
+    """
+    Run every stage once over the corpus and return the seconds spent in each
+    of them. Stages run file by file, so only one image is held in memory.
+    """
+    seconds = dict.fromkeys(["scan", "exif", "decode", "overlay", "encode", "write"], 0.0)
+
+    start = time.perf_counter()
+    files = Scanner(corpus).files_recursive
+    seconds["scan"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for file in files:
+        file.photo_metadata
+    seconds["exif"] = time.perf_counter() - start
+
+    for i, file in enumerate(files):
+        start = time.perf_counter()
+        image = cv2.imdecode(np.frombuffer(file.load().data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        exif = file.exif_bytes if file.data[:2] in EXIF_CONTAINERS else b""
+        decoded = time.perf_counter()
+        Processor.draw_metadata_overlay(image, LINES)
+        drawn = time.perf_counter()
+        encoded = encode_jpeg(image, exif, EncoderBackend.OPENCV)
+        done = time.perf_counter()
+        Processor.write_image(encoded, str(Path(workdir) / f"{i}.jpg"))
+        written = time.perf_counter()
+        file.release()
+
+        seconds["decode"] += decoded - start
+        seconds["overlay"] += drawn - decoded
+        seconds["encode"] += done - drawn
+        seconds["write"] += written - done
+
+    return seconds
+
+
+def time_naming(corpus: str, workdir: str, **options) -> float:
+    """
+    Run the `naming` command on the corpus and return its wall time. Its
+    console output and progress bar are discarded.
+    """
+    output_dir = str(Path(workdir) / "naming")
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        naming(input_dir=corpus, output_dir=output_dir, **options)
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return elapsed
+
+
+def summarize(samples: list[float], files: int, size: int) -> dict[str, float]:
+    """
+    Returns the median time of a stage and the throughput it gives.
+    """
+    median = statistics.median(samples)
+    return {
+        "seconds": round(median, 6),
+        "min_seconds": round(min(samples), 6),
+        "ms_per_file": round(1000 * median / files, 4),
+        "files_per_second": round(files / median, 2) if median else None,
+        "mib_per_second": round(size / 2**20 / median, 2) if median else None,
+    }
+
+
+def run(spec: CorpusSpec, repeat: int, corpus: str | None = None) -> dict:
+    """
+    Generate the corpus (unless an existing one is given) and benchmark it.
+
+    Parameters
+    ----------
+    spec : CorpusSpec
+        The parameters of the synthetic corpus.
+    repeat : int
+        The number of times every measure is repeated; the median is kept.
+    corpus : str, optional
+        An existing corpus to benchmark instead of a generated one.
+
+    Returns
+    -------
+    dict
+        The environment, the corpus and the timing of every stage.
+    """
+    with tempfile.TemporaryDirectory(prefix="kmera-bench-") as tmp:
+        source = corpus
+        if corpus is None:
+            corpus = str(Path(tmp) / "corpus")
+            generate_corpus(corpus, spec)
+        paths = [path for path in Path(corpus).rglob("*") if path.is_file()]
+        files, size = len(paths), sum(path.stat().st_size for path in paths)
+
+        samples: dict[str, list[float]] = {}
+        for _ in range(repeat):
+            workdir = tempfile.mkdtemp(dir=tmp)
+            for stage, seconds in time_stages(corpus, workdir).items():
+                samples.setdefault(stage, []).append(seconds)
+            samples.setdefault("naming_copy", []).append(time_naming(corpus, workdir))
+            samples.setdefault("naming_link", []).append(time_naming(corpus, workdir, mode="link"))
+            samples.setdefault("naming_in_image", []).append(time_naming(corpus, workdir, in_image=True))
+            samples.setdefault("naming_preview", []).append(time_naming(corpus, workdir, preview=1024))
+            shutil.rmtree(workdir)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "corpus": {**asdict(spec), "path": source, "files": files, "bytes": size},
+        "repeat": repeat,
+        "stages": {stage: summarize(values, files, size) for stage, values in samples.items()},
+    }
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """
+    Print the speedup of every stage against a baseline run.
+    """
+    print(f"{'stage':<16}{'baseline ms':>14}{'current ms':>14}{'speedup':>10}")
+    for stage, current in results["stages"].items():
+        if stage not in baseline.get("stages", {}):
+            continue
+        before = baseline["stages"][stage]["ms_per_file"]
+        after = current["ms_per_file"]
+        speedup = before / after if after else float("inf")
+        print(f"{stage:<16}{before:>14.3f}{after:>14.3f}{speedup:>9.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=CorpusSpec.count)
+    parser.add_argument("--depth", type=int, default=CorpusSpec.depth)
+    parser.add_argument("--fanout", type=int, default=CorpusSpec.fanout)
+    parser.add_argument("--resolutions", type=parse_resolutions, default=CorpusSpec.resolutions)
+    parser.add_argument("--formats", type=lambda value: tuple(value.split(",")), default=CorpusSpec.formats)
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", help="benchmark an existing directory instead of a generated corpus")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="a previous JSON result to compare against")
+    args = parser.parse_args()
+
+    spec = CorpusSpec(
+        count=args.count, depth=args.depth, fanout=args.fanout,
+        resolutions=args.resolutions, formats=args.formats, seed=args.seed
+    )
+    results = run(spec, args.repeat, args.corpus)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import cv2
+
+from src.cli.naming import build_metadata_cache
+from src.common.enums import GridOrder
+from src.core.grid import ContactSheet, sort_key
+from src.core.processor import Processor
+from src.data.folder import Folder
+
+
+def check_grid_args(input_dir: str, output: str, columns: int, tile_size: int, order: GridOrder, workers: int) -> None:
+    """
+    Check the arguments for the grid function.
+
+    Parameters
+    ----------
+    input_dir : str
+        The input directory to process.
+    output : str
+        The path of the contact sheet.
+    columns : int
+        The number of tiles per row.
+    tile_size : int
+        The side of every tile, in pixels.
+    order : GridOrder
+        The order of the tiles (NAME, DATE, EV or EXPOSURE).
+    workers : int
+        The number of threads drawing tiles.
+    """
+    if not Path(input_dir).is_dir():
+        raise FileNotFoundError(f"Input directory does not exist: {input_dir}")
+    if Path(output).suffix.lower() not in (".jpg", ".jpeg", ".png", ".tif", ".tiff"):
+        raise ValueError(f"Invalid output file: {output}. It must be a .jpg, .png or .tiff file.")
+    if str(order) not in GridOrder.choices():
+        raise ValueError(f"Invalid order: {order}. Available orders: {GridOrder.choices()}")
+    for name, value in (("columns", columns), ("tile size", tile_size), ("workers", workers)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"Invalid {name}: {value}. It must be a positive integer.")
+
+def grid(
+    input_dir: str,
+    output: str = "./grid.jpg",
+    columns: int = 6,
+    tile_size: int = 320,
+    order: GridOrder = GridOrder.NAME,
+    workers: int = 4,
+    cache: bool | str = False,
+) -> None:
+    """
+    Build a contact sheet of the photos of a directory tree: one tile per
+    photo, annotated with its name and exposure settings, e.g. to compare the
+    shots of a bracket series sorted by EV.
+
+    Parameters
+    ----------
+    input_dir : str
+        The input directory containing the photos. Subfolders are included.
+    output : str, optional
+        The path of the contact sheet (.jpg, .png or .tiff). Default is "./grid.jpg".
+    columns : int, optional
+        The number of tiles per row. Default is 6.
+    tile_size : int, optional
+        The side of every tile, in pixels. Default is 320.
+    order : GridOrder, optional
+        The order of the tiles: by path (NAME), date taken (DATE), exposure bias (EV)
+        or exposure time (EXPOSURE). Default is NAME.
+    workers : int, optional
+        The number of threads decoding and drawing tiles. Default is 4.
+    cache : bool | str, optional
+        If True, parsed metadata is kept in a persistent cache inside `input_dir`.
+        A path can be given to store the cache elsewhere. Default is False.
+    """
+    check_grid_args(input_dir, output, columns, tile_size, order, workers)
+    print(
+        f"🚀 Running grid with:\n"
+        f"\t📂 Input Directory: {input_dir}\n"
+        f"\t🔢 Columns: {columns}\n"
+        f"\t📐 Tile Size: {tile_size}\n"
+        f"\t↕️ Order: {order}\n"
+        f"\t➡️ Output: {output}"
+    )
+
+    metadata_cache = build_metadata_cache(cache, input_dir)
+    files = sorted(Folder(input_dir, cache=metadata_cache).files_recursive, key=sort_key(GridOrder(str(order))))
+    sheet, errors = ContactSheet(columns=columns, tile_size=tile_size, workers=workers).build(files)
+    if metadata_cache is not None:
+        metadata_cache.close()
+
+    ok, encoded = cv2.imencode(Path(output).suffix, sheet)
+    if not ok:
+        raise ValueError(f"Could not encode the contact sheet as {Path(output).suffix}.")
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Processor.write_image(encoded.tobytes(), output)
+
+    print(f"🖼️ Contact sheet of {len(files) - len(errors)} photos ({sheet.shape[1]}x{sheet.shape[0]}) written to {output}")
+    if errors:
+        print(f"⚠️ {len(errors)} of {len(files)} files could not be drawn:")
+        for source, error in errors:
+            print(f"\t❌ {source}: {error}")
+    print("✅ Grid completed successfully!")
@@ -0,0 +1,164 @@
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from src.core.executor import Executor
+from src.data.scanner import Scanner
+from src.metadata.index import (
+    INDEX_FILENAME,
+    IndexEntry,
+    MetadataIndex,
+    parse_filter,
+    parse_order,
+)
+
+
+def check_index_args(input_dir: str, workers: int, scan_workers: int) -> None:
+    """
+    Check the arguments for the index function.
+
+    Parameters
+    ----------
+    input_dir : str
+        The input directory to index.
+    workers : int
+        The number of worker processes reading metadata.
+    scan_workers : int
+        The number of threads listing directories.
+    """
+    if not Path(input_dir).is_dir():
+        raise FileNotFoundError(f"Input directory does not exist: {input_dir}")
+    for name, value in (("workers", workers), ("scan workers", scan_workers)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"Invalid number of {name}: {value}. It must be a positive integer.")
+
+def check_query_args(index_path: str, where: list[str], order: str, limit: int | None) -> None:
+    """
+    Check the arguments for the query function.
+
+    Parameters
+    ----------
+    index_path : str
+        The path of the index file.
+    where : list[str]
+        The filters.
+    order : str
+        The sort order.
+    limit : int | None
+        The maximum number of photos listed.
+    """
+    if not Path(index_path).is_file():
+        raise FileNotFoundError(f"Index does not exist: {index_path}. Build it with `kmera index` first.")
+    for expression in where:
+        parse_filter(expression)
+    parse_order(order)
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        raise ValueError(f"Invalid limit: {limit}. It must be a positive integer.")
+
+def index_location(path: str) -> str:
+    """
+    Returns the path of the index file: `path` itself, or the default index
+    file inside it if it is a directory.
+    """
+    return str(Path(path) / INDEX_FILENAME) if Path(path).is_dir() else path
+
+def format_entry(entry: IndexEntry) -> str:
+    """
+    Returns a line describing an indexed photo: exposure, aperture, ISO,
+    focal length, exposure bias, date and path. Missing values are shown as "-".
+    """
+    exposure, date = entry.exposure_time, entry.date_taken
+    columns = (
+        "-" if not exposure else f"1/{round(1 / exposure)}" if exposure < 1 else f"{exposure:g}s",
+        "-" if entry.aperture is None else f"f/{entry.aperture:g}",
+        "-" if entry.iso is None else f"ISO {entry.iso}",
+        "-" if entry.focal_length is None else f"{entry.focal_length:g}mm",
+        "-" if entry.exposure_bias is None else f"{entry.exposure_bias:+.1f}EV",
+        "-" if date is None else datetime.fromtimestamp(date, UTC).strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    widths = (8, 7, 9, 7, 7, 19)
+    return " ".join(f"{column:>{width}}" for column, width in zip(columns, widths)) + f"  {entry.path}"
+
+def index(input_dir: str, output: str | None = None, workers: int = 1, scan_workers: int = 1) -> None:
+    """
+    Build or update the metadata index of a directory tree. Only new and
+    modified photos are read again, and deleted ones are dropped.
+
+    Parameters
+    ----------
+    input_dir : str
+        The input directory containing the photos. Subfolders are included.
+    output : str, optional
+        The path of the index file. Default is `.kmera-index.sqlite` inside `input_dir`.
+    workers : int, optional
+        The number of worker processes reading metadata. Default is 1.
+    scan_workers : int, optional
+        The number of threads listing directories concurrently. Default is 1.
+    """
+    check_index_args(input_dir, workers, scan_workers)
+    metadata_index = MetadataIndex(path=output) if output else MetadataIndex.in_directory(input_dir)
+    print(
+        f"🚀 Running index with:\n"
+        f"\t📂 Input Directory: {input_dir}\n"
+        f"\t🔢 Workers: {workers}\n"
+        f"\t➡️ Index: {metadata_index.path}"
+    )
+
+    start = time.perf_counter()
+    update = metadata_index.update(
+        Scanner(input_dir, workers=scan_workers), root=input_dir, mapper=Executor(workers=workers).map
+    )
+    total = len(metadata_index)
+    metadata_index.close()
+
+    print(
+        f"🗂️ {total} photos indexed in {time.perf_counter() - start:.2f}s: "
+        f"{update.added} added, {update.updated} updated, {update.unchanged} unchanged, {update.removed} removed."
+    )
+    if update.errors:
+        print(f"⚠️ {len(update.errors)} files could not be indexed:")
+        for source, error in update.errors:
+            print(f"\t❌ {source}: {error}")
+    print("✅ Index completed successfully!")
+
+def query(
+    index: str,
+    where: str | list[str] = (),
+    order: str = "path",
+    limit: int | None = None,
+    paths: bool = False,
+) -> None:
+    """
+    List the indexed photos matching the given filters, without opening them.
+
+    Parameters
+    ----------
+    index : str
+        The index file, or the directory it was built in.
+    where : str | list[str], optional
+        The filters every photo must match, as a list or separated by commas, e.g.
+        "iso>=3200,aperture<=2.8". Fields are path, camera, exposure, aperture, iso,
+        focal, ev and date; operators are <, <=, >, >=, =, != and ~ (contains).
+        Default is no filter.
+    order : str, optional
+        The field the photos are sorted by, prefixed with "-" for the descending
+        order, e.g. "-iso". Default is "path".
+    limit : int, optional
+        The maximum number of photos listed. Default is no limit.
+    paths : bool, optional
+        If True, only the paths are printed, one per line. Default is False.
+    """
+    index_path = index_location(index)
+    filters = [part for part in where.split(",") if part.strip()] if isinstance(where, str) else list(where)
+    check_query_args(index_path, filters, order, limit)
+
+    metadata_index = MetadataIndex(path=index_path)
+    start = time.perf_counter()
+    entries = metadata_index.query(filters, order=order, limit=limit)
+    elapsed = time.perf_counter() - start
+    metadata_index.close()
+
+    for entry in entries:
+        print(entry.path if paths else format_entry(entry))
+    if not paths:
+        print(f"🔎 {len(entries)} photos matched in {elapsed * 1000:.1f} ms.")
@@ -1,11 +1,31 @@
+from collections.abc import Callable
+import importlib
+import sys
+
 import fire
 
-from src.cli.naming import naming
+# Module of every command. Only the module of the command being run is
+# imported, so that e.g. `query` does not load OpenCV or Flask.
+COMMANDS = {
+    "naming": "src.cli.naming",
+    "grid": "src.cli.grid",
+    "index": "src.cli.index",
+    "query": "src.cli.index",
+    "stats": "src.cli.stats",
+    "watch": "src.cli.watch",
+    "serve": "src.cli.serve",
+}
+
+def load_command(name: str) -> Callable:
+    """
+    Import the module of a command and returns its function.
+    """
+    return getattr(importlib.import_module(COMMANDS[name]), name)
 
 def main() -> None:
     """
     CLI entrypoint.
     """
-    fire.Fire({
-        "naming": naming
-    })
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    names = [command] if command in COMMANDS else list(COMMANDS)
+    fire.Fire({name: load_command(name) for name in names})
@@ -1,28 +1,136 @@
 from pathlib import Path
+from src.core.budget import parse_size
 from src.core.namer import Namer
-from src.data.folder import Folder
-from src.common.enums import NamingMode
+from src.data.scanner import Scanner
+from src.common.enums import EncoderBackend, ExecutorBackend, GroupLayout, NamingMode
+from src.constants.image import DEFAULT_QUALITY
+from src.core.grouping import GROUP_GAP
+from src.metadata.cache import MetadataCache
 
 
-def check_naming_args(mode: NamingMode, input_dir: str) -> None:
+def check_naming_args(
+    mode: NamingMode, input_dir: str, workers: int = 1, incremental: bool = False
+) -> None:
     """
     Check the arguments for the naming function.
 
     Parameters
     ----------
     mode : NamingMode
-        The naming mode to be used (COPY or REPLACE).
+        The naming mode to be used (COPY, REPLACE or LINK).
     input_dir : str
         The input directory to process.
+    workers : int, optional
+        The number of worker processes. Default is 1.
+    incremental : bool, optional
+        If True, only files newer than their existing output are processed. Default is False.
     """
-    if mode not in NamingMode.choices():
+    if str(mode) not in NamingMode.choices():
         raise ValueError(f"Invalid naming mode: {mode}. Available modes: {NamingMode.choices()}")
     if not Path(input_dir).exists():
         raise FileNotFoundError(f"Input directory does not exist: {input_dir}")
     if not Path(input_dir).is_dir():
         raise ValueError(f"Input path is not a directory: {input_dir}")
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError(f"Invalid number of workers: {workers}. It must be a positive integer.")
+    if incremental and NamingMode(str(mode)) == NamingMode.REPLACE:
+        raise ValueError("Incremental runs are only supported in copy and link modes.")
+
+def check_encoder_args(encoder: EncoderBackend, quality: int) -> None:
+    """
+    Check the arguments used to encode annotated images.
+
+    Parameters
+    ----------
+    encoder : EncoderBackend
+        The library used to encode annotated images (OPENCV or PILLOW).
+    quality : int
+        The JPEG quality of annotated images.
+    """
+    if str(encoder) not in EncoderBackend.choices():
+        raise ValueError(f"Invalid encoder: {encoder}. Available encoders: {EncoderBackend.choices()}")
+    if not isinstance(quality, int) or not 1 <= quality <= 100:
+        raise ValueError(f"Invalid quality: {quality}. It must be an integer between 1 and 100.")
+
+def check_executor_args(executor: ExecutorBackend, queue_depth: int, io_threads: int) -> None:
+    """
+    Check the arguments used to select and size the executor.
+
+    Parameters
+    ----------
+    executor : ExecutorBackend
+        How the jobs are run (POOL or PIPELINE).
+    queue_depth : int
+        The capacity of the queues between the stages of the pipeline.
+    io_threads : int
+        The number of reader threads and of writer threads of the pipeline.
+    """
+    if str(executor) not in ExecutorBackend.choices():
+        raise ValueError(f"Invalid executor: {executor}. Available executors: {ExecutorBackend.choices()}")
+    if not isinstance(queue_depth, int) or queue_depth < 1:
+        raise ValueError(f"Invalid queue depth: {queue_depth}. It must be a positive integer.")
+    if not isinstance(io_threads, int) or io_threads < 1:
+        raise ValueError(f"Invalid number of I/O threads: {io_threads}. It must be a positive integer.")
+
+def check_memory_args(max_memory: int | str | None) -> int | None:
+    """
+    Check and parse the memory budget of the run.
+
+    Parameters
+    ----------
+    max_memory : int | str | None
+        The number of bytes the images processed concurrently may hold, with an
+        optional K, M, G or T unit (e.g. "4G"), or None for no budget.
+
+    Returns
+    -------
+    int | None
+        The budget in bytes, or None if there is none.
+    """
+    if max_memory is None:
+        return None
+    limit = parse_size(max_memory)
+    if limit < 1:
+        raise ValueError(f"Invalid memory budget: {max_memory}. It must be a positive size.")
+    return limit
+
+def check_preview_args(preview: int | None, mode: NamingMode) -> None:
+    """
+    Check the size of the previews requested from the command line.
 
-def show_execution_info(input_dir: str, mode: NamingMode, in_image: bool, output_dir: str) -> None:
+    Parameters
+    ----------
+    preview : int | None
+        The longest side of the previews, in pixels, or None for full-size images.
+    mode : NamingMode
+        The naming mode to be used (COPY, REPLACE or LINK).
+    """
+    if preview is None:
+        return
+    if isinstance(preview, bool) or not isinstance(preview, int) or preview < 1:
+        raise ValueError(f"Invalid preview size: {preview}. It must be a positive number of pixels.")
+    if NamingMode(str(mode)) != NamingMode.COPY:
+        raise ValueError("Previews are only supported in copy mode.")
+
+def check_group_args(group: GroupLayout | None, group_gap: float) -> None:
+    """
+    Check the arguments used to group brackets and bursts.
+
+    Parameters
+    ----------
+    group : GroupLayout | None
+        How groups are laid out (FOLDER or SUFFIX), or None to disable grouping.
+    group_gap : float
+        The maximum number of seconds between two frames of a group.
+    """
+    if group is not None and str(group) not in GroupLayout.choices():
+        raise ValueError(f"Invalid group layout: {group}. Available layouts: {GroupLayout.choices()}")
+    if isinstance(group_gap, bool) or not isinstance(group_gap, int | float) or group_gap < 0:
+        raise ValueError(f"Invalid group gap: {group_gap}. It must be a non-negative number of seconds.")
+
+def show_execution_info(
+    input_dir: str, mode: NamingMode, in_image: bool, output_dir: str, workers: int = 1
+) -> None:
     """
     Display the execution information for the naming process.
 
@@ -31,26 +139,67 @@ def show_execution_info(input_dir: str, mode: NamingMode, in_image: bool, output
     input_dir : str
         The input directory to process.
     mode : NamingMode
-        The naming mode to be used (COPY or REPLACE).
+        The naming mode to be used (COPY, REPLACE or LINK).
     in_image : bool
         If True, metadata will be added inside the image files.
     output_dir : str
         The output directory where files will be copied or replaced.
+    workers : int, optional
+        The number of worker processes. Default is 1.
     """
     print(
         f"🚀 Running naming with:\n"
         f"\t📂 Input Directory: {input_dir}\n"
         f"\t⚙️ Mode: {mode}\n"
-        f"\t🖼️ In Image: {in_image}\n", end=""
+        f"\t🖼️ In Image: {in_image}\n"
+        f"\t🧵 Workers: {workers}\n", end=""
     )
-    if NamingMode(mode) == NamingMode.COPY:
+    if NamingMode(str(mode)) != NamingMode.REPLACE:
         print(f"\t➡️ Output Directory: {output_dir}")
 
+def build_metadata_cache(cache: bool | str, input_dir: str) -> MetadataCache | None:
+    """
+    Build the persistent metadata cache requested from the command line.
+
+    Parameters
+    ----------
+    cache : bool | str
+        True to store the cache inside `input_dir`, a path to store it
+        elsewhere, or False to disable it.
+    input_dir : str
+        The input directory to process.
+
+    Returns
+    -------
+    MetadataCache | None
+        The metadata cache, or None if it is disabled.
+    """
+    if cache is True:
+        return MetadataCache.in_directory(input_dir)
+    if isinstance(cache, str) and cache:
+        return MetadataCache(path=cache)
+    return None
+
 def naming(
     input_dir: str,
     mode: NamingMode = NamingMode.COPY,
     in_image: bool = False,
-    output_dir: str = "./naming/"
+    output_dir: str = "./naming/",
+    workers: int = 1,
+    cache: bool | str = False,
+    resume: bool = False,
+    incremental: bool = False,
+    scan_workers: int = 1,
+    encoder: EncoderBackend = EncoderBackend.OPENCV,
+    quality: int = DEFAULT_QUALITY,
+    executor: ExecutorBackend = ExecutorBackend.POOL,
+    queue_depth: int = 8,
+    io_threads: int = 2,
+    profile: bool | str = False,
+    max_memory: int | str | None = None,
+    preview: int | None = None,
+    group: GroupLayout | None = None,
+    group_gap: float = GROUP_GAP
 ) -> None:
     """
     Main function to handle the naming process.
@@ -60,17 +209,84 @@ def naming(
     input_dir : str
         The input directory containing files to be processed.
     mode : NamingMode, optional
-        The naming mode to be used (COPY or REPLACE). Default is COPY.
+        The naming mode to be used (COPY, REPLACE or LINK). Default is COPY.
     in_image : bool, optional
         If True, metadata will be added inside the image files. Default is False.
     output_dir : str, optional
         The output directory where files will be copied or replaced. Default is "./naming/".
+    workers : int, optional
+        The number of worker processes used to process the files. Default is 1.
+    cache : bool | str, optional
+        If True, parsed metadata is kept in a persistent cache inside `input_dir`
+        and reused by later runs. A path can be given to store the cache elsewhere.
+        Default is False.
+    resume : bool, optional
+        If True, files already processed by a previous interrupted run are skipped. Default is False.
+    incremental : bool, optional
+        If True, only files newer than their existing output are processed (copy and link modes only).
+        Default is False.
+    scan_workers : int, optional
+        The number of threads listing directories concurrently while the tree is
+        scanned (useful on network file systems). Default is 1.
+    encoder : EncoderBackend, optional
+        The library used to encode annotated images (OPENCV or PILLOW). Default is OPENCV.
+    quality : int, optional
+        The JPEG quality of annotated images. Default is 75.
+    executor : ExecutorBackend, optional
+        How the jobs are run: on a pool of `workers` processes (POOL) or through
+        a pipeline of reader, render and writer threads (PIPELINE). Default is POOL.
+    queue_depth : int, optional
+        The capacity of the queues between the stages of the pipeline. Default is 8.
+    io_threads : int, optional
+        The number of reader threads and of writer threads of the pipeline. Default is 2.
+    profile : bool | str, optional
+        If set, the time spent in every stage, the bytes read and written and the
+        peak memory are measured. A summary is printed and a JSON report is written
+        next to the journal, or to the given path. Default is False.
+    max_memory : int | str, optional
+        The memory the images processed concurrently may hold, in bytes or with a
+        K, M, G or T unit (e.g. "4G"). It is estimated from the image dimensions
+        before decoding: large images run alone, small ones many at a time.
+        Default is no limit.
+    preview : int, optional
+        If set, small annotated previews whose longest side is at most this many pixels
+        are written instead of full-size copies (copy mode only). JPEGs are decoded at
+        a reduced size, which is much faster. Implies `in_image`. Default is full size.
+    group : GroupLayout, optional
+        If set, exposure brackets (frames with varying exposure bias) and bursts are
+        detected from the dates of the photos. FOLDER moves every group to its own
+        subfolder (e.g. "bracket_001"), SUFFIX appends the group and frame to the file
+        names (e.g. "_bracket001-2"). Default is no grouping.
+    group_gap : float, optional
+        The maximum number of seconds between two frames of a group. Default is 2.
     """
-    check_naming_args(mode, input_dir)
-    show_execution_info(input_dir, mode, in_image, output_dir)
+    check_naming_args(mode, input_dir, workers, incremental)
+    check_encoder_args(encoder, quality)
+    check_executor_args(executor, queue_depth, io_threads)
+    memory_limit = check_memory_args(max_memory)
+    check_preview_args(preview, mode)
+    check_group_args(group, group_gap)
+    in_image = in_image or preview is not None
+    show_execution_info(input_dir, mode, in_image, output_dir, workers)
 
-    Namer(mode=NamingMode(mode), in_image=in_image).run(
-        folder=Folder(input_dir), output_dir=output_dir
+    metadata_cache = build_metadata_cache(cache, input_dir)
+    scanner = Scanner(
+        input_dir, workers=scan_workers, cache=metadata_cache,
+        exclude=(output_dir,) if NamingMode(str(mode)) != NamingMode.REPLACE else ()
+    )
+    namer = Namer(
+        mode=NamingMode(str(mode)), in_image=in_image, workers=workers,
+        resume=resume, incremental=incremental,
+        encoder=EncoderBackend(str(encoder)), quality=quality,
+        executor=ExecutorBackend(str(executor)), queue_depth=queue_depth, io_threads=io_threads,
+        profile=profile, max_memory=memory_limit, preview=preview or 0,
+        group=GroupLayout(str(group)) if group is not None else None, group_gap=group_gap
     )
+    namer.run(folder=scanner, output_dir=output_dir)
+    if metadata_cache is not None:
+        metadata_cache.close()
 
-    print("✅ Naming completed successfully!")
+    if namer.errors:
+        print(f"❌ Naming completed with {namer.errors} files not processed.")
+    else:
+        print("✅ Naming completed successfully!")
@@ -0,0 +1,211 @@
+import json
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import BaseWSGIServer, make_server
+
+from src.cli.naming import check_encoder_args, check_preview_args
+from src.common.enums import EncoderBackend, NamingMode
+from src.constants.image import DEFAULT_QUALITY
+from src.core.service import AnnotationRequest, AnnotationService, ServiceBusy
+
+# Seconds a client is asked to wait before retrying a request rejected because the queue is full.
+RETRY_AFTER = 1
+
+
+def check_serve_args(port: int, workers: int, batch_size: int, batch_wait: float, queue_depth: int) -> None:
+    """
+    Check the arguments for the serve function.
+
+    Parameters
+    ----------
+    port : int
+        The TCP port the service listens on.
+    workers : int
+        The number of worker processes.
+    batch_size : int
+        The maximum number of images sent to a worker at once.
+    batch_wait : float
+        The seconds the dispatcher waits for more images to fill a batch.
+    queue_depth : int
+        The maximum number of images waiting to be processed.
+    """
+    if isinstance(port, bool) or not isinstance(port, int) or not 0 <= port <= 65535:
+        raise ValueError(f"Invalid port: {port}. It must be an integer between 0 and 65535.")
+    for name, value in (("number of workers", workers), ("batch size", batch_size), ("queue depth", queue_depth)):
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f"Invalid {name}: {value}. It must be a positive integer.")
+    if isinstance(batch_wait, bool) or not isinstance(batch_wait, int | float) or batch_wait < 0:
+        raise ValueError(f"Invalid batch wait: {batch_wait}. It must be a non-negative number of seconds.")
+
+def read_upload(annotate: bool, encoder: EncoderBackend, quality: int) -> AnnotationRequest:
+    """
+    Build the request of the service from the HTTP request: the image is the
+    "image" field of a multipart form, or the raw body with its name in the
+    "filename" query parameter. The "quality", "preview" and "encoder" query
+    parameters override the defaults of the service.
+    """
+    if request.files:
+        upload = request.files.get("image") or next(iter(request.files.values()))
+        name, data = upload.filename or "image.jpg", upload.read()
+    else:
+        name, data = request.args.get("filename", "image.jpg"), request.get_data()
+    if not data:
+        raise ValueError("No image was sent.")
+
+    quality = request.args.get("quality", quality, type=int)
+    preview = request.args.get("preview", 0, type=int)
+    encoder = request.args.get("encoder", str(encoder))
+    check_encoder_args(encoder, quality)
+    check_preview_args(preview or None, NamingMode.COPY)
+    return AnnotationRequest(
+        name=name, data=data, annotate=annotate,
+        encoder=EncoderBackend(str(encoder)), quality=quality, preview=preview
+    )
+
+def error_response(message: str, status: int) -> Response:
+    response = jsonify(error=message)
+    response.status_code = status
+    if status == 503:
+        response.headers["Retry-After"] = str(RETRY_AFTER)
+    return response
+
+def create_app(
+    service: AnnotationService,
+    encoder: EncoderBackend = EncoderBackend.OPENCV,
+    quality: int = DEFAULT_QUALITY,
+    timeout: float = 60,
+) -> Flask:
+    """
+    Create the HTTP application of the annotation service.
+
+    Endpoints
+    ---------
+    GET /health
+        The counters of the service.
+    POST /metadata
+        Returns the renamed file name and the parsed PhotoMetadata as JSON.
+    POST /annotate
+        Returns the annotated JPEG, with the renamed file name in the
+        "X-Kmera-Name" header and the metadata as JSON in "X-Kmera-Metadata".
+
+    Parameters
+    ----------
+    service : AnnotationService
+        The started service processing the images.
+    encoder : EncoderBackend, optional
+        The default library used to encode annotated images. Default is OPENCV.
+    quality : int, optional
+        The default JPEG quality of annotated images. Default is 75.
+    timeout : float, optional
+        The seconds a request waits for its result. Default is 60.
+
+    Returns
+    -------
+    Flask
+        The application.
+    """
+    app = Flask("kmera")
+
+    def process(annotate: bool):
+        try:
+            future = service.submit(read_upload(annotate, encoder, quality))
+            result = future.result(timeout=timeout)
+        except ValueError as error:
+            return None, error_response(str(error), 400)
+        except ServiceBusy as error:
+            return None, error_response(str(error), 503)
+        except TimeoutError:
+            return None, error_response(f"The image was not processed within {timeout}s.", 504)
+        if not result.ok:
+            return None, error_response(result.error, 422)
+        return result, None
+
+    @app.get("/health")
+    def health():
+        return jsonify(status="ok", **service.stats())
+
+    @app.post("/metadata")
+    def metadata():
+        result, error = process(annotate=False)
+        return error or jsonify(name=result.name, metadata=result.metadata)
+
+    @app.post("/annotate")
+    def annotate():
+        result, error = process(annotate=True)
+        if error:
+            return error
+        return Response(result.image, mimetype="image/jpeg", headers={
+            "X-Kmera-Name": result.name,
+            "X-Kmera-Metadata": json.dumps(result.metadata),
+        })
+
+    return app
+
+def build_server(
+    service: AnnotationService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    encoder: EncoderBackend = EncoderBackend.OPENCV,
+    quality: int = DEFAULT_QUALITY,
+    timeout: float = 60,
+) -> BaseWSGIServer:
+    """
+    Build a threaded HTTP server for the service: every connection is
+    handled by its own thread, which waits for its image on the worker pool.
+    Port 0 picks a free port.
+    """
+    return make_server(host, port, create_app(service, encoder, quality, timeout), threaded=True)
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int = 1,
+    batch_size: int = 8,
+    batch_wait: float = 0.005,
+    queue_depth: int = 64,
+    encoder: EncoderBackend = EncoderBackend.OPENCV,
+    quality: int = DEFAULT_QUALITY,
+    timeout: float = 60,
+) -> None:
+    """
+    Run kmera as a local HTTP service, so that an upload pipeline can name and
+    annotate photos without starting a process per photo.
+
+    Parameters
+    ----------
+    host : str, optional
+        The address the service listens on. Default is "127.0.0.1".
+    port : int, optional
+        The TCP port the service listens on. Default is 8765.
+    workers : int, optional
+        The number of worker processes, started once and kept warm. Default is 1.
+    batch_size : int, optional
+        The maximum number of images sent to a worker at once. Default is 8.
+    batch_wait : float, optional
+        The seconds the dispatcher waits for more images to fill a batch. Default is 0.005.
+    queue_depth : int, optional
+        The maximum number of images waiting to be processed. When the queue is full,
+        requests are rejected with "503 Service Unavailable". Default is 64.
+    encoder : EncoderBackend, optional
+        The default library used to encode annotated images. Default is OPENCV.
+    quality : int, optional
+        The default JPEG quality of annotated images. Default is 75.
+    timeout : float, optional
+        The seconds a request waits for its result before "504 Gateway Timeout". Default is 60.
+    """
+    check_serve_args(port, workers, batch_size, batch_wait, queue_depth)
+    check_encoder_args(encoder, quality)
+    service = AnnotationService(workers=workers, batch_size=batch_size, batch_wait=batch_wait, queue_depth=queue_depth)
+    with service:
+        server = build_server(service, host, port, EncoderBackend(str(encoder)), quality, timeout)
+        print(
+            f"🌐 Serving on http://{host}:{server.server_port} with {workers} worker(s) "
+            f"(batches of {batch_size}, queue of {queue_depth}). Press Ctrl+C to stop."
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    print(f"✅ Service stopped after {service.stats()['requests']} images.")
@@ -0,0 +1,144 @@
+import json
+import time
+from pathlib import Path
+
+from src.common.enums import OutputFormat, StatsGroup
+from src.core.executor import Executor
+from src.core.stats import ExposureStats
+from src.data.scanner import Scanner
+from src.metadata.index import MetadataIndex
+
+
+def check_stats_args(
+    input_dir: str, by: StatsGroup, session_gap: float, output_format: OutputFormat, workers: int
+) -> None:
+    """
+    Check the arguments for the stats function.
+
+    Parameters
+    ----------
+    input_dir : str
+        The input directory to summarise.
+    by : StatsGroup
+        How photos are grouped (FOLDER or SESSION).
+    session_gap : float
+        The minutes between two photos that start a new session.
+    output_format : OutputFormat
+        The format of the report (TABLE or JSON).
+    workers : int
+        The number of worker processes reading metadata.
+    """
+    if not Path(input_dir).is_dir():
+        raise FileNotFoundError(f"Input directory does not exist: {input_dir}")
+    if str(by) not in StatsGroup.choices():
+        raise ValueError(f"Invalid grouping: {by}. Available groupings: {StatsGroup.choices()}")
+    if str(output_format) not in OutputFormat.choices():
+        raise ValueError(f"Invalid format: {output_format}. Available formats: {OutputFormat.choices()}")
+    if isinstance(session_gap, bool) or not isinstance(session_gap, int | float) or session_gap <= 0:
+        raise ValueError(f"Invalid session gap: {session_gap}. It must be a positive number of minutes.")
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+        raise ValueError(f"Invalid number of workers: {workers}. It must be a positive integer.")
+
+def format_histogram(values: dict[str, int]) -> str:
+    """
+    Returns a histogram on one line, e.g. "100: 12  200: 3", or "-" if it is empty.
+    """
+    return "  ".join(f"{key}: {count}" for key, count in values.items()) or "-"
+
+def format_summary(name: str, summary: dict) -> str:
+    """
+    Returns the statistics of a group as a few indented lines.
+    """
+    ev = summary["ev100"]
+    if ev["count"]:
+        distribution = (
+            f"min {ev['min']:.1f}  p25 {ev['p25']:.1f}  median {ev['p50']:.1f}  "
+            f"p75 {ev['p75']:.1f}  max {ev['max']:.1f}  mean {ev['mean']:.1f} ± {ev['std']:.1f}"
+        )
+    else:
+        distribution = "-"
+    return (
+        f"📁 {name} ({summary['photos']} photos)\n"
+        f"\tEV100     {distribution}\n"
+        f"\t          {format_histogram(ev['histogram'])}\n"
+        f"\tBias      {format_histogram(summary['exposure_bias'])}\n"
+        f"\tISO       {format_histogram(summary['iso'])}\n"
+        f"\tAperture  {format_histogram(summary['aperture'])}"
+    )
+
+def format_report(report: dict) -> str:
+    """
+    Returns the report as a table: the statistics of every group, then of all photos.
+    """
+    sections = [format_summary(group["name"], group) for group in report["groups"]]
+    return "\n".join([*sections, format_summary("All photos", report["total"])])
+
+def stats(
+    input_dir: str,
+    by: StatsGroup = StatsGroup.FOLDER,
+    session_gap: float = 120,
+    format: OutputFormat = OutputFormat.TABLE,
+    output: str | None = None,
+    workers: int = 1,
+    scan_workers: int = 1,
+    index: bool | str = False,
+) -> None:
+    """
+    Summarise the exposure of the photos of a directory tree, per folder or
+    per shooting session: the distribution of their EV100 (computed from
+    shutter, aperture and ISO), and the histograms of their exposure bias,
+    ISO and aperture.
+
+    Parameters
+    ----------
+    input_dir : str
+        The input directory containing the photos. Subfolders are included.
+    by : StatsGroup, optional
+        How photos are grouped: by FOLDER or by SESSION. Default is FOLDER.
+    session_gap : float, optional
+        The minutes between two consecutive photos that start a new session. Default is 120.
+    format : OutputFormat, optional
+        The format of the report: TABLE or JSON. Default is TABLE.
+    output : str, optional
+        If given, the report is written to this file instead of being printed.
+    workers : int, optional
+        The number of worker processes reading metadata. Default is 1.
+    scan_workers : int, optional
+        The number of threads listing directories concurrently. Default is 1.
+    index : bool | str, optional
+        If True, metadata is read from the index of `input_dir` (see `index`), which
+        is updated first: only new and modified photos are opened. A path can be
+        given to use an index stored elsewhere. Default is False.
+    """
+    check_stats_args(input_dir, by, session_gap, format, workers)
+    start = time.perf_counter()
+    files = Scanner(input_dir, workers=scan_workers)
+    mapper = Executor(workers=workers).map
+    if index:
+        metadata_index = MetadataIndex(path=index) if isinstance(index, str) else MetadataIndex.in_directory(input_dir)
+        errors = metadata_index.update(files, root=input_dir, mapper=mapper).errors
+        exposure_stats = ExposureStats.from_records(
+            (entry.path, entry.record, None) for entry in metadata_index.entries(input_dir)
+        )
+        exposure_stats.errors.extend(errors)
+        metadata_index.close()
+    else:
+        exposure_stats = ExposureStats.from_files(files, mapper=mapper)
+    report = exposure_stats.report(StatsGroup(str(by)), gap=session_gap * 60)
+
+    if OutputFormat(str(format)) == OutputFormat.JSON:
+        text = json.dumps(report, indent=2, ensure_ascii=False)
+    else:
+        text = format_report(report)
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if OutputFormat(str(format)) == OutputFormat.TABLE or output:
+        print(f"📊 {len(exposure_stats)} photos summarised in {time.perf_counter() - start:.2f}s.")
+        if exposure_stats.errors:
+            print(f"⚠️ {len(exposure_stats.errors)} files could not be read:")
+            for source, error in exposure_stats.errors:
+                print(f"\t❌ {source}: {error}")
@@ -0,0 +1,176 @@
+import time
+from pathlib import Path
+
+from src.cli.naming import build_metadata_cache, check_encoder_args, check_naming_args
+from src.common.enums import EncoderBackend, NamingMode, WatchBackend
+from src.constants.image import DEFAULT_QUALITY
+from src.core.executor import Executor
+from src.core.job import JobResult
+from src.core.journal import Journal
+from src.core.namer import Namer
+from src.core.processor import Processor
+from src.core.watcher import POLL_INTERVAL, SETTLE_TIME, Batch, FolderWatcher, Inotify
+
+
+def check_watch_args(backend: WatchBackend, settle: float, interval: float, duration: float | None) -> None:
+    """
+    Check the arguments used to watch a directory.
+
+    Parameters
+    ----------
+    backend : WatchBackend
+        How the directory is monitored (AUTO, INOTIFY or POLLING).
+    settle : float
+        The seconds a file must stay unchanged before it is processed.
+    interval : float
+        The seconds between two listings of the tree when it is polled.
+    duration : float | None
+        The seconds after which the watch stops, or None to run until interrupted.
+    """
+    if str(backend) not in WatchBackend.choices():
+        raise ValueError(f"Invalid backend: {backend}. Available backends: {WatchBackend.choices()}")
+    if WatchBackend(str(backend)) == WatchBackend.INOTIFY and not Inotify.available():
+        raise ValueError("inotify is not available on this platform, use the polling backend.")
+    for name, value in (("settle time", settle), ("polling interval", interval)):
+        if isinstance(value, bool) or not isinstance(value, int | float) or value < 0:
+            raise ValueError(f"Invalid {name}: {value}. It must be a non-negative number of seconds.")
+    if interval == 0:
+        raise ValueError("Invalid polling interval: 0. It must be a positive number of seconds.")
+    if duration is not None and (isinstance(duration, bool) or not isinstance(duration, int | float) or duration <= 0):
+        raise ValueError(f"Invalid duration: {duration}. It must be a positive number of seconds.")
+
+def process_batch(
+    batch: Batch,
+    mode: NamingMode,
+    in_image: bool,
+    output_dir: str,
+    executor: Executor,
+    **options,
+) -> list[JobResult]:
+    """
+    Name the files of a batch with the Processor and print where each one went.
+
+    Parameters
+    ----------
+    batch : Batch
+        The files ready to be processed.
+    mode : NamingMode
+        The naming mode to be used (COPY, REPLACE or LINK).
+    in_image : bool
+        If True, metadata is added inside the image files.
+    output_dir : str
+        The output directory. Not used in REPLACE mode.
+    executor : Executor
+        The executor running the jobs, whose worker pool is kept open.
+    **options
+        Extra attributes set on every job (e.g. `journal`, `encoder`).
+
+    Returns
+    -------
+    list[JobResult]
+        The result of every file of the batch.
+    """
+    start = time.perf_counter()
+    if mode == NamingMode.REPLACE:
+        jobs = Processor.build_jobs(batch, mode, in_image, **options)
+    else:
+        jobs = Processor.build_jobs(batch, mode, in_image, Path(batch.directory), Path(output_dir), **options)
+    results = Processor.run_jobs(jobs, desc=f" 👀 Naming {len(batch)} new files", executor=executor)
+    elapsed = time.perf_counter() - start
+    for result in results:
+        if result.ok:
+            print(f"📸 {result.source} ➝ {result.destination}")
+    Namer.report(results)
+    print(f"⏱️ {len(results)} files processed in {elapsed:.2f}s.")
+    return results
+
+def watch(
+    input_dir: str,
+    mode: NamingMode = NamingMode.COPY,
+    in_image: bool = False,
+    output_dir: str = "./naming/",
+    workers: int = 1,
+    backend: WatchBackend = WatchBackend.AUTO,
+    settle: float = SETTLE_TIME,
+    interval: float = POLL_INTERVAL,
+    cache: bool | str = False,
+    encoder: EncoderBackend = EncoderBackend.OPENCV,
+    quality: int = DEFAULT_QUALITY,
+    duration: float | None = None,
+) -> None:
+    """
+    Watch a directory (e.g. a tethering or ingest folder) and name every new
+    photo as soon as it is completely written, instead of scanning the whole
+    tree again on every run.
+
+    Parameters
+    ----------
+    input_dir : str
+        The directory to watch. Its subfolders, including new ones, are watched too.
+        Photos already there when the watch starts are left alone.
+    mode : NamingMode, optional
+        The naming mode to be used (COPY, REPLACE or LINK). Default is COPY.
+    in_image : bool, optional
+        If True, metadata will be added inside the image files. Default is False.
+    output_dir : str, optional
+        The output directory of the COPY and LINK modes. Default is "./naming/".
+    workers : int, optional
+        The number of worker processes, started once for the whole watch. Default is 1.
+    backend : WatchBackend, optional
+        How the directory is monitored: with inotify events if the platform supports
+        them (AUTO), with inotify only (INOTIFY), or by listing it every `interval`
+        seconds (POLLING). Default is AUTO.
+    settle : float, optional
+        The seconds a file must stay unchanged (size and modification time) before it
+        is processed, so that files still being written are not picked up. Default is 0.5.
+    interval : float, optional
+        The seconds between two listings of the directory when it is polled. Default is 1.
+    cache : bool | str, optional
+        Same as for `naming`. Default is False.
+    encoder : EncoderBackend, optional
+        The library used to encode annotated images. Default is OPENCV.
+    quality : int, optional
+        The JPEG quality of annotated images. Default is 75.
+    duration : float, optional
+        If set, the watch stops after this many seconds. Default is to run until
+        interrupted (Ctrl+C).
+    """
+    check_naming_args(mode, input_dir, workers)
+    check_encoder_args(encoder, quality)
+    check_watch_args(backend, settle, interval, duration)
+    mode = NamingMode(str(mode))
+
+    metadata_cache = build_metadata_cache(cache, input_dir)
+    journal = Journal.in_directory(input_dir if mode == NamingMode.REPLACE else output_dir)
+    exclude = (output_dir,) if mode != NamingMode.REPLACE else ()
+    deadline = time.monotonic() + duration if duration is not None else None
+    processed = 0
+    with (
+        Executor(workers=workers) as executor,
+        FolderWatcher(
+            input_dir, backend=WatchBackend(str(backend)), settle=settle, interval=interval,
+            exclude=exclude, cache=metadata_cache
+        ) as watcher,
+    ):
+        how = "inotify" if watcher.uses_inotify else f"polling every {interval}s"
+        print(f"👀 Watching {input_dir} for new photos ({how}, {mode} mode). Press Ctrl+C to stop.")
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                timeout = 1.0 if deadline is None else min(1.0, max(deadline - time.monotonic(), 0))
+                files = watcher.poll(timeout=timeout)
+                if not files:
+                    continue
+                results = process_batch(
+                    Batch.of(input_dir, files), mode, in_image, output_dir, executor,
+                    journal=journal, encoder=EncoderBackend(str(encoder)), quality=quality
+                )
+                processed += len(results)
+                # Renamed files land in the watched tree: they are not new photos.
+                watcher.ignore([path for result in results if result.ok for path in result.destinations])
+        except KeyboardInterrupt:
+            pass
+
+    journal.close()
+    if metadata_cache is not None:
+        metadata_cache.close()
+    print(f"✅ Watch stopped after {processed} files.")
@@ -6,6 +6,7 @@ class NamingMode(Enum):
     """
     COPY = "copy"
     REPLACE = "replace"
+    LINK = "link"
 
     def __str__(self) -> str:
         """
@@ -19,3 +20,179 @@ class NamingMode(Enum):
         Returns a list of available modes.
         """
         return [mode.value for mode in cls]
+
+
+class EncoderBackend(Enum):
+    """
+    Enum to represent the libraries available to encode annotated images.
+    """
+    OPENCV = "opencv"
+    PILLOW = "pillow"
+    STRIP = "strip"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the backend.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available backends.
+        """
+        return [backend.value for backend in cls]
+
+
+class ExecutorBackend(Enum):
+    """
+    Enum to represent the ways naming jobs can be executed.
+    """
+    POOL = "pool"
+    PIPELINE = "pipeline"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the backend.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available backends.
+        """
+        return [backend.value for backend in cls]
+
+
+class GridOrder(Enum):
+    """
+    Enum to represent the orders in which photos are laid out in a grid.
+    """
+    NAME = "name"
+    DATE = "date"
+    EV = "ev"
+    EXPOSURE = "exposure"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the order.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available orders.
+        """
+        return [order.value for order in cls]
+
+
+class StatsGroup(Enum):
+    """
+    Enum to represent how photos are grouped in exposure statistics.
+    """
+    FOLDER = "folder"
+    SESSION = "session"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the grouping.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available groupings.
+        """
+        return [group.value for group in cls]
+
+
+class OutputFormat(Enum):
+    """
+    Enum to represent the formats reports are printed in.
+    """
+    TABLE = "table"
+    JSON = "json"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the format.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available formats.
+        """
+        return [output_format.value for output_format in cls]
+
+
+class GroupLayout(Enum):
+    """
+    Enum to represent how the frames of a bracket or burst are named: in a
+    subfolder per group (FOLDER) or with a group suffix (SUFFIX).
+    """
+    FOLDER = "folder"
+    SUFFIX = "suffix"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the layout.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available layouts.
+        """
+        return [layout.value for layout in cls]
+
+
+class GroupKind(Enum):
+    """
+    Enum to represent the kinds of photo groups: exposure brackets, whose
+    frames have different exposure biases, and bursts, whose frames share it.
+    """
+    BRACKET = "bracket"
+    BURST = "burst"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the kind.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available kinds.
+        """
+        return [kind.value for kind in cls]
+
+
+class WatchBackend(Enum):
+    """
+    Enum to represent how a watched folder is monitored: with inotify events
+    when the platform supports them (AUTO), with inotify only (INOTIFY), or
+    by listing the tree periodically (POLLING).
+    """
+    AUTO = "auto"
+    INOTIFY = "inotify"
+    POLLING = "polling"
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the backend.
+        """
+        return self.value
+
+    @classmethod
+    def choices(cls) -> list[str]:
+        """
+        Returns a list of available backends.
+        """
+        return [backend.value for backend in cls]
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import json
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+PROFILE_FILENAME = "kmera-profile.json"
+
+# Upper bounds (in milliseconds) of the latency histogram buckets.
+HISTOGRAM_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, math.inf)
+
+# The profile of the job running in the current thread, or None when
+# profiling is disabled. Hooks only pay for this lookup when it is None.
+_active: ContextVar[JobProfile | None] = ContextVar("kmera_profile", default=None)
+_disabled = nullcontext()
+
+
+@dataclass
+class JobProfile:
+    """
+    The measures taken while processing a single file. It travels back from
+    the worker processes inside the JobResult.
+
+    Attributes
+    ----------
+    stages : dict[str, float]
+        The seconds spent in every stage.
+    bytes_read : int
+        The number of bytes read from disk.
+    bytes_written : int
+        The number of bytes written to disk.
+    """
+
+    stages: dict[str, float] = field(default_factory=dict)
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    def add(self, stage: str, seconds: float) -> None:
+        """
+        Add the seconds spent in a stage.
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+class _StageTimer:
+    __slots__ = ("name", "profile", "start")
+
+    def __init__(self, profile: JobProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *_) -> None:
+        self.profile.add(self.name, time.perf_counter() - self.start)
+
+
+@contextmanager
+def activate(profile: JobProfile | None) -> Iterator[JobProfile | None]:
+    """
+    Make `profile` the target of the hooks called from the current thread
+    within the block. With None, the hooks are disabled.
+    """
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+
+
+def stage(name: str) -> AbstractContextManager:
+    """
+    Returns a context manager timing the block as the given stage of the
+    active job profile, or a no-op one when profiling is disabled.
+    """
+    profile = _active.get()
+    if profile is None:
+        return _disabled
+    return _StageTimer(profile, name)
+
+
+def count_read(size: int) -> None:
+    """
+    Add bytes read from disk to the active job profile, if any.
+    """
+    profile = _active.get()
+    if profile is not None:
+        profile.bytes_read += size
+
+
+def count_written(size: int) -> None:
+    """
+    Add bytes written to disk to the active job profile, if any.
+    """
+    profile = _active.get()
+    if profile is not None:
+        profile.bytes_written += size
+
+
+def peak_rss() -> dict[str, int | None]:
+    """
+    Returns the peak resident set size, in bytes, of this process and of the
+    largest of its finished child processes (e.g. pool workers).
+    """
+    if resource is None:
+        return {"self": None, "children": None}
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit,
+    }
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """
+    Returns the nearest-rank percentile of an already sorted list.
+    """
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+@dataclass
+class Profiler:
+    """
+    Aggregates the job profiles of a naming run into per-stage latency
+    histograms, I/O totals and peak memory usage.
+
+    Attributes
+    ----------
+    samples : dict[str, array]
+        The per-file seconds spent in every stage.
+    totals : dict[str, float]
+        The seconds spent in stages that are not measured per file (e.g. scan).
+    files : int
+        The number of profiled files.
+    bytes_read : int
+        The number of bytes read from disk.
+    bytes_written : int
+        The number of bytes written to disk.
+    """
+
+    samples: dict[str, array] = field(default_factory=dict)
+    totals: dict[str, float] = field(default_factory=dict)
+    files: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def merge(self, profile: JobProfile | None) -> None:
+        """
+        Add the measures of a processed file.
+        """
+        if profile is None:
+            return
+        self.files += 1
+        self.bytes_read += profile.bytes_read
+        self.bytes_written += profile.bytes_written
+        for name, seconds in profile.stages.items():
+            self.samples.setdefault(name, array("d")).append(seconds)
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Add seconds to a stage that is not measured per file.
+        """
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+
+    def report(self) -> dict:
+        """
+        Returns the summary of the run as a JSON-serializable dictionary.
+        """
+        wall = time.perf_counter() - self.started
+        stages = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            histogram = [0] * len(HISTOGRAM_BUCKETS_MS)
+            for seconds in ordered:
+                histogram[bisect_left(HISTOGRAM_BUCKETS_MS, seconds * 1000)] += 1
+            stages[name] = {
+                "count": len(ordered),
+                "total_s": round(sum(ordered), 6),
+                "mean_ms": round(1000 * sum(ordered) / len(ordered), 4),
+                "p50_ms": round(1000 * percentile(ordered, 0.50), 4),
+                "p90_ms": round(1000 * percentile(ordered, 0.90), 4),
+                "p99_ms": round(1000 * percentile(ordered, 0.99), 4),
+                "max_ms": round(1000 * ordered[-1], 4),
+                "histogram_ms": {
+                    f"<={bound:g}": count for bound, count in zip(HISTOGRAM_BUCKETS_MS, histogram) if count
+                },
+            }
+        for name, seconds in self.totals.items():
+            stages[name] = {"count": 1, "total_s": round(seconds, 6)}
+
+        return {
+            "files": self.files,
+            "wall_s": round(wall, 6),
+            "files_per_second": round(self.files / wall, 2) if wall else None,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "peak_rss_bytes": peak_rss(),
+            "stages": stages,
+        }
+
+    def table(self, report: dict | None = None) -> str:
+        """
+        Returns the summary of the run as a text table.
+        """
+        report = report or self.report()
+        header = (
+            f"{'stage':<12}{'files':>8}{'total s':>10}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}"
+            f"{'p99 ms':>10}{'max ms':>10}"
+        )
+        lines = [header]
+        for name, values in sorted(report["stages"].items(), key=lambda item: -item[1]["total_s"]):
+            if "mean_ms" not in values:
+                lines.append(f"{name:<12}{'-':>8}{values['total_s']:>10.3f}")
+                continue
+            lines.append(
+                f"{name:<12}{values['count']:>8}{values['total_s']:>10.3f}{values['mean_ms']:>10.2f}"
+                f"{values['p50_ms']:>10.2f}{values['p90_ms']:>10.2f}{values['p99_ms']:>10.2f}{values['max_ms']:>10.2f}"
+            )
+
+        rss = report["peak_rss_bytes"]
+        memory = ", ".join(f"{who} {size / 2**20:.1f} MiB" for who, size in rss.items() if size is not None)
+        lines.append(
+            f"{report['files']} files in {report['wall_s']:.2f} s, "
+            f"{report['bytes_read'] / 2**20:.1f} MiB read, {report['bytes_written'] / 2**20:.1f} MiB written"
+            + (f", peak RSS: {memory}" if memory else "")
+        )
+        return "\n".join(lines)
+
+    def write(self, path: str, report: dict | None = None) -> None:
+        """
+        Write the summary of the run as JSON.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(report or self.report(), indent=2) + "\n", encoding="utf-8")
@@ -1,3 +1,11 @@
+# TIFF-based RAW formats, named and annotated from their embedded JPEG preview.
+RAW_EXTENSIONS = {ext for base in [
+    ".pef", ".dng", ".cr2", ".nef"
+] for ext in (base.lower(), base.upper())}
+
 IMAGE_EXTENSIONS = {ext for base in [
     ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"
-] for ext in (base.lower(), base.upper())}
+] for ext in (base.lower(), base.upper())} | RAW_EXTENSIONS
+
+# JPEG quality of annotated images.
+DEFAULT_QUALITY = 75
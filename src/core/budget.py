@@ -0,0 +1,117 @@
+import re
+import threading
+from dataclasses import dataclass, field
+
+SIZE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*$", re.IGNORECASE)
+
+
+def parse_size(size: int | str) -> int:
+    """
+    Parse a number of bytes, given as an integer or as a string with an
+    optional binary unit suffix (e.g. "512M", "4G", "1.5GiB").
+
+    Parameters
+    ----------
+    size : int | str
+        The size to parse.
+
+    Returns
+    -------
+    int
+        The number of bytes.
+    """
+    if isinstance(size, int) and not isinstance(size, bool):
+        return size
+    match = SIZE_PATTERN.match(str(size))
+    if match is None:
+        raise ValueError(f"Invalid size: {size}. Expected a number of bytes with an optional K, M, G or T unit.")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    """
+    Returns a human-readable number of bytes (e.g. "1.5 GiB").
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+@dataclass
+class MemoryBudget:
+    """
+    Admits jobs while the estimated memory of the jobs in flight stays within
+    a limit. A job larger than the whole budget is admitted once nothing else
+    is in flight, so it runs alone instead of never running.
+
+    It is safe to use from several threads: `acquire` blocks until the job
+    fits and `release` wakes up the waiting threads.
+
+    Attributes
+    ----------
+    limit : int
+        The number of bytes the jobs in flight may hold.
+    used : int
+        The estimated number of bytes held by the jobs in flight.
+    peak : int
+        The highest value of `used` since the last reset.
+    """
+
+    limit: int
+    used: int = field(default=0, init=False)
+    peak: int = field(default=0, init=False)
+    condition: threading.Condition = field(default_factory=threading.Condition, init=False, repr=False, compare=False)
+
+    def fits(self, cost: int) -> bool:
+        """
+        Returns True if a job of the given cost can be admitted right now.
+        """
+        return self.used == 0 or self.used + cost <= self.limit
+
+    def acquire(self, cost: int, timeout: float | None = None) -> bool:
+        """
+        Wait until a job of the given cost fits in the budget and admit it.
+
+        Parameters
+        ----------
+        cost : int
+            The estimated number of bytes held by the job.
+        timeout : float, optional
+            The maximum number of seconds to wait. Default is to wait forever.
+
+        Returns
+        -------
+        bool
+            True if the job was admitted, False if the timeout expired.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.fits(cost), timeout):
+                return False
+            self.used += cost
+            self.peak = max(self.peak, self.used)
+            return True
+
+    def release(self, cost: int) -> None:
+        """
+        Give back the memory of a finished job.
+        """
+        with self.condition:
+            self.used -= cost
+            self.condition.notify_all()
+
+    def reset(self) -> None:
+        """
+        Forget the jobs in flight and the peak usage, before a new run.
+        """
+        with self.condition:
+            self.used = self.peak = 0
+            self.condition.notify_all()
+
+    def summary(self) -> str:
+        """
+        Returns a one-line description of the budget and its peak usage.
+        """
+        return f"memory budget {format_size(self.limit)} (peak {format_size(self.peak)})"
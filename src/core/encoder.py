@@ -0,0 +1,93 @@
+import struct
+from io import BytesIO
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.common.enums import EncoderBackend
+from src.constants.image import DEFAULT_QUALITY
+from src.metadata.exif import EXIF_HEADER, JPEG_SOI
+
+JPEG_APP0 = 0xE0
+JPEG_APP1 = 0xE1
+
+
+def splice_exif(jpeg: bytes, exif: bytes) -> bytes:
+    """
+    Insert an EXIF APP1 segment into a JPEG byte stream, right after the SOI
+    marker and the JFIF APP0 segment if there is one. An EXIF segment already
+    present at that position is replaced.
+
+    Parameters
+    ----------
+    jpeg : bytes
+        The JPEG byte stream.
+    exif : bytes
+        The EXIF data, starting with the "Exif\\0\\0" header (as returned by
+        `piexif.dump`).
+
+    Returns
+    -------
+    bytes
+        The JPEG byte stream with the EXIF segment.
+    """
+    if not jpeg.startswith(JPEG_SOI):
+        raise ValueError("Not a JPEG byte stream.")
+    if not exif:
+        return jpeg
+    if len(exif) + 2 > 0xFFFF:
+        raise ValueError(f"EXIF data is too long: {len(exif)} bytes.")
+
+    position = len(JPEG_SOI)
+    while jpeg[position] == 0xFF and jpeg[position + 1] == JPEG_APP0:
+        position += 2 + struct.unpack(">H", jpeg[position + 2:position + 4])[0]
+
+    rest = position
+    if jpeg[position + 1] == JPEG_APP1 and jpeg[position + 4:position + 10] == EXIF_HEADER:
+        rest += 2 + struct.unpack(">H", jpeg[position + 2:position + 4])[0]
+
+    segment = bytes([0xFF, JPEG_APP1]) + struct.pack(">H", len(exif) + 2) + exif
+    return jpeg[:position] + segment + jpeg[rest:]
+
+
+def encode_jpeg(
+    image: np.ndarray,
+    exif: bytes,
+    backend: EncoderBackend = EncoderBackend.OPENCV,
+    quality: int = DEFAULT_QUALITY,
+) -> bytes:
+    """
+    Encode a BGR image as JPEG with the given EXIF data.
+
+    The OpenCV backend encodes the BGR buffer directly and splices the EXIF
+    segment into the byte stream. The Pillow backend converts the image to
+    RGB and lets Pillow write the EXIF data.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        The BGR image to encode.
+    exif : bytes
+        The EXIF data, starting with the "Exif\\0\\0" header.
+    backend : EncoderBackend, optional
+        The library used to encode the image. Default is OPENCV.
+    quality : int, optional
+        The JPEG quality, from 1 to 100. Default is 75.
+
+    Returns
+    -------
+    bytes
+        The JPEG byte stream.
+    """
+    if EncoderBackend(backend) == EncoderBackend.PILLOW:
+        buffer = BytesIO()
+        Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)).save(
+            buffer, "jpeg", quality=quality, exif=exif
+        )
+        return buffer.getvalue()
+
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("OpenCV could not encode the image.")
+    return splice_exif(encoded.tobytes(), exif)
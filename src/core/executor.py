@@ -0,0 +1,324 @@
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from queue import Empty, Full, Queue
+from typing import Self
+
+from src.core.budget import MemoryBudget
+from src.core.job import Job, JobResult
+
+# Marks the end of the stream in the queues of the pipeline.
+_DONE = object()
+
+
+def run_stages(stages: Sequence[Callable], job: Job) -> JobResult:
+    """
+    Run the stages of a job one after the other, passing the output of each
+    stage to the next one.
+    """
+    item = job
+    for stage in stages:
+        item = stage(item)
+    return item
+
+
+@dataclass
+class Executor:
+    """
+    Runs naming jobs either inline or on a pool of worker processes.
+
+    Results are always yielded in the same order as the jobs were given, no
+    matter how many workers are used, so the output of a run is deterministic.
+
+    Attributes
+    ----------
+    workers : int
+        The number of worker processes. With 1 (or less) jobs run inline in
+        the current process.
+    backlog : int
+        The number of jobs submitted per worker ahead of the result being
+        consumed. It bounds the memory used by pending jobs.
+    budget : MemoryBudget | None
+        If given, jobs are only submitted while the estimated memory of the
+        jobs in flight fits in it, so large images run alone and small ones
+        many at a time.
+
+    Used as a context manager, the worker processes are started once and
+    shared by every call until the block exits, instead of one pool per call.
+    """
+
+    workers: int = 1
+    backlog: int = 4
+    budget: MemoryBudget | None = None
+    pool: ProcessPoolExecutor | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __enter__(self) -> Self:
+        if self.workers > 1 and self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def run(self, stages: Sequence[Callable], jobs: Iterable[Job]) -> Iterator[JobResult]:
+        """
+        Run every job through all the stages in a single call, yielding the
+        results in job order.
+
+        Parameters
+        ----------
+        stages : Sequence[Callable]
+            Picklable functions applied in turn: the first one takes the job
+            and the last one returns its JobResult.
+        jobs : Iterable[Job]
+            The jobs to be processed. It is consumed lazily.
+
+        Yields
+        ------
+        JobResult
+            The result of each job, in the same order as `jobs`.
+        """
+        return self.map(partial(run_stages, tuple(stages)), jobs)
+
+    def map(self, func: Callable[[Job], JobResult], jobs: Iterable[Job]) -> Iterator[JobResult]:
+        """
+        Apply `func` to every job, yielding the results in job order.
+
+        Parameters
+        ----------
+        func : Callable[[Job], JobResult]
+            A picklable function that processes a single job.
+        jobs : Iterable[Job]
+            The jobs to be processed. It is consumed lazily.
+
+        Yields
+        ------
+        JobResult
+            The result of each job, in the same order as `jobs`.
+        """
+        if self.workers <= 1:
+            for job in jobs:
+                yield func(job)
+            return
+
+        budget = self.budget
+        if budget is not None:
+            budget.reset()
+
+        def collect() -> JobResult:
+            future, cost = pending.popleft()
+            result = future.result()
+            if budget is not None:
+                budget.release(cost)
+            return result
+
+        # A shared pool stays open when the call ends.
+        with nullcontext(self.pool) if self.pool is not None else ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for job in jobs:
+                cost = 0
+                if budget is not None:
+                    cost = job.memory
+                    # Results come back in job order: wait for the oldest jobs
+                    # until the new one fits.
+                    while not budget.fits(cost):
+                        yield collect()
+                    budget.acquire(cost)
+
+                pending.append((pool.submit(func, job), cost))
+                if len(pending) >= self.workers * self.backlog:
+                    yield collect()
+
+            while pending:
+                yield collect()
+
+    def summary(self) -> str:
+        """
+        Returns a one-line description of the executor for the run summary.
+        """
+        summary = f"{self.workers} worker process(es), backlog {self.backlog} per worker"
+        if self.budget is not None:
+            summary += f", {self.budget.summary()}"
+        return summary
+
+
+@dataclass
+class PipelineExecutor:
+    """
+    Runs naming jobs through a pipeline of thread stages, so that disk reads,
+    CPU-bound decoding, rendering and encoding, and disk writes overlap
+    instead of alternating.
+
+    Every stage has its own threads and consecutive stages are connected by
+    bounded queues, so a slow stage applies back-pressure to the previous ones
+    and the number of jobs held in memory (and their image buffers) is capped.
+    OpenCV releases the GIL while decoding, drawing and encoding, so the
+    render threads run in parallel.
+
+    Results are yielded in the same order as the jobs were given.
+
+    Attributes
+    ----------
+    readers : int
+        The number of threads running the first stage (reading files).
+    workers : int
+        The number of threads running the middle stages (decode, render, encode).
+    writers : int
+        The number of threads running the last stage (writing outputs).
+    depth : int
+        The capacity of every queue between two stages.
+    budget : MemoryBudget | None
+        If given, jobs enter the pipeline only while the estimated memory of
+        the jobs in flight fits in it, so large images run alone and small
+        ones many at a time. A job leaves it once its last stage is done.
+    peaks : list[int]
+        The highest occupancy reached by each queue during the last run.
+    """
+
+    readers: int = 2
+    workers: int = 2
+    writers: int = 2
+    depth: int = 8
+    budget: MemoryBudget | None = None
+    peaks: list[int] = field(default_factory=list, init=False)
+
+    def threads(self, stages: int) -> list[int]:
+        """
+        Returns the number of threads of each stage: readers for the first,
+        writers for the last and workers for the ones in between.
+        """
+        if stages == 1:
+            return [max(self.workers, 1)]
+        return [max(self.readers, 1)] + [max(self.workers, 1)] * (stages - 2) + [max(self.writers, 1)]
+
+    def run(self, stages: Sequence[Callable], jobs: Iterable[Job]) -> Iterator[JobResult]:
+        """
+        Run every job through the pipeline, yielding the results in job order.
+
+        Parameters
+        ----------
+        stages : Sequence[Callable]
+            Functions applied in turn, each on its own threads: the first one
+            takes the job and the last one returns its JobResult.
+        jobs : Iterable[Job]
+            The jobs to be processed. It is consumed lazily.
+
+        Yields
+        ------
+        JobResult
+            The result of each job, in the same order as `jobs`.
+        """
+        stages = list(stages)
+        threads = self.threads(len(stages))
+        queues = [Queue(maxsize=self.depth) for _ in range(len(stages) + 1)]
+        self.peaks = [0] * len(queues)
+        # Results finished out of order wait in memory for the earlier ones,
+        # so the number of jobs in flight is capped as well.
+        in_flight = threading.BoundedSemaphore(self.depth * len(queues) + sum(threads))
+        stop = threading.Event()
+        remaining = list(threads)
+        lock = threading.Lock()
+        budget, costs = self.budget, {}
+        if budget is not None:
+            budget.reset()
+
+        def put(index: int, item) -> None:
+            while not stop.is_set():
+                try:
+                    queues[index].put(item, timeout=0.1)
+                except Full:
+                    continue
+                self.peaks[index] = max(self.peaks[index], queues[index].qsize())
+                return
+
+        def get(index: int):
+            while not stop.is_set():
+                try:
+                    return queues[index].get(timeout=0.1)
+                except Empty:
+                    continue
+            return _DONE
+
+        def feed() -> None:
+            try:
+                for position, job in enumerate(jobs):
+                    while not in_flight.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if budget is not None:
+                        costs[position] = cost = job.memory
+                        while not budget.acquire(cost, timeout=0.1):
+                            if stop.is_set():
+                                return
+                    put(0, (position, job))
+            except Exception as error:  # noqa: BLE001 - raised again by run()
+                put(len(stages), (-1, error))
+            finally:
+                for _ in range(threads[0]):
+                    put(0, _DONE)
+
+        def work(index: int) -> None:
+            stage = stages[index]
+            while (entry := get(index)) is not _DONE:
+                position, item = entry
+                try:
+                    item = stage(item)
+                except Exception as error:  # noqa: BLE001 - raised again by run()
+                    # A failed job leaves the pipeline at this stage.
+                    if budget is not None:
+                        budget.release(costs.pop(position, 0))
+                    put(len(stages), (-1, error))
+                    continue
+                if budget is not None and index == len(stages) - 1:
+                    budget.release(costs.pop(position, 0))
+                put(index + 1, (position, item))
+
+            # The last thread leaving a stage closes the next one.
+            with lock:
+                remaining[index] -= 1
+                closed = remaining[index] == 0
+            if closed:
+                for _ in range(threads[index + 1] if index + 1 < len(stages) else 1):
+                    put(index + 1, _DONE)
+
+        pool = [threading.Thread(target=feed, daemon=True)]
+        for index, count in enumerate(threads):
+            pool.extend(threading.Thread(target=work, args=(index,), daemon=True) for _ in range(count))
+        for thread in pool:
+            thread.start()
+
+        try:
+            ready, expected = {}, 0
+            while (entry := get(len(stages))) is not _DONE:
+                position, result = entry
+                if position < 0:
+                    raise result
+                ready[position] = result
+                while expected in ready:
+                    in_flight.release()
+                    yield ready.pop(expected)
+                    expected += 1
+        finally:
+            stop.set()
+            for thread in pool:
+                thread.join()
+
+    def summary(self) -> str:
+        """
+        Returns a one-line description of the pipeline and the peak occupancy
+        of its queues during the last run, for the run summary.
+        """
+        peaks = "/".join(str(peak) for peak in self.peaks) or "-"
+        summary = (
+            f"pipeline of {self.readers} reader(s), {self.workers} worker(s) and "
+            f"{self.writers} writer(s), queue depth {self.depth} (peak {peaks})"
+        )
+        if self.budget is not None:
+            summary += f", {self.budget.summary()}"
+        return summary
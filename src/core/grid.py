@@ -0,0 +1,163 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from tqdm import tqdm
+
+from src.common.enums import GridOrder
+from src.core.grouping import read_metadata
+from src.core.overlay import draw_overlay
+from src.core.preview import decode_preview
+from src.core.processor import Processor
+from src.data.file import File
+from src.metadata.exif import METADATA_ERRORS
+from src.metadata.photo import parse_ratio
+
+
+def sort_key(order: GridOrder) -> Callable[[File], tuple]:
+    """
+    Returns the key sorting files in the given order. Files whose value is
+    missing or whose metadata cannot be read go last, and ties are broken by
+    path so the layout is stable. Unreadable files are reported when their
+    tile is drawn.
+    """
+    def numeric(field: str) -> Callable[[File], tuple]:
+        def key(file: File) -> tuple:
+            metadata = read_metadata(file)
+            value = parse_ratio(getattr(metadata, field)) if metadata is not None else None
+            return value is None, value or 0.0, str(file.directory)
+        return key
+
+    def date(file: File) -> tuple:
+        metadata = read_metadata(file)
+        date_taken = metadata.date_taken if metadata is not None else ""
+        return not date_taken, date_taken, str(file.directory)
+
+    if order == GridOrder.DATE:
+        return date
+    if order == GridOrder.EV:
+        return numeric("exposure_bias")
+    if order == GridOrder.EXPOSURE:
+        return numeric("exposure_time")
+    return lambda file: str(file.directory)
+
+
+@dataclass
+class ContactSheet:
+    """
+    Lays out photos as annotated tiles of a grid, to compare exposures side
+    by side.
+
+    The canvas is allocated once and every tile is decoded at a reduced size
+    (see `decode_preview`), annotated and copied into its cell by a pool of
+    threads. Only one tile per thread is in memory at any time, however many
+    photos the sheet holds.
+
+    Attributes
+    ----------
+    columns : int
+        The number of tiles per row.
+    tile_size : int
+        The side of the square cell of every tile, in pixels. Photos are
+        shrunk to fit and centered in it.
+    gap : int
+        The space between two cells and around the grid, in pixels.
+    workers : int
+        The number of threads decoding and drawing tiles.
+    background : int
+        The gray level of the canvas around the tiles.
+    """
+
+    columns: int = 6
+    tile_size: int = 320
+    gap: int = 8
+    workers: int = 4
+    background: int = 32
+
+    def shape(self, count: int) -> tuple[int, int, int]:
+        """
+        Returns the (height, width, channels) of a sheet holding `count` tiles.
+        """
+        rows = max(1, -(-count // self.columns))
+        columns = max(1, min(count, self.columns))
+        return (
+            rows * self.tile_size + (rows + 1) * self.gap,
+            columns * self.tile_size + (columns + 1) * self.gap,
+            3,
+        )
+
+    def cell(self, index: int) -> tuple[int, int]:
+        """
+        Returns the (x, y) position of the top-left corner of a tile's cell.
+        """
+        row, column = divmod(index, self.columns)
+        return (
+            self.gap + column * (self.tile_size + self.gap),
+            self.gap + row * (self.tile_size + self.gap),
+        )
+
+    def render_tile(self, file: File) -> np.ndarray | None:
+        """
+        Decode a photo at the size of a tile and draw its name and metadata.
+
+        Parameters
+        ----------
+        file : File
+            The photo.
+
+        Returns
+        -------
+        np.ndarray | None
+            The annotated tile, or None if the photo could not be decoded.
+        """
+        try:
+            tile = decode_preview(file.image_data, self.tile_size, file.image_header)
+        finally:
+            file.release()
+        if tile is not None:
+            draw_overlay(tile, [file.name, *Processor.metadata_lines(file.photo_metadata)])
+        return tile
+
+    def build(self, files: Iterable[File], desc: str = "🖼️ Drawing tiles") -> tuple[np.ndarray, list[tuple[str, str]]]:
+        """
+        Draw the sheet of the given photos, in order, left to right and top to
+        bottom. Photos that cannot be read leave their cell empty.
+
+        Parameters
+        ----------
+        files : Iterable[File]
+            The photos of the sheet.
+        desc : str, optional
+            The description shown in the progress bar.
+
+        Returns
+        -------
+        tuple[np.ndarray, list[tuple[str, str]]]
+            The BGR sheet, and the path and error of every photo left out.
+        """
+        files = list(files)
+        canvas = np.full(self.shape(len(files)), self.background, dtype=np.uint8)
+
+        def draw(index: int) -> tuple[str, str] | None:
+            file = files[index]
+            try:
+                tile = self.render_tile(file)
+            except (*METADATA_ERRORS, cv2.error) as error:
+                return str(file.directory), f"{type(error).__name__}: {error}"
+            if tile is None:
+                return str(file.directory), "Could not decode the image."
+
+            height, width = tile.shape[:2]
+            x, y = self.cell(index)
+            x += (self.tile_size - width) // 2
+            y += (self.tile_size - height) // 2
+            canvas[y:y + height, x:x + width] = tile
+            return None
+
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1)) as pool:
+            outcomes = list(tqdm(
+                pool.map(draw, range(len(files))), total=len(files), desc=desc, unit="tile", leave=False
+            ))
+        return canvas, [outcome for outcome in outcomes if outcome is not None]
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import math
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.common.enums import GroupKind, GroupLayout
+from src.data.file import File
+from src.data.folder import Folder
+from src.data.scanner import Scanner
+from src.metadata.exif import METADATA_ERRORS
+from src.metadata.photo import PhotoMetadata, parse_date, parse_ratio
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Frames of a bracket or burst taken at most this many seconds apart. EXIF
+# dates have a one-second resolution.
+GROUP_GAP = 2.0
+
+
+def find_groups(
+    timestamps: np.ndarray,
+    biases: np.ndarray,
+    directories: np.ndarray,
+    gap: float = GROUP_GAP,
+    min_size: int = 2,
+) -> list[tuple[GroupKind, np.ndarray]]:
+    """
+    Find the exposure brackets and bursts among photos.
+
+    Photos are sorted by directory and date once (O(n log n)). Consecutive
+    photos of a directory at most `gap` seconds apart form a run. A run whose
+    frames share their exposure bias is a burst. Otherwise it is made of
+    brackets: a new bracket starts whenever a bias repeats, so that
+    back-to-back sequences such as 0, -1, +1, 0, -1, +1 make two brackets.
+
+    Parameters
+    ----------
+    timestamps : np.ndarray
+        The date of every photo, in seconds. Undated photos (NaN) are never grouped.
+    biases : np.ndarray
+        The exposure bias of every photo, in EV. NaN counts as 0.
+    directories : np.ndarray
+        An integer identifying the directory of every photo. Groups never span
+        two directories.
+    gap : float, optional
+        The maximum number of seconds between two frames of a group.
+    min_size : int, optional
+        The minimum number of frames of a group. Default is 2.
+
+    Returns
+    -------
+    list[tuple[GroupKind, np.ndarray]]
+        The kind of every group and the indices of its photos, in
+        chronological order. Groups are sorted by directory and date.
+    """
+    import numpy as np
+
+    dated = np.flatnonzero(~np.isnan(timestamps))
+    if len(dated) < min_size:
+        return []
+    order = dated[np.lexsort((timestamps[dated], directories[dated]))]
+    times, folders = timestamps[order], directories[order]
+    biases = np.nan_to_num(biases[order])
+
+    breaks = np.flatnonzero((np.diff(times) > gap) | (np.diff(folders) != 0)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(order)]))
+    groups = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if end - start < min_size:
+            continue
+        run = biases[start:end]
+        if (run == run[0]).all():
+            groups.append((GroupKind.BURST, order[start:end]))
+            continue
+
+        first, seen = start, set()
+        for position, bias in enumerate(run.tolist(), start=start):
+            if bias in seen:
+                if position - first >= min_size:
+                    groups.append((GroupKind.BRACKET, order[first:position]))
+                first, seen = position, set()
+            seen.add(bias)
+        if end - first >= min_size:
+            groups.append((GroupKind.BRACKET, order[first:end]))
+    return groups
+
+
+def group_names(
+    groups: list[tuple[GroupKind, np.ndarray]], paths: list[str], layout: GroupLayout
+) -> dict[str, tuple[str, str]]:
+    """
+    Name the frames of every group. Groups are numbered from 1 per directory
+    and kind, and frames from 1 in chronological order.
+
+    Parameters
+    ----------
+    groups : list[tuple[GroupKind, np.ndarray]]
+        The groups returned by `find_groups`.
+    paths : list[str]
+        The path of every photo.
+    layout : GroupLayout
+        FOLDER to move every group to its own subfolder ("bracket_001"),
+        SUFFIX to append the group and frame to the file names ("bracket001-2").
+
+    Returns
+    -------
+    dict[str, tuple[str, str]]
+        The (subfolder, suffix) of the path of every grouped photo. One of
+        them is empty, depending on the layout.
+    """
+    names, counters = {}, {}
+    for kind, indices in groups:
+        directory = os.path.dirname(paths[indices[0]])
+        number = counters[(directory, kind)] = counters.get((directory, kind), 0) + 1
+        for frame, index in enumerate(indices.tolist(), start=1):
+            if layout == GroupLayout.FOLDER:
+                names[paths[index]] = (f"{kind}_{number:03d}", "")
+            else:
+                names[paths[index]] = ("", f"{kind}{number:03d}-{frame}")
+    return names
+
+
+def read_metadata(file: File) -> PhotoMetadata | None:
+    """
+    Returns the photo metadata of a file, or None if it cannot be read. Runs
+    in worker processes.
+    """
+    try:
+        return file.photo_metadata
+    except METADATA_ERRORS:
+        return None
+
+
+@dataclass
+class GroupedTree:
+    """
+    A tree of files held in memory with their photo metadata, and the
+    bracket and burst groups found among them.
+
+    It is built with a single metadata pass: the files carry their parsed
+    metadata from then on, so naming them never opens them again. It can be
+    given to the Processor in place of a Folder or a Scanner.
+
+    Attributes
+    ----------
+    directory : str
+        The root directory of the tree.
+    directories : list[tuple[str, list[File]]]
+        Every directory of the tree with its files, as yielded by `walk`.
+    groups : list[tuple[GroupKind, np.ndarray]]
+        The groups, as indices in `files`.
+    """
+
+    directory: str
+    directories: list[tuple[str, list[File]]] = field(default_factory=list)
+    groups: list[tuple[GroupKind, np.ndarray]] = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        source: Folder | Scanner,
+        gap: float = GROUP_GAP,
+        mapper: Callable[[Callable, Iterable], Iterator] = map,
+    ) -> GroupedTree:
+        """
+        Read the metadata of every file of the tree and find its groups.
+
+        Parameters
+        ----------
+        source : Folder | Scanner
+            The tree of files.
+        gap : float, optional
+            The maximum number of seconds between two frames of a group.
+        mapper : Callable, optional
+            The function reading the metadata of every file, such as
+            `Executor.map` to read them in parallel. Default is `map`.
+
+        Returns
+        -------
+        GroupedTree
+            The tree and its groups.
+        """
+        import numpy as np
+
+        tree = cls(directory=str(source.directory), directories=list(source.walk()))
+        files = tree.files
+        timestamps = np.full(len(files), np.nan)
+        biases = np.zeros(len(files))
+        directories = np.empty(len(files), dtype=np.int64)
+
+        index = 0
+        for folder_id, (_, folder_files) in enumerate(tree.directories):
+            directories[index:index + len(folder_files)] = folder_id
+            index += len(folder_files)
+
+        for index, (file, metadata) in enumerate(zip(files, mapper(read_metadata, files))):
+            if metadata is None:
+                continue
+            # Parsed in another process: keep it so that it is not read again.
+            file.__dict__["photo_metadata"] = metadata
+            timestamps[index] = parse_date(metadata.date_taken) or math.nan
+            biases[index] = parse_ratio(metadata.exposure_bias) or 0.0
+
+        tree.groups = find_groups(timestamps, biases, directories, gap)
+        return tree
+
+    @property
+    def files(self) -> list[File]:
+        """
+        Returns every file of the tree, directory by directory.
+        """
+        return [file for _, files in self.directories for file in files]
+
+    def walk(self) -> Iterator[tuple[str, list[File]]]:
+        """
+        Yield every directory of the tree with its files.
+        """
+        yield from self.directories
+
+    def names(self, layout: GroupLayout) -> dict[str, tuple[str, str]]:
+        """
+        Returns the (subfolder, suffix) of every grouped file, see `group_names`.
+        """
+        return group_names(self.groups, [str(file.directory) for file in self.files], layout)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from src.common.enums import EncoderBackend, NamingMode
+from src.common.profiling import JobProfile
+from src.constants.image import DEFAULT_QUALITY
+from src.core.journal import Journal
+from src.data.file import File
+
+# Ratio between the decoded and the compressed size of an image, assumed when
+# its dimensions cannot be read from its header.
+UNKNOWN_DECODED_RATIO = 10
+
+
+@dataclass
+class Job:
+    """
+    A single unit of naming work: one source file and the directory where its
+    renamed version must end up.
+
+    Attributes
+    ----------
+    file : File
+        The source file to be processed.
+    dest_dir : str
+        The directory where the renamed file will be written. In REPLACE mode
+        it is the directory that already contains the file.
+    mode : NamingMode
+        The naming mode to be applied (COPY, REPLACE or LINK).
+    in_image : bool
+        If True, metadata will be added inside the image file.
+    incremental : bool
+        If True, the file is skipped when its destination already exists and
+        is not older than the source. Only used in COPY and LINK modes.
+    journal : Journal | None
+        The journal where the progress of the job is recorded.
+    encoder : EncoderBackend
+        The library used to encode the annotated image.
+    quality : int
+        The JPEG quality of the annotated image.
+    profile : bool
+        If True, the time spent in every stage and the bytes read and written
+        are measured and returned in the result.
+    preview : int
+        If set, the annotated image is a preview whose longest side is at most
+        this many pixels. Only used with `in_image`.
+    suffix : str
+        If set, appended to the renamed file name before its extension, e.g.
+        the group and frame of a bracket ("bracket001-2").
+
+    RAW photos annotated with `in_image` are written as JPEGs of their embedded
+    preview, so the renamed file gets a ".jpg" extension.
+    """
+
+    file: File
+    dest_dir: str
+    mode: NamingMode
+    in_image: bool
+    incremental: bool = False
+    journal: Journal | None = None
+    encoder: EncoderBackend = EncoderBackend.OPENCV
+    quality: int = DEFAULT_QUALITY
+    profile: bool = False
+    preview: int = 0
+    suffix: str = ""
+
+    @property
+    def file_name(self) -> str:
+        """
+        Returns the name of the renamed file, with its suffix if any.
+        """
+        stem = str(self.file).removesuffix(self.file.extension)
+        if self.suffix:
+            stem = f"{stem}_{self.suffix}"
+        return stem + (self.file.annotated_extension if self.in_image else self.file.extension)
+
+    @property
+    def memory(self) -> int:
+        """
+        Returns the estimated number of bytes held while the job is processed.
+        Annotating an image holds the file content, the decoded pixels and the
+        encoded output (about the size of the file); other jobs stream the file
+        and hold nothing significant. Previews of JPEGs are decoded at a
+        fraction of their size.
+        """
+        if not self.in_image:
+            return 0
+        try:
+            header = self.file.image_header
+        except OSError:
+            header = None
+        decoded = header.decoded_size if header is not None else self.file.size * UNKNOWN_DECODED_RATIO
+        if self.preview and (self.file.is_raw or self.file.extension.lower() in (".jpg", ".jpeg")):
+            from src.core.preview import reduction
+
+            decoded //= reduction(header, self.preview) ** 2
+        return decoded + 2 * self.file.size
+
+
+@dataclass
+class JobResult:
+    """
+    The outcome of processing a single job.
+
+    Attributes
+    ----------
+    source : str
+        The path of the source file.
+    destination : str
+        The path of the renamed file. Empty if it could not be computed.
+    raw_destination : str
+        The path the RAW source is renamed to, next to the annotated JPEG of
+        its preview written at `destination`, in REPLACE mode with
+        `in_image`. Empty otherwise.
+    error : str | None
+        A description of the error raised while processing the file, or None
+        if the job succeeded.
+    skipped : bool
+        True if the file was not processed because its output is up to date.
+    profile : JobProfile | None
+        The measures taken while processing the file, if it was profiled.
+    """
+
+    source: str
+    destination: str = ""
+    raw_destination: str = ""
+    error: str | None = None
+    skipped: bool = False
+    profile: JobProfile | None = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns True if the job finished without errors.
+        """
+        return self.error is None
+
+    @property
+    def destinations(self) -> list[str]:
+        """
+        Returns every path written by the job: the destination and, for a
+        RAW annotated in REPLACE mode, the path the RAW was renamed to.
+        """
+        return [path for path in (self.destination, self.raw_destination) if path]
+
+
+@dataclass
+class Task:
+    """
+    A job moving through the processing stages (read, render, write), with
+    its partial result and the intermediate data handed between stages.
+
+    Attributes
+    ----------
+    job : Job
+        The job being processed.
+    result : JobResult
+        The result of the job, completed stage by stage.
+    encoded : bytes | None
+        The annotated image, encoded by the render stage and written by the
+        write stage.
+    """
+
+    job: Job
+    result: JobResult
+    encoded: bytes | None = None
+
+    @property
+    def finished(self) -> bool:
+        """
+        Returns True if the job failed or was skipped, so that the remaining
+        stages have nothing to do.
+        """
+        return not self.result.ok or self.result.skipped
+
+    def fail(self, error: Exception) -> None:
+        """
+        Store the error that stopped the job in its result.
+        """
+        self.result.error = f"{type(error).__name__}: {error}"
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+JOURNAL_FILENAME = ".kmera-journal.jsonl"
+
+
+@dataclass
+class JournalEntry:
+    """
+    A single line of the journal.
+
+    Attributes
+    ----------
+    status : str
+        "started" when an operation is about to modify the source, "done"
+        once the destination is complete.
+    source : str
+        The absolute path of the source file.
+    destination : str
+        The absolute path of the renamed file.
+    mtime_ns : int
+        The modification time of the source file when it was processed.
+    """
+
+    status: str
+    source: str
+    destination: str
+    mtime_ns: int = 0
+
+
+@dataclass
+class JournalState:
+    """
+    The state of a previous run, as recorded in its journal.
+
+    Attributes
+    ----------
+    latest : dict[str, JournalEntry]
+        The last entry recorded for each source path.
+    destinations : set[str]
+        Every destination path recorded, whether the operation finished or not.
+    """
+
+    latest: dict[str, JournalEntry] = field(default_factory=dict)
+    destinations: set[str] = field(default_factory=set)
+
+    def is_done(self, source: str, mtime_ns: int) -> bool:
+        """
+        Returns True if the given version of the source was already processed
+        and its destination still exists, or if the path itself is the
+        output of a previous operation.
+
+        Parameters
+        ----------
+        source : str
+            The path of the source file.
+        mtime_ns : int
+            The current modification time of the source file.
+        """
+        source = os.path.abspath(source)
+        if source in self.destinations:
+            return True
+
+        entry = self.latest.get(source)
+        return (
+            entry is not None
+            and entry.status == "done"
+            and entry.mtime_ns == mtime_ns
+            and Path(entry.destination).exists()
+        )
+
+
+@dataclass
+class Journal:
+    """
+    An append-only journal of the operations completed by a naming run, used
+    to resume interrupted runs.
+
+    Each entry is written with a single `write` on a file opened in append
+    mode, so worker processes can share the journal without interleaving
+    lines. The file descriptor is opened lazily and is not pickled: the copy
+    sent to a worker with every job opens, appends and closes the file on
+    each entry, since nothing would ever close a descriptor it kept.
+
+    Attributes
+    ----------
+    path : str
+        The path of the journal file.
+    """
+
+    path: str
+
+    @classmethod
+    def in_directory(cls, directory: str) -> Journal:
+        """
+        Create a journal stored in the given directory.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the journal file is stored.
+
+        Returns
+        -------
+        Journal
+            The journal.
+        """
+        return cls(path=str(Path(directory) / JOURNAL_FILENAME))
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("fd", None)
+        state["unpickled"] = True
+        return state
+
+    def record(self, status: str, source: str, destination: str, mtime_ns: int = 0) -> None:
+        """
+        Append an entry to the journal.
+
+        Parameters
+        ----------
+        status : str
+            "started" or "done".
+        source : str
+            The path of the source file.
+        destination : str
+            The path of the renamed file.
+        mtime_ns : int, optional
+            The modification time of the source file.
+        """
+        entry = JournalEntry(
+            status=status,
+            source=os.path.abspath(source),
+            destination=os.path.abspath(destination),
+            mtime_ns=mtime_ns,
+        )
+        line = (json.dumps(entry.__dict__) + "\n").encode()
+        if self.__dict__.get("unpickled"):
+            fd = self.open()
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            return
+
+        if "fd" not in self.__dict__:
+            self.fd = self.open()
+        os.write(self.fd, line)
+
+    def open(self) -> int:
+        """
+        Open the journal file in append mode, creating it if needed, and
+        return its file descriptor.
+        """
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def state(self) -> JournalState:
+        """
+        Read the journal and return the state it describes. A truncated last
+        line, left by a run that died while writing it, is ignored.
+
+        Returns
+        -------
+        JournalState
+            The state of the previous runs.
+        """
+        state = JournalState()
+        if not Path(self.path).exists():
+            return state
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = JournalEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                state.latest[entry.source] = entry
+                state.destinations.add(entry.destination)
+
+        return state
+
+    def reset(self) -> None:
+        """
+        Discard every entry of the journal.
+        """
+        self.close()
+        Path(self.path).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """
+        Close the journal file, if it is open.
+        """
+        if "fd" in self.__dict__:
+            os.close(self.__dict__.pop("fd"))
@@ -0,0 +1,91 @@
+import errno
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# ioctl request cloning a whole file (Linux, _IOW(0x94, 9, int)), supported by
+# copy-on-write filesystems such as Btrfs, XFS or bcachefs.
+FICLONE = 0x40049409
+
+# Errors meaning that a link or a clone is not possible between the two paths
+# (other device, unsupported filesystem or operation), so the next strategy
+# must be tried.
+FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EINVAL,
+    errno.ENOTTY, errno.EOPNOTSUPP, errno.ENOSYS, errno.EBADF,
+}
+
+
+def reflink(src_file: Path, dst_file: Path) -> None:
+    """
+    Clone the source into the destination, sharing its data blocks until one
+    of them is modified.
+
+    Parameters
+    ----------
+    src_file : Path
+        The file to be cloned.
+    dst_file : Path
+        The path of the clone. It must not exist.
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform.")
+
+    with open(src_file, "rb") as src, open(dst_file, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            dst_file.unlink(missing_ok=True)
+            raise
+    shutil.copystat(src_file, dst_file)
+
+
+def link_file(src_file: Path, dst_file: Path) -> str:
+    """
+    Make the destination a zero-copy view of the source: a reflink where the
+    filesystem supports it, otherwise a hardlink, otherwise (e.g. across
+    devices) a regular copy.
+
+    The link is created next to the destination and renamed over it, so an
+    existing destination is replaced atomically.
+
+    Parameters
+    ----------
+    src_file : Path
+        The file to be linked.
+    dst_file : Path
+        The path of the link.
+
+    Returns
+    -------
+    str
+        The strategy used: "reflink", "hardlink" or "copy".
+    """
+    src_file, dst_file = Path(src_file), Path(dst_file)
+    if dst_file.exists() and os.path.samefile(src_file, dst_file):
+        # Already a hardlink of the source: renaming another link of the same
+        # inode over it would be a no-op that leaves the temporary link behind.
+        return "hardlink"
+
+    tmp_file = dst_file.with_name(f"{dst_file.name}.tmp")
+    tmp_file.unlink(missing_ok=True)
+
+    for method, create in (("reflink", reflink), ("hardlink", os.link)):
+        try:
+            create(src_file, tmp_file)
+        except OSError as error:
+            if error.errno not in FALLBACK_ERRNOS:
+                raise
+            continue
+        os.replace(tmp_file, dst_file)
+        return method
+
+    shutil.copy2(src_file, tmp_file)
+    os.replace(tmp_file, dst_file)
+    return "copy"
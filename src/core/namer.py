@@ -1,8 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from src.core.budget import MemoryBudget
+from src.core.executor import Executor, PipelineExecutor
+from src.core.grouping import GROUP_GAP, GroupedTree
+from src.core.job import JobResult
+from src.core.journal import Journal
 from src.core.processor import Processor
 from src.data.folder import Folder
-from src.common.enums import NamingMode
+from src.data.scanner import Scanner
+from src.common.enums import EncoderBackend, ExecutorBackend, GroupKind, GroupLayout, NamingMode
+from src.common.profiling import PROFILE_FILENAME, Profiler
+from src.constants.image import DEFAULT_QUALITY
 
 
 @dataclass
@@ -14,24 +22,205 @@ class Namer:
     Attributes
     ----------
     mode : NamingMode
-        The mode of naming operation, either COPY or REPLACE.
+        The mode of naming operation: COPY, REPLACE or LINK.
     in_image : bool
         If True, metadata will be added inside the image files.
+    workers : int
+        The number of worker processes used to process the files, or the
+        number of render threads with the PIPELINE executor.
+    resume : bool
+        If True, files already processed by a previous (interrupted) run are
+        skipped, according to its journal.
+    incremental : bool
+        If True, only files newer than their existing output are processed.
+        Only supported in COPY and LINK modes.
+    encoder : EncoderBackend
+        The library used to encode annotated images.
+    quality : int
+        The JPEG quality of annotated images.
+    executor : ExecutorBackend
+        How the jobs are run: on a pool of worker processes (POOL) or through
+        a pipeline of reader, render and writer threads (PIPELINE).
+    queue_depth : int
+        The capacity of the queues between the stages of the pipeline.
+    io_threads : int
+        The number of reader threads and of writer threads of the pipeline.
+    profile : bool | str
+        If set, every stage of every file is timed and a summary is printed.
+        The JSON report is written next to the journal, or to the given path.
+    max_memory : int | None
+        If set, the number of bytes the images processed concurrently may
+        hold, estimated from their dimensions before they are decoded.
+    preview : int
+        If set, the annotated images are previews whose longest side is at
+        most this many pixels. Only supported in COPY mode.
+    group : GroupLayout | None
+        If set, exposure brackets and bursts are detected from the metadata
+        and every group is moved to its own subfolder (FOLDER) or numbered in
+        the file names (SUFFIX).
+    group_gap : float
+        The maximum number of seconds between two frames of a group.
+    errors : int
+        The number of files the last run could not process.
     """
 
     mode: NamingMode
     in_image: bool
+    workers: int = 1
+    resume: bool = False
+    incremental: bool = False
+    encoder: EncoderBackend = EncoderBackend.OPENCV
+    quality: int = DEFAULT_QUALITY
+    executor: ExecutorBackend = ExecutorBackend.POOL
+    queue_depth: int = 8
+    io_threads: int = 2
+    profile: bool | str = False
+    max_memory: int | None = None
+    preview: int = 0
+    group: GroupLayout | None = None
+    group_gap: float = GROUP_GAP
+    errors: int = field(default=0, init=False)
 
-    def run(self, folder: Folder, output_dir: str) -> "Namer":
+    def run(self, folder: Folder | Scanner, output_dir: str) -> "Namer":
+        executor = self.build_executor()
+        profiler = Profiler() if self.profile else None
+        grouping = {}
+        if self.group is not None:
+            folder = self.find_groups(folder)
+            grouping = {"groups": folder.names(self.group)}
         if self.mode == NamingMode.COPY:
-            Processor.copy_naming_metadata(
-                folder, Path(folder.directory), Path(output_dir), in_image=self.in_image
+            journal = self.open_journal(output_dir)
+            results = Processor.copy_naming_metadata(
+                folder, Path(folder.directory), Path(output_dir),
+                in_image=self.in_image, workers=self.workers, resume=self.resume,
+                executor=executor, profiler=profiler, journal=journal, incremental=self.incremental,
+                encoder=self.encoder, quality=self.quality, preview=self.preview, **grouping
             )
             print(f"📂 Copied files from {folder.directory} ➝ {output_dir}...")
+        elif self.mode == NamingMode.LINK:
+            journal = self.open_journal(output_dir)
+            results = Processor.link_naming_metadata(
+                folder, Path(folder.directory), Path(output_dir),
+                in_image=self.in_image, workers=self.workers, resume=self.resume,
+                executor=executor, profiler=profiler, journal=journal, incremental=self.incremental,
+                encoder=self.encoder, quality=self.quality, **grouping
+            )
+            print(f"🔗 Linked files from {folder.directory} ➝ {output_dir}...")
         elif self.mode == NamingMode.REPLACE:
-            Processor.replace_naming_metadata(folder, in_image=self.in_image)
+            journal = self.open_journal(folder.directory)
+            results = Processor.replace_naming_metadata(
+                folder, in_image=self.in_image, workers=self.workers, resume=self.resume,
+                executor=executor, profiler=profiler, journal=journal, encoder=self.encoder, quality=self.quality,
+                **grouping
+            )
             print(f"✍️ Replaced files in {folder.directory} with photo metadata info.")
         else:
             raise ValueError(f"Unsupported naming mode: {self.mode}")
 
+        journal.close()
+        print(f"🧵 Executor: {executor.summary()}")
+        self.errors = sum(not result.ok for result in results)
+        self.report(results)
+        if profiler is not None:
+            self.report_profile(profiler, str(Path(journal.path).parent))
         return self
+
+    def find_groups(self, folder: Folder | Scanner) -> GroupedTree:
+        """
+        Read the metadata of every file once, on `workers` processes, and
+        find the brackets and bursts of the tree.
+
+        Parameters
+        ----------
+        folder : Folder | Scanner
+            The tree of files to be processed.
+
+        Returns
+        -------
+        GroupedTree
+            The tree, whose files carry their metadata, and its groups.
+        """
+        tree = GroupedTree.build(folder, gap=self.group_gap, mapper=Executor(workers=self.workers).map)
+        kinds = [kind for kind, _ in tree.groups]
+        print(
+            f"🎞️ Found {kinds.count(GroupKind.BRACKET)} brackets and {kinds.count(GroupKind.BURST)} bursts "
+            f"among {len(tree.files)} files."
+        )
+        return tree
+
+    def report_profile(self, profiler: Profiler, directory: str) -> None:
+        """
+        Print the profiling summary of the run and write its JSON report.
+
+        Parameters
+        ----------
+        profiler : Profiler
+            The profiler of the run.
+        directory : str
+            The directory where the report is written, unless `profile` is a path.
+        """
+        report = profiler.report()
+        path = self.profile if isinstance(self.profile, str) else str(Path(directory) / PROFILE_FILENAME)
+        profiler.write(path, report)
+        print(f"⏱️ Profile:\n{profiler.table(report)}\n📄 Profile report written to {path}")
+
+    def build_executor(self) -> Executor | PipelineExecutor:
+        """
+        Build the executor selected for the run.
+
+        Returns
+        -------
+        Executor | PipelineExecutor
+            A pool of `workers` processes, or a pipeline with `io_threads`
+            readers and writers, `workers` render threads and queues of
+            `queue_depth` jobs. Both admit jobs within `max_memory`, if set.
+        """
+        budget = MemoryBudget(limit=self.max_memory) if self.max_memory is not None else None
+        if self.executor == ExecutorBackend.PIPELINE:
+            return PipelineExecutor(
+                readers=self.io_threads, workers=self.workers,
+                writers=self.io_threads, depth=self.queue_depth, budget=budget
+            )
+        return Executor(workers=self.workers, budget=budget)
+
+    def open_journal(self, directory: str) -> Journal:
+        """
+        Open the journal of the run, stored in the given directory. Unless the
+        run is resumed, the entries of previous runs are discarded.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the journal is stored.
+
+        Returns
+        -------
+        Journal
+            The journal of the run.
+        """
+        journal = Journal.in_directory(directory)
+        if not self.resume:
+            journal.reset()
+        return journal
+
+    @staticmethod
+    def report(results: list[JobResult]) -> None:
+        """
+        Print the files that could not be processed, if any.
+
+        Parameters
+        ----------
+        results : list[JobResult]
+            The results of the processed jobs.
+        """
+        skipped = sum(result.skipped for result in results)
+        if skipped:
+            print(f"⏭️ {skipped} of {len(results)} files were already up to date and were skipped.")
+
+        errors = [result for result in results if not result.ok]
+        if not errors:
+            return
+
+        print(f"⚠️ {len(errors)} of {len(results)} files could not be processed:")
+        for result in errors:
+            print(f"\t❌ {result.source}: {result.error}")
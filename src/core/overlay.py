@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_DUPLEX
+WHITE = (255, 255, 255)
+LAYOUT_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class OverlayLayout:
+    """
+    The geometry of the metadata box for a given image width and text: every
+    measure needed to draw it, without measuring any text.
+
+    Attributes
+    ----------
+    box : tuple[int, int, int, int]
+        The (left, top, right, bottom) corners of the semi-transparent box,
+        inclusive. They may be negative for very small images.
+    origin : tuple[int, int]
+        The (x, y) position of the region where the border and text are drawn.
+    size : tuple[int, int]
+        The (height, width) of that region: the box grown by the border
+        thickness on every side, clipped to the top-left corner of the image.
+    lines : tuple[str, ...]
+        The text lines written inside the box.
+    positions : tuple[tuple[int, int], ...]
+        The (x, y) origin of every line, relative to the region.
+    font_scale : float
+        The font scale of the text.
+    thickness : int
+        The thickness of the text strokes.
+    border_thickness : int
+        The thickness of the white border.
+    """
+
+    box: tuple[int, int, int, int]
+    origin: tuple[int, int]
+    size: tuple[int, int]
+    lines: tuple[str, ...]
+    positions: tuple[tuple[int, int], ...]
+    font_scale: float
+    thickness: int
+    border_thickness: int
+
+    def apply(self, image: np.ndarray) -> None:
+        """
+        Draw the box on the image, in place: darken the box region by half,
+        then draw the white border and text on the region around it. Both are
+        clipped to the image.
+
+        The text is rasterised on the image itself, so antialiased strokes
+        blend exactly as when the whole frame is drawn on.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            The BGR image where the box is drawn.
+        """
+        left, top, right, bottom = self.box
+        box = image[max(top, 0):bottom + 1, max(left, 0):right + 1]
+        cv2.convertScaleAbs(box, box, 0.5)
+
+        x, y = self.origin
+        height, width = self.size
+        roi = image[y:y + height, x:x + width]
+        cv2.rectangle(
+            roi, (left - x, top - y), (right - x, bottom - y), WHITE, self.border_thickness
+        )
+        for line, position in zip(self.lines, self.positions):
+            cv2.putText(roi, line, position, FONT, self.font_scale, WHITE, self.thickness)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def overlay_layout(width: int, lines: tuple[str, ...]) -> OverlayLayout:
+    """
+    Compute the layout of the metadata box for an image of the given width:
+    the font scale, the box corners and the position of every line.
+
+    A shoot usually shares a handful of resolutions and repeated exposure
+    values, so layouts are kept in a bounded LRU cache and applying the box to
+    an image does not measure any text.
+
+    Parameters
+    ----------
+    width : int
+        The width of the image, which sets the size of the box.
+    lines : tuple[str, ...]
+        The text lines written inside the box.
+
+    Returns
+    -------
+    OverlayLayout
+        The layout of the box.
+    """
+    font_scale = max(0.8, width / 1000)
+    thickness = max(2, width // 800)
+    line_height = int(40 * font_scale)
+    padding_internal = int(15 * font_scale)
+    padding_external = int(30 * font_scale)
+
+    sizes = [cv2.getTextSize(line, FONT, font_scale, thickness)[0] for line in lines]
+    text_width = max(size[0] for size in sizes)
+    text_height = len(lines) * line_height
+
+    x, y = padding_external, padding_external + sizes[0][1]
+    left = x - padding_internal
+    top = y - sizes[0][1] - padding_internal
+    right = x + text_width + padding_internal
+    bottom = y + text_height - (line_height - sizes[0][1]) + padding_internal
+
+    # The border is centered on the box edges, so the drawing region is the
+    # box grown by the border thickness on every side.
+    border_thickness = max(3, int((4 * font_scale)/2))
+    origin_x, origin_y = max(left - border_thickness, 0), max(top - border_thickness, 0)
+    return OverlayLayout(
+        box=(left, top, right, bottom),
+        origin=(origin_x, origin_y),
+        size=(bottom + border_thickness + 1 - origin_y, right + border_thickness + 1 - origin_x),
+        lines=lines,
+        positions=tuple((x - origin_x, y + i * line_height - origin_y) for i in range(len(lines))),
+        font_scale=font_scale,
+        thickness=thickness,
+        border_thickness=border_thickness,
+    )
+
+
+def draw_overlay(image: np.ndarray, lines: list[str]) -> None:
+    """
+    Draw the metadata box in the top-left corner of the image, in place.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        The BGR image where the box is drawn.
+    lines : list[str]
+        The text lines written inside the box.
+    """
+    overlay_layout(image.shape[1], tuple(lines)).apply(image)
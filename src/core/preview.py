@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+
+from src.metadata.dimensions import ImageHeader
+from src.metadata.exif import JPEG_SOI
+
+# The DCT scaling factors libjpeg can decode at, largest first.
+REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def reduction(header: ImageHeader | None, max_size: int) -> int:
+    """
+    Returns the largest DCT scaling factor (8, 4 or 2) that still decodes the
+    image with a longest side of at least `max_size`, or 1 if none does.
+
+    Parameters
+    ----------
+    header : ImageHeader | None
+        The dimensions of the image, or None if they are unknown.
+    max_size : int
+        The longest side of the preview, in pixels.
+    """
+    if header is None:
+        return 1
+    longest = max(header.width, header.height)
+    return next((factor for factor, _ in REDUCED_FLAGS if longest // factor >= max_size), 1)
+
+
+def decode_preview(data: bytes, max_size: int, header: ImageHeader | None = None) -> np.ndarray | None:
+    """
+    Decode an image so that its longest side is at most `max_size` pixels.
+
+    JPEGs are decoded directly at 1/2, 1/4 or 1/8 of their size by libjpeg,
+    which skips most of the inverse DCT work and never holds the full-size
+    pixels. The result, like any other format, is then shrunk to the exact
+    size with area interpolation.
+
+    Parameters
+    ----------
+    data : bytes
+        The content of the image file.
+    max_size : int
+        The longest side of the preview, in pixels.
+    header : ImageHeader, optional
+        The dimensions of the image, read from its header. Without them the
+        image is decoded at full size.
+
+    Returns
+    -------
+    np.ndarray | None
+        The BGR preview, or None if the image could not be decoded.
+    """
+    flag = cv2.IMREAD_COLOR
+    factor = reduction(header, max_size) if data.startswith(JPEG_SOI) else 1
+    if factor > 1:
+        flag = dict(REDUCED_FLAGS)[factor]
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flag)
+    if image is None:
+        return None
+
+    height, width = image.shape[:2]
+    scale = max_size / max(height, width)
+    if scale >= 1:
+        return image
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
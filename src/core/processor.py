@@ -1,10 +1,26 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+import os
 from pathlib import Path
 import shutil
+import time
+from typing import TYPE_CHECKING
 from tqdm import tqdm
+from src.common.enums import EncoderBackend, NamingMode
+from src.common.profiling import JobProfile, Profiler, activate, count_read, count_written, stage
+from src.constants.image import DEFAULT_QUALITY
+from src.core.executor import Executor, PipelineExecutor
+from src.core.job import Job, JobResult, Task
+from src.core.journal import Journal, JournalState
+from src.core.linker import link_file
 from src.data.file import File
 from src.data.folder import Folder
-import cv2
-from PIL import Image
+from src.data.scanner import Scanner
+from src.metadata.photo import PhotoMetadata
+
+if TYPE_CHECKING:
+    import numpy as np
 
 class Processor:
     """
@@ -14,62 +30,120 @@ class Processor:
 
     @staticmethod
     def copy_naming_metadata(
-        folder: Folder, source_root: Path, output_root: Path, in_image: bool
-    ) -> "Processor":
+        folder: Folder | Scanner,
+        source_root: Path,
+        output_root: Path,
+        in_image: bool,
+        workers: int = 1,
+        resume: bool = False,
+        executor: Executor | PipelineExecutor | None = None,
+        profiler: Profiler | None = None,
+        **options,
+    ) -> list[JobResult]:
         """
         Copy files from the source folder to the output folder, preserving the
         directory structure. If `in_image` is True, it adds metadata inside the image.
 
         Parameters
         ----------
-        folder : Folder
-            The folder object containing files and subfolders to be processed.
+        folder : Folder | Scanner
+            The folder object containing files and subfolders to be processed,
+            or a scanner streaming them as they are discovered.
         source_root : Path
             The root path of the source directory.
         output_root : Path
             The root path of the output directory where files will be copied.
         in_image : bool
             If True, adds metadata inside the image files.
+        workers : int, optional
+            The number of worker processes used to process the files. Default is 1.
+        resume : bool, optional
+            If True, files already processed according to the `journal` option
+            are skipped. Default is False.
+        executor : Executor | PipelineExecutor, optional
+            The executor running the jobs. Default is a process pool of `workers`.
+        profiler : Profiler, optional
+            If given, every job is profiled and its measures are merged into it.
+        **options
+            Extra attributes set on every job: `journal`, `incremental`,
+            `encoder`, `quality` and `preview`.
 
         Returns
         -------
-        Processor
-            The Processor instance for method chaining.
+        list[JobResult]
+            The result of every processed file, in a deterministic order.
         """
+        jobs = Processor.build_jobs(folder, NamingMode.COPY, in_image, source_root, output_root, **options)
+        return Processor.run_jobs(
+            jobs, workers, desc=f"📂 Copying files from {folder.directory}",
+            done=Processor.journal_state(options.get("journal"), resume),
+            executor=executor, profiler=profiler
+        )
 
-        relative_path = Path(folder.directory).relative_to(source_root)
-        dest_dir = output_root / relative_path
-        dest_dir.mkdir(parents=True, exist_ok=True)
-
-        for file in tqdm(
-            folder.files,
-            desc=f"📂 Copying files from {folder.directory}",
-            unit="file",
-            leave=False,
-            bar_format="{l_bar}💾|{bar:30}📸| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
-            colour="green"
-        ):
-            src_file = Path(file.directory)
-            dst_file = dest_dir / str(file)
-
-            if in_image:
-                Processor.add_metadata_inside_image(file, str(dst_file))
-                continue
+    @staticmethod
+    def link_naming_metadata(
+        folder: Folder | Scanner,
+        source_root: Path,
+        output_root: Path,
+        in_image: bool,
+        workers: int = 1,
+        resume: bool = False,
+        executor: Executor | PipelineExecutor | None = None,
+        profiler: Profiler | None = None,
+        **options,
+    ) -> list[JobResult]:
+        """
+        Build the renamed tree in the output folder like `copy_naming_metadata`,
+        but with reflinks or hardlinks instead of copies, falling back to a copy
+        when neither is possible (e.g. across devices). If `in_image` is True the
+        annotated images are new files, written as in COPY mode.
 
-            shutil.copy2(src_file, dst_file)
+        Parameters
+        ----------
+        folder : Folder | Scanner
+            The folder object containing files and subfolders to be processed,
+            or a scanner streaming them as they are discovered.
+        source_root : Path
+            The root path of the source directory.
+        output_root : Path
+            The root path of the output directory where files will be linked.
+        in_image : bool
+            If True, adds metadata inside the image files.
+        workers : int, optional
+            The number of worker processes used to process the files. Default is 1.
+        resume : bool, optional
+            If True, files already processed according to the `journal` option
+            are skipped. Default is False.
+        executor : Executor | PipelineExecutor, optional
+            The executor running the jobs. Default is a process pool of `workers`.
+        profiler : Profiler, optional
+            If given, every job is profiled and its measures are merged into it.
+        **options
+            Extra attributes set on every job: `journal`, `incremental`,
+            `encoder` and `quality`.
 
-        for subfolder in tqdm(
-            folder.folders,
-            desc=f"📂 Copying subfolders from {folder.directory}",
-            unit="folder",
-            leave=False,
-            bar_format="{l_bar}💾|{bar:30}📸| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
-            colour="blue"
-        ):
-            Processor.copy_naming_metadata(subfolder, source_root, output_root, in_image)
+        Returns
+        -------
+        list[JobResult]
+            The result of every processed file, in a deterministic order.
+        """
+        jobs = Processor.build_jobs(folder, NamingMode.LINK, in_image, source_root, output_root, **options)
+        return Processor.run_jobs(
+            jobs, workers, desc=f"🔗 Linking files from {folder.directory}",
+            done=Processor.journal_state(options.get("journal"), resume),
+            executor=executor, profiler=profiler
+        )
 
     @staticmethod
-    def replace_naming_metadata(folder: Folder, in_image: bool) -> "Processor":
+    def replace_naming_metadata(
+        folder: Folder | Scanner,
+        in_image: bool,
+        workers: int = 1,
+        resume: bool = False,
+        executor: Executor | PipelineExecutor | None = None,
+        profiler: Profiler | None = None,
+        **options,
+    ) -> list[JobResult]:
         """
         Replace files in the folder with their metadata information.
         This method renames files based on their metadata and moves them to their
@@ -77,41 +151,412 @@ class Processor:
 
         Parameters
         ----------
-        folder : Folder
-            The folder object containing files and subfolders to be processed.
+        folder : Folder | Scanner
+            The folder object containing files and subfolders to be processed,
+            or a scanner streaming them as they are discovered.
         in_image : bool
             If True, adds metadata inside the image files.
+        workers : int, optional
+            The number of worker processes used to process the files. Default is 1.
+        resume : bool, optional
+            If True, files already renamed according to the `journal` option are
+            skipped. Default is False.
+        executor : Executor | PipelineExecutor, optional
+            The executor running the jobs. Default is a process pool of `workers`.
+        profiler : Profiler, optional
+            If given, every job is profiled and its measures are merged into it.
+        **options
+            Extra attributes set on every job: `journal`, `encoder` and `quality`.
 
         Returns
         -------
-        Processor
-            The Processor instance for method chaining.
+        list[JobResult]
+            The result of every processed file, in a deterministic order.
+        """
+        # A scanner lists directories lazily: consume it up front so that
+        # renamed files are never picked up again by the same run.
+        jobs = list(Processor.build_jobs(folder, NamingMode.REPLACE, in_image, **options))
+        return Processor.run_jobs(
+            jobs, workers, desc=f" ✍️ Replacing files in {folder.directory}",
+            done=Processor.journal_state(options.get("journal"), resume),
+            executor=executor, profiler=profiler
+        )
+
+    @staticmethod
+    def journal_state(journal: Journal | None, resume: bool) -> JournalState | None:
+        """
+        Returns the state recorded in the journal if the run is resumed, or None.
+        """
+        if not resume or journal is None:
+            return None
+        return journal.state()
+
+    @staticmethod
+    def iter_jobs(
+        source: Folder | Scanner,
+        mode: NamingMode,
+        in_image: bool,
+        source_root: Path | None = None,
+        output_root: Path | None = None,
+        groups: Mapping[str, tuple[str, str]] | None = None,
+        **options,
+    ) -> Iterator[Job]:
+        """
+        Yield a job for every file of the tree, directory by directory. In COPY
+        and LINK modes each output directory is created before its jobs are yielded, so
+        empty subfolders are preserved and workers never race on them. So are the
+        subfolders of groups.
+
+        Parameters
+        ----------
+        source : Folder | Scanner
+            The tree of files to be processed.
+        mode : NamingMode
+            The naming mode to be used (COPY or REPLACE).
+        in_image : bool
+            If True, adds metadata inside the image files.
+        source_root : Path, optional
+            The root path of the source directory. Only used in COPY and LINK modes.
+        output_root : Path, optional
+            The root path of the output directory. Only used in COPY and LINK modes.
+        groups : Mapping[str, tuple[str, str]], optional
+            The subfolder and the file name suffix of every grouped file, keyed
+            by its path (see `GroupedTree.names`).
+        **options
+            Extra attributes set on every job (e.g. `journal`, `incremental`).
+
+        Yields
+        ------
+        Job
+            The jobs to be processed.
         """
-        for file in tqdm(
-            folder.files,
-            desc=f" ✍️ Replacing files in {folder.directory}",
+        for directory, files in source.walk():
+            if mode in (NamingMode.COPY, NamingMode.LINK):
+                dest_dir = output_root / Path(directory).relative_to(source_root)
+                dest_dir.mkdir(parents=True, exist_ok=True)
+            else:
+                dest_dir = Path(directory)
+
+            for file in files:
+                subfolder, suffix = groups.get(str(file.directory), ("", "")) if groups else ("", "")
+                if subfolder:
+                    (dest_dir / subfolder).mkdir(parents=True, exist_ok=True)
+                yield Job(
+                    file=file, dest_dir=str(dest_dir / subfolder), mode=mode, in_image=in_image,
+                    suffix=suffix, **options
+                )
+
+    @staticmethod
+    def build_jobs(
+        source: Folder | Scanner,
+        mode: NamingMode,
+        in_image: bool,
+        source_root: Path | None = None,
+        output_root: Path | None = None,
+        **options,
+    ) -> list[Job] | Iterator[Job]:
+        """
+        Flatten the tree into jobs. A Folder, already in memory, gives a list
+        sorted by source path; a Scanner gives a lazy stream in scan order.
+
+        Parameters
+        ----------
+        source : Folder | Scanner
+            The tree of files to be processed.
+        mode : NamingMode
+            The naming mode to be used (COPY or REPLACE).
+        in_image : bool
+            If True, adds metadata inside the image files.
+        source_root : Path, optional
+            The root path of the source directory. Only used in COPY and LINK modes.
+        output_root : Path, optional
+            The root path of the output directory. Only used in COPY and LINK modes.
+        **options
+            Extra attributes set on every job (e.g. `journal`, `incremental`).
+
+        Returns
+        -------
+        list[Job] | Iterator[Job]
+            The jobs to be processed.
+        """
+        jobs = Processor.iter_jobs(source, mode, in_image, source_root, output_root, **options)
+        if isinstance(source, Scanner):
+            return jobs
+        return sorted(jobs, key=lambda job: str(job.file.directory))
+
+    @staticmethod
+    def run_jobs(
+        jobs: Iterable[Job],
+        workers: int = 1,
+        desc: str = "📸 Processing files",
+        done: JournalState | None = None,
+        executor: Executor | PipelineExecutor | None = None,
+        profiler: Profiler | None = None,
+    ) -> list[JobResult]:
+        """
+        Run the jobs with the given executor, by default a process pool of
+        `workers`. Errors are collected per file instead of aborting the run.
+
+        Parameters
+        ----------
+        jobs : Iterable[Job]
+            The jobs to be processed. It is consumed lazily.
+        workers : int, optional
+            The number of worker processes. Default is 1 (inline processing).
+        desc : str, optional
+            The description shown in the progress bar.
+        done : JournalState, optional
+            The state of a previous run. Jobs it reports as done are skipped.
+        executor : Executor | PipelineExecutor, optional
+            The executor running the stages of the jobs. It takes precedence
+            over `workers`.
+        profiler : Profiler, optional
+            If given, every job is profiled and its measures are merged into
+            it, as well as the time spent scanning the tree for jobs.
+
+        Returns
+        -------
+        list[JobResult]
+            A result for every skipped job, followed by the result of every
+            processed job in the same order as `jobs`.
+        """
+        skipped = []
+
+        def pending() -> Iterator[Job]:
+            source = iter(jobs)
+            while True:
+                start = time.perf_counter()
+                job = next(source, None)
+                if profiler is not None:
+                    profiler.add("scan", time.perf_counter() - start)
+                if job is None:
+                    return
+
+                if done is not None and done.is_done(job.file.directory, job.file.mtime_ns):
+                    skipped.append(JobResult(source=str(job.file.directory), skipped=True))
+                    continue
+                job.profile = profiler is not None
+                yield job
+
+        def profiled(results: Iterator[JobResult]) -> Iterator[JobResult]:
+            for result in results:
+                profiler.merge(result.profile)
+                yield result
+
+        results = (executor or Executor(workers=workers)).run(Processor.stages(), pending())
+        if profiler is not None:
+            results = profiled(results)
+
+        results = list(tqdm(
+            results,
+            total=len(jobs) if isinstance(jobs, list) and done is None else None,
+            desc=desc,
             unit="file",
             leave=False,
             bar_format="{l_bar}💾|{bar:30}📸| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
             colour="green"
-        ):
-            if in_image:
-                Processor.add_metadata_inside_image(file, file.directory)
+        ))
+        return skipped + results
 
-            shutil.move(Path(file.directory), Path(file.directory).with_name(str(file)))
+    @staticmethod
+    def stages() -> tuple:
+        """
+        Returns the stages a job goes through, in order: `read`, `render` and
+        `write`. Executors may run them back to back or on separate threads.
+        """
+        return Processor.read, Processor.render, Processor.write
 
-        for subfolder in tqdm(
-            folder.folders,
-            desc=f" ✍️ Replacing subfolders in {folder.directory}",
-            unit="folder",
-            leave=False,
-            bar_format="{l_bar}💾|{bar:30}📸| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
-            colour="blue"
-        ):
-            Processor.replace_naming_metadata(subfolder, in_image)
+    @staticmethod
+    def process(job: Job) -> JobResult:
+        """
+        Process a single job: copy, link or rename the file to its
+        metadata-based name, optionally adding the metadata inside the image.
+
+        In REPLACE mode the source is never modified in place: the annotated
+        image is written under its new name and the source is removed
+        afterwards (a RAW photo is renamed next to the JPEG of its preview),
+        so a job interrupted at any point can simply be re-run.
+        The journal records the destination before the source is touched and
+        once the job is done.
+
+        Parameters
+        ----------
+        job : Job
+            The job to be processed.
+
+        Returns
+        -------
+        JobResult
+            The result of the job. Any exception raised while processing the
+            file is stored in it instead of being propagated.
+        """
+        return Processor.write(Processor.render(Processor.read(job)))
 
     @staticmethod
-    def add_metadata_inside_image(file: File, dst_file: str) -> "Processor":
+    def read(job: Job) -> Task:
+        """
+        First stage of a job: read the file (only when its pixels are needed),
+        parse its metadata and compute its destination. Up-to-date files of an
+        incremental run are marked as skipped.
+
+        Parameters
+        ----------
+        job : Job
+            The job to be processed.
+
+        Returns
+        -------
+        Task
+            The job with its partial result.
+        """
+        profile = JobProfile() if job.profile else None
+        task = Task(job=job, result=JobResult(source=str(job.file.directory), profile=profile))
+        with activate(profile):
+            try:
+                if job.in_image and not job.incremental and not job.file.is_raw:
+                    # Read the file once: metadata, EXIF dump and decode share it.
+                    # A RAW photo is never loaded: only its IFDs and preview are read.
+                    job.file.load()
+
+                dst_file = Path(job.dest_dir) / job.file_name
+                task.result.destination = str(dst_file)
+                if job.mode == NamingMode.REPLACE and job.in_image and job.file.is_raw:
+                    # Only a JPEG of its preview is annotated: the RAW is
+                    # renamed next to it.
+                    task.result.raw_destination = str(dst_file.with_suffix(job.file.extension))
+
+                if (
+                    job.mode in (NamingMode.COPY, NamingMode.LINK)
+                    and job.incremental
+                    and Processor.is_up_to_date(job.file, dst_file)
+                ):
+                    task.result.skipped = True
+            except Exception as error:  # noqa: BLE001 - stored in the JobResult
+                task.fail(error)
+
+        return task
+
+    @staticmethod
+    def render(task: Task) -> Task:
+        """
+        Second stage of a job: decode the image, draw the metadata box and
+        encode the result. The file content is released as soon as the
+        annotated image is encoded. Jobs without `in_image` pass through.
+
+        Parameters
+        ----------
+        task : Task
+            The task returned by `read`.
+
+        Returns
+        -------
+        Task
+            The task with the encoded image.
+        """
+        if task.finished or not task.job.in_image:
+            return task
+
+        job = task.job
+        with activate(task.result.profile):
+            try:
+                task.encoded = Processor.render_metadata(job.file, job.encoder, job.quality, job.preview)
+            except Exception as error:  # noqa: BLE001 - stored in the JobResult
+                task.fail(error)
+            finally:
+                job.file.release()
+
+        return task
+
+    @staticmethod
+    def write(task: Task) -> JobResult:
+        """
+        Last stage of a job: write the annotated image, or copy, link or move
+        the file, and record the progress in the journal.
+
+        Parameters
+        ----------
+        task : Task
+            The task returned by `render`.
+
+        Returns
+        -------
+        JobResult
+            The result of the job.
+        """
+        job, result = task.job, task.result
+        with activate(result.profile):
+            try:
+                if task.finished:
+                    return result
+
+                src_file, dst_file = Path(job.file.directory), Path(result.destination)
+                if job.in_image and task.encoded is None:
+                    raise ValueError("Could not decode the image.")
+
+                if job.mode in (NamingMode.COPY, NamingMode.LINK):
+                    if job.in_image:
+                        Processor.write_image(task.encoded, str(dst_file))
+                    elif job.mode == NamingMode.LINK:
+                        with stage("link"):
+                            link_file(src_file, dst_file)
+                    else:
+                        with stage("copy"):
+                            shutil.copy2(src_file, dst_file)
+                        count_read(job.file.size)
+                        count_written(job.file.size)
+                else:
+                    if job.journal is not None:
+                        with stage("journal"):
+                            for destination in result.destinations:
+                                job.journal.record("started", str(src_file), destination, job.file.mtime_ns)
+
+                    if job.in_image:
+                        Processor.write_image(task.encoded, str(dst_file))
+                        if result.raw_destination:
+                            with stage("move"):
+                                shutil.move(src_file, result.raw_destination)
+                        else:
+                            src_file.unlink()
+                    else:
+                        with stage("move"):
+                            shutil.move(src_file, dst_file)
+
+                if job.journal is not None:
+                    with stage("journal"):
+                        for destination in result.destinations:
+                            job.journal.record("done", str(src_file), destination, job.file.mtime_ns)
+            except Exception as error:  # noqa: BLE001 - stored in the JobResult
+                task.fail(error)
+            finally:
+                job.file.release()
+                task.encoded = None
+
+        return result
+
+    @staticmethod
+    def is_up_to_date(file: File, dst_file: Path) -> bool:
+        """
+        Returns True if the destination exists and is not older than the source file.
+
+        Parameters
+        ----------
+        file : File
+            The source file.
+        dst_file : Path
+            The destination path.
+        """
+        if not dst_file.exists():
+            return False
+        src_mtime_ns = file.mtime_ns or Path(file.directory).stat().st_mtime_ns
+        return dst_file.stat().st_mtime_ns >= src_mtime_ns
+
+    @staticmethod
+    def add_metadata_inside_image(
+        file: File,
+        dst_file: str,
+        encoder: EncoderBackend = EncoderBackend.OPENCV,
+        quality: int = DEFAULT_QUALITY,
+    ) -> None:
         """
         Open the image file with OpenCV and add photo metadata inside it
         with a semi-transparent background and white text. The metadata
@@ -123,56 +568,148 @@ class Processor:
             The file object containing the image and its metadata.
         dst_file : str
             The destination file path where the modified image will be saved.
+        encoder : EncoderBackend, optional
+            The library used to encode the annotated image. Default is OPENCV.
+        quality : int, optional
+            The JPEG quality of the annotated image. Default is 75.
+
+        Raises
+        ------
+        ValueError
+            If the file could not be decoded. Nothing is written then.
+        """
+        encoded = Processor.render_metadata(file, encoder, quality)
+        if encoded is None:
+            raise ValueError(f"Could not decode the image {file.directory}.")
+        Processor.write_image(encoded, dst_file)
+
+    @staticmethod
+    def render_metadata(
+        file: File,
+        encoder: EncoderBackend = EncoderBackend.OPENCV,
+        quality: int = DEFAULT_QUALITY,
+        preview: int = 0,
+    ) -> bytes | None:
+        """
+        Decode the image, draw its metadata box and encode it as a JPEG with
+        the original EXIF data.
+
+        With the STRIP encoder, JPEGs with restart markers only have the rows
+        under the box decoded and encoded again (see `patch_jpeg`); the other
+        images are fully decoded and encoded with OpenCV.
+
+        RAW photos are never demosaiced: the JPEG preview embedded by the
+        camera is decoded instead, and the EXIF of the RAW is written with it.
+
+        Parameters
+        ----------
+        file : File
+            The file object containing the image and its metadata.
+        encoder : EncoderBackend, optional
+            The library used to encode the annotated image. Default is OPENCV.
+        quality : int, optional
+            The JPEG quality of the annotated image. Default is 75. Images
+            patched by the STRIP encoder keep the quality of the source.
+        preview : int, optional
+            If set, the image is shrunk so that its longest side is at most
+            this many pixels before the box is drawn (see `decode_preview`).
+            Default is 0 (full size).
 
         Returns
         -------
-        Processor
-            The Processor instance for method chaining.
+        bytes | None
+            The encoded image, or None if the file could not be decoded.
         """
-        image = cv2.imread(file.directory)
+        # OpenCV, Pillow and NumPy are only loaded once an image is rendered,
+        # so that runs which only rename files start quickly.
+        import cv2
+        import numpy as np
+
+        from src.core.encoder import encode_jpeg
+        from src.core.preview import decode_preview
+        from src.core.strip import patch_jpeg
+
+        data = file.image_data
+        if EncoderBackend(encoder) == EncoderBackend.STRIP:
+            # The strip is patched into the JPEG itself, so it needs the full
+            # size JPEG of the file, which a RAW photo is not.
+            patchable = bool(data) and not preview and not file.is_raw
+            patched = patch_jpeg(data, Processor.metadata_lines(file.photo_metadata)) if patchable else None
+            if patched is not None:
+                return patched
+            encoder = EncoderBackend.OPENCV
+
+        with stage("decode"):
+            if not data:
+                image = None
+            elif preview:
+                image = decode_preview(data, preview, file.image_header)
+            else:
+                image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
         if image is None:
-            print(f"Error: Could not read image {file.directory}, skipping...")
-            return
+            return None
 
-        _, w, _ = image.shape
+        with stage("overlay"):
+            Processor.draw_metadata_overlay(image, Processor.metadata_lines(file.photo_metadata))
+        exif = file.exif_bytes
+        with stage("encode"):
+            return encode_jpeg(image, exif, encoder, quality)
 
-        metadata = file.photo_metadata
-        lines = [
+    @staticmethod
+    def metadata_lines(metadata: PhotoMetadata) -> list[str]:
+        """
+        Returns the text lines of the metadata box: exposure time, aperture,
+        ISO and EV (exposure bias).
+
+        Parameters
+        ----------
+        metadata : PhotoMetadata
+            The metadata of the photo.
+        """
+        return [
             f"Exposure: {metadata.exposure_time.replace('s', '/')}",
             f"Aperture: {metadata.aperture}",
             f"ISO: {metadata.iso}",
             f"EV: {metadata.exposure_bias}"
         ]
 
-        font = cv2.FONT_HERSHEY_DUPLEX
-        font_scale = max(0.8, w / 1000)
-        thickness = max(2, w // 800)
-        line_height = int(40 * font_scale)
-        padding_internal = int(15 * font_scale)
-        padding_external = int(30 * font_scale)
-
-        sizes = [cv2.getTextSize(line, font, font_scale, thickness)[0] for line in lines]
-        text_width = max(size[0] for size in sizes)
-        text_height = len(lines) * line_height
-
-        x, y = padding_external, padding_external + sizes[0][1]
-        top_left_x = x - padding_internal
-        top_left_y = y - sizes[0][1] - padding_internal
-        bottom_right_x = x + text_width + padding_internal
-        bottom_right_y = y + text_height - (line_height - sizes[0][1]) + padding_internal
+    @staticmethod
+    def write_image(encoded: bytes, dst_file: str) -> None:
+        """
+        Write an encoded image next to the destination and rename it, so an
+        interrupted run never leaves a truncated image behind.
 
-        overlay = image.copy()
-        cv2.rectangle(overlay, (top_left_x, top_left_y), (bottom_right_x, bottom_right_y), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.5, image, 0.5, 0, image)
+        Parameters
+        ----------
+        encoded : bytes
+            The encoded image.
+        dst_file : str
+            The destination file path.
+        """
+        tmp_file = f"{dst_file}.tmp"
+        with stage("write"):
+            Path(tmp_file).write_bytes(encoded)
+            os.replace(tmp_file, dst_file)
+        count_written(len(encoded))
 
-        border_thickness = max(3, int((4 * font_scale)/2))
-        cv2.rectangle(image, (top_left_x, top_left_y), (bottom_right_x, bottom_right_y), (255, 255, 255), border_thickness)
+    @staticmethod
+    def draw_metadata_overlay(image: np.ndarray, lines: list[str]) -> None:
+        """
+        Draw the metadata box in the top-left corner of the image, in place:
+        a semi-transparent black background with a white border and white text.
 
-        for i, line in enumerate(lines):
-            line_y = y + i * line_height
-            cv2.putText(image, line, (x, line_y), font, font_scale, (255, 255, 255), thickness)
+        The geometry of the box is cached per image width and text, so drawing
+        it only blends the box region and draws the border and text around
+        it. The result is the same, pixel for pixel, as blending the whole
+        frame and drawing on it.
 
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(image_rgb)
+        Parameters
+        ----------
+        image : np.ndarray
+            The BGR image where the box is drawn.
+        lines : list[str]
+            The text lines written inside the box.
+        """
+        from src.core.overlay import draw_overlay
 
-        pil_image.save(dst_file, "jpeg", exif=file.exif_bytes)
+        draw_overlay(image, lines)
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from typing import Self
+
+from src.common.enums import EncoderBackend
+from src.constants.image import DEFAULT_QUALITY
+from src.core.processor import Processor
+from src.data.file import File
+
+# Marks the end of the requests in the queue of the service.
+_STOP = object()
+
+
+class ServiceBusy(RuntimeError):
+    """
+    Raised when a request is submitted while the queue of the service is full.
+    """
+
+
+@dataclass
+class AnnotationRequest:
+    """
+    An image sent to the service.
+
+    Attributes
+    ----------
+    name : str
+        The name of the uploaded file.
+    data : bytes
+        The content of the uploaded file.
+    annotate : bool
+        If True, the annotated image is rendered as well as the metadata.
+    encoder : EncoderBackend
+        The library used to encode the annotated image.
+    quality : int
+        The JPEG quality of the annotated image.
+    preview : int
+        If set, the annotated image is a preview whose longest side is at
+        most this many pixels.
+    """
+
+    name: str
+    data: bytes
+    annotate: bool = False
+    encoder: EncoderBackend = EncoderBackend.OPENCV
+    quality: int = DEFAULT_QUALITY
+    preview: int = 0
+
+
+@dataclass
+class AnnotationResult:
+    """
+    The outcome of an annotation request.
+
+    Attributes
+    ----------
+    name : str
+        The renamed file name (e.g. "IMG001_1s250-2.8f-100.jpg"), or the
+        uploaded name if the metadata could not be read.
+    metadata : dict | None
+        The parsed PhotoMetadata, as JSON-compatible values.
+    image : bytes | None
+        The annotated image, if it was requested.
+    error : str | None
+        The error raised while processing the image, if any.
+    """
+
+    name: str
+    metadata: dict | None = None
+    image: bytes | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def annotate(request: AnnotationRequest) -> AnnotationResult:
+    """
+    Parse the metadata of an uploaded image and, if requested, draw it inside
+    the image. The image never touches the disk. Runs in worker processes.
+
+    Parameters
+    ----------
+    request : AnnotationRequest
+        The uploaded image and the options of the request.
+
+    Returns
+    -------
+    AnnotationResult
+        The renamed file name, the metadata and the annotated image, or the error.
+    """
+    try:
+        file = File.from_bytes(request.name, request.data)
+        result = AnnotationResult(name=str(file), metadata=file.photo_metadata.model_dump())
+        if request.annotate:
+            result.name = result.name.removesuffix(file.extension) + file.annotated_extension
+            result.image = Processor.render_metadata(file, request.encoder, request.quality, request.preview)
+            if result.image is None:
+                raise ValueError("the image could not be decoded")
+        return result
+    except Exception as error:  # noqa: BLE001 - reported to the client as the error of its request
+        return AnnotationResult(name=request.name, error=f"{type(error).__name__}: {error}")
+
+
+def annotate_batch(requests: Sequence[AnnotationRequest]) -> list[AnnotationResult]:
+    """
+    Process a batch of requests in a single call, so that a batch costs one
+    round trip to a worker process instead of one per image.
+    """
+    return [annotate(request) for request in requests]
+
+
+def warm_up() -> None:
+    """
+    Run in every worker process when the service starts, so that the first
+    requests do not pay for starting the process: the pixel libraries, which
+    the Processor only imports once an image is rendered, are imported here,
+    and a 1x1 image is annotated, encoded and decoded once, so that OpenCV
+    loads its codecs before the first request.
+    """
+    import cv2
+    import numpy as np
+
+    import src.core.preview  # noqa: F401
+    from src.core.encoder import encode_jpeg
+    from src.core.overlay import draw_overlay
+
+    image = np.zeros((1, 1, 3), dtype=np.uint8)
+    draw_overlay(image, ["1s250 2.8f 100"])
+    cv2.imdecode(np.frombuffer(encode_jpeg(image, b""), dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+@dataclass
+class AnnotationService:
+    """
+    Processes uploaded images on a warm pool of worker processes.
+
+    Requests are queued and a dispatcher thread groups them into batches of
+    up to `batch_size` requests, waiting at most `batch_wait` seconds for a
+    batch to fill. At most two batches per worker are in flight: when the
+    workers fall behind, the queue fills up and new requests are rejected
+    with ServiceBusy instead of piling up in memory.
+
+    Attributes
+    ----------
+    workers : int
+        The number of worker processes. With 1 (or less) requests are
+        processed by the dispatcher thread itself.
+    batch_size : int
+        The maximum number of requests sent to a worker at once.
+    batch_wait : float
+        The seconds the dispatcher waits for more requests to fill a batch.
+    queue_depth : int
+        The maximum number of requests waiting to be dispatched.
+    """
+
+    workers: int = 1
+    batch_size: int = 8
+    batch_wait: float = 0.005
+    queue_depth: int = 64
+
+    def __post_init__(self):
+        self.counters = dict.fromkeys(("requests", "rejected", "batches", "errors"), 0)
+        self.queue: Queue = Queue(maxsize=self.queue_depth)
+        self.pool: ProcessPoolExecutor | None = None
+        self.slots = threading.BoundedSemaphore(2 * max(self.workers, 1))
+        self.thread: threading.Thread | None = None
+        self.lock = threading.Lock()
+
+    def start(self) -> AnnotationService:
+        """
+        Start the worker processes, wait until they are all running, then
+        start the dispatcher thread.
+        """
+        if self.thread is not None:
+            return self
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            for future in [self.pool.submit(warm_up) for _ in range(self.workers)]:
+                future.result()
+        self.thread = threading.Thread(target=self.dispatch, name="kmera-dispatcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def submit(self, request: AnnotationRequest) -> Future:
+        """
+        Queue a request without blocking.
+
+        Parameters
+        ----------
+        request : AnnotationRequest
+            The request.
+
+        Returns
+        -------
+        Future
+            The future AnnotationResult of the request.
+
+        Raises
+        ------
+        ServiceBusy
+            If the queue is full.
+        """
+        future: Future = Future()
+        try:
+            self.queue.put_nowait((request, future))
+        except Full:
+            self.count("rejected")
+            raise ServiceBusy(f"The queue is full ({self.queue_depth} requests), try again later.") from None
+        self.count("requests")
+        return future
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += value
+
+    def dispatch(self) -> None:
+        """
+        Group the queued requests into batches and run them, until the
+        service is closed.
+        """
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self.run(batch)
+
+    def run(self, batch: list[tuple[AnnotationRequest, Future]]) -> None:
+        """
+        Run a batch inline or on the pool, and resolve the futures of its requests.
+        """
+        requests, futures = [request for request, _ in batch], [future for _, future in batch]
+        self.count("batches")
+        if self.pool is None:
+            self.resolve(futures, annotate_batch(requests))
+            return
+
+        # Blocks the dispatcher while every worker is busy: the queue fills up.
+        self.slots.acquire()
+        try:
+            pending = self.pool.submit(annotate_batch, requests)
+        except RuntimeError as error:
+            # The pool is shut down or broken (BrokenProcessPool).
+            self.slots.release()
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        def done(pending: Future) -> None:
+            self.slots.release()
+            if pending.exception() is not None:
+                for future in futures:
+                    future.set_exception(pending.exception())
+                return
+            self.resolve(futures, pending.result())
+
+        pending.add_done_callback(done)
+
+    def resolve(self, futures: list[Future], results: list[AnnotationResult]) -> None:
+        self.count("errors", sum(not result.ok for result in results))
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the counters of the service and the number of queued requests.
+        """
+        with self.lock:
+            return {**self.counters, "queued": self.queue.qsize(), "workers": self.workers}
+
+    def close(self) -> None:
+        """
+        Process the queued requests, then stop the dispatcher and the workers.
+        """
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import cached_property
+
+import numpy as np
+
+from src.common.enums import StatsGroup
+from src.data.file import File
+from src.metadata.record import TYPECODES, PhotoRecord, PhotoRecords, read_record
+
+# Photos taken more than this many seconds apart belong to different sessions.
+SESSION_GAP = 2 * 3600.0
+PERCENTILES = (10, 25, 50, 75, 90)
+# Exposure bias is set in thirds of a stop.
+BIAS_STEP = 1 / 3
+
+
+def ev100(exposure_time: np.ndarray, aperture: np.ndarray, iso: np.ndarray) -> np.ndarray:
+    """
+    Returns the exposure value of every photo normalised to ISO 100:
+    log2(N² / t) - log2(ISO / 100). Photos missing a setting are NaN.
+
+    Parameters
+    ----------
+    exposure_time : np.ndarray
+        The exposure times, in seconds.
+    aperture : np.ndarray
+        The f-numbers.
+    iso : np.ndarray
+        The ISO speed ratings, 0 when unknown.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ev = np.log2(aperture * aperture / exposure_time) - np.log2(iso / 100.0)
+    ev[~np.isfinite(ev)] = np.nan
+    return ev
+
+
+def split_sessions(timestamps: np.ndarray, gap: float = SESSION_GAP) -> np.ndarray:
+    """
+    Label every photo with its session: photos are sorted by date, and a new
+    session starts whenever two consecutive photos are more than `gap`
+    seconds apart. Sessions are numbered chronologically from 0, and undated
+    photos are labelled -1.
+    """
+    labels = np.full(len(timestamps), -1, dtype=np.int64)
+    dated = np.flatnonzero(~np.isnan(timestamps))
+    if len(dated):
+        order = dated[np.argsort(timestamps[dated], kind="stable")]
+        labels[order] = np.concatenate(([0], np.cumsum(np.diff(timestamps[order]) > gap)))
+    return labels
+
+
+def split_groups(labels: np.ndarray) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Yield every distinct label, in ascending order, with the indices of the
+    photos carrying it. One sort for all groups instead of one scan per group.
+    """
+    order = np.argsort(labels, kind="stable")
+    values, starts = np.unique(labels[order], return_index=True)
+    yield from zip(values.tolist(), np.split(order, starts[1:]))
+
+
+def distribution(values: np.ndarray) -> dict[str, float]:
+    """
+    Returns the count, mean, standard deviation, extremes and percentiles of
+    the values that are not NaN.
+    """
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {"count": 0}
+    def number(value: float) -> float:
+        # Adding 0.0 turns the -0.0 of values rounded to zero into 0.0.
+        return round(float(value), 2) + 0.0
+
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": len(values),
+        "mean": number(values.mean()),
+        "std": number(values.std()),
+        "min": number(values.min()),
+        **{f"p{p}": number(value) for p, value in zip(PERCENTILES, percentiles)},
+        "max": number(values.max()),
+    }
+
+
+def histogram(values: np.ndarray, label: Callable[[float], str], step: float | None = None) -> dict[str, int]:
+    """
+    Count the photos per value, in ascending order, leaving out NaN.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values.
+    label : Callable[[float], str]
+        Formats a value as a key of the histogram.
+    step : float, optional
+        If given, values are rounded to a multiple of it first.
+    """
+    values = values[~np.isnan(values)]
+    if step is not None:
+        values = np.round(values / step) * step + 0.0
+    keys, counts = np.unique(values, return_counts=True)
+    return {label(key): int(count) for key, count in zip(keys.tolist(), counts.tolist())}
+
+
+def format_bias(value: float) -> str:
+    return f"{value:+.1f}"
+
+
+def format_iso(value: float) -> str:
+    return f"{value:.0f}"
+
+
+def format_aperture(value: float) -> str:
+    return f"f/{value:g}"
+
+
+def format_ev(value: float) -> str:
+    return f"{value:.0f}"
+
+
+@dataclass
+class ExposureStats:
+    """
+    Exposure statistics of a set of photos, computed with NumPy over the
+    columns of their records: every quantity is derived once for all photos,
+    and groups are slices of those arrays.
+
+    Attributes
+    ----------
+    records : PhotoRecords
+        The records of the photos.
+    folders : list[str]
+        The distinct folders of the photos.
+    folder_ids : np.ndarray
+        The index in `folders` of the folder of every photo.
+    errors : list[tuple[str, str]]
+        The path and error of every photo whose metadata could not be read.
+    """
+
+    records: PhotoRecords
+    folders: list[str]
+    folder_ids: np.ndarray
+    errors: list[tuple[str, str]] = field(default_factory=list)
+
+    @classmethod
+    def from_records(cls, records: Iterable[tuple[str, PhotoRecord | None, str | None]]) -> ExposureStats:
+        """
+        Collect the (path, record, error) of every photo, as returned by
+        `read_record`.
+        """
+        batch, folders, folder_ids, errors = PhotoRecords(), {}, [], []
+        for path, record, error in records:
+            if record is None:
+                errors.append((path, error))
+                continue
+            batch.append(record)
+            folder_ids.append(folders.setdefault(os.path.dirname(path), len(folders)))
+        return cls(batch, list(folders), np.array(folder_ids, dtype=np.int64), errors)
+
+    @classmethod
+    def from_files(cls, files: Iterable[File], mapper: Callable[[Callable, Iterable], Iterator] = map) -> ExposureStats:
+        """
+        Read the records of the given files, with `mapper` (such as
+        `Executor.map` to read them in parallel).
+        """
+        return cls.from_records(mapper(read_record, files))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a numeric field of every record as a NumPy array, without copying it.
+        """
+        column = self.records.column(name)
+        return np.frombuffer(column, dtype=column.typecode) if len(column) else np.empty(0, dtype=TYPECODES[name])
+
+    @cached_property
+    def ev100(self) -> np.ndarray:
+        """
+        The EV100 of every photo, see `ev100`.
+        """
+        return ev100(self.column("exposure_time"), self.column("aperture"), self.column("iso").astype(np.float64))
+
+    def groups(self, by: StatsGroup, gap: float = SESSION_GAP) -> list[tuple[str, np.ndarray]]:
+        """
+        Returns the name and the indices of the photos of every group: folders
+        sorted by path, or sessions in chronological order (undated photos last).
+        """
+        if by == StatsGroup.SESSION:
+            timestamps = self.column("timestamp")
+            groups = []
+            for label, indices in split_groups(split_sessions(timestamps, gap)):
+                if label < 0:
+                    continue
+                start, end = (
+                    datetime.fromtimestamp(value, UTC).strftime("%Y-%m-%d %H:%M")
+                    for value in (timestamps[indices].min(), timestamps[indices].max())
+                )
+                groups.append((f"{start} → {end}", indices))
+            undated = np.flatnonzero(np.isnan(timestamps))
+            return groups + ([("undated", undated)] if len(undated) else [])
+
+        groups = [(self.folders[label], indices) for label, indices in split_groups(self.folder_ids)]
+        return sorted(groups, key=lambda group: group[0])
+
+    def summary(self, indices: np.ndarray | slice = slice(None)) -> dict:
+        """
+        Returns the statistics of the given photos: the distribution of their
+        EV100 (also as a histogram by whole stops), and the histograms of
+        their exposure bias (by thirds of a stop), ISO and aperture.
+        """
+        iso = self.column("iso")[indices].astype(np.float64)
+        iso[iso <= 0] = np.nan
+        ev = self.ev100[indices]
+        return {
+            "photos": len(ev),
+            "ev100": {**distribution(ev), "histogram": histogram(ev, format_ev, step=1.0)},
+            "exposure_bias": histogram(self.column("exposure_bias")[indices], format_bias, step=BIAS_STEP),
+            "iso": histogram(iso, format_iso),
+            "aperture": histogram(self.column("aperture")[indices], format_aperture, step=0.1),
+        }
+
+    def report(self, by: StatsGroup = StatsGroup.FOLDER, gap: float = SESSION_GAP) -> dict:
+        """
+        Returns the statistics of all photos and of every group.
+
+        Parameters
+        ----------
+        by : StatsGroup, optional
+            How photos are grouped: by FOLDER or by SESSION. Default is FOLDER.
+        gap : float, optional
+            The seconds between two photos that start a new session.
+
+        Returns
+        -------
+        dict
+            The "total" statistics (see `summary`) and the "groups", each with
+            its "name".
+        """
+        return {
+            "total": self.summary(),
+            "groups": [{"name": name, **self.summary(indices)} for name, indices in self.groups(by, gap)],
+        }
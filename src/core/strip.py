@@ -0,0 +1,338 @@
+import re
+import struct
+from dataclasses import dataclass
+from io import BytesIO
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.common.profiling import stage
+from src.core.overlay import overlay_layout
+from src.metadata.exif import EXIF_HEADER, JPEG_SOI
+
+JPEG_SOF0 = 0xC0
+JPEG_DHT = 0xC4
+JPEG_DQT = 0xDB
+JPEG_DRI = 0xDD
+JPEG_SOS = 0xDA
+JPEG_APP1 = 0xE1
+JPEG_EOI = b"\xff\xd9"
+# Frame markers other than baseline: extended, progressive, lossless and
+# arithmetic-coded frames are not supported.
+JPEG_OTHER_SOF = frozenset(range(0xC1, 0xD0)) - {JPEG_DHT, 0xC8, 0xCC}
+# Inside entropy-coded data every 0xFF byte is stuffed with 0x00, so this only
+# matches actual RST0-RST7 markers.
+RESTART_MARKER = re.compile(rb"\xff[\xd0-\xd7]")
+
+EXIF_ORIENTATION = 0x0112
+
+# Position in the 8x8 block (row-major) of every coefficient, in the zigzag
+# order DQT segments store them in.
+ZIGZAG = (
+    0, 1, 8, 16, 9, 2, 3, 10, 17, 24, 32, 25, 18, 11, 4, 5,
+    12, 19, 26, 33, 40, 48, 41, 34, 27, 20, 13, 6, 7, 14, 21, 28,
+    35, 42, 49, 56, 57, 50, 43, 36, 29, 22, 15, 23, 30, 37, 44, 51,
+    58, 59, 52, 45, 38, 31, 39, 46, 53, 60, 61, 54, 47, 55, 62, 63,
+)
+
+# Pillow `subsampling` option for the sampling factors of the luma component
+# (chroma components are always sampled 1x1).
+SUBSAMPLING = {(1, 1): 0, (2, 1): 1, (2, 2): 2}
+
+
+@dataclass(frozen=True)
+class JpegFrame:
+    """
+    The header of a baseline JPEG with restart markers: what is needed to
+    decode its first MCU rows on their own and to encode replacement rows
+    that fit in its entropy-coded data.
+
+    Attributes
+    ----------
+    width : int
+        The width of the image, in pixels.
+    height : int
+        The height of the image, in pixels.
+    components : tuple[tuple[int, int, int, int], ...]
+        The (id, horizontal sampling, vertical sampling, quantization table)
+        of every component.
+    quantization : dict[int, bytes]
+        The 8-bit quantization tables by id, in zigzag order.
+    huffman : dict[tuple[int, int], bytes]
+        The Huffman tables by (class, id): code counts followed by symbols.
+    scan : bytes
+        The component selectors of the scan header.
+    restart_interval : int
+        The number of MCUs between two restart markers.
+    orientation : int
+        The EXIF orientation of the image, 1 if there is none.
+    header : tuple[bytes, ...]
+        The table, frame and scan segments, in file order.
+    scan_start : int
+        The offset of the entropy-coded data in the file.
+    """
+
+    width: int
+    height: int
+    components: tuple[tuple[int, int, int, int], ...]
+    quantization: dict[int, bytes]
+    huffman: dict[tuple[int, int], bytes]
+    scan: bytes
+    restart_interval: int
+    orientation: int
+    header: tuple[bytes, ...]
+    scan_start: int
+
+    @property
+    def mcu_size(self) -> tuple[int, int]:
+        """
+        Returns the (width, height) of an MCU, in pixels.
+        """
+        if len(self.components) == 1:
+            return 8, 8
+        return 8 * max(c[1] for c in self.components), 8 * max(c[2] for c in self.components)
+
+    @property
+    def mcus_per_row(self) -> int:
+        """
+        Returns the number of MCUs in a row of the image.
+        """
+        return -(-self.width // self.mcu_size[0])
+
+    def strip_rows(self, height: int) -> int | None:
+        """
+        Returns the smallest number of MCU rows covering `height` pixels that
+        ends on a restart marker, or None if only the whole image does.
+        """
+        mcu_height = self.mcu_size[1]
+        for rows in range(-(-height // mcu_height), -(-self.height // mcu_height)):
+            if rows * self.mcus_per_row % self.restart_interval == 0:
+                return rows
+        return None
+
+    def strip_header(self, height: int) -> bytes:
+        """
+        Returns the header of a JPEG made of the first `height` pixel rows of
+        the image: the same tables and scan, with a shorter frame.
+        """
+        segments = [
+            segment[:5] + struct.pack(">H", height) + segment[7:] if segment[1] == JPEG_SOF0 else segment
+            for segment in self.header
+        ]
+        return JPEG_SOI + b"".join(segments)
+
+    def compatible(self, other: "JpegFrame") -> bool:
+        """
+        Returns True if the entropy-coded data of `other` can be spliced into
+        this image: same width, components, tables, scan and restart interval.
+        """
+        tables = {c[3] for c in self.components}
+        selectors = self.scan[1::2]
+        huffman = {(0, s >> 4) for s in selectors} | {(1, s & 0x0F) for s in selectors}
+        return (
+            self.width == other.width
+            and self.components == other.components
+            and self.scan == other.scan
+            and self.restart_interval == other.restart_interval
+            and all(self.quantization.get(t) == other.quantization.get(t) for t in tables)
+            and all(self.huffman.get(t) == other.huffman.get(t) for t in huffman)
+        )
+
+
+def exif_orientation(tiff: bytes) -> int:
+    """
+    Returns the Orientation tag of IFD0 of a TIFF-structured EXIF block, or 1
+    if it is missing.
+    """
+    byte_order = "<" if tiff[:2] == b"II" else ">"
+    (offset,) = struct.unpack_from(f"{byte_order}I", tiff, 4)
+    (count,) = struct.unpack_from(f"{byte_order}H", tiff, offset)
+    for i in range(count):
+        tag, _, _, value = struct.unpack_from(f"{byte_order}HHIH", tiff, offset + 2 + 12 * i)
+        if tag == EXIF_ORIENTATION:
+            return value
+    return 1
+
+
+def read_frame(data: bytes) -> JpegFrame | None:
+    """
+    Parse the header of a JPEG byte stream, up to the start of its
+    entropy-coded data.
+
+    Parameters
+    ----------
+    data : bytes
+        The JPEG byte stream.
+
+    Returns
+    -------
+    JpegFrame | None
+        The header of the image, or None if it is not a baseline JPEG with
+        8-bit tables, restart markers and a single interleaved scan.
+    """
+    if not data.startswith(JPEG_SOI):
+        return None
+
+    quantization, huffman, header = {}, {}, []
+    frame, restart_interval, orientation = None, 0, 1
+    position = len(JPEG_SOI)
+    try:
+        while position + 4 <= len(data):
+            if data[position] != 0xFF:
+                return None
+            marker = data[position + 1]
+            if marker == 0xFF:
+                # Fill byte before the actual marker.
+                position += 1
+                continue
+
+            end = position + 2 + struct.unpack_from(">H", data, position + 2)[0]
+            segment, payload = data[position:end], data[position + 4:end]
+            if marker == JPEG_DQT:
+                while payload:
+                    if payload[0] >> 4:
+                        return None
+                    quantization[payload[0] & 0x0F] = payload[1:65]
+                    payload = payload[65:]
+            elif marker == JPEG_DHT:
+                while payload:
+                    size = 17 + sum(payload[1:17])
+                    huffman[(payload[0] >> 4, payload[0] & 0x0F)] = payload[1:size]
+                    payload = payload[size:]
+            elif marker == JPEG_DRI:
+                (restart_interval,) = struct.unpack(">H", payload[:2])
+            elif marker == JPEG_SOF0:
+                precision, height, width, count = struct.unpack(">BHHB", payload[:6])
+                components = tuple(
+                    (payload[6 + 3 * i], payload[7 + 3 * i] >> 4, payload[7 + 3 * i] & 0x0F, payload[8 + 3 * i])
+                    for i in range(count)
+                )
+                if precision != 8:
+                    return None
+                frame = (width, height, components)
+            elif marker in JPEG_OTHER_SOF:
+                return None
+            elif marker == JPEG_APP1 and payload.startswith(EXIF_HEADER):
+                orientation = exif_orientation(payload[len(EXIF_HEADER):])
+
+            if marker in (JPEG_DQT, JPEG_DHT, JPEG_DRI, JPEG_SOF0, JPEG_SOS):
+                header.append(segment)
+            if marker == JPEG_SOS:
+                break
+            position = end
+        else:
+            return None
+    except (struct.error, IndexError):
+        return None
+
+    if frame is None or not restart_interval:
+        return None
+    width, height, components = frame
+    scan = payload[:1 + 2 * payload[0]]
+    if not width or not height or len(components) not in (1, 3) or scan[0] != len(components):
+        return None
+
+    return JpegFrame(
+        width=width, height=height, components=components, quantization=quantization, huffman=huffman,
+        scan=scan, restart_interval=restart_interval, orientation=orientation, header=tuple(header),
+        scan_start=end,
+    )
+
+
+def find_restart(data: bytes, start: int, intervals: int) -> int | None:
+    """
+    Returns the offset of the restart marker that follows the given number of
+    restart intervals of the entropy-coded data starting at `start`, or None
+    if the data ends before.
+    """
+    for count, match in enumerate(RESTART_MARKER.finditer(data, start), start=1):
+        if count == intervals:
+            # Markers cycle through RST0-RST7: a mismatch means corrupt data.
+            return match.start() if data[match.start() + 1] == 0xD0 + (count - 1) % 8 else None
+    return None
+
+
+def encode_strip(strip: np.ndarray, frame: JpegFrame) -> bytes | None:
+    """
+    Encode a BGR strip with the quantization tables, sampling factors and
+    restart interval of the frame, and return its entropy-coded data, or None
+    if the encoder could not reproduce the tables of the frame.
+    """
+    luma = frame.components[0]
+    if len(frame.components) == 3:
+        if (luma[1], luma[2]) not in SUBSAMPLING or any(c[1:3] != (1, 1) for c in frame.components[1:]):
+            return None
+        image = Image.fromarray(cv2.cvtColor(strip, cv2.COLOR_BGR2RGB))
+        options = {"subsampling": SUBSAMPLING[(luma[1], luma[2])]}
+    else:
+        image, options = Image.fromarray(cv2.cvtColor(strip, cv2.COLOR_BGR2GRAY)), {}
+
+    qtables = {
+        table: [raw[ZIGZAG.index(i)] for i in range(64)] for table, raw in frame.quantization.items()
+    }
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", qtables=qtables, restart_marker_blocks=frame.restart_interval, **options)
+    encoded = buffer.getvalue()
+
+    strip_frame = read_frame(encoded)
+    if strip_frame is None or not frame.compatible(strip_frame) or not encoded.endswith(JPEG_EOI):
+        return None
+    return encoded[strip_frame.scan_start:-len(JPEG_EOI)]
+
+
+def patch_jpeg(data: bytes, lines: list[str]) -> bytes | None:
+    """
+    Draw the metadata box on a JPEG by re-encoding only the MCU rows under it.
+
+    The rows down to the first restart marker below the box are decoded on
+    their own, annotated and encoded again with the quantization tables,
+    sampling and restart interval of the image. Their entropy-coded data then
+    replaces the original one, and the rest of the file (metadata segments and
+    every row below) is copied byte for byte. The work depends on the height
+    of the box, not on the size of the image, and the photo below the box
+    suffers no generation loss.
+
+    Parameters
+    ----------
+    data : bytes
+        The JPEG byte stream.
+    lines : list[str]
+        The text lines written inside the box.
+
+    Returns
+    -------
+    bytes | None
+        The annotated JPEG, or None if the image cannot be patched: not a
+        baseline JPEG, no restart markers aligned on MCU rows below the box,
+        rotated by its EXIF orientation, or tables the encoder cannot
+        reproduce. It must then be fully decoded and encoded again.
+    """
+    frame = read_frame(data)
+    if frame is None or frame.orientation != 1:
+        return None
+
+    layout = overlay_layout(frame.width, tuple(lines))
+    rows = frame.strip_rows(layout.origin[1] + layout.size[0])
+    if rows is None:
+        return None
+    end = find_restart(data, frame.scan_start, rows * frame.mcus_per_row // frame.restart_interval)
+    if end is None:
+        return None
+
+    height = rows * frame.mcu_size[1]
+    with stage("decode"):
+        strip = cv2.imdecode(
+            np.frombuffer(frame.strip_header(height) + data[frame.scan_start:end] + JPEG_EOI, dtype=np.uint8),
+            cv2.IMREAD_COLOR
+        )
+    if strip is None or strip.shape[:2] != (height, frame.width):
+        return None
+
+    with stage("overlay"):
+        layout.apply(strip)
+    with stage("encode"):
+        entropy = encode_strip(strip, frame)
+        if entropy is None:
+            return None
+        return data[:frame.scan_start] + entropy + data[end:]
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Self
+
+from src.common.enums import WatchBackend
+from src.constants.image import IMAGE_EXTENSIONS
+from src.data.file import File
+from src.metadata.cache import MetadataCache
+
+# Seconds a file must stay unchanged before it is considered complete.
+SETTLE_TIME = 0.5
+# Seconds between two listings of the tree with the POLLING backend.
+POLL_INTERVAL = 1.0
+
+# Flags and events of <sys/inotify.h>.
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+# struct inotify_event: wd, mask, cookie and len, followed by len bytes of name.
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """
+    A minimal binding of the Linux inotify API through `ctypes`, so that no
+    extra dependency is needed. Events are read without blocking, with a
+    timeout, and directories are watched one by one.
+    """
+
+    def __init__(self):
+        libc = self.libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.directories: dict[int, str] = {}
+
+    @staticmethod
+    def libc() -> ctypes.CDLL | None:
+        """
+        Returns the C library if it provides inotify, or None.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        except OSError:
+            return None
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        return libc
+
+    @classmethod
+    def available(cls) -> bool:
+        """
+        Returns True if inotify can be used.
+        """
+        return cls.libc() is not None
+
+    def add(self, directory: str) -> None:
+        """
+        Watch a directory (not its subdirectories) for new and written files.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), directory)
+        self.directories[wd] = directory
+
+    def read(self, timeout: float) -> list[tuple[str, int]]:
+        """
+        Wait at most `timeout` seconds for events and return them.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            The path and the event mask of every event. The path is empty
+            when the event queue overflowed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+            if mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+            elif mask & IN_Q_OVERFLOW:
+                events.append(("", mask))
+            elif wd in self.directories:
+                events.append((os.path.join(self.directories[wd], os.fsdecode(name)), mask))
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+@dataclass
+class Batch:
+    """
+    A set of files ready to be named, grouped by directory. It can be given
+    to the Processor in place of a Folder or a Scanner.
+
+    Attributes
+    ----------
+    directory : str
+        The root directory of the watched tree.
+    directories : list[tuple[str, list[File]]]
+        Every directory with its ready files, as yielded by `walk`.
+    """
+
+    directory: str
+    directories: list[tuple[str, list[File]]] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, directory: str, files: list[File]) -> Batch:
+        """
+        Group the given files by directory, sorted by path.
+        """
+        directories: dict[str, list[File]] = {}
+        for file in sorted(files, key=lambda file: file.directory):
+            directories.setdefault(os.path.dirname(file.directory), []).append(file)
+        return cls(directory=directory, directories=list(directories.items()))
+
+    def __len__(self) -> int:
+        return sum(len(files) for _, files in self.directories)
+
+    def walk(self) -> Iterator[tuple[str, list[File]]]:
+        """
+        Yield every directory of the batch with its files.
+        """
+        yield from self.directories
+
+
+@dataclass
+class FolderWatcher:
+    """
+    Watches a directory tree for new or rewritten images, and reports them
+    once they are complete.
+
+    Changes come from inotify events when available, or from listing the
+    tree every `interval` seconds otherwise. A file is reported once its size
+    and modification time have not changed for `settle` seconds, so files
+    still being copied or written by a camera are not picked up half-written.
+    Files present when the watch starts are left alone.
+
+    Attributes
+    ----------
+    directory : str
+        The root directory to watch. New subdirectories are watched as well.
+    backend : WatchBackend
+        How the tree is monitored (AUTO, INOTIFY or POLLING).
+    settle : float
+        The seconds a file must stay unchanged before it is reported.
+    interval : float
+        The seconds between two listings of the tree with the POLLING backend.
+    exclude : tuple[str, ...]
+        Directories that are not watched, such as an output directory living
+        inside the watched tree.
+    cache : MetadataCache | None
+        The persistent metadata cache given to every file.
+    """
+
+    directory: str
+    backend: WatchBackend = WatchBackend.AUTO
+    settle: float = SETTLE_TIME
+    interval: float = POLL_INTERVAL
+    exclude: tuple[str, ...] = ()
+    cache: MetadataCache | None = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.excluded = {os.path.abspath(directory) for directory in self.exclude}
+        # Files changed recently: their (size, mtime_ns) and when it last changed.
+        self.pending: dict[str, tuple[int, int, float]] = {}
+        # The (size, mtime_ns) of every file already reported or ignored.
+        self.known: dict[str, tuple[int, int]] = {}
+        self.inotify: Inotify | None = None
+        if self.backend != WatchBackend.POLLING and (self.backend == WatchBackend.INOTIFY or Inotify.available()):
+            self.inotify = Inotify()
+        self.last_scan = time.monotonic()
+        self.known.update(self.listing(str(self.directory), watch=True))
+
+    @property
+    def uses_inotify(self) -> bool:
+        """
+        Returns True if changes come from inotify events, False if the tree is polled.
+        """
+        return self.inotify is not None
+
+    def listing(self, directory: str, watch: bool = False) -> dict[str, tuple[int, int]]:
+        """
+        List the images of a tree with their (size, mtime_ns), leaving out
+        the excluded directories. With `watch`, inotify watches the
+        directories of the tree, before they are listed so that no file
+        created in the meantime is missed.
+        """
+        images, pending = {}, [directory]
+        while pending:
+            directory = pending.pop()
+            if watch and self.inotify is not None:
+                try:
+                    self.inotify.add(directory)
+                except OSError:
+                    continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if os.path.abspath(entry.path) not in self.excluded:
+                                pending.append(entry.path)
+                        elif os.path.splitext(entry.name)[1] in IMAGE_EXTENSIONS:
+                            stat = entry.stat()
+                            images[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        return images
+
+    def ignore(self, paths: list[str]) -> None:
+        """
+        Never report the given files as new, unless they change again: used
+        for the renamed files written inside the watched tree.
+        """
+        for path in paths:
+            self.pending.pop(path, None)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self.known[path] = (stat.st_size, stat.st_mtime_ns)
+
+    def touch(self, path: str, now: float, version: tuple[int, int] | None = None) -> None:
+        """
+        Record that a file may have changed. Its (size, mtime_ns) is read
+        from disk unless it is given.
+        """
+        if os.path.splitext(path)[1] not in IMAGE_EXTENSIONS:
+            return
+        if version is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.pending.pop(path, None)
+                return
+            version = (stat.st_size, stat.st_mtime_ns)
+        if self.known.get(path) == version:
+            return
+        previous = self.pending.get(path)
+        if previous is None or previous[:2] != version:
+            self.pending[path] = (*version, now)
+
+    def collect(self, timeout: float) -> None:
+        """
+        Wait at most `timeout` seconds for changes and record them.
+        """
+        if self.inotify is None:
+            time.sleep(max(timeout, 0))
+            now = time.monotonic()
+            if now - self.last_scan >= self.interval:
+                self.last_scan = now
+                for path, version in self.listing(str(self.directory)).items():
+                    self.touch(path, now, version)
+            return
+
+        for path, mask in self.inotify.read(timeout):
+            now = time.monotonic()
+            if not path:
+                # Events were lost: look for changed files in the whole tree.
+                for image, version in self.listing(str(self.directory), watch=True).items():
+                    self.touch(image, now, version)
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and os.path.abspath(path) not in self.excluded:
+                    # Files may have landed before the directory was watched.
+                    for image, version in self.listing(path, watch=True).items():
+                        self.touch(image, now, version)
+            else:
+                self.touch(path, now)
+
+    def poll(self, timeout: float = 1.0) -> list[File]:
+        """
+        Wait at most `timeout` seconds for files to be complete.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait. Default is 1.
+
+        Returns
+        -------
+        list[File]
+            The files that stayed unchanged for `settle` seconds, possibly
+            none. Each file is reported once per version.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            ready = self.settled(now)
+            if ready or now >= deadline:
+                return ready
+            # Wake up for the next file to settle or the next listing of the tree.
+            wait = deadline - now
+            if self.pending:
+                wait = min(wait, min(changed for *_, changed in self.pending.values()) + self.settle - now)
+            if self.inotify is None:
+                wait = min(wait, self.last_scan + self.interval - now)
+            self.collect(max(wait, 0.01))
+
+    def settled(self, now: float) -> list[File]:
+        """
+        Returns the pending files unchanged for `settle` seconds, checking
+        that they are still unchanged on disk.
+        """
+        ready = []
+        for path, (size, mtime_ns, changed) in list(self.pending.items()):
+            if now - changed < self.settle:
+                continue
+            del self.pending[path]
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self.pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+                continue
+            self.known[path] = (size, mtime_ns)
+            ready.append(File(
+                name=os.path.basename(path), size=size, directory=path, mtime_ns=mtime_ns, cache=self.cache
+            ))
+        return ready
+
+    def close(self) -> None:
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,10 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
+from io import BytesIO
 from pathlib import Path
 
+from src.common.profiling import count_read, stage
+from src.constants.image import RAW_EXTENSIONS
+from src.metadata.cache import MetadataCache
+from src.metadata.dimensions import ImageHeader, read_image_header
+from src.metadata.exif import read_exif_tags
 from src.metadata.photo import PhotoMetadata
-import exifread
-import piexif
+from src.metadata.raw import RawPreview, exif_extent, raw_exif, read_raw_preview
+from src.metadata.record import PhotoRecord
 
 @dataclass
 class File:
@@ -19,35 +25,202 @@ class File:
         The size of the file in bytes.
     directory : str
         The directory where the file is located (absolute path).
+    mtime_ns : int
+        The modification time of the file in nanoseconds, or 0 if unknown.
+    cache : MetadataCache | None
+        The persistent cache checked before parsing the file metadata.
 
     """
     name: str
     size: int
     directory: str
+    mtime_ns: int = 0
+    cache: MetadataCache | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_bytes(cls, name: str, data: bytes) -> "File":
+        """
+        Build a file held only in memory, such as an uploaded image. Its
+        metadata, EXIF dump and pixels are all read from `data`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the file.
+        data : bytes
+            The content of the file.
+
+        Returns
+        -------
+        File
+            The loaded file.
+        """
+        file = cls(name=name, size=len(data), directory=name)
+        file.__dict__["data"] = data
+        return file
 
     @cached_property
     def extension(self) -> str:
         return Path(self.name).suffix
 
+    @property
+    def is_raw(self) -> bool:
+        """
+        Returns True if the file is a RAW photo (see `RAW_EXTENSIONS`).
+        """
+        return self.extension in RAW_EXTENSIONS
+
+    @property
+    def annotated_extension(self) -> str:
+        """
+        The extension of the annotated image: RAW photos are annotated from
+        their embedded preview, as JPEGs.
+        """
+        return ".jpg" if self.is_raw else self.extension
+
+    @cached_property
+    def data(self) -> bytes:
+        """
+        The whole content of the file, read from disk only once and shared by
+        the EXIF parse, the EXIF dump and the pixel decode.
+        """
+        with stage("read"):
+            data = Path(self.directory).read_bytes()
+        count_read(len(data))
+        return data
+
     @cached_property
     def photo_metadata(self) -> PhotoMetadata:
+        if self.cache is not None and (metadata := self.cache.get_metadata(self)) is not None:
+            return metadata
+
+        metadata = PhotoMetadata.from_tags(self.read_tags())
+        if self.cache is not None:
+            self.cache.put_metadata(self, metadata)
+        return metadata
+
+    @cached_property
+    def photo_record(self) -> PhotoRecord:
+        """
+        The settings of the photo as numbers, parsed straight from the EXIF
+        tags without building a PhotoMetadata.
+        """
+        return PhotoRecord.from_tags(self.read_tags())
+
+    @cached_property
+    def image_header(self) -> ImageHeader | None:
+        """
+        The dimensions of the image, read from its header without decoding the
+        pixels, or None if the format is not recognised.
+        """
+        if self.is_raw:
+            return self.raw_preview.header if self.raw_preview is not None else None
+        if self.is_loaded:
+            return read_image_header(BytesIO(self.data))
         with open(Path(self.directory), 'rb') as f:
-            tags = exifread.process_file(f)
-            return PhotoMetadata(
-                camera_model=str(tags.get("Image Model", "")).rstrip(),
-                exposure_time=str(tags.get("EXIF ExposureTime", "")).rstrip(),
-                aperture=str(tags.get("EXIF FNumber", "")).rstrip(),
-                iso=str(tags.get("EXIF ISOSpeedRatings", "")).rstrip(),
-                focal_length=str(tags.get("EXIF FocalLength", "")).rstrip(),
-                date_taken=str(tags.get("EXIF DateTimeOriginal", "")).rstrip(),
-                location=f"{tags.get('GPS GPSLatitude', '').rstrip()}{tags.get('GPS GPSLongitude', '').rstrip()}",
-                description=str(tags.get("Image ImageDescription", "")).rstrip(),
-                exposure_bias=str(tags.get("EXIF ExposureBiasValue", "")).rstrip()
-            )
+            header = read_image_header(f)
+            count_read(f.tell())
+        return header
+
+    @cached_property
+    def raw_preview(self) -> RawPreview | None:
+        """
+        The JPEG preview embedded in a RAW photo, located by reading its IFDs
+        only, or None if the file is not a RAW or has no preview.
+        """
+        if not self.is_raw:
+            return None
+        if self.is_loaded:
+            return read_raw_preview(BytesIO(self.data))
+        with open(Path(self.directory), 'rb') as f:
+            preview = read_raw_preview(f)
+            count_read(f.tell())
+        return preview
+
+    @property
+    def image_data(self) -> bytes:
+        """
+        The encoded image to decode: the embedded JPEG preview of a RAW photo,
+        read on its own unless the file is loaded, or the whole content of any
+        other image. RAW photos without a preview return no bytes, as their
+        sensor data is never demosaiced.
+        """
+        if not self.is_raw:
+            return self.data
+        preview = self.raw_preview
+        if preview is None:
+            return b""
+        if self.is_loaded:
+            return self.data[preview.offset:preview.offset + preview.length]
+        with stage("read"), open(Path(self.directory), 'rb') as f:
+            f.seek(preview.offset)
+            data = f.read(preview.length)
+        count_read(len(data))
+        return data
 
     @cached_property
     def exif_bytes(self) -> bytes:
-        return piexif.dump(piexif.load(self.directory))
+        if self.cache is not None and (exif := self.cache.get_exif(self)) is not None:
+            return exif
+
+        data = self.exif_data
+        with stage("exif_dump"):
+            import piexif
+
+            exif = piexif.load(data)
+            exif = piexif.dump(raw_exif(exif) if self.is_raw else exif)
+        if self.cache is not None:
+            self.cache.put_exif(self, exif)
+        return exif
+
+    @property
+    def exif_data(self) -> bytes:
+        """
+        The bytes the EXIF dump is parsed from: the whole content of the file,
+        or only the TIFF header and IFDs of a RAW photo that is not loaded
+        (see `exif_extent`).
+        """
+        if not self.is_raw or self.is_loaded:
+            return self.data
+        with stage("read"), open(Path(self.directory), 'rb') as f:
+            extent = exif_extent(f)
+            f.seek(0)
+            data = f.read(extent)
+        count_read(len(data))
+        return data
+
+    def read_tags(self) -> dict:
+        """
+        Read the EXIF tags of the file, from memory if it is loaded.
+        """
+        with stage("exif"):
+            if self.is_loaded:
+                return read_exif_tags(BytesIO(self.data))
+            with open(Path(self.directory), 'rb') as f:
+                tags = read_exif_tags(f)
+                count_read(f.tell())
+            return tags
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Returns True if the content of the file is already in memory.
+        """
+        return "data" in self.__dict__
+
+    def load(self) -> "File":
+        """
+        Read the content of the file into memory, so that every later access
+        to it (metadata, EXIF dump, pixel decode) is served from the buffer.
+        """
+        _ = self.data
+        return self
+
+    def release(self) -> None:
+        """
+        Drop the in-memory content of the file. The parsed metadata is kept.
+        """
+        self.__dict__.pop("data", None)
 
     def __str__(self) -> str:
         return (
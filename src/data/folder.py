@@ -1,16 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass, field
-from pathlib import Path
 
-from src.constants.image import IMAGE_EXTENSIONS
 from src.data.file import File
+from src.data.scanner import scan_directory
+from src.metadata.cache import MetadataCache
 
 @dataclass
 class Folder:
     """
     A class representing a folder containing files and subfolders.
 
+    The whole tree is built eagerly on top of `scan_directory`. To stream very
+    large trees without keeping them in memory, use `Scanner` instead.
+
     Attributes
     ----------
     directory : str
@@ -19,25 +23,27 @@ class Folder:
         A list of subfolders within this folder.
     files : list[File]
         A list of files within this folder.
+    cache : MetadataCache | None
+        The persistent metadata cache shared by every file in the tree.
     """
     
     directory: str
     folders: list[Folder] = field(default_factory=list)
     files: list[File] = field(default_factory=list)
+    cache: MetadataCache | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        for child in Path(self.directory).iterdir():
-            if child.is_dir():
-                self.folders.append(Folder(child))
-                continue
-
-            if child.suffix in IMAGE_EXTENSIONS:
-                self.files.append(File(
-                    name=child.name,
-                    size=child.stat().st_size,
-                    directory=str(child)
-                ))
+        folders, files = scan_directory(str(self.directory), self.cache)
+        self.folders.extend(Folder(folder, cache=self.cache) for folder in folders)
+        self.files.extend(files)
 
+    def walk(self) -> Iterator[tuple[str, list[File]]]:
+        """
+        Yield this folder and every subfolder with the files it contains.
+        """
+        yield str(self.directory), self.files
+        for folder in self.folders:
+            yield from folder.walk()
 
     @property
     def files_recursive(self) -> list[File]:
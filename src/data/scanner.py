@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.constants.image import IMAGE_EXTENSIONS
+from src.data.file import File
+from src.metadata.cache import MetadataCache
+
+
+def scan_directory(directory: str, cache: MetadataCache | None = None) -> tuple[list[str], list[File]]:
+    """
+    List a single directory with `os.scandir`, sorted by name.
+
+    The entry type comes from the directory listing itself and only image
+    files are stat'ed, once, to get their size and modification time.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to list.
+    cache : MetadataCache, optional
+        The persistent metadata cache given to every file.
+
+    Returns
+    -------
+    tuple[list[str], list[File]]
+        The paths of the subdirectories and the image files of the directory.
+    """
+    folders, files = [], []
+    with os.scandir(directory) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if entry.is_dir():
+                folders.append(entry.path)
+                continue
+
+            if os.path.splitext(entry.name)[1] in IMAGE_EXTENSIONS:
+                stat = entry.stat()
+                files.append(File(
+                    name=entry.name,
+                    size=stat.st_size,
+                    directory=entry.path,
+                    mtime_ns=stat.st_mtime_ns,
+                    cache=cache
+                ))
+
+    return folders, files
+
+
+@dataclass
+class Scanner:
+    """
+    A lazy, streaming alternative to Folder: directories are listed only as
+    the scan is consumed and files are never kept in memory by the scanner.
+
+    Directories are visited breadth first and their entries sorted by name,
+    so the order of the files is deterministic. With several workers the
+    directories of the frontier are listed concurrently (useful on network
+    file systems) without changing that order.
+
+    Attributes
+    ----------
+    directory : str
+        The root directory to scan.
+    workers : int
+        The number of threads listing directories concurrently.
+    cache : MetadataCache | None
+        The persistent metadata cache given to every file.
+    exclude : tuple[str, ...]
+        Directories that are not scanned, such as an output directory living
+        inside the scanned tree.
+    """
+
+    directory: str
+    workers: int = 1
+    cache: MetadataCache | None = field(default=None, repr=False, compare=False)
+    exclude: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        self.excluded = {os.path.abspath(directory) for directory in self.exclude}
+
+    def scan(self, directory: str) -> tuple[list[str], list[File]]:
+        """
+        List a single directory, leaving out the excluded subdirectories.
+        """
+        folders, files = scan_directory(directory, self.cache)
+        return [folder for folder in folders if os.path.abspath(folder) not in self.excluded], files
+
+    def walk(self) -> Iterator[tuple[str, list[File]]]:
+        """
+        Yield every directory of the tree with the image files it contains.
+
+        Yields
+        ------
+        tuple[str, list[File]]
+            The path of the directory and its image files.
+        """
+        if self.workers <= 1:
+            pending = deque([str(self.directory)])
+            while pending:
+                directory = pending.popleft()
+                folders, files = self.scan(directory)
+                pending.extend(folders)
+                yield directory, files
+            return
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque([(str(self.directory), pool.submit(self.scan, str(self.directory)))])
+            while pending:
+                directory, future = pending.popleft()
+                folders, files = future.result()
+                pending.extend((folder, pool.submit(self.scan, folder)) for folder in folders)
+                yield directory, files
+
+    def __iter__(self) -> Iterator[File]:
+        for _, files in self.walk():
+            yield from files
+
+    @property
+    def files_recursive(self) -> list[File]:
+        """
+        Returns a flat list of all files in the tree.
+        """
+        return list(self)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.metadata.photo import PhotoMetadata
+
+if TYPE_CHECKING:
+    from src.data.file import File
+
+CACHE_FILENAME = ".kmera-cache.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    metadata TEXT,
+    exif BLOB,
+    accessed REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CacheConnection:
+    """
+    The connection of a process to a cache file, shared by every copy of the
+    cache in that process (e.g. the copies unpickled with each job sent to a
+    worker).
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        The SQLite connection, shared by all threads.
+    lock : threading.RLock
+        The lock held by every operation on the connection.
+    writes : int
+        The number of writes made through the connection, which triggers
+        the periodic eviction.
+    """
+
+    connection: sqlite3.Connection
+    lock: threading.RLock
+    writes: int = 0
+
+
+# The open connections of this process, keyed by process id and cache path:
+# a forked worker never reuses the connection of its parent.
+CONNECTIONS: dict[tuple[int, str], CacheConnection] = {}
+CONNECTIONS_LOCK = threading.Lock()
+
+
+def connect(path: str) -> CacheConnection:
+    """
+    Returns the connection of this process to the cache file, opening it and
+    creating the schema on first use.
+    """
+    key = (os.getpid(), os.path.abspath(path))
+    with CONNECTIONS_LOCK:
+        if key not in CONNECTIONS:
+            connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            CONNECTIONS[key] = CacheConnection(connection=connection, lock=threading.RLock())
+        return CONNECTIONS[key]
+
+
+@dataclass
+class MetadataCache:
+    """
+    A persistent SQLite cache of the parsed photo metadata and the raw EXIF
+    bytes of each file.
+
+    Entries are keyed by the absolute path of the file and validated against
+    its size and modification time, so stale entries are dropped as soon as
+    they are looked up. When the cache grows beyond `max_entries`, the least
+    recently used entries are evicted.
+
+    The connection is opened lazily and is not pickled, so the cache can be
+    shared with worker processes: each of them opens a single connection,
+    shared by every copy of the cache it receives (see `connect`). Within a
+    process the connection is shared by all threads and every operation holds
+    a lock. Writes are counted per process, so each worker evicts in turn.
+
+    Attributes
+    ----------
+    path : str
+        The path of the SQLite database file.
+    max_entries : int
+        The maximum number of entries kept in the cache.
+    evict_every : int
+        The number of writes between two eviction passes.
+    """
+
+    path: str
+    max_entries: int = 100_000
+    evict_every: int = 1_000
+
+    @classmethod
+    def in_directory(cls, directory: str, **kwargs) -> MetadataCache:
+        """
+        Create a cache stored in the given directory.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the cache file is stored.
+
+        Returns
+        -------
+        MetadataCache
+            The metadata cache.
+        """
+        return cls(path=str(Path(directory) / CACHE_FILENAME), **kwargs)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return connect(self.path).connection
+
+    @property
+    def lock(self) -> threading.RLock:
+        return connect(self.path).lock
+
+    @staticmethod
+    def key(file: File) -> tuple[str, int, int]:
+        """
+        Returns the (path, size, mtime) key identifying the current version of a file.
+        """
+        mtime_ns = file.mtime_ns or os.stat(file.directory).st_mtime_ns
+        return os.path.abspath(file.directory), file.size, mtime_ns
+
+    def get_metadata(self, file: File) -> PhotoMetadata | None:
+        """
+        Returns the cached photo metadata of the file, or None on a miss.
+        """
+        value = self._get(file, "metadata")
+        if value is None:
+            return None
+        # Values were validated when they were parsed, validating them again
+        # would re-apply the field validators.
+        return PhotoMetadata.model_construct(**json.loads(value))
+
+    def put_metadata(self, file: File, metadata: PhotoMetadata) -> None:
+        """
+        Store the photo metadata of the file.
+        """
+        self._put(file, "metadata", metadata.model_dump_json())
+
+    def get_exif(self, file: File) -> bytes | None:
+        """
+        Returns the cached EXIF bytes of the file, or None on a miss.
+        """
+        return self._get(file, "exif")
+
+    def put_exif(self, file: File, exif: bytes) -> None:
+        """
+        Store the EXIF bytes of the file.
+        """
+        self._put(file, "exif", exif)
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries beyond `max_entries`.
+        """
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM entries WHERE path IN ("
+                "SELECT path FROM entries ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def close(self) -> None:
+        """
+        Evict the exceeding entries, whichever process wrote them, and close
+        the connection of this process.
+        """
+        self.evict()
+        with CONNECTIONS_LOCK:
+            shared = CONNECTIONS.pop((os.getpid(), os.path.abspath(self.path)), None)
+        if shared is not None:
+            shared.connection.close()
+
+    def _get(self, file: File, column: str) -> str | bytes | None:
+        path, size, mtime_ns = self.key(file)
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT size, mtime_ns, {column} FROM entries WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if (row[0], row[1]) != (size, mtime_ns):
+                self.connection.execute("DELETE FROM entries WHERE path = ?", (path,))
+                return None
+
+            if row[2] is not None:
+                self.connection.execute(
+                    "UPDATE entries SET accessed = ? WHERE path = ?", (time.time(), path)
+                )
+            return row[2]
+
+    def _put(self, file: File, column: str, value: str | bytes) -> None:
+        path, size, mtime_ns = self.key(file)
+        shared = connect(self.path)
+        with shared.lock, shared.connection as connection:
+            connection.execute("BEGIN")
+            connection.execute(
+                "DELETE FROM entries WHERE path = ? AND (size != ? OR mtime_ns != ?)",
+                (path, size, mtime_ns)
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO entries (path, size, mtime_ns, accessed) VALUES (?, ?, ?, ?)",
+                (path, size, mtime_ns, time.time())
+            )
+            connection.execute(
+                f"UPDATE entries SET {column} = ?, accessed = ? WHERE path = ?",
+                (value, time.time(), path)
+            )
+            shared.writes += 1
+            evict = shared.writes % self.evict_every == 0
+
+        if evict:
+            self.evict()
@@ -0,0 +1,193 @@
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+TIFF_LITTLE_ENDIAN = b"II*\x00"
+TIFF_BIG_ENDIAN = b"MM\x00*"
+GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+BMP_SIGNATURE = b"BM"
+
+# Start Of Frame markers: every 0xC0-0xCF marker but DHT, JPG and DAC.
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_SOS = 0xDA
+JPEG_EOI = 0xD9
+
+# Samples per pixel of every PNG color type (palette images decode to color).
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+
+TIFF_IMAGE_WIDTH = 256
+TIFF_IMAGE_LENGTH = 257
+TIFF_BITS_PER_SAMPLE = 258
+TIFF_SAMPLES_PER_PIXEL = 277
+TIFF_SHORT = 3
+
+# Channels of the images decoded with cv2.IMREAD_COLOR (8-bit BGR).
+DECODED_CHANNELS = 3
+
+
+@dataclass(frozen=True)
+class ImageHeader:
+    """
+    The pixel layout of an image, read from its header without decoding it.
+
+    Attributes
+    ----------
+    width : int
+        The width of the image, in pixels.
+    height : int
+        The height of the image, in pixels.
+    channels : int
+        The number of samples per pixel stored in the file.
+    bit_depth : int
+        The number of bits per sample stored in the file.
+    """
+
+    width: int
+    height: int
+    channels: int = 3
+    bit_depth: int = 8
+
+    @property
+    def decoded_size(self) -> int:
+        """
+        Returns the number of bytes held while the image is decoded: the 8-bit
+        BGR array, plus the full-depth buffer the decoder fills first when the
+        file stores another layout (e.g. 16-bit or RGBA TIFF).
+        """
+        pixels = self.width * self.height
+        size = pixels * DECODED_CHANNELS
+        if self.channels != DECODED_CHANNELS or self.bit_depth > 8:
+            size += pixels * self.channels * -(-self.bit_depth // 8)
+        return size
+
+
+def read_jpeg_header(fh: BinaryIO) -> ImageHeader | None:
+    """
+    Read the frame header of a JPEG stream, skipping every segment before it
+    without reading its payload.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The JPEG stream, positioned right after the SOI marker.
+    """
+    while True:
+        header = fh.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            return None
+
+        marker = header[1]
+        if marker == 0xFF:
+            # Fill byte before the actual marker.
+            fh.seek(-3, 1)
+            continue
+        if marker in (JPEG_SOS, JPEG_EOI):
+            return None
+
+        length = struct.unpack(">H", header[2:4])[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = fh.read(6)
+            if len(frame) < 6:
+                return None
+            bit_depth, height, width, channels = struct.unpack(">BHHB", frame)
+            return ImageHeader(width=width, height=height, channels=channels, bit_depth=bit_depth)
+
+        fh.seek(length - 2, 1)
+
+
+def read_tiff_header(fh: BinaryIO, byte_order: str) -> ImageHeader | None:
+    """
+    Read the dimensions of the first image of a TIFF stream from its IFD.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The TIFF stream, positioned right after the byte order and magic number.
+    byte_order : str
+        The `struct` byte order of the stream ("<" or ">").
+    """
+    (offset,) = struct.unpack(f"{byte_order}I", fh.read(4))
+    fh.seek(offset)
+    count_bytes = fh.read(2)
+    if len(count_bytes) < 2:
+        return None
+
+    (count,) = struct.unpack(f"{byte_order}H", count_bytes)
+    entries = fh.read(12 * count)
+    tags = {}
+    for i in range(len(entries) // 12):
+        tag, kind, values, value = struct.unpack(f"{byte_order}HHI4s", entries[12 * i:12 * i + 12])
+        tags[tag] = (kind, values, value)
+
+    def first_value(tag: int, default: int) -> int:
+        if tag not in tags:
+            return default
+        kind, values, value = tags[tag]
+        fmt = f"{byte_order}H" if kind == TIFF_SHORT else f"{byte_order}I"
+        if struct.calcsize(fmt) * values > 4:
+            # The values do not fit in the entry, which holds their offset.
+            fh.seek(struct.unpack(f"{byte_order}I", value)[0])
+            value = fh.read(4)
+        return struct.unpack_from(fmt, value)[0]
+
+    if TIFF_IMAGE_WIDTH not in tags or TIFF_IMAGE_LENGTH not in tags:
+        return None
+
+    return ImageHeader(
+        width=first_value(TIFF_IMAGE_WIDTH, 0),
+        height=first_value(TIFF_IMAGE_LENGTH, 0),
+        channels=first_value(TIFF_SAMPLES_PER_PIXEL, 1),
+        bit_depth=first_value(TIFF_BITS_PER_SAMPLE, 1),
+    )
+
+
+def read_image_header(fh: BinaryIO) -> ImageHeader | None:
+    """
+    Read the dimensions of an image from its header, without decoding it.
+    JPEG, PNG, TIFF, GIF and BMP images are supported.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The image stream, opened in binary mode.
+
+    Returns
+    -------
+    ImageHeader | None
+        The pixel layout of the image, or None if the format is not supported
+        or the header is truncated.
+    """
+    fh.seek(0)
+    signature = fh.read(8)
+    try:
+        if signature[:2] == b"\xff\xd8":
+            fh.seek(2)
+            return read_jpeg_header(fh)
+
+        if signature == PNG_SIGNATURE:
+            chunk = fh.read(18)
+            if chunk[4:8] != b"IHDR":
+                return None
+            width, height, bit_depth, color_type = struct.unpack(">IIBB", chunk[8:18])
+            return ImageHeader(
+                width=width, height=height, channels=PNG_CHANNELS.get(color_type, 3), bit_depth=bit_depth
+            )
+
+        if signature[:4] in (TIFF_LITTLE_ENDIAN, TIFF_BIG_ENDIAN):
+            fh.seek(4)
+            return read_tiff_header(fh, "<" if signature[:2] == b"II" else ">")
+
+        if signature[:6] in GIF_SIGNATURES:
+            fh.seek(6)
+            width, height = struct.unpack("<HH", fh.read(4))
+            return ImageHeader(width=width, height=height)
+
+        if signature[:2] == BMP_SIGNATURE:
+            fh.seek(18)
+            width, height, _, bits = struct.unpack("<iiHH", fh.read(12))
+            return ImageHeader(width=width, height=abs(height), channels=max(bits // 8, 1))
+    except struct.error:
+        return None
+
+    return None
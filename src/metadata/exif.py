@@ -0,0 +1,89 @@
+import struct
+from io import BytesIO
+from typing import Any, BinaryIO
+
+import exifread
+from exifread.core.exceptions import ExifError
+
+# Highest-numbered EXIF tag needed by PhotoMetadata. IFD entries are sorted by
+# tag number, so the EXIF SubIFD can be left as soon as it has been read.
+EXIF_STOP_TAG = "FocalLength"
+
+JPEG_SOI = b"\xff\xd8"
+JPEG_APP1 = 0xE1
+JPEG_SOS = 0xDA
+JPEG_EOI = 0xD9
+EXIF_HEADER = b"Exif\x00\x00"
+
+# Errors raised while reading the metadata of a missing, truncated or corrupt
+# file, or one whose tags do not parse (e.g. an FNumber of 0/0).
+METADATA_ERRORS = (OSError, ValueError, ArithmeticError, struct.error, ExifError)
+
+
+def read_jpeg_app1(fh: BinaryIO) -> bytes | None:
+    """
+    Read the EXIF APP1 segment of a JPEG stream, skipping every other segment
+    without reading its payload. Reading stops at the start of the image data.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The JPEG stream, positioned right after the SOI marker.
+
+    Returns
+    -------
+    bytes | None
+        The whole APP1 segment (marker and length included), or None if the
+        stream has no EXIF segment.
+    """
+    while True:
+        header = fh.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            return None
+
+        marker = header[1]
+        if marker == 0xFF:
+            # Fill byte before the actual marker.
+            fh.seek(-3, 1)
+            continue
+        if marker in (JPEG_SOS, JPEG_EOI):
+            return None
+
+        length = struct.unpack(">H", header[2:4])[0]
+        if marker == JPEG_APP1:
+            payload = fh.read(length - 2)
+            if payload.startswith(EXIF_HEADER):
+                return header + payload
+            continue
+
+        fh.seek(length - 2, 1)
+
+
+def read_exif_tags(fh: BinaryIO) -> dict[str, Any]:
+    """
+    Read only the EXIF tags needed to build a PhotoMetadata.
+
+    For JPEG files only the APP1 segment is read from disk and MakerNotes,
+    thumbnails and the tags after `EXIF_STOP_TAG` are not parsed. Other
+    formats go through `exifread.process_file` with the same restrictions.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The image stream, opened in binary mode.
+
+    Returns
+    -------
+    dict[str, Any]
+        The EXIF tags, keyed as `exifread` does ("IFD_NAME TAG_NAME").
+    """
+    fh.seek(0)
+    if fh.read(2) == JPEG_SOI:
+        app1 = read_jpeg_app1(fh)
+        if app1 is None:
+            return {}
+        fh = BytesIO(JPEG_SOI + app1)
+
+    return exifread.process_file(
+        fh, stop_tag=EXIF_STOP_TAG, details=False, extract_thumbnail=False
+    )
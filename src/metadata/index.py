@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import sqlite3
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import astuple, dataclass, field, fields
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.metadata.cache import MetadataCache
+from src.metadata.exif import METADATA_ERRORS
+from src.metadata.photo import parse_date, parse_ratio
+from src.metadata.record import PhotoRecord
+
+if TYPE_CHECKING:
+    from src.data.file import File
+
+INDEX_FILENAME = ".kmera-index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    camera_model TEXT NOT NULL,
+    exposure_time REAL,
+    aperture REAL,
+    iso INTEGER,
+    focal_length REAL,
+    exposure_bias REAL,
+    date_taken REAL,
+    token TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS photos_exposure_time ON photos (exposure_time);
+CREATE INDEX IF NOT EXISTS photos_aperture ON photos (aperture);
+CREATE INDEX IF NOT EXISTS photos_iso ON photos (iso);
+CREATE INDEX IF NOT EXISTS photos_focal_length ON photos (focal_length);
+CREATE INDEX IF NOT EXISTS photos_date_taken ON photos (date_taken);
+"""
+
+# The names filters and orders may use for every column of the index.
+FIELDS = {
+    "path": "path",
+    "camera": "camera_model",
+    "exposure": "exposure_time",
+    "aperture": "aperture",
+    "iso": "iso",
+    "focal": "focal_length",
+    "ev": "exposure_bias",
+    "date": "date_taken",
+}
+FIELDS.update({column: column for column in FIELDS.values()})
+TEXT_COLUMNS = frozenset({"path", "camera_model"})
+
+FILTER = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|=|<|>|~)\s*(.+?)\s*$")
+# Characters with a meaning in LIKE patterns, escaped with a backslash.
+LIKE_SPECIAL = re.compile(r"([%_\\])")
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """
+    The indexed metadata of a photo, with the numbers of its PhotoRecord so
+    that they can be compared and sorted. Missing values are None.
+
+    Attributes
+    ----------
+    path : str
+        The absolute path of the photo.
+    size : int
+        The size of the file in bytes, when it was indexed.
+    mtime_ns : int
+        The modification time of the file in nanoseconds, when it was indexed.
+    camera_model : str
+        The model of the camera.
+    exposure_time : float | None
+        The exposure time, in seconds.
+    aperture : float | None
+        The f-number.
+    iso : int | None
+        The ISO speed rating.
+    focal_length : float | None
+        The focal length, in millimeters.
+    exposure_bias : float | None
+        The exposure bias, in EV.
+    date_taken : float | None
+        The date the photo was taken, in seconds since the epoch (see `parse_date`).
+    token : str
+        The metadata written in file names, e.g. "1s250-2.8f-100".
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    camera_model: str
+    exposure_time: float | None
+    aperture: float | None
+    iso: int | None
+    focal_length: float | None
+    exposure_bias: float | None
+    date_taken: float | None
+    token: str
+
+    @classmethod
+    def from_file(cls, file: File) -> IndexEntry:
+        """
+        Build the index entry of a file from its photo record.
+        """
+        path, size, mtime_ns = MetadataCache.key(file)
+        record = file.photo_record
+
+        def number(value: float) -> float | None:
+            return None if math.isnan(value) else value
+
+        return cls(
+            path=path,
+            size=size,
+            mtime_ns=mtime_ns,
+            camera_model=record.camera_model,
+            exposure_time=number(record.exposure_time),
+            aperture=number(record.aperture),
+            iso=record.iso or None,
+            focal_length=number(record.focal_length),
+            exposure_bias=number(record.exposure_bias),
+            date_taken=number(record.timestamp),
+            token=str(record),
+        )
+
+    @property
+    def record(self) -> PhotoRecord:
+        """
+        Returns the photo record the entry was built from.
+        """
+        def number(value: float | None) -> float:
+            return math.nan if value is None else value
+
+        return PhotoRecord(
+            camera_model=self.camera_model,
+            exposure_time=number(self.exposure_time),
+            aperture=number(self.aperture),
+            iso=self.iso or 0,
+            focal_length=number(self.focal_length),
+            exposure_bias=number(self.exposure_bias),
+            timestamp=number(self.date_taken),
+        )
+
+
+COLUMNS = tuple(column.name for column in fields(IndexEntry))
+
+
+def read_entry(file: File) -> tuple[str, IndexEntry | None, str | None]:
+    """
+    Read the index entry of a file. Runs in worker processes.
+
+    Returns
+    -------
+    tuple[str, IndexEntry | None, str | None]
+        The absolute path of the file, and its entry or the error raised
+        while reading its metadata.
+    """
+    try:
+        return os.path.abspath(file.directory), IndexEntry.from_file(file), None
+    except METADATA_ERRORS as error:
+        return os.path.abspath(file.directory), None, f"{type(error).__name__}: {error}"
+
+
+def parse_filter(expression: str) -> tuple[str, str, float | str]:
+    """
+    Parse a filter such as "iso>=3200", "aperture<=2.8", "exposure<1/60",
+    "date>=2025-01-01" or "camera~PENTAX" (contains).
+
+    Parameters
+    ----------
+    expression : str
+        The filter: a field, an operator (<, <=, >, >=, =, != or ~) and a value.
+
+    Returns
+    -------
+    tuple[str, str, float | str]
+        The column, the operator and the value, parsed as a number for
+        numeric columns and as a timestamp for dates.
+    """
+    match = FILTER.match(expression)
+    if match is None:
+        raise ValueError(f"Invalid filter: {expression}. Expected <field><operator><value>, e.g. iso>=3200.")
+    name, operator, raw = match.groups()
+    column = FIELDS.get(name.lower())
+    if column is None:
+        raise ValueError(f"Invalid filter field: {name}. Available fields: {sorted(set(FIELDS))}")
+
+    if column in TEXT_COLUMNS:
+        if operator not in ("=", "!=", "~"):
+            raise ValueError(f"Invalid filter: {expression}. Text fields only support =, != and ~.")
+        return column, operator, raw
+    if operator == "~":
+        raise ValueError(f"Invalid filter: {expression}. ~ only applies to text fields.")
+
+    value = parse_date(raw) if column == "date_taken" else parse_ratio(raw)
+    if value is None:
+        raise ValueError(f"Invalid filter value: {raw} for {name}.")
+    return column, operator, value
+
+
+def parse_order(order: str) -> tuple[str, bool]:
+    """
+    Parse a sort order: a field, prefixed with "-" to sort in descending order.
+
+    Returns
+    -------
+    tuple[str, bool]
+        The column and whether the order is descending.
+    """
+    descending = order.startswith("-")
+    column = FIELDS.get(order.lstrip("-").lower())
+    if column is None:
+        raise ValueError(f"Invalid order: {order}. Available fields: {sorted(set(FIELDS))}")
+    return column, descending
+
+
+@dataclass
+class IndexUpdate:
+    """
+    The outcome of an incremental update of the index.
+
+    Attributes
+    ----------
+    added : int
+        The number of files indexed for the first time.
+    updated : int
+        The number of files indexed again because they changed.
+    unchanged : int
+        The number of files whose entry was still valid.
+    removed : int
+        The number of entries of files that no longer exist.
+    errors : list[tuple[str, str]]
+        The path and error of every file whose metadata could not be read.
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    errors: list[tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class MetadataIndex:
+    """
+    A persistent SQLite index of the photo metadata of a tree, with numeric
+    columns for exposure, aperture, ISO, focal length, exposure bias and date,
+    so that photos can be filtered and sorted without opening them.
+
+    Entries are keyed by the absolute path of the file and record its size
+    and modification time: updating the index only reads the metadata of new
+    and modified files, and drops the entries of deleted ones.
+
+    Attributes
+    ----------
+    path : str
+        The path of the SQLite database file.
+    batch_size : int
+        The number of entries written per transaction.
+    """
+
+    path: str
+    batch_size: int = 1_000
+
+    @classmethod
+    def in_directory(cls, directory: str, **kwargs) -> MetadataIndex:
+        """
+        Create an index stored in the given directory.
+        """
+        return cls(path=str(Path(directory) / INDEX_FILENAME), **kwargs)
+
+    @cached_property
+    def connection(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM photos").fetchone()[0]
+
+    def update(
+        self,
+        files: Iterable[File],
+        root: str | None = None,
+        mapper: Callable[[Callable, Iterable], Iterator] = map,
+    ) -> IndexUpdate:
+        """
+        Bring the index up to date with the given files.
+
+        Parameters
+        ----------
+        files : Iterable[File]
+            The files of the tree. It is consumed lazily.
+        root : str, optional
+            The root of the tree. Entries below it whose file was not given
+            are removed.
+        mapper : Callable, optional
+            The function applying `read_entry` to the new and modified files,
+            such as `Executor.map` to read them in parallel. Default is `map`.
+
+        Returns
+        -------
+        IndexUpdate
+            The number of entries added, updated, unchanged and removed.
+        """
+        outcome = IndexUpdate()
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.connection.execute("SELECT path, size, mtime_ns FROM photos")
+        }
+        seen = set()
+
+        def stale() -> Iterator[File]:
+            for file in files:
+                path, size, mtime_ns = MetadataCache.key(file)
+                seen.add(path)
+                if known.get(path) == (size, mtime_ns):
+                    outcome.unchanged += 1
+                    continue
+                yield file
+
+        entries, failed = [], []
+        for path, entry, error in mapper(read_entry, stale()):
+            if entry is None:
+                outcome.errors.append((path, error))
+                failed.append((path,))
+                continue
+            if path in known:
+                outcome.updated += 1
+            else:
+                outcome.added += 1
+            entries.append(astuple(entry))
+            if len(entries) >= self.batch_size:
+                self._write(entries, [])
+                entries = []
+
+        removed = []
+        if root is not None:
+            prefix = os.path.join(os.path.abspath(root), "")
+            removed = [(path,) for path in known if path.startswith(prefix) and path not in seen]
+            outcome.removed = len(removed)
+        self._write(entries, failed + removed)
+        return outcome
+
+    def query(self, where: Sequence[str] = (), order: str = "path", limit: int | None = None) -> list[IndexEntry]:
+        """
+        Select the entries matching every filter.
+
+        Parameters
+        ----------
+        where : Sequence[str], optional
+            The filters, see `parse_filter`. Photos missing a value never
+            match a filter on it.
+        order : str, optional
+            The field the entries are sorted by, prefixed with "-" for the
+            descending order (see `parse_order`). Missing values come last.
+            Default is "path".
+        limit : int, optional
+            The maximum number of entries returned.
+
+        Returns
+        -------
+        list[IndexEntry]
+            The matching entries.
+        """
+        conditions, parameters = [], []
+        for column, operator, value in map(parse_filter, where):
+            if operator == "~":
+                # "%" and "_" in the value match themselves, not any text.
+                conditions.append(f"{column} LIKE ? ESCAPE '\\'")
+                parameters.append("%" + LIKE_SPECIAL.sub(r"\\\1", value) + "%")
+            else:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+
+        column, descending = parse_order(order)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM photos"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        sql += f" ORDER BY {column} IS NULL, {column} {'DESC' if descending else 'ASC'}, path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [IndexEntry(*row) for row in self.connection.execute(sql, parameters)]
+
+    def entries(self, root: str | None = None) -> Iterator[IndexEntry]:
+        """
+        Yield the entries of the index, sorted by path.
+
+        Parameters
+        ----------
+        root : str, optional
+            If given, only the entries of the files below this directory.
+        """
+        sql, parameters = f"SELECT {', '.join(COLUMNS)} FROM photos", []
+        if root is not None:
+            prefix = os.path.join(os.path.abspath(root), "")
+            sql += " WHERE substr(path, 1, ?) = ?"
+            parameters = [len(prefix), prefix]
+        for row in self.connection.execute(f"{sql} ORDER BY path", parameters):
+            yield IndexEntry(*row)
+
+    def close(self) -> None:
+        """
+        Close the connection.
+        """
+        if "connection" in self.__dict__:
+            self.__dict__.pop("connection").close()
+
+    def _write(self, entries: list[tuple], deleted: list[tuple[str]]) -> None:
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany("DELETE FROM photos WHERE path = ?", deleted)
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO photos VALUES ({', '.join('?' * len(COLUMNS))})", entries
+            )
@@ -1,5 +1,76 @@
+import calendar
+from datetime import datetime, UTC
+from typing import Any
+
 from pydantic import BaseModel, field_validator
 
+
+def parse_ratio(value: str) -> float | None:
+    """
+    Parse a rational EXIF value as printed by `exifread` (e.g. "1/250",
+    "-1/3", "28/10" or "5.6"). The units appended by PhotoMetadata are
+    ignored: "1s250" is 1/250 and "5.6f" is 5.6.
+
+    Parameters
+    ----------
+    value : str
+        The value to parse.
+
+    Returns
+    -------
+    float | None
+        The value as a number, or None if it is empty or not a number.
+    """
+    value = value.strip().rstrip("f").replace("s", "/")
+    try:
+        if "/" in value:
+            numerator, denominator = value.split("/")
+            return float(numerator) / float(denominator)
+        return float(value)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+# The formats accepted for dates: EXIF first, then ISO 8601.
+DATE_FORMATS = ("%Y:%m:%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%Y:%m:%d")
+
+
+def parse_date(value: str) -> float | None:
+    """
+    Parse a date as written by cameras ("2025:08:15 10:45:42") or in ISO
+    format ("2025-08-15", "2025-08-15 10:45:42") into seconds since the epoch.
+    EXIF dates have no time zone: they are read as UTC, so that the same
+    date always gives the same number.
+
+    Parameters
+    ----------
+    value : str
+        The date to parse.
+
+    Returns
+    -------
+    float | None
+        The timestamp, or None if the date is empty or not valid.
+    """
+    value = value.strip()
+    if len(value) == 19 and value[10] in " T" and value[4] == value[7] and value[4] in ":-":
+        # Fast path for full dates, without the locale handling of strptime.
+        try:
+            date = datetime(
+                int(value[:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19]), tzinfo=UTC
+            )
+            return date.timestamp()
+        except ValueError:
+            return None
+    for date_format in DATE_FORMATS:
+        try:
+            return float(calendar.timegm(datetime.strptime(value, date_format).timetuple()))
+        except ValueError:
+            continue
+    return None
+
+
 class PhotoMetadata(BaseModel):
     """
     A class representing metadata for a photo.
@@ -36,6 +107,33 @@ class PhotoMetadata(BaseModel):
     description: str
     exposure_bias: str
 
+    @classmethod
+    def from_tags(cls, tags: dict[str, Any]) -> "PhotoMetadata":
+        """
+        Build the photo metadata from the EXIF tags read by `exifread`.
+
+        Parameters
+        ----------
+        tags : dict[str, Any]
+            The EXIF tags, keyed as "IFD_NAME TAG_NAME".
+
+        Returns
+        -------
+        PhotoMetadata
+            The photo metadata.
+        """
+        return cls(
+            camera_model=str(tags.get("Image Model", "")).rstrip(),
+            exposure_time=str(tags.get("EXIF ExposureTime", "")).rstrip(),
+            aperture=str(tags.get("EXIF FNumber", "")).rstrip(),
+            iso=str(tags.get("EXIF ISOSpeedRatings", "")).rstrip(),
+            focal_length=str(tags.get("EXIF FocalLength", "")).rstrip(),
+            date_taken=str(tags.get("EXIF DateTimeOriginal", "")).rstrip(),
+            location=f"{str(tags.get('GPS GPSLatitude', '')).rstrip()}{str(tags.get('GPS GPSLongitude', '')).rstrip()}",
+            description=str(tags.get("Image ImageDescription", "")).rstrip(),
+            exposure_bias=str(tags.get("EXIF ExposureBiasValue", "")).rstrip()
+        )
+
     @field_validator("exposure_time", mode="before")
     @classmethod
     def validate_exposure_time(cls, value):
@@ -0,0 +1,323 @@
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from src.metadata.dimensions import (
+    TIFF_BIG_ENDIAN,
+    TIFF_LITTLE_ENDIAN,
+    ImageHeader,
+    read_jpeg_header,
+)
+from src.metadata.exif import JPEG_SOI
+
+TIFF_COMPRESSION = 259
+TIFF_STRIP_OFFSETS = 273
+TIFF_STRIP_BYTE_COUNTS = 279
+TIFF_SUB_IFDS = 330
+TIFF_JPEG_OFFSET = 513
+TIFF_JPEG_LENGTH = 514
+TIFF_EXIF_IFD = 34665
+TIFF_GPS_IFD = 34853
+EXIF_MAKER_NOTE = 37500
+EXIF_INTEROP_IFD = 40965
+
+# Compression of strips holding a JPEG stream ("old-style" and DNG JPEG).
+TIFF_JPEG_COMPRESSIONS = (6, 7)
+
+# `struct` format of the integer TIFF types (BYTE, SHORT, LONG, UNDEFINED, IFD).
+TIFF_INTEGER_TYPES = {1: "B", 3: "H", 4: "I", 7: "B", 13: "I"}
+
+# Size in bytes of every TIFF type (BYTE, ASCII, SHORT, LONG, RATIONAL,
+# SBYTE, UNDEFINED, SSHORT, SLONG, SRATIONAL, FLOAT, DOUBLE, IFD).
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 13: 4}
+
+# Pentax MakerNotes: "AOC\0" (PEF files, offsets from the TIFF header) and
+# "PENTAX \0" (DNG files, offsets from the MakerNote), followed by the byte
+# order. PreviewImageLength and PreviewImageStart point to a JPEG preview.
+PENTAX_HEADERS = ((b"AOC\x00", 6, False), (b"PENTAX \x00", 10, True))
+PENTAX_PREVIEW_LENGTH = 0x0004
+PENTAX_PREVIEW_START = 0x0005
+
+# Bounds on the structures followed, so that a corrupt file cannot make the
+# parser read more than a few kilobytes.
+MAX_IFDS = 16
+MAX_ENTRIES = 1024
+
+# IFD0 tags kept in the EXIF of an image rendered from a RAW. The others
+# describe the layout of the RAW data (strips, tiles, sub-IFDs, CFA pattern...)
+# and would point at nothing in the JPEG.
+RAW_KEPT_IMAGE_TAGS = frozenset({
+    270,    # ImageDescription
+    271,    # Make
+    272,    # Model
+    274,    # Orientation
+    282,    # XResolution
+    283,    # YResolution
+    296,    # ResolutionUnit
+    305,    # Software
+    306,    # DateTime
+    315,    # Artist
+    33432,  # Copyright
+})
+
+
+@dataclass(frozen=True)
+class RawPreview:
+    """
+    The JPEG preview embedded in a RAW file by the camera, located from the
+    TIFF structure of the file.
+
+    Attributes
+    ----------
+    offset : int
+        The position of the JPEG stream in the file.
+    length : int
+        The length of the JPEG stream, in bytes.
+    header : ImageHeader
+        The dimensions of the preview.
+    """
+
+    offset: int
+    length: int
+    header: ImageHeader
+
+
+def read_ifd(fh: BinaryIO, offset: int, byte_order: str) -> tuple[dict[int, tuple[int, int, bytes]], int]:
+    """
+    Read the entries of an IFD and the offset of the next one.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The TIFF stream.
+    offset : int
+        The position of the IFD.
+    byte_order : str
+        The `struct` byte order of the stream ("<" or ">").
+
+    Returns
+    -------
+    tuple[dict[int, tuple[int, int, bytes]], int]
+        The type, count and raw 4-byte value of every tag, and the offset of
+        the next IFD (0 if it is the last one).
+    """
+    fh.seek(offset)
+    count_bytes = fh.read(2)
+    if len(count_bytes) < 2:
+        return {}, 0
+    (count,) = struct.unpack(f"{byte_order}H", count_bytes)
+    if count > MAX_ENTRIES:
+        return {}, 0
+
+    entries = fh.read(12 * count + 4)
+    tags = {}
+    for i in range(min(count, len(entries) // 12)):
+        tag, kind, values, value = struct.unpack(f"{byte_order}HHI4s", entries[12 * i:12 * i + 12])
+        tags[tag] = (kind, values, value)
+    next_offset = entries[12 * count:]
+    return tags, struct.unpack(f"{byte_order}I", next_offset)[0] if len(next_offset) == 4 else 0
+
+
+def tag_values(fh: BinaryIO, entry: tuple[int, int, bytes], byte_order: str) -> tuple[int, ...]:
+    """
+    Returns the values of an integer tag, reading them from their offset when
+    they do not fit in the entry. Other types, and tags with more than
+    `MAX_ENTRIES` values, return an empty tuple.
+    """
+    kind, count, value = entry
+    fmt = TIFF_INTEGER_TYPES.get(kind)
+    if fmt is None or count > MAX_ENTRIES:
+        return ()
+    size = struct.calcsize(fmt) * count
+    if size > 4:
+        fh.seek(struct.unpack(f"{byte_order}I", value)[0])
+        value = fh.read(size)
+        if len(value) < size:
+            return ()
+    return struct.unpack_from(f"{byte_order}{count}{fmt}", value)
+
+
+def single_value(fh: BinaryIO, tags: dict[int, tuple[int, int, bytes]], byte_order: str, tag: int) -> int | None:
+    """
+    Returns the value of an integer tag holding exactly one value, or None.
+    """
+    values = tag_values(fh, tags[tag], byte_order) if tag in tags else ()
+    return values[0] if len(values) == 1 else None
+
+
+def read_maker_note_previews(fh: BinaryIO, entry: tuple[int, int, bytes], byte_order: str) -> list[tuple[int, int]]:
+    """
+    Returns the JPEG preview of a Pentax MakerNote as an (offset, length)
+    candidate, or nothing for the MakerNotes of other makes.
+    """
+    _, _, value = entry
+    (start,) = struct.unpack(f"{byte_order}I", value)
+    fh.seek(start)
+    head = fh.read(12)
+    for signature, ifd_start, relative in PENTAX_HEADERS:
+        if not head.startswith(signature):
+            continue
+        order = head[len(signature):len(signature) + 2]
+        note_order = {b"II": "<", b"MM": ">"}.get(order, byte_order)
+        tags, _ = read_ifd(fh, start + ifd_start, note_order)
+        if PENTAX_PREVIEW_START not in tags or PENTAX_PREVIEW_LENGTH not in tags:
+            return []
+        offsets = tag_values(fh, tags[PENTAX_PREVIEW_START], note_order)
+        lengths = tag_values(fh, tags[PENTAX_PREVIEW_LENGTH], note_order)
+        if not offsets or not lengths:
+            return []
+        return [((start if relative else 0) + offsets[0], lengths[0])]
+    return []
+
+
+def find_raw_previews(fh: BinaryIO) -> list[tuple[int, int]]:
+    """
+    Returns the (offset, length) of every stream of a TIFF-based RAW file
+    that may hold a JPEG image: JPEGInterchangeFormat tags and single JPEG
+    strips of IFD0, the IFDs chained to it and their SubIFDs (CR2, NEF, DNG),
+    and the preview of Pentax MakerNotes (PEF). Only the IFDs are read.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The RAW stream, opened in binary mode.
+    """
+    fh.seek(0)
+    signature = fh.read(8)
+    if signature[:4] not in (TIFF_LITTLE_ENDIAN, TIFF_BIG_ENDIAN):
+        return []
+    byte_order = "<" if signature[:2] == b"II" else ">"
+
+    candidates = []
+    pending, visited = [struct.unpack(f"{byte_order}I", signature[4:8])[0]], set()
+    while pending and len(visited) < MAX_IFDS:
+        offset = pending.pop(0)
+        if not offset or offset in visited:
+            continue
+        visited.add(offset)
+        tags, next_offset = read_ifd(fh, offset, byte_order)
+        pending.append(next_offset)
+        if TIFF_SUB_IFDS in tags:
+            pending.extend(tag_values(fh, tags[TIFF_SUB_IFDS], byte_order))
+
+        value = {
+            tag: single_value(fh, tags, byte_order, tag)
+            for tag in (
+                TIFF_JPEG_OFFSET, TIFF_JPEG_LENGTH, TIFF_COMPRESSION,
+                TIFF_STRIP_OFFSETS, TIFF_STRIP_BYTE_COUNTS, TIFF_EXIF_IFD,
+            )
+        }
+        if value[TIFF_JPEG_OFFSET] and value[TIFF_JPEG_LENGTH]:
+            candidates.append((value[TIFF_JPEG_OFFSET], value[TIFF_JPEG_LENGTH]))
+        if value[TIFF_COMPRESSION] in TIFF_JPEG_COMPRESSIONS and value[TIFF_STRIP_OFFSETS] and value[TIFF_STRIP_BYTE_COUNTS]:
+            candidates.append((value[TIFF_STRIP_OFFSETS], value[TIFF_STRIP_BYTE_COUNTS]))
+        if (exif_offset := value[TIFF_EXIF_IFD]) and exif_offset not in visited:
+            visited.add(exif_offset)
+            exif_tags, _ = read_ifd(fh, exif_offset, byte_order)
+            if EXIF_MAKER_NOTE in exif_tags:
+                candidates.extend(read_maker_note_previews(fh, exif_tags[EXIF_MAKER_NOTE], byte_order))
+    return candidates
+
+
+def read_raw_preview(fh: BinaryIO) -> RawPreview | None:
+    """
+    Locate the largest JPEG preview embedded in a RAW file, without reading
+    the RAW data. Lossless JPEG streams (the sensor data of CR2 and DNG
+    files) are left out: only 8-bit JPEGs that OpenCV decodes are kept.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The RAW stream, opened in binary mode.
+
+    Returns
+    -------
+    RawPreview | None
+        The largest preview, or None if the file has none.
+    """
+    best = None
+    try:
+        for offset, length in find_raw_previews(fh):
+            fh.seek(offset)
+            if fh.read(2) != JPEG_SOI:
+                continue
+            header = read_jpeg_header(fh)
+            if header is None or header.bit_depth != 8 or header.channels not in (1, 3):
+                continue
+            if best is None or header.width * header.height > best.header.width * best.header.height:
+                best = RawPreview(offset=offset, length=length, header=header)
+    except (struct.error, OSError, ValueError):
+        return best
+    return best
+
+
+def exif_extent(fh: BinaryIO) -> int:
+    """
+    Returns the number of bytes at the start of a TIFF-based RAW file that
+    hold its EXIF: the IFDs parsed by `piexif.load` (IFD0 and IFD1, the EXIF,
+    GPS and Interoperability IFDs) and the values they point to. The
+    MakerNote, dropped by `raw_exif`, is left out, as are the preview and the
+    sensor data, which usually follow the EXIF.
+
+    Parameters
+    ----------
+    fh : BinaryIO
+        The RAW stream, opened in binary mode.
+
+    Returns
+    -------
+    int
+        The length of the prefix to read, or 0 if the file is not a TIFF.
+    """
+    fh.seek(0)
+    signature = fh.read(8)
+    if len(signature) < 8 or signature[:4] not in (TIFF_LITTLE_ENDIAN, TIFF_BIG_ENDIAN):
+        return 0
+    byte_order = "<" if signature[:2] == b"II" else ">"
+
+    extent = len(signature)
+    (first,) = struct.unpack(f"{byte_order}I", signature[4:8])
+    pending, visited = [(first, True)], set()
+    while pending and len(visited) < MAX_IFDS:
+        offset, is_first = pending.pop(0)
+        if not offset or offset in visited:
+            continue
+        visited.add(offset)
+        tags, next_offset = read_ifd(fh, offset, byte_order)
+        extent = max(extent, offset + 2 + 12 * len(tags) + 4)
+        if is_first:
+            pending.append((next_offset, False))
+        for tag in (TIFF_EXIF_IFD, TIFF_GPS_IFD, EXIF_INTEROP_IFD):
+            if (pointer := single_value(fh, tags, byte_order, tag)) is not None:
+                pending.append((pointer, False))
+
+        for tag, (kind, count, value) in tags.items():
+            size = TIFF_TYPE_SIZES.get(kind, 0) * count
+            if tag != EXIF_MAKER_NOTE and size > 4:
+                extent = max(extent, struct.unpack(f"{byte_order}I", value)[0] + size)
+    return extent
+
+
+def raw_exif(exif: dict) -> dict:
+    """
+    Keep the EXIF of a RAW file that still applies to an image rendered from
+    its preview: the settings and GPS position, and the IFD0 tags in
+    `RAW_KEPT_IMAGE_TAGS`. The thumbnail and the MakerNote, whose offsets
+    point inside the RAW file, are dropped.
+
+    Parameters
+    ----------
+    exif : dict
+        The EXIF of the RAW file, as returned by `piexif.load`.
+
+    Returns
+    -------
+    dict
+        The EXIF to be dumped into the rendered JPEG.
+    """
+    return {
+        "0th": {tag: value for tag, value in exif.get("0th", {}).items() if tag in RAW_KEPT_IMAGE_TAGS},
+        "Exif": {tag: value for tag, value in exif.get("Exif", {}).items() if tag != EXIF_MAKER_NOTE},
+        "GPS": exif.get("GPS", {}),
+        "Interop": exif.get("Interop", {}),
+    }
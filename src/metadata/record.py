@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import math
+import os
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any
+
+from src.metadata.exif import METADATA_ERRORS
+from src.metadata.photo import parse_date, parse_ratio
+
+if TYPE_CHECKING:
+    from src.data.file import File
+
+# The largest denominator of the exposure times written in file names:
+# exposures are stored as seconds and turned back into "1/8000"-like ratios.
+MAX_EXPOSURE_DENOMINATOR = 1_000_000
+
+
+def tag_number(tag: Any) -> float:
+    """
+    Returns the first value of an `exifread` tag as a number, or NaN if the
+    tag is missing or is not a number.
+
+    `Ratio` and integer values are used directly instead of being printed
+    and parsed again. Plain strings (e.g. "1/250") are parsed as well.
+    """
+    if tag is None:
+        return math.nan
+    values = getattr(tag, "values", None)
+    if type(values) is list and values:
+        # Ratios and integers both have a numerator and a denominator.
+        # exifread builds ratios without checking the denominator.
+        denominator = getattr(values[0], "denominator", None)
+        if denominator is not None:
+            return values[0].numerator / denominator if denominator else math.nan
+    number = parse_ratio(str(tag))
+    return math.nan if number is None else number
+
+
+@dataclass(slots=True)
+class PhotoRecord:
+    """
+    A compact, numeric alternative to PhotoMetadata: the settings of a photo
+    parsed once into numbers, without pydantic validation or per-field
+    strings. Missing values are NaN (0 for the ISO).
+
+    Attributes
+    ----------
+    camera_model : str
+        The model of the camera used to take the photo.
+    exposure_time : float
+        The exposure time, in seconds.
+    aperture : float
+        The f-number.
+    iso : int
+        The ISO speed rating.
+    focal_length : float
+        The focal length, in millimeters.
+    exposure_bias : float
+        The exposure bias, in EV.
+    timestamp : float
+        The date the photo was taken, in seconds since the epoch (see `parse_date`).
+    """
+
+    camera_model: str
+    exposure_time: float
+    aperture: float
+    iso: int
+    focal_length: float
+    exposure_bias: float
+    timestamp: float
+
+    @classmethod
+    def from_tags(cls, tags: dict[str, Any]) -> PhotoRecord:
+        """
+        Build the record from the EXIF tags read by `exifread`.
+
+        Parameters
+        ----------
+        tags : dict[str, Any]
+            The EXIF tags, keyed as "IFD_NAME TAG_NAME".
+
+        Returns
+        -------
+        PhotoRecord
+            The photo record.
+        """
+        iso = tag_number(tags.get("EXIF ISOSpeedRatings"))
+        timestamp = parse_date(str(tags.get("EXIF DateTimeOriginal", "")))
+        return cls(
+            camera_model=str(tags.get("Image Model", "")).rstrip(),
+            exposure_time=tag_number(tags.get("EXIF ExposureTime")),
+            aperture=tag_number(tags.get("EXIF FNumber")),
+            iso=0 if math.isnan(iso) else int(iso),
+            focal_length=tag_number(tags.get("EXIF FocalLength")),
+            exposure_bias=tag_number(tags.get("EXIF ExposureBiasValue")),
+            timestamp=math.nan if timestamp is None else timestamp,
+        )
+
+    def __str__(self) -> str:
+        """
+        Returns the same file name token as PhotoMetadata, e.g. "1s250-2.8f-100".
+        """
+        exposure = ""
+        if not math.isnan(self.exposure_time):
+            ratio = Fraction(self.exposure_time).limit_denominator(MAX_EXPOSURE_DENOMINATOR)
+            exposure = str(ratio).replace("/", "s")
+        aperture = ""
+        if not math.isnan(self.aperture):
+            aperture = str(int(self.aperture)) if self.aperture.is_integer() else str(round(self.aperture, 1))
+        iso = str(self.iso) if self.iso else ""
+        return f"{exposure}-{aperture}f-{iso}"
+
+
+def read_record(file: File) -> tuple[str, PhotoRecord | None, str | None]:
+    """
+    Read the photo record of a file. Runs in worker processes.
+
+    Returns
+    -------
+    tuple[str, PhotoRecord | None, str | None]
+        The absolute path of the file, and its record or the error raised
+        while reading its metadata.
+    """
+    try:
+        return os.path.abspath(file.directory), file.photo_record, None
+    except METADATA_ERRORS as error:
+        return os.path.abspath(file.directory), None, f"{type(error).__name__}: {error}"
+
+
+# The typecode of the array holding every numeric field of PhotoRecord.
+TYPECODES = {"exposure_time": "d", "aperture": "d", "iso": "l", "focal_length": "d", "exposure_bias": "d", "timestamp": "d"}
+
+
+class PhotoRecords:
+    """
+    A batch of photo records stored column by column: one `array` per numeric
+    field (8 bytes per photo and field) and interned camera models, instead
+    of one object per photo.
+
+    Columns can be handed to NumPy without a copy with `np.frombuffer`.
+    """
+
+    __slots__ = ("_interned", "camera_ids", "cameras", "columns")
+
+    def __init__(self, records: Iterable[PhotoRecord] = ()):
+        self.columns = {name: array(typecode) for name, typecode in TYPECODES.items()}
+        self.cameras: list[str] = []
+        self.camera_ids = array("H")
+        self._interned: dict[str, int] = {}
+        self.extend(records)
+
+    def append(self, record: PhotoRecord) -> None:
+        """
+        Add a record at the end of the batch.
+        """
+        for name, column in self.columns.items():
+            column.append(getattr(record, name))
+        camera = self._interned.get(record.camera_model)
+        if camera is None:
+            camera = self._interned[record.camera_model] = len(self.cameras)
+            self.cameras.append(record.camera_model)
+        self.camera_ids.append(camera)
+
+    def extend(self, records: Iterable[PhotoRecord]) -> None:
+        """
+        Add records at the end of the batch.
+        """
+        for record in records:
+            self.append(record)
+
+    def column(self, name: str) -> array:
+        """
+        Returns the values of a numeric field for every record, in order.
+        """
+        return self.columns[name]
+
+    def __len__(self) -> int:
+        return len(self.camera_ids)
+
+    def __getitem__(self, index: int) -> PhotoRecord:
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Record index out of range: {index}")
+        values = {name: column[index] for name, column in self.columns.items()}
+        return PhotoRecord(camera_model=self.cameras[self.camera_ids[index]], **values)
+
+    def __iter__(self) -> Iterator[PhotoRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
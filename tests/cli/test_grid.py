@@ -0,0 +1,46 @@
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+
+from src.cli.grid import check_grid_args, grid
+from src.common.enums import GridOrder
+
+
+class TestCLIGrid(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input_dir = Path(self.tmpdir) / "test_input"
+        (self.input_dir / "bracket").mkdir(parents=True)
+        for i in range(3):
+            cv2.imwrite(str(self.input_dir / "bracket" / f"photo_{i}.jpg"), np.full((60, 80, 3), 100, dtype=np.uint8))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_check_grid_args_all_valid(self):
+        check_grid_args(str(self.input_dir), "grid.png", 6, 320, GridOrder.EV, 4)
+        check_grid_args(str(self.input_dir), "grid.jpg", 1, 64, "date", 1)
+
+    def test_check_grid_args_invalid(self):
+        with self.assertRaises(FileNotFoundError):
+            check_grid_args(str(self.input_dir / "missing"), "grid.jpg", 6, 320, GridOrder.NAME, 4)
+        with self.assertRaises(ValueError):
+            check_grid_args(str(self.input_dir), "grid.gif", 6, 320, GridOrder.NAME, 4)
+        with self.assertRaises(ValueError):
+            check_grid_args(str(self.input_dir), "grid.jpg", 6, 320, "iso", 4)
+        for columns, tile_size, workers in ((0, 320, 4), (6, -1, 4), (6, 320, True), (6, "320", 4)):
+            with self.assertRaises(ValueError):
+                check_grid_args(str(self.input_dir), "grid.jpg", columns, tile_size, GridOrder.NAME, workers)
+
+    def test_grid(self):
+        output = Path(self.tmpdir) / "sheets" / "grid.png"
+        grid(str(self.input_dir), output=str(output), columns=2, tile_size=50, order="ev", workers=2)
+
+        sheet = cv2.imread(str(output))
+        self.assertEqual(sheet.shape, (2 * 50 + 3 * 8, 2 * 50 + 3 * 8, 3))
+        # The last cell is empty.
+        self.assertTrue((sheet[66:116, 66:116] == 32).all())
@@ -0,0 +1,81 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.cli.index import check_index_args, check_query_args, format_entry, index, index_location, query
+from src.metadata.index import INDEX_FILENAME, IndexEntry
+from tests.metadata.test_index import write_photo
+
+
+class TestCLIIndex(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input_dir = Path(self.tmpdir) / "test_input"
+        self.input_dir.mkdir()
+        write_photo(self.input_dir / "day.jpg", (1, 500), (80, 10), 100, "2025:08:15 10:45:42")
+        write_photo(self.input_dir / "night.jpg", (2, 1), (28, 10), 3200, "2025:08:15 22:10:00")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def run_command(self, command, *args, **kwargs) -> str:
+        output = StringIO()
+        with redirect_stdout(output):
+            command(*args, **kwargs)
+        return output.getvalue()
+
+    def test_check_index_args(self):
+        check_index_args(str(self.input_dir), 1, 4)
+        with self.assertRaises(FileNotFoundError):
+            check_index_args(str(self.input_dir / "missing"), 1, 1)
+        with self.assertRaises(ValueError):
+            check_index_args(str(self.input_dir), 0, 1)
+        with self.assertRaises(ValueError):
+            check_index_args(str(self.input_dir), 1, True)
+
+    def test_check_query_args(self):
+        index_path = str(self.input_dir / INDEX_FILENAME)
+        with self.assertRaises(FileNotFoundError):
+            check_query_args(index_path, [], "path", None)
+
+        Path(index_path).touch()
+        check_query_args(index_path, ["iso>=3200"], "-date", 10)
+        with self.assertRaises(ValueError):
+            check_query_args(index_path, ["iso>>3200"], "path", None)
+        with self.assertRaises(ValueError):
+            check_query_args(index_path, [], "shutter", None)
+        with self.assertRaises(ValueError):
+            check_query_args(index_path, [], "path", 0)
+
+    def test_index_location(self):
+        self.assertEqual(index_location(str(self.input_dir)), str(self.input_dir / INDEX_FILENAME))
+        self.assertEqual(index_location("photos.sqlite"), "photos.sqlite")
+
+    def test_index_and_query(self):
+        output = self.run_command(index, str(self.input_dir))
+        self.assertIn("2 added, 0 updated, 0 unchanged, 0 removed", output)
+        output = self.run_command(index, str(self.input_dir), workers=2)
+        self.assertIn("0 added, 0 updated, 2 unchanged, 0 removed", output)
+
+        output = self.run_command(query, str(self.input_dir), where="iso>=3200,aperture<=2.8", paths=True)
+        self.assertEqual(output.splitlines(), [str(self.input_dir / "night.jpg")])
+        output = self.run_command(query, str(self.input_dir / INDEX_FILENAME), where=["exposure<1"], order="-iso")
+        self.assertIn("1/500", output.splitlines()[0])
+        self.assertIn("🔎 1 photos matched", output)
+
+    def test_index_output(self):
+        index_path = str(Path(self.tmpdir) / "photos.sqlite")
+        self.run_command(index, str(self.input_dir), output=index_path)
+        self.assertFalse((self.input_dir / INDEX_FILENAME).exists())
+        output = self.run_command(query, index_path, order="-date", paths=True)
+        self.assertEqual(output.splitlines(), [str(self.input_dir / "night.jpg"), str(self.input_dir / "day.jpg")])
+
+    def test_format_entry(self):
+        entry = IndexEntry(
+            path="/photos/a.jpg", size=1, mtime_ns=1, camera_model="", exposure_time=2.0, aperture=2.8, iso=100,
+            focal_length=None, exposure_bias=-1 / 3, date_taken=0.0, token="2-2.8f-100"
+        )
+        self.assertEqual(format_entry(entry).split(), ["2s", "f/2.8", "ISO", "100", "-", "-0.3EV", "1970-01-01", "00:00:00", "/photos/a.jpg"])
@@ -1,11 +1,89 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
 from unittest import TestCase
 from unittest.mock import patch
+from src.cli.grid import grid
+from src.cli.index import index, query
 from src.cli.naming import naming
-from src.cli.main import main
+from src.cli.serve import serve
+from src.cli.stats import stats
+from src.cli.watch import watch
+from src.cli.main import COMMANDS, load_command, main
 
 class TestCLIMain(TestCase):
 
+    @patch("src.cli.main.fire.Fire")
+    def test_main_help(self, mock_fire):
+        with patch("sys.argv", ["main.py"]):
+            main()
+        mock_fire.assert_called_once_with({
+            "naming": naming, "grid": grid, "index": index, "query": query, "stats": stats, "watch": watch,
+            "serve": serve
+        })
+
     @patch("src.cli.main.fire.Fire")
     def test_main_naming(self, mock_fire):
-        main()
+        with patch("sys.argv", ["main.py", "naming", "photos/"]):
+            main()
         mock_fire.assert_called_once_with({"naming": naming})
+
+    @patch("src.cli.main.fire.Fire")
+    def test_main_unknown(self, mock_fire):
+        with patch("sys.argv", ["main.py", "nameing"]):
+            main()
+        self.assertEqual(set(mock_fire.call_args.args[0]), set(COMMANDS))
+
+    def test_load_command(self):
+        self.assertIs(load_command("query"), query)
+        with self.assertRaises(KeyError):
+            load_command("nameing")
+
+
+class TestCLIImports(TestCase):
+    """
+    Commands which only read metadata must not pay for the image and HTTP
+    libraries at startup.
+    """
+    ROOT = Path(__file__).resolve().parents[2]
+    PIXEL_MODULES = {"cv2", "PIL", "piexif", "numpy", "flask", "werkzeug"}
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def imports(self, *args: str) -> tuple[set[str], float]:
+        """
+        Run main.py with `-X importtime` and returns the top-level packages it
+        imported and their cumulative import time in milliseconds.
+        """
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "main.py", *args],
+            cwd=self.ROOT, capture_output=True, text=True, check=True, stdin=subprocess.DEVNULL
+        )
+        modules, total = set(), 0
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            modules.add(name.strip().split(".")[0])
+            if not name.startswith("  "):
+                total += int(cumulative)
+        return modules, total / 1000
+
+    def test_metadata_commands(self):
+        commands = [
+            ("naming", self.tmpdir, f"--output_dir={self.tmpdir}/out"),
+            ("index", self.tmpdir),
+            ("query", self.tmpdir),
+            ("watch", "--help"),
+        ]
+        for command in commands:
+            with self.subTest(command=command[0]):
+                modules, total = self.imports(*command)
+                loaded = modules & self.PIXEL_MODULES
+                self.assertFalse(loaded, f"{command[0]} imported {sorted(loaded)} ({total:.0f} ms of imports)")
@@ -1,9 +1,23 @@
 from pathlib import Path
+import resource
 import shutil
+import subprocess
+import sys
 import tempfile
 from unittest import TestCase
 from unittest.mock import patch
-from src.cli.naming import naming
+
+import cv2
+import numpy as np
+
+from src.cli.naming import (
+    build_metadata_cache, check_encoder_args, check_executor_args, check_group_args, check_memory_args, check_naming_args,
+    check_preview_args, naming
+)
+from src.common.enums import EncoderBackend, GroupLayout, NamingMode
+from src.core.namer import Namer
+from src.metadata.cache import CACHE_FILENAME
+from tests.metadata.test_index import write_photo
 
 class TestCLINaming(TestCase):
     def setUp(self):
@@ -30,9 +44,9 @@ class TestCLINaming(TestCase):
             output_dir=self.output_dir
         )
 
-        mock_check_args.assert_called_once_with(self.mode, self.input_dir)
+        mock_check_args.assert_called_once_with(self.mode, self.input_dir, 1, False)
         mock_show_info.assert_called_once_with(
-            self.input_dir, self.mode, self.in_image, self.output_dir
+            self.input_dir, self.mode, self.in_image, self.output_dir, 1
         )
         mock_run.assert_called_once()
 
@@ -71,3 +85,143 @@ class TestCLINaming(TestCase):
                 in_image=self.in_image,
                 output_dir=self.output_dir
             )
+
+    def test_check_naming_args_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            naming(
+                input_dir=self.input_dir,
+                mode=self.mode,
+                in_image=self.in_image,
+                output_dir=self.output_dir,
+                workers=0
+            )
+
+    def test_build_metadata_cache(self):
+        self.assertIsNone(build_metadata_cache(False, self.input_dir))
+        self.assertEqual(
+            build_metadata_cache(True, self.input_dir).path,
+            str(Path(self.input_dir) / CACHE_FILENAME)
+        )
+        custom_path = str(Path(self.tmpdir) / "cache.sqlite")
+        self.assertEqual(build_metadata_cache(custom_path, self.input_dir).path, custom_path)
+
+    def test_naming_with_cache(self):
+        (Path(self.input_dir) / "test_file.jpg").touch()
+        naming(
+            input_dir=self.input_dir,
+            mode=self.mode,
+            in_image=self.in_image,
+            output_dir=self.output_dir,
+            cache=True
+        )
+        self.assertTrue((Path(self.input_dir) / CACHE_FILENAME).exists())
+
+    def test_check_naming_args_incremental_replace(self):
+        with self.assertRaises(ValueError):
+            naming(
+                input_dir=self.input_dir,
+                mode="replace",
+                in_image=self.in_image,
+                output_dir=self.output_dir,
+                incremental=True
+            )
+
+    def test_check_naming_args_enum_mode(self):
+        check_naming_args(NamingMode.COPY, self.input_dir)
+        check_naming_args(NamingMode.LINK, self.input_dir, incremental=True)
+
+    def test_naming_link_mode(self):
+        (Path(self.input_dir) / "image.jpg").write_bytes(b"not an image")
+        naming(
+            input_dir=self.input_dir,
+            mode="link",
+            output_dir=self.output_dir
+        )
+        linked = list(Path(self.output_dir).glob("image_*.jpg"))
+        self.assertEqual(len(linked), 1)
+        self.assertEqual(linked[0].read_bytes(), b"not an image")
+
+    def test_check_encoder_args_invalid(self):
+        with self.assertRaises(ValueError):
+            check_encoder_args("invalid_encoder", 75)
+        with self.assertRaises(ValueError):
+            check_encoder_args("opencv", 101)
+        check_encoder_args("pillow", 90)
+        check_encoder_args(EncoderBackend.OPENCV, 75)
+
+    def test_check_executor_args(self):
+        check_executor_args("pipeline", 8, 2)
+        with self.assertRaises(ValueError):
+            check_executor_args("threads", 8, 2)
+        with self.assertRaises(ValueError):
+            check_executor_args("pipeline", 0, 2)
+        with self.assertRaises(ValueError):
+            check_executor_args("pipeline", 8, 0)
+
+    def test_check_memory_args(self):
+        self.assertIsNone(check_memory_args(None))
+        self.assertEqual(check_memory_args("4G"), 4 * 2**30)
+        self.assertEqual(check_memory_args(1024), 1024)
+        with self.assertRaises(ValueError):
+            check_memory_args("lots")
+        with self.assertRaises(ValueError):
+            check_memory_args(0)
+
+    def test_check_preview_args(self):
+        check_preview_args(None, "replace")
+        check_preview_args(1024, "copy")
+        for preview in (0, -1, "big", True):
+            with self.assertRaises(ValueError):
+                check_preview_args(preview, "copy")
+        with self.assertRaises(ValueError):
+            check_preview_args(1024, "replace")
+
+    def test_naming_preview(self):
+        image = np.random.default_rng(0).integers(0, 256, (600, 800, 3), dtype=np.uint8)
+        cv2.imwrite(str(Path(self.input_dir) / "image.jpg"), image)
+        naming(input_dir=self.input_dir, output_dir=self.output_dir, preview=200)
+
+        previews = list(Path(self.output_dir).glob("image_*.jpg"))
+        self.assertEqual(len(previews), 1)
+        self.assertEqual(cv2.imread(str(previews[0])).shape, (150, 200, 3))
+
+    def test_check_group_args(self):
+        check_group_args(None, 2.0)
+        check_group_args("folder", 0)
+        check_group_args("suffix", 5)
+        with self.assertRaises(ValueError):
+            check_group_args("album", 2.0)
+        for gap in (-1, "2s", True):
+            with self.assertRaises(ValueError):
+                check_group_args("folder", gap)
+
+    @patch("src.core.namer.Namer.run")
+    def test_naming_group(self, mock_run):
+        with patch("src.cli.naming.Namer", wraps=Namer) as mock_namer:
+            naming(input_dir=self.input_dir, output_dir=self.output_dir, group="suffix", group_gap=1)
+        self.assertEqual(mock_namer.call_args.kwargs["group"], GroupLayout.SUFFIX)
+        self.assertEqual(mock_namer.call_args.kwargs["group_gap"], 1)
+        mock_run.assert_called_once()
+
+    def test_naming_workers_within_fd_limit(self):
+        # Every job carries the journal to a worker: more files than the
+        # descriptor limit must not leave one descriptor open per file.
+        limit = 64
+        for i in range(3 * limit):
+            write_photo(Path(self.input_dir) / f"IMG{i:03d}.jpg", (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        process = subprocess.run(
+            [sys.executable, "main.py", "naming", self.input_dir, f"--output_dir={self.output_dir}", "--workers=2"],
+            cwd=Path(__file__).resolve().parents[2], capture_output=True, text=True, stdin=subprocess.DEVNULL,
+            preexec_fn=lambda: resource.setrlimit(resource.RLIMIT_NOFILE, (limit, limit)),
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertNotIn("Too many open files", process.stdout + process.stderr)
+        self.assertIn("Naming completed successfully", process.stdout)
+        self.assertEqual(len(list(Path(self.output_dir).glob("IMG*.jpg"))), 3 * limit)
+
+    @patch("src.cli.naming.show_execution_info")
+    @patch("builtins.print")
+    def test_naming_reports_errors(self, mock_print, _):
+        Path(self.input_dir, "broken.jpg").write_bytes(b"not an image")
+        naming(input_dir=self.input_dir, output_dir=self.output_dir, in_image=True)
+        self.assertIn("1 files not processed", mock_print.call_args.args[0])
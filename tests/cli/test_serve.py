@@ -0,0 +1,110 @@
+from io import BytesIO
+import json
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import requests
+
+from src.cli.serve import build_server, check_serve_args, create_app, serve
+from src.core.service import AnnotationService, ServiceBusy
+from tests.metadata.test_index import write_photo
+
+
+class TestCLIServe(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        path = Path(cls.tmpdir) / "photo.jpg"
+        write_photo(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        cls.data = path.read_bytes()
+        cls.service = AnnotationService(workers=1).start()
+        cls.client = create_app(cls.service).test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def test_check_serve_args(self):
+        check_serve_args(8765, 1, 8, 0.005, 64)
+        check_serve_args(0, 4, 1, 0, 1)
+        invalid = [
+            (70000, 1, 8, 0.005, 64), ("8765", 1, 8, 0.005, 64), (8765, 0, 8, 0.005, 64),
+            (8765, 1, 0, 0.005, 64), (8765, 1, 8, -1, 64), (8765, 1, 8, 0.005, True),
+        ]
+        for args in invalid:
+            with self.assertRaises(ValueError):
+                check_serve_args(*args)
+
+    def test_health(self):
+        response = self.client.get("/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["status"], "ok")
+        self.assertEqual(response.json["workers"], 1)
+
+    def test_metadata_multipart(self):
+        response = self.client.post("/metadata", data={"image": (BytesIO(self.data), "IMG001.jpg")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["name"], "IMG001_1s250-2.8f-800.jpg")
+        self.assertEqual(response.json["metadata"]["exposure_time"], "1s250")
+
+    def test_metadata_raw_body(self):
+        response = self.client.post("/metadata?filename=raw.jpg", data=self.data)
+        self.assertEqual(response.json["name"], "raw_1s250-2.8f-800.jpg")
+
+    def test_annotate(self):
+        response = self.client.post("/annotate?filename=IMG001.jpg&preview=8&quality=90", data=self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "image/jpeg")
+        self.assertEqual(response.headers["X-Kmera-Name"], "IMG001_1s250-2.8f-800.jpg")
+        self.assertEqual(json.loads(response.headers["X-Kmera-Metadata"])["iso"], "800")
+        image = cv2.imdecode(np.frombuffer(response.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(image.shape[:2], (8, 8))
+
+    def test_errors(self):
+        self.assertEqual(self.client.post("/metadata").status_code, 400)
+        self.assertEqual(self.client.post("/annotate?quality=0", data=self.data).status_code, 400)
+        self.assertEqual(self.client.post("/annotate?encoder=gimp", data=self.data).status_code, 400)
+        response = self.client.post("/annotate", data=b"not an image")
+        self.assertEqual(response.status_code, 422)
+        self.assertIn("error", response.json)
+
+    def test_busy(self):
+        with patch.object(self.service, "submit", side_effect=ServiceBusy("full")):
+            response = self.client.post("/metadata", data=self.data)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+    def test_timeout(self):
+        service = AnnotationService(workers=1)
+        # The service is never started: the request waits until the timeout.
+        response = create_app(service, timeout=0.05).test_client().post("/metadata", data=self.data)
+        self.assertEqual(response.status_code, 504)
+
+    def test_server(self):
+        server = build_server(self.service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            response = requests.post(
+                f"http://127.0.0.1:{server.server_port}/metadata", files={"image": ("a.jpg", self.data)}, timeout=10
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(response.json()["name"], "a_1s250-2.8f-800.jpg")
+
+    @patch("src.cli.serve.build_server")
+    def test_serve(self, mock_build_server):
+        mock_build_server.return_value.server_port = 8765
+        mock_build_server.return_value.serve_forever.side_effect = KeyboardInterrupt
+        serve(workers=1)
+        mock_build_server.return_value.server_close.assert_called_once()
+        with self.assertRaises(ValueError):
+            serve(port=-1)
@@ -0,0 +1,69 @@
+from contextlib import redirect_stdout
+from io import StringIO
+import json
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.cli.stats import check_stats_args, format_histogram, stats
+from src.common.enums import OutputFormat, StatsGroup
+from src.metadata.index import INDEX_FILENAME
+from tests.metadata.test_index import write_photo
+
+
+class TestCLIStats(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input_dir = Path(self.tmpdir) / "test_input"
+        (self.input_dir / "night").mkdir(parents=True)
+        write_photo(self.input_dir / "day.jpg", (1, 125), (160, 10), 100, "2025:08:15 10:45:42")
+        write_photo(self.input_dir / "night" / "1.jpg", (2, 1), (28, 10), 3200, "2025:08:15 22:10:00")
+        write_photo(self.input_dir / "night" / "2.jpg", (1, 1), (28, 10), 3200, "2025:08:15 22:11:00")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def run_stats(self, **kwargs) -> str:
+        output = StringIO()
+        with redirect_stdout(output):
+            stats(str(self.input_dir), **kwargs)
+        return output.getvalue()
+
+    def test_check_stats_args(self):
+        check_stats_args(str(self.input_dir), StatsGroup.SESSION, 30, OutputFormat.JSON, 2)
+        check_stats_args(str(self.input_dir), "folder", 0.5, "table", 1)
+        invalid = [
+            ("group", 30, "table", 1), ("folder", 0, "table", 1), ("folder", True, "table", 1),
+            ("folder", 30, "csv", 1), ("folder", 30, "table", 0),
+        ]
+        for by, session_gap, output_format, workers in invalid:
+            with self.assertRaises(ValueError):
+                check_stats_args(str(self.input_dir), by, session_gap, output_format, workers)
+        with self.assertRaises(FileNotFoundError):
+            check_stats_args(str(self.input_dir / "missing"), "folder", 30, "table", 1)
+
+    def test_stats_table(self):
+        output = self.run_stats()
+        self.assertIn(f"📁 {self.input_dir / 'night'} (2 photos)", output)
+        self.assertIn("ISO       3200: 2", output)
+        self.assertIn("📁 All photos (3 photos)", output)
+        self.assertIn("📊 3 photos summarised", output)
+
+    def test_stats_json_by_session(self):
+        report = json.loads(self.run_stats(by="session", format="json"))
+        self.assertEqual([group["photos"] for group in report["groups"]], [1, 2])
+        self.assertEqual(report["total"]["aperture"], {"f/2.8": 2, "f/16": 1})
+        self.assertEqual(report["total"]["ev100"]["histogram"], {"-3": 1, "-2": 1, "15": 1})
+
+    def test_stats_from_index(self):
+        output_path = Path(self.tmpdir) / "reports" / "stats.json"
+        self.run_stats(format="json", output=str(output_path), index=True, workers=2)
+        self.assertTrue((self.input_dir / INDEX_FILENAME).exists())
+        report = json.loads(output_path.read_text(encoding="utf-8"))
+        self.assertEqual(report["total"]["photos"], 3)
+        self.assertEqual(report, json.loads(self.run_stats(format="json")))
+
+    def test_format_histogram(self):
+        self.assertEqual(format_histogram({"100": 2, "200": 1}), "100: 2  200: 1")
+        self.assertEqual(format_histogram({}), "-")
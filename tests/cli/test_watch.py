@@ -0,0 +1,124 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.cli.watch import check_watch_args, watch
+from src.common.enums import WatchBackend
+from src.core.journal import JOURNAL_FILENAME
+from tests.metadata.test_index import write_photo
+from tests.metadata.test_raw import write_raw
+
+
+class TestCLIWatch(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input_dir = Path(self.tmpdir) / "ingest"
+        self.output_dir = Path(self.tmpdir) / "named"
+        self.input_dir.mkdir()
+        write_photo(self.input_dir / "old.jpg", (1, 125), (80, 10), 100, "2025:08:15 10:45:42")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def run_watch(self, **kwargs) -> str:
+        # The photo lands while the watch is running.
+        timer = threading.Timer(
+            0.3, write_photo, (self.input_dir / "new.jpg", (1, 250), (28, 10), 800, "2025:08:15 10:50:00")
+        )
+        output = StringIO()
+        timer.start()
+        with redirect_stdout(output):
+            watch(str(self.input_dir), settle=0.1, interval=0.1, duration=1.5, **kwargs)
+        timer.join()
+        return output.getvalue()
+
+    def test_check_watch_args(self):
+        check_watch_args(WatchBackend.POLLING, 0.5, 1, None)
+        check_watch_args("auto", 0, 0.2, 60)
+        invalid = [
+            ("fsevents", 0.5, 1, None), ("polling", -1, 1, None), ("polling", True, 1, None),
+            ("polling", 0.5, 0, None), ("polling", 0.5, "1s", None), ("polling", 0.5, 1, 0),
+        ]
+        for backend, settle, interval, duration in invalid:
+            with self.assertRaises(ValueError):
+                check_watch_args(backend, settle, interval, duration)
+
+    @patch("src.cli.watch.Inotify.available", return_value=False)
+    def test_check_watch_args_without_inotify(self, _):
+        with self.assertRaises(ValueError):
+            check_watch_args("inotify", 0.5, 1, None)
+        check_watch_args("auto", 0.5, 1, None)
+
+    def test_watch_copy(self):
+        output = self.run_watch(output_dir=str(self.output_dir), backend="polling")
+        self.assertEqual([path.name for path in self.output_dir.glob("*.jpg")], ["new_1s250-2.8f-800.jpg"])
+        self.assertTrue((self.output_dir / JOURNAL_FILENAME).exists())
+        self.assertIn("polling every 0.1s", output)
+        self.assertIn("Watch stopped after 1 files", output)
+
+    def test_watch_replace(self):
+        output = self.run_watch(mode="replace", workers=2)
+        self.assertEqual(
+            sorted(path.name for path in self.input_dir.glob("*.jpg")), ["new_1s250-2.8f-800.jpg", "old.jpg"]
+        )
+        # The renamed file is not picked up as a new photo.
+        self.assertIn("Watch stopped after 1 files", output)
+
+    def test_watch_replace_raw_in_image(self):
+        timer = threading.Timer(
+            0.3, write_raw, (self.input_dir / "IMGP0001.PEF", (1, 250), (28, 10), 800, "2025:08:15 10:50:00")
+        )
+        output = StringIO()
+        timer.start()
+        with redirect_stdout(output):
+            watch(
+                str(self.input_dir), mode="replace", in_image=True, backend="polling", settle=0.1, interval=0.1,
+                duration=1.5
+            )
+        timer.join()
+        self.assertEqual(
+            sorted(path.name for path in self.input_dir.glob("IMGP*")),
+            ["IMGP0001_1s250-2.8f-800.PEF", "IMGP0001_1s250-2.8f-800.jpg"]
+        )
+        # Neither the annotated preview nor the renamed RAW is picked up as a new photo.
+        self.assertIn("Watch stopped after 1 files", output.getvalue())
+
+    def test_watch_invalid_args(self):
+        with self.assertRaises(FileNotFoundError):
+            watch(str(Path(self.tmpdir) / "missing"), duration=1)
+        with self.assertRaises(ValueError):
+            watch(str(self.input_dir), settle=-1, duration=1)
+
+    def test_watch_workers_within_fd_limit(self):
+        # The worker pool lives as long as the watch, and every job carries the
+        # journal: naming more photos than the descriptor limit must not fail.
+        limit = 64
+        process = subprocess.Popen(
+            [
+                sys.executable, "main.py", "watch", str(self.input_dir), f"--output_dir={self.output_dir}",
+                "--workers=2", "--backend=polling", "--settle=0.1", "--interval=0.1", "--duration=6",
+            ],
+            cwd=Path(__file__).resolve().parents[2], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            stdin=subprocess.DEVNULL, preexec_fn=lambda: resource.setrlimit(resource.RLIMIT_NOFILE, (limit, limit)),
+        )
+        self.assertIn("Watching", process.stdout.readline())
+        for batch in range(3):
+            for i in range(limit):
+                write_photo(
+                    self.input_dir / f"IMG{batch}{i:03d}.jpg", (1, 250), (28, 10), 800, "2025:08:15 10:45:42"
+                )
+            time.sleep(0.5)
+        stdout, stderr = process.communicate(timeout=30)
+        self.assertEqual(process.returncode, 0, stderr)
+        self.assertNotIn("Too many open files", stdout + stderr)
+        self.assertIn(f"Watch stopped after {3 * limit} files", stdout)
+        self.assertEqual(len(list(self.output_dir.glob("IMG*.jpg"))), 3 * limit)
@@ -1,15 +1,92 @@
 from unittest import TestCase
-from src.common.enums import NamingMode
+from src.common.enums import (
+    EncoderBackend, ExecutorBackend, GridOrder, GroupKind, GroupLayout, NamingMode, OutputFormat, StatsGroup,
+    WatchBackend
+)
 
 class TestNamingMode(TestCase):
     def test_naming_mode(self):
         self.assertEqual(NamingMode.COPY, NamingMode("copy"))
         self.assertEqual(NamingMode.REPLACE, NamingMode("replace"))
+        self.assertEqual(NamingMode.LINK, NamingMode("link"))
 
     def test_naming_mode_values(self):
         self.assertIn("copy", NamingMode.choices())
         self.assertIn("replace", NamingMode.choices())
+        self.assertIn("link", NamingMode.choices())
 
     def test_naming_mode_str(self):
         self.assertEqual(str(NamingMode.COPY), "copy")
         self.assertEqual(str(NamingMode.REPLACE), "replace")
+
+
+class TestEncoderBackend(TestCase):
+    def test_encoder_backend(self):
+        self.assertEqual(EncoderBackend.OPENCV, EncoderBackend("opencv"))
+        self.assertEqual(EncoderBackend.PILLOW, EncoderBackend("pillow"))
+        self.assertEqual(EncoderBackend.STRIP, EncoderBackend("strip"))
+
+    def test_encoder_backend_values(self):
+        self.assertEqual(EncoderBackend.choices(), ["opencv", "pillow", "strip"])
+
+    def test_encoder_backend_str(self):
+        self.assertEqual(str(EncoderBackend.OPENCV), "opencv")
+
+
+class TestExecutorBackend(TestCase):
+    def test_executor_backend(self):
+        self.assertEqual(ExecutorBackend.POOL, ExecutorBackend("pool"))
+        self.assertEqual(ExecutorBackend.PIPELINE, ExecutorBackend("pipeline"))
+
+    def test_executor_backend_values(self):
+        self.assertEqual(ExecutorBackend.choices(), ["pool", "pipeline"])
+
+    def test_executor_backend_str(self):
+        self.assertEqual(str(ExecutorBackend.PIPELINE), "pipeline")
+
+
+class TestGridOrder(TestCase):
+    def test_grid_order(self):
+        self.assertEqual(GridOrder.EV, GridOrder("ev"))
+        self.assertEqual(GridOrder.EXPOSURE, GridOrder("exposure"))
+
+    def test_grid_order_values(self):
+        self.assertEqual(GridOrder.choices(), ["name", "date", "ev", "exposure"])
+
+    def test_grid_order_str(self):
+        self.assertEqual(str(GridOrder.DATE), "date")
+
+
+class TestStatsGroup(TestCase):
+    def test_stats_group(self):
+        self.assertEqual(StatsGroup.FOLDER, StatsGroup("folder"))
+        self.assertEqual(StatsGroup.choices(), ["folder", "session"])
+        self.assertEqual(str(StatsGroup.SESSION), "session")
+
+
+class TestOutputFormat(TestCase):
+    def test_output_format(self):
+        self.assertEqual(OutputFormat.JSON, OutputFormat("json"))
+        self.assertEqual(OutputFormat.choices(), ["table", "json"])
+        self.assertEqual(str(OutputFormat.TABLE), "table")
+
+
+class TestGroupLayout(TestCase):
+    def test_group_layout(self):
+        self.assertEqual(GroupLayout.SUFFIX, GroupLayout("suffix"))
+        self.assertEqual(GroupLayout.choices(), ["folder", "suffix"])
+        self.assertEqual(str(GroupLayout.FOLDER), "folder")
+
+
+class TestGroupKind(TestCase):
+    def test_group_kind(self):
+        self.assertEqual(GroupKind.BURST, GroupKind("burst"))
+        self.assertEqual(GroupKind.choices(), ["bracket", "burst"])
+        self.assertEqual(f"{GroupKind.BRACKET}_001", "bracket_001")
+
+
+class TestWatchBackend(TestCase):
+    def test_watch_backend(self):
+        self.assertEqual(WatchBackend.POLLING, WatchBackend("polling"))
+        self.assertEqual(WatchBackend.choices(), ["auto", "inotify", "polling"])
+        self.assertEqual(str(WatchBackend.INOTIFY), "inotify")
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+import tempfile
+from unittest import TestCase
+
+from src.common.profiling import (
+    JobProfile, Profiler, activate, count_read, count_written, percentile, stage
+)
+
+
+class TestProfiling(TestCase):
+    def test_hooks_disabled(self):
+        with stage("read"):
+            count_read(10)
+            count_written(10)
+
+    def test_hooks_record_active_profile(self):
+        profile = JobProfile()
+        with activate(profile):
+            with stage("read"):
+                count_read(10)
+            with stage("read"):
+                count_written(4)
+        with stage("write"):
+            count_written(100)
+
+        self.assertEqual(set(profile.stages), {"read"})
+        self.assertGreaterEqual(profile.stages["read"], 0)
+        self.assertEqual((profile.bytes_read, profile.bytes_written), (10, 4))
+
+    def test_percentile(self):
+        ordered = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(ordered, 0.5), 50)
+        self.assertEqual(percentile(ordered, 0.99), 99)
+        self.assertEqual(percentile([3.0], 0.9), 3)
+
+
+class TestProfiler(TestCase):
+    def setUp(self):
+        self.profiler = Profiler()
+        for ms in (1, 2, 3, 40):
+            self.profiler.merge(JobProfile(stages={"decode": ms / 1000}, bytes_read=100, bytes_written=50))
+        self.profiler.merge(None)
+        self.profiler.add("scan", 0.5)
+
+    def test_report(self):
+        report = self.profiler.report()
+        self.assertEqual(report["files"], 4)
+        self.assertEqual((report["bytes_read"], report["bytes_written"]), (400, 200))
+        self.assertIn("self", report["peak_rss_bytes"])
+
+        decode = report["stages"]["decode"]
+        self.assertEqual(decode["count"], 4)
+        self.assertEqual(decode["p50_ms"], 2)
+        self.assertEqual(decode["max_ms"], 40)
+        self.assertEqual(decode["histogram_ms"], {"<=1": 1, "<=2.5": 1, "<=5": 1, "<=50": 1})
+        self.assertEqual(report["stages"]["scan"], {"count": 1, "total_s": 0.5})
+
+    def test_table(self):
+        table = self.profiler.table()
+        self.assertIn("decode", table)
+        self.assertIn("scan", table)
+        self.assertIn("4 files", table)
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "reports" / "profile.json"
+            self.profiler.write(str(path))
+            self.assertEqual(json.loads(path.read_text())["files"], 4)
@@ -0,0 +1,58 @@
+import threading
+import time
+from unittest import TestCase
+
+from src.core.budget import MemoryBudget, format_size, parse_size
+
+
+class TestBudget(TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size(1024), 1024)
+        self.assertEqual(parse_size("1024"), 1024)
+        self.assertEqual(parse_size("512M"), 512 * 2**20)
+        self.assertEqual(parse_size("4G"), 4 * 2**30)
+        self.assertEqual(parse_size("1.5GiB"), 3 * 2**29)
+        self.assertEqual(parse_size("2kb"), 2048)
+        for invalid in ["", "G", "4X", "-1G", "four"]:
+            with self.assertRaises(ValueError):
+                parse_size(invalid)
+
+    def test_format_size(self):
+        self.assertEqual(format_size(512), "512 B")
+        self.assertEqual(format_size(3 * 2**29), "1.5 GiB")
+
+    def test_admits_within_limit(self):
+        budget = MemoryBudget(limit=100)
+        self.assertTrue(budget.acquire(60))
+        self.assertTrue(budget.fits(40))
+        self.assertFalse(budget.fits(41))
+        self.assertFalse(budget.acquire(41, timeout=0.01))
+        budget.release(60)
+        self.assertTrue(budget.acquire(41, timeout=0.01))
+        self.assertEqual((budget.used, budget.peak), (41, 60))
+
+    def test_oversized_job_runs_alone(self):
+        budget = MemoryBudget(limit=100)
+        self.assertTrue(budget.acquire(500))
+        self.assertFalse(budget.fits(1))
+        budget.release(500)
+        self.assertTrue(budget.fits(500))
+
+    def test_release_wakes_up_waiting_threads(self):
+        budget = MemoryBudget(limit=100)
+        budget.acquire(100)
+        admitted = threading.Event()
+        thread = threading.Thread(target=lambda: budget.acquire(50) and admitted.set())
+        thread.start()
+        time.sleep(0.05)
+        self.assertFalse(admitted.is_set())
+        budget.release(100)
+        thread.join(timeout=1)
+        self.assertTrue(admitted.is_set())
+
+    def test_reset(self):
+        budget = MemoryBudget(limit=100)
+        budget.acquire(70)
+        budget.reset()
+        self.assertEqual((budget.used, budget.peak), (0, 0))
+        self.assertIn("100 B", budget.summary())
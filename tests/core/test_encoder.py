@@ -0,0 +1,62 @@
+from io import BytesIO
+from unittest import TestCase
+
+import cv2
+import exifread
+import numpy as np
+import piexif
+
+from src.common.enums import EncoderBackend
+from src.core.encoder import encode_jpeg, splice_exif
+
+
+class TestEncoder(TestCase):
+    def setUp(self):
+        self.image = np.random.default_rng(0).integers(0, 256, (64, 96, 3), dtype=np.uint8)
+        self.exif = piexif.dump({
+            "0th": {piexif.ImageIFD.Model: b"PENTAX K-50"},
+            "Exif": {piexif.ExifIFD.ISOSpeedRatings: 200},
+        })
+
+    def test_encode_jpeg_backends(self):
+        for backend in EncoderBackend:
+            jpeg = encode_jpeg(self.image, self.exif, backend, quality=90)
+            tags = exifread.process_file(BytesIO(jpeg))
+            self.assertEqual(str(tags["Image Model"]), "PENTAX K-50")
+            self.assertEqual(str(tags["EXIF ISOSpeedRatings"]), "200")
+
+            decoded = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            self.assertEqual(decoded.shape, self.image.shape)
+
+    def test_encode_jpeg_opencv_keeps_pixels(self):
+        jpeg = encode_jpeg(self.image, self.exif, EncoderBackend.OPENCV, quality=90)
+        _, expected = cv2.imencode(".jpg", self.image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        np.testing.assert_array_equal(
+            cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR),
+            cv2.imdecode(expected, cv2.IMREAD_COLOR),
+        )
+
+    def test_splice_exif_after_jfif(self):
+        _, encoded = cv2.imencode(".jpg", self.image)
+        jpeg = splice_exif(encoded.tobytes(), self.exif)
+        self.assertEqual(jpeg[2:4], b"\xff\xe0")
+        app1 = 4 + int.from_bytes(jpeg[4:6], "big")
+        self.assertEqual(jpeg[app1:app1 + 2], b"\xff\xe1")
+        self.assertEqual(jpeg[app1 + 4:app1 + 10], b"Exif\x00\x00")
+
+    def test_splice_exif_replaces_existing_segment(self):
+        _, encoded = cv2.imencode(".jpg", self.image)
+        jpeg = splice_exif(splice_exif(encoded.tobytes(), self.exif), self.exif)
+        self.assertEqual(jpeg.count(b"Exif\x00\x00"), 1)
+        self.assertEqual(len(jpeg), len(encoded.tobytes()) + len(self.exif) + 4)
+
+    def test_splice_exif_empty(self):
+        _, encoded = cv2.imencode(".jpg", self.image)
+        self.assertEqual(splice_exif(encoded.tobytes(), b""), encoded.tobytes())
+
+    def test_splice_exif_errors(self):
+        with self.assertRaises(ValueError):
+            splice_exif(b"not a jpeg", self.exif)
+        _, encoded = cv2.imencode(".jpg", self.image)
+        with self.assertRaises(ValueError):
+            splice_exif(encoded.tobytes(), b"Exif\x00\x00" + b"\x00" * 0xFFFF)
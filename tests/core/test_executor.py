@@ -0,0 +1,179 @@
+import threading
+import time
+from unittest import TestCase
+
+from src.core.budget import MemoryBudget
+from src.core.executor import Executor, PipelineExecutor
+from src.core.job import Job, JobResult
+from src.common.enums import NamingMode
+from src.data.file import File
+
+
+def fake_process(job: Job) -> JobResult:
+    return JobResult(source=job.file.directory, destination=job.dest_dir)
+
+
+def fake_read(job: Job) -> Job:
+    return Job(file=job.file, dest_dir="/read", mode=job.mode, in_image=job.in_image)
+
+
+class TestExecutor(TestCase):
+    def setUp(self):
+        self.jobs = [
+            Job(
+                file=File(name=f"file_{i}.jpg", size=0, directory=f"/input/file_{i}.jpg"),
+                dest_dir="/output",
+                mode=NamingMode.COPY,
+                in_image=False,
+            )
+            for i in range(20)
+        ]
+
+    def test_map_inline(self):
+        results = list(Executor(workers=1).map(fake_process, self.jobs))
+        self.assertEqual([result.source for result in results], [job.file.directory for job in self.jobs])
+
+    def test_map_pool_keeps_order(self):
+        results = list(Executor(workers=3, backlog=2).map(fake_process, self.jobs))
+        self.assertEqual([result.source for result in results], [job.file.directory for job in self.jobs])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_map_shares_pool_within_context(self):
+        with Executor(workers=2) as executor:
+            pool = executor.pool
+            for jobs in (self.jobs[:5], self.jobs[5:]):
+                results = list(executor.map(fake_process, jobs))
+                self.assertEqual([result.source for result in results], [job.file.directory for job in jobs])
+            self.assertIs(executor.pool, pool)
+        self.assertIsNone(executor.pool)
+        with Executor(workers=1) as executor:
+            self.assertIsNone(executor.pool)
+
+    def test_map_consumes_jobs_lazily(self):
+        consumed = []
+
+        def jobs():
+            for job in self.jobs:
+                consumed.append(job)
+                yield job
+
+        results = Executor(workers=1).map(fake_process, jobs())
+        next(results)
+        self.assertEqual(len(consumed), 1)
+
+    def test_run_pool_chains_stages(self):
+        stages = (fake_read, fake_process)
+        results = list(Executor(workers=2, backlog=1).run(stages, self.jobs))
+        self.assertEqual([result.destination for result in results], ["/read"] * len(self.jobs))
+
+    def test_pipeline_keeps_order(self):
+        def slow_read(job):
+            # Later jobs finish first, so results must be reordered.
+            time.sleep(0.001 * (20 - int(job.file.name[5:-4])))
+            return job
+
+        executor = PipelineExecutor(readers=4, workers=3, writers=2, depth=2)
+        results = list(executor.run((slow_read, fake_read, fake_process), self.jobs))
+        self.assertEqual([result.source for result in results], [job.file.directory for job in self.jobs])
+        self.assertEqual(len(executor.peaks), 4)
+        self.assertTrue(all(peak <= 2 for peak in executor.peaks))
+
+    def test_pipeline_bounds_jobs_in_flight(self):
+        consumed = []
+
+        def jobs():
+            for job in self.jobs:
+                consumed.append(job)
+                yield job
+
+        executor = PipelineExecutor(readers=1, workers=1, writers=1, depth=1)
+        results = executor.run((fake_process,), jobs())
+        next(results)
+        time.sleep(0.2)
+        self.assertLess(len(consumed), len(self.jobs))
+        results.close()
+
+    def test_pipeline_propagates_errors(self):
+        def broken(job):
+            raise RuntimeError("broken stage")
+
+        with self.assertRaises(RuntimeError):
+            list(PipelineExecutor().run((broken, fake_process), self.jobs))
+
+    def test_pipeline_stops_threads_when_closed(self):
+        before = threading.active_count()
+        results = PipelineExecutor(depth=1).run((fake_read, fake_process), self.jobs)
+        next(results)
+        results.close()
+        self.assertEqual(threading.active_count(), before)
+
+    def image_jobs(self, sizes):
+        # The files do not exist, so their memory is estimated from their size.
+        return [
+            Job(
+                file=File(name=f"file_{i}.jpg", size=size, directory=f"/input/file_{i}.jpg"),
+                dest_dir="/output",
+                mode=NamingMode.COPY,
+                in_image=True,
+            )
+            for i, size in enumerate(sizes)
+        ]
+
+    def test_job_memory(self):
+        self.assertEqual(self.jobs[0].memory, 0)
+        self.assertEqual(self.image_jobs([100])[0].memory, 100 * 12)
+
+    def test_map_pool_waits_for_memory_budget(self):
+        jobs = self.image_jobs([1] * 10)
+        consumed = []
+
+        def stream():
+            for job in jobs:
+                consumed.append(job)
+                yield job
+
+        budget = MemoryBudget(limit=2 * jobs[0].memory)
+        results = Executor(workers=2, backlog=100, budget=budget).map(fake_process, stream())
+        next(results)
+        self.assertLessEqual(len(consumed), 3)
+        self.assertEqual(len(list(results)), 9)
+        self.assertEqual((budget.used, budget.peak), (0, 2 * jobs[0].memory))
+
+    def test_pipeline_runs_large_jobs_alone(self):
+        jobs = self.image_jobs([1, 1, 1, 1, 20, 1, 1, 1])
+        lock, active, overlaps = threading.Lock(), {}, []
+
+        def enter(job):
+            with lock:
+                active[job.file.name] = job.memory
+                overlaps.append(dict(active))
+            time.sleep(0.01)
+            return job
+
+        def leave(job):
+            with lock:
+                del active[job.file.name]
+            return fake_process(job)
+
+        budget = MemoryBudget(limit=4 * jobs[0].memory)
+        executor = PipelineExecutor(readers=4, workers=4, writers=4, depth=8, budget=budget)
+        results = list(executor.run((enter, leave), jobs))
+        self.assertEqual([result.source for result in results], [job.file.directory for job in jobs])
+        self.assertTrue(all(sum(snapshot.values()) <= budget.limit or len(snapshot) == 1 for snapshot in overlaps))
+        self.assertEqual(budget.peak, jobs[4].memory)
+        self.assertEqual(budget.used, 0)
+        self.assertIn("memory budget", executor.summary())
+
+    def test_pipeline_releases_budget_of_failed_jobs(self):
+        def broken(job):
+            raise RuntimeError("broken stage")
+
+        for stages in ((broken, fake_process), (fake_read, broken)):
+            budget = MemoryBudget(limit=10 * self.image_jobs([1])[0].memory)
+            with self.assertRaises(RuntimeError):
+                list(PipelineExecutor(budget=budget).run(stages, self.image_jobs([1])))
+            self.assertEqual(budget.used, 0)
+
+    def test_summary(self):
+        self.assertIn("3 worker", Executor(workers=3).summary())
+        self.assertIn("queue depth 4", PipelineExecutor(depth=4).summary())
@@ -0,0 +1,97 @@
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+import piexif
+
+from src.common.enums import GridOrder
+from src.core.grid import ContactSheet, sort_key
+from src.data.file import File
+from src.metadata.photo import PhotoMetadata
+
+
+def metadata(**values) -> PhotoMetadata:
+    fields = dict.fromkeys(PhotoMetadata.model_fields, "")
+    return PhotoMetadata(**{**fields, **values})
+
+
+class TestGrid(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.files = []
+        for i, (height, width) in enumerate([(300, 400), (400, 300), (100, 100)]):
+            path = Path(self.tmpdir) / f"photo_{i}.jpg"
+            cv2.imwrite(str(path), np.full((height, width, 3), 50 * (i + 1), dtype=np.uint8))
+            self.files.append(File(name=path.name, size=path.stat().st_size, directory=str(path)))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_layout(self):
+        sheet = ContactSheet(columns=2, tile_size=100, gap=10)
+        self.assertEqual(sheet.shape(3), (230, 230, 3))
+        self.assertEqual(sheet.shape(1), (120, 120, 3))
+        self.assertEqual(sheet.cell(0), (10, 10))
+        self.assertEqual(sheet.cell(3), (120, 120))
+
+    def test_build(self):
+        sheet = ContactSheet(columns=2, tile_size=100, gap=10, background=0)
+        canvas, errors = sheet.build(self.files)
+        self.assertEqual(errors, [])
+        self.assertEqual(canvas.shape, (230, 230, 3))
+        # Tiles are centered in their cell: the 4:3 photo fills its width,
+        # the 3:4 one its height, and the margins keep the background.
+        self.assertEqual(canvas[22, 20].tolist(), [50, 50, 50])
+        self.assertEqual(canvas[21, 20].tolist(), [0, 0, 0])
+        self.assertEqual(canvas[12, 160].tolist(), [100, 100, 100])
+        self.assertEqual(canvas[12, 130].tolist(), [0, 0, 0])
+        # Every tile is annotated.
+        self.assertTrue((canvas[120:220, 10:110] == 255).any())
+
+    def test_build_reports_unreadable_files(self):
+        broken = Path(self.tmpdir) / "broken.jpg"
+        broken.write_bytes(b"not an image")
+        files = [*self.files, File(name=broken.name, size=12, directory=str(broken))]
+        canvas, errors = ContactSheet(columns=2, tile_size=100, gap=10, background=0).build(files)
+        self.assertEqual(errors, [(str(broken), "Could not decode the image.")])
+        self.assertFalse(canvas[120:220, 120:220].any())
+
+    def test_render_tile_releases_file(self):
+        tile = ContactSheet(tile_size=64).render_tile(self.files[0])
+        self.assertEqual(tile.shape, (48, 64, 3))
+        self.assertFalse(self.files[0].is_loaded)
+
+    def test_sort_key(self):
+        values = [
+            metadata(exposure_bias="1/3", exposure_time="1s250", date_taken="2024:01:02 10:00:00"),
+            metadata(exposure_bias="-1", exposure_time="2", date_taken=""),
+            metadata(exposure_bias="", exposure_time="1s4000", date_taken="2024:01:01 10:00:00"),
+        ]
+        for file, value in zip(self.files, values):
+            file.__dict__["photo_metadata"] = value
+        names = {order: [file.name for file in sorted(self.files, key=sort_key(order))] for order in GridOrder}
+        self.assertEqual(names[GridOrder.NAME], ["photo_0.jpg", "photo_1.jpg", "photo_2.jpg"])
+        self.assertEqual(names[GridOrder.EV], ["photo_1.jpg", "photo_0.jpg", "photo_2.jpg"])
+        self.assertEqual(names[GridOrder.EXPOSURE], ["photo_2.jpg", "photo_0.jpg", "photo_1.jpg"])
+        self.assertEqual(names[GridOrder.DATE], ["photo_2.jpg", "photo_0.jpg", "photo_1.jpg"])
+
+    def test_sort_key_unreadable_metadata(self):
+        corrupt = Path(self.tmpdir) / "a_corrupt.jpg"
+        cv2.imwrite(str(corrupt), np.zeros((10, 10, 3), dtype=np.uint8))
+        piexif.insert(piexif.dump({"Exif": {piexif.ExifIFD.FNumber: (0, 0)}}), str(corrupt))
+        missing = Path(self.tmpdir) / "a_missing.jpg"
+        for file in self.files:
+            file.__dict__["photo_metadata"] = metadata(
+                exposure_bias="0", exposure_time="1s250", date_taken="2024:01:01 10:00:00"
+            )
+        files = [File(name=path.name, size=0, directory=str(path)) for path in (corrupt, missing)] + self.files
+        for order in (GridOrder.DATE, GridOrder.EV, GridOrder.EXPOSURE):
+            names = [file.name for file in sorted(files, key=sort_key(order))]
+            self.assertEqual(names[-2:], ["a_corrupt.jpg", "a_missing.jpg"])
+
+        # Their tiles are reported as failed.
+        _, errors = ContactSheet(columns=2, tile_size=100).build(sorted(files, key=sort_key(GridOrder.EV)))
+        self.assertEqual([source for source, _ in errors], [str(corrupt), str(missing)])
@@ -0,0 +1,166 @@
+import math
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import piexif
+
+from src.common.enums import GroupKind, GroupLayout
+from src.core.grouping import GroupedTree, find_groups, group_names, read_metadata
+from src.core.processor import Processor
+from src.data.file import File
+from src.data.folder import Folder
+from src.data.scanner import Scanner
+
+
+def write_frame(path: Path, date: str, bias: tuple[int, int]) -> None:
+    cv2.imwrite(str(path), np.zeros((16, 16, 3), dtype=np.uint8))
+    piexif.insert(piexif.dump({
+        "Exif": {
+            piexif.ExifIFD.ExposureTime: (1, 125),
+            piexif.ExifIFD.FNumber: (8, 1),
+            piexif.ExifIFD.ISOSpeedRatings: 100,
+            piexif.ExifIFD.ExposureBiasValue: bias,
+            piexif.ExifIFD.DateTimeOriginal: date.encode(),
+        },
+    }), str(path))
+
+
+class TestFindGroups(TestCase):
+    def groups(self, timestamps, biases, directories=None, **kwargs):
+        directories = np.zeros(len(timestamps), dtype=np.int64) if directories is None else np.array(directories)
+        groups = find_groups(np.array(timestamps, dtype=float), np.array(biases, dtype=float), directories, **kwargs)
+        return [(kind, indices.tolist()) for kind, indices in groups]
+
+    def test_empty(self):
+        self.assertEqual(self.groups([], []), [])
+
+    def test_bracket(self):
+        self.assertEqual(
+            self.groups([10, 10, 11, 100], [0, -1, 1, 0]),
+            [(GroupKind.BRACKET, [0, 1, 2])]
+        )
+
+    def test_burst(self):
+        self.assertEqual(
+            self.groups([10, 11, 11, 12, 50], [0, 0, 0, math.nan, 0]),
+            [(GroupKind.BURST, [0, 1, 2, 3])]
+        )
+
+    def test_back_to_back_brackets(self):
+        self.assertEqual(
+            self.groups([1, 1, 2, 3, 3, 4, 5], [0, -1, 1, 0, -1, 1, 0]),
+            [(GroupKind.BRACKET, [0, 1, 2]), (GroupKind.BRACKET, [3, 4, 5])]
+        )
+
+    def test_sorts_by_date(self):
+        self.assertEqual(
+            self.groups([12, 500, 10, 11], [1, 0, 0, -1]),
+            [(GroupKind.BRACKET, [2, 3, 0])]
+        )
+
+    def test_gap(self):
+        self.assertEqual(self.groups([0, 3, 6], [0, 0, 0]), [])
+        self.assertEqual(self.groups([0, 3, 6], [0, 0, 0], gap=3), [(GroupKind.BURST, [0, 1, 2])])
+
+    def test_directories_and_undated_photos(self):
+        self.assertEqual(self.groups([0, 1, math.nan, 5], [0, 0, 0, 0], directories=[0, 1, 0, 0]), [])
+        self.assertEqual(
+            self.groups([0, 1, 1, 0], [0, 0, 0, 0], directories=[1, 0, 1, 0]),
+            [(GroupKind.BURST, [3, 1]), (GroupKind.BURST, [0, 2])]
+        )
+
+    def test_min_size(self):
+        self.assertEqual(self.groups([0, 1, 2, 3], [0, 1, 0, 1], min_size=3), [])
+        self.assertEqual(self.groups([0, 1, 2], [0, 1, 2], min_size=3), [(GroupKind.BRACKET, [0, 1, 2])])
+
+
+class TestGroupNames(TestCase):
+    def setUp(self):
+        self.paths = ["/a/1.jpg", "/a/2.jpg", "/a/3.jpg", "/a/4.jpg", "/b/5.jpg", "/b/6.jpg"]
+        self.groups = [
+            (GroupKind.BRACKET, np.array([1, 0])),
+            (GroupKind.BRACKET, np.array([2, 3])),
+            (GroupKind.BURST, np.array([4, 5])),
+        ]
+
+    def test_folder_layout(self):
+        names = group_names(self.groups, self.paths, GroupLayout.FOLDER)
+        self.assertEqual(names["/a/2.jpg"], ("bracket_001", ""))
+        self.assertEqual(names["/a/4.jpg"], ("bracket_002", ""))
+        self.assertEqual(names["/b/6.jpg"], ("burst_001", ""))
+
+    def test_suffix_layout(self):
+        names = group_names(self.groups, self.paths, GroupLayout.SUFFIX)
+        self.assertEqual(names["/a/2.jpg"], ("", "bracket001-1"))
+        self.assertEqual(names["/a/1.jpg"], ("", "bracket001-2"))
+        self.assertEqual(names["/a/3.jpg"], ("", "bracket002-1"))
+        self.assertEqual(names["/b/5.jpg"], ("", "burst001-1"))
+        self.assertEqual(len(names), 6)
+
+
+class TestGroupedTree(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input_dir = Path(self.tmpdir) / "input"
+        self.output_dir = Path(self.tmpdir) / "output"
+        self.input_dir.mkdir()
+        write_frame(self.input_dir / "a.jpg", "2025:08:15 10:00:00", (0, 1))
+        write_frame(self.input_dir / "b.jpg", "2025:08:15 10:00:01", (-1, 1))
+        write_frame(self.input_dir / "c.jpg", "2025:08:15 10:00:01", (1, 1))
+        write_frame(self.input_dir / "d.jpg", "2025:08:15 11:00:00", (0, 1))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_build(self):
+        tree = GroupedTree.build(Scanner(str(self.input_dir)))
+        self.assertEqual(len(tree.files), 4)
+        self.assertEqual(len(tree.groups), 1)
+        kind, indices = tree.groups[0]
+        self.assertEqual(kind, GroupKind.BRACKET)
+        self.assertEqual(sorted(tree.files[index].name for index in indices), ["a.jpg", "b.jpg", "c.jpg"])
+        # Metadata is read once and kept on the files.
+        self.assertIn("photo_metadata", tree.files[indices[0]].__dict__)
+
+    def test_copy_into_group_folders(self):
+        tree = GroupedTree.build(Folder(directory=str(self.input_dir)))
+        results = Processor.copy_naming_metadata(
+            tree, self.input_dir, self.output_dir, in_image=False, groups=tree.names(GroupLayout.FOLDER)
+        )
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(list((self.output_dir / "bracket_001").glob("*.jpg"))), 3)
+        self.assertEqual(len(list(self.output_dir.glob("d_*.jpg"))), 1)
+
+    def test_copy_with_suffixes(self):
+        tree = GroupedTree.build(Folder(directory=str(self.input_dir)))
+        Processor.copy_naming_metadata(
+            tree, self.input_dir, self.output_dir, in_image=False, groups=tree.names(GroupLayout.SUFFIX)
+        )
+        names = sorted(path.name for path in self.output_dir.glob("*.jpg"))
+        self.assertEqual(len(names), 4)
+        self.assertTrue(names[0].startswith("a_") and names[0].endswith("_bracket001-1.jpg"))
+        self.assertTrue(names[2].startswith("c_") and names[2].endswith("_bracket001-3.jpg"))
+        self.assertNotIn("bracket", names[3])
+
+    def test_replace_into_group_folders(self):
+        tree = GroupedTree.build(Folder(directory=str(self.input_dir)))
+        Processor.replace_naming_metadata(tree, in_image=False, groups=tree.names(GroupLayout.FOLDER))
+        self.assertEqual(len(list((self.input_dir / "bracket_001").glob("*.jpg"))), 3)
+        self.assertEqual(len(list(self.input_dir.glob("*.jpg"))), 1)
+
+    def test_read_metadata_errors(self):
+        zero = self.input_dir / "zero.jpg"
+        write_frame(zero, "2025:01:01 10:00:00", (0, 1))
+        piexif.insert(piexif.dump({"Exif": {piexif.ExifIFD.FNumber: (0, 0)}}), str(zero))
+        for path in (self.input_dir / "missing.jpg", zero):
+            self.assertIsNone(read_metadata(File(name=path.name, size=0, directory=str(path))))
+
+        # Anything else is a bug and is not hidden.
+        file = File(name="a.jpg", size=0, directory=str(self.input_dir / "a.jpg"))
+        with patch("src.data.file.read_exif_tags", side_effect=TypeError("bug")), self.assertRaises(TypeError):
+            read_metadata(file)
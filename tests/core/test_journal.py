@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+import pickle
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.core.journal import JOURNAL_FILENAME, Journal
+
+
+class TestJournal(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.journal = Journal.in_directory(self.tmpdir)
+        self.source = str(Path(self.tmpdir) / "a.jpg")
+        self.destination = str(Path(self.tmpdir) / "a_1s250-2.8f-100.jpg")
+
+    def tearDown(self):
+        self.journal.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_in_directory(self):
+        self.assertEqual(self.journal.path, str(Path(self.tmpdir) / JOURNAL_FILENAME))
+
+    def test_empty_state(self):
+        state = self.journal.state()
+        self.assertEqual(state.latest, {})
+        self.assertFalse(state.is_done(self.source, 0))
+
+    def test_done_entry(self):
+        self.journal.record("started", self.source, self.destination, 10)
+        self.journal.record("done", self.source, self.destination, 10)
+        state = self.journal.state()
+        self.assertEqual(state.latest[self.source].status, "done")
+
+        # The destination must still exist for the entry to count.
+        self.assertFalse(state.is_done(self.source, 10))
+        Path(self.destination).touch()
+        self.assertTrue(state.is_done(self.source, 10))
+        self.assertFalse(state.is_done(self.source, 11))
+
+    def test_started_entry(self):
+        self.journal.record("started", self.source, self.destination, 10)
+        Path(self.destination).touch()
+        state = self.journal.state()
+        self.assertFalse(state.is_done(self.source, 10))
+        self.assertTrue(state.is_done(self.destination, 10))
+
+    def test_truncated_line_is_ignored(self):
+        self.journal.record("done", self.source, self.destination)
+        self.journal.close()
+        with open(self.journal.path, "a", encoding="utf-8") as f:
+            f.write('{"status": "done", "sou')
+        self.assertEqual(len(self.journal.state().latest), 1)
+
+    def test_relative_paths_are_made_absolute(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir)
+        try:
+            self.journal.record("done", "a.jpg", "a_1s250-2.8f-100.jpg")
+        finally:
+            os.chdir(cwd)
+        self.assertIn(self.source, self.journal.state().latest)
+
+    def test_reset(self):
+        self.journal.record("done", self.source, self.destination)
+        self.journal.reset()
+        self.assertFalse(Path(self.journal.path).exists())
+        self.journal.record("done", self.source, self.destination)
+        self.assertEqual(len(self.journal.state().latest), 1)
+
+    def test_pickle_without_fd(self):
+        self.journal.record("done", self.source, self.destination)
+        restored = pickle.loads(pickle.dumps(self.journal))
+        self.assertNotIn("fd", restored.__dict__)
+        restored.record("done", self.destination, self.source)
+        # A copy sent to a worker never keeps a descriptor open.
+        self.assertNotIn("fd", restored.__dict__)
+        self.assertEqual(len(self.journal.state().latest), 2)
+
+    def test_pickled_copies_do_not_leak_fds(self):
+        fds = len(os.listdir("/proc/self/fd"))
+        for i in range(50):
+            pickle.loads(pickle.dumps(self.journal)).record("done", f"{i}.jpg", f"{i}_1s250-2.8f-100.jpg")
+        self.assertEqual(len(os.listdir("/proc/self/fd")), fds)
+        self.assertEqual(len(self.journal.state().latest), 50)
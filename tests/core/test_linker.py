@@ -0,0 +1,53 @@
+import errno
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.core.linker import link_file
+
+
+class TestLinker(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.src_file = Path(self.tmpdir) / "source.jpg"
+        self.dst_file = Path(self.tmpdir) / "linked.jpg"
+        self.src_file.write_bytes(b"image bytes")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_link_file(self):
+        method = link_file(self.src_file, self.dst_file)
+        self.assertIn(method, ("reflink", "hardlink", "copy"))
+        self.assertEqual(self.dst_file.read_bytes(), b"image bytes")
+        self.assertFalse(self.dst_file.with_name("linked.jpg.tmp").exists())
+
+    @patch("src.core.linker.reflink", side_effect=OSError(errno.EOPNOTSUPP, "not supported"))
+    def test_link_file_hardlink(self, _):
+        self.assertEqual(link_file(self.src_file, self.dst_file), "hardlink")
+        self.assertTrue(os.path.samefile(self.src_file, self.dst_file))
+
+    @patch("src.core.linker.os.link", side_effect=OSError(errno.EXDEV, "cross-device link"))
+    @patch("src.core.linker.reflink", side_effect=OSError(errno.EXDEV, "cross-device link"))
+    def test_link_file_copy_across_devices(self, *_):
+        self.assertEqual(link_file(self.src_file, self.dst_file), "copy")
+        self.assertEqual(self.dst_file.read_bytes(), b"image bytes")
+        self.assertFalse(os.path.samefile(self.src_file, self.dst_file))
+
+    @patch("src.core.linker.reflink", side_effect=OSError(errno.EOPNOTSUPP, "not supported"))
+    def test_link_file_replaces_destination(self, _):
+        self.dst_file.write_bytes(b"old bytes")
+        link_file(self.src_file, self.dst_file)
+        self.assertEqual(self.dst_file.read_bytes(), b"image bytes")
+
+        # Linking again over an existing hardlink of the source is a no-op.
+        self.assertEqual(link_file(self.src_file, self.dst_file), "hardlink")
+        self.assertEqual(sorted(path.name for path in Path(self.tmpdir).iterdir()), ["linked.jpg", "source.jpg"])
+
+    @patch("src.core.linker.reflink", side_effect=OSError(errno.ENOSPC, "no space left"))
+    def test_link_file_unexpected_error(self, _):
+        with self.assertRaises(OSError):
+            link_file(self.src_file, self.dst_file)
@@ -1,11 +1,17 @@
+import json
 from pathlib import Path
 import shutil
 import tempfile
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 from src.data.file import File
+from src.core.grouping import GroupedTree
 from src.core.namer import Namer
-from src.common.enums import NamingMode
+from src.core.job import JobResult
+from src.core.journal import JOURNAL_FILENAME, Journal
+from src.common.enums import EncoderBackend, ExecutorBackend, GroupLayout, NamingMode
+from src.common.profiling import PROFILE_FILENAME
+from src.core.executor import Executor, PipelineExecutor
 from src.data.folder import Folder
 
 class TestNamer(TestCase):
@@ -29,20 +35,123 @@ class TestNamer(TestCase):
             folder=self.folder, output_dir=self.output_dir
         )
         mock_copy_naming_metadata.assert_called_once_with(
-            self.folder, Path(self.input_dir), Path(self.output_dir), in_image=self.in_image
+            self.folder, Path(self.input_dir), Path(self.output_dir),
+            in_image=self.in_image, workers=1, resume=False,
+            executor=ANY, profiler=None, journal=ANY, incremental=False, encoder=EncoderBackend.OPENCV, quality=75,
+            preview=0
         )
         self.assertIsInstance(namer, Namer)
 
+    @patch("src.core.namer.Processor.copy_naming_metadata")
+    def test_run_copy_mode_with_groups(self, mock_copy_naming_metadata):
+        Namer(mode=NamingMode.COPY, in_image=self.in_image, group=GroupLayout.FOLDER).run(
+            folder=self.folder, output_dir=self.output_dir
+        )
+        tree = mock_copy_naming_metadata.call_args.args[0]
+        self.assertIsInstance(tree, GroupedTree)
+        self.assertEqual(tree.directory, self.input_dir)
+        self.assertEqual(mock_copy_naming_metadata.call_args.kwargs["groups"], {})
+
     @patch("src.core.namer.Processor.replace_naming_metadata")
     def test_run_replace_mode(self, mock_replace_naming_metadata):
         namer = Namer(mode=NamingMode.REPLACE, in_image=self.in_image).run(
             folder=self.folder, output_dir=self.output_dir
         )
-        mock_replace_naming_metadata.assert_called_once_with(self.folder, in_image=self.in_image)
+        mock_replace_naming_metadata.assert_called_once_with(
+            self.folder, in_image=self.in_image, workers=1, resume=False,
+            executor=ANY, profiler=None, journal=ANY, encoder=EncoderBackend.OPENCV, quality=75
+        )
         self.assertIsInstance(namer, Namer)
         
+    @patch("src.core.namer.Processor.link_naming_metadata")
+    def test_run_link_mode(self, mock_link_naming_metadata):
+        namer = Namer(mode=NamingMode.LINK, in_image=self.in_image, incremental=True).run(
+            folder=self.folder, output_dir=self.output_dir
+        )
+        mock_link_naming_metadata.assert_called_once_with(
+            self.folder, Path(self.input_dir), Path(self.output_dir),
+            in_image=self.in_image, workers=1, resume=False,
+            executor=ANY, profiler=None, journal=ANY, incremental=True, encoder=EncoderBackend.OPENCV, quality=75
+        )
+        self.assertIsInstance(namer, Namer)
+
+    def test_build_executor(self):
+        self.assertEqual(Namer(mode=NamingMode.COPY, in_image=False, workers=3).build_executor(), Executor(workers=3))
+        executor = Namer(
+            mode=NamingMode.COPY, in_image=True, workers=3,
+            executor=ExecutorBackend.PIPELINE, queue_depth=4, io_threads=1
+        ).build_executor()
+        self.assertIsInstance(executor, PipelineExecutor)
+        self.assertEqual((executor.readers, executor.workers, executor.writers, executor.depth), (1, 3, 1, 4))
+        self.assertIsNone(executor.budget)
+
+    def test_build_executor_with_memory_budget(self):
+        for backend in (ExecutorBackend.POOL, ExecutorBackend.PIPELINE):
+            executor = Namer(
+                mode=NamingMode.COPY, in_image=True, workers=2, executor=backend, max_memory=2**30
+            ).build_executor()
+            self.assertEqual(executor.budget.limit, 2**30)
+
+    @patch("builtins.print")
+    def test_run_reports_executor(self, mock_print):
+        Namer(mode=NamingMode.COPY, in_image=False, executor=ExecutorBackend.PIPELINE, queue_depth=3).run(
+            folder=self.folder, output_dir=self.output_dir
+        )
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        self.assertTrue(any("queue depth 3" in line for line in printed))
+
+    @patch("builtins.print")
+    def test_run_with_profile(self, mock_print):
+        Path(self.input_dir, "image.jpg").write_bytes(b"not an image")
+        Namer(mode=NamingMode.COPY, in_image=False, profile=True).run(
+            folder=Folder(directory=self.input_dir), output_dir=self.output_dir
+        )
+        report = json.loads((Path(self.output_dir) / PROFILE_FILENAME).read_text())
+        self.assertEqual(report["files"], 1)
+        self.assertEqual(report["stages"]["copy"]["count"], 1)
+        self.assertEqual(report["bytes_written"], len(b"not an image"))
+
+        custom = str(Path(self.tmpdir) / "profile.json")
+        Namer(mode=NamingMode.COPY, in_image=False, profile=custom).run(
+            folder=Folder(directory=self.input_dir), output_dir=self.output_dir
+        )
+        self.assertTrue(Path(custom).exists())
+
     def test_run_invalid_mode(self):
         with self.assertRaises(ValueError):
             Namer(mode="invalid_mode", in_image=self.in_image).run(
                 folder=self.folder, output_dir=self.output_dir
             )
+
+    @patch("builtins.print")
+    def test_report_errors(self, mock_print):
+        Namer.report([
+            JobResult(source="a.jpg", destination="a_1s250-2.8f-100.jpg"),
+            JobResult(source="b.jpg", error="ValueError: broken"),
+        ])
+        self.assertEqual(mock_print.call_count, 2)
+        self.assertIn("1 of 2", mock_print.call_args_list[0].args[0])
+        self.assertIn("b.jpg", mock_print.call_args_list[1].args[0])
+
+    @patch("builtins.print")
+    def test_report_skipped(self, mock_print):
+        Namer.report([
+            JobResult(source="a.jpg", skipped=True),
+            JobResult(source="b.jpg", destination="b_1s250-2.8f-100.jpg"),
+        ])
+        mock_print.assert_called_once()
+        self.assertIn("1 of 2", mock_print.call_args.args[0])
+
+    def test_open_journal(self):
+        Journal.in_directory(self.output_dir).record("done", "a.jpg", "b.jpg")
+        journal = Namer(mode=NamingMode.COPY, in_image=False, resume=True).open_journal(self.output_dir)
+        self.assertEqual(journal.path, str(Path(self.output_dir) / JOURNAL_FILENAME))
+        self.assertEqual(len(journal.state().latest), 1)
+
+        journal = Namer(mode=NamingMode.COPY, in_image=False).open_journal(self.output_dir)
+        self.assertEqual(len(journal.state().latest), 0)
+
+    @patch("builtins.print")
+    def test_report_no_errors(self, mock_print):
+        Namer.report([JobResult(source="a.jpg", destination="a_1s250-2.8f-100.jpg")])
+        mock_print.assert_not_called()
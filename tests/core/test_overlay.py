@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import numpy as np
+
+from src.core.overlay import draw_overlay, overlay_layout
+
+LINES = ("Exposure: 1/250", "Aperture: 5.6f", "ISO: 200", "EV: 0")
+
+
+class TestOverlay(TestCase):
+    def setUp(self):
+        overlay_layout.cache_clear()
+
+    def test_overlay_layout_is_cached(self):
+        first = overlay_layout(1920, LINES)
+        self.assertIs(overlay_layout(1920, LINES), first)
+        self.assertIsNot(overlay_layout(1920, LINES[:3]), first)
+        self.assertIsNot(overlay_layout(4000, LINES), first)
+        info = overlay_layout.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 3))
+
+    def test_overlay_layout_geometry(self):
+        layout = overlay_layout(1920, LINES)
+        left, top, right, bottom = layout.box
+        x, y = layout.origin
+        height, width = layout.size
+        self.assertTrue(0 <= x < left < right < x + width)
+        self.assertTrue(0 <= y < top < bottom < y + height)
+        self.assertEqual((x + width - 1 - right, y + height - 1 - bottom), (layout.border_thickness,) * 2)
+        # Every line starts inside the box, one below the other.
+        self.assertEqual(len(layout.positions), len(LINES))
+        for (line_x, line_y), (next_x, next_y) in zip(layout.positions, layout.positions[1:]):
+            self.assertEqual(line_x, next_x)
+            self.assertLess(line_y, next_y)
+        self.assertTrue(left < x + layout.positions[0][0] < right)
+        self.assertTrue(top < y + layout.positions[-1][1] < bottom)
+
+    def test_draw_overlay(self):
+        image = np.full((1280, 1920, 3), 200, dtype=np.uint8)
+        draw_overlay(image, list(LINES))
+        left, top, right, bottom = overlay_layout(1920, LINES).box
+
+        self.assertEqual(image[top + 5, left + 5].tolist(), [100, 100, 100])
+        self.assertEqual(image[top, (left + right) // 2].tolist(), [255, 255, 255])
+        self.assertEqual(image[bottom + 20, right + 20].tolist(), [200, 200, 200])
+        self.assertTrue((image[top:bottom, left:right] == 255).any())
+
+    def test_draw_overlay_clips_to_small_images(self):
+        for height, width in [(10, 10), (30, 200), (200, 30)]:
+            image = np.zeros((height, width, 3), dtype=np.uint8)
+            draw_overlay(image, list(LINES))
+            self.assertEqual(image.shape, (height, width, 3))
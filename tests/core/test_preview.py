@@ -0,0 +1,40 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from src.core.preview import decode_preview, reduction
+from src.metadata.dimensions import ImageHeader
+
+
+class TestPreview(TestCase):
+    def setUp(self):
+        self.image = np.random.default_rng(0).integers(0, 256, (1200, 1600, 3), dtype=np.uint8)
+        self.header = ImageHeader(width=1600, height=1200)
+
+    def test_reduction(self):
+        self.assertEqual(reduction(self.header, 200), 8)
+        self.assertEqual(reduction(self.header, 201), 4)
+        self.assertEqual(reduction(self.header, 800), 2)
+        self.assertEqual(reduction(self.header, 1024), 1)
+        self.assertEqual(reduction(None, 200), 1)
+
+    def test_decode_preview_jpeg_uses_reduced_decoding(self):
+        data = cv2.imencode(".jpg", self.image)[1].tobytes()
+        with patch("src.core.preview.cv2.imdecode", wraps=cv2.imdecode) as mock_imdecode:
+            preview = decode_preview(data, 300, self.header)
+        self.assertEqual(mock_imdecode.call_args.args[1], cv2.IMREAD_REDUCED_COLOR_4)
+        self.assertEqual(preview.shape, (225, 300, 3))
+
+    def test_decode_preview_other_formats(self):
+        data = cv2.imencode(".png", self.image)[1].tobytes()
+        self.assertEqual(decode_preview(data, 300, self.header).shape, (225, 300, 3))
+        self.assertEqual(decode_preview(data, 300).shape, (225, 300, 3))
+
+    def test_decode_preview_never_upscales(self):
+        data = cv2.imencode(".jpg", self.image)[1].tobytes()
+        self.assertEqual(decode_preview(data, 4000, self.header).shape, self.image.shape)
+
+    def test_decode_preview_invalid(self):
+        self.assertIsNone(decode_preview(b"not an image", 300))
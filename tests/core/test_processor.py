@@ -6,10 +6,19 @@ from unittest.mock import patch
 
 import cv2
 import numpy as np
+from PIL import Image
+import piexif
 
 from src.data.file import File
 from src.data.folder import Folder
+from src.data.scanner import Scanner
+from src.common.profiling import Profiler
+from src.core.executor import Executor, PipelineExecutor
 from src.core.processor import Processor
+from src.core.job import Job
+from src.core.journal import Journal
+from src.common.enums import EncoderBackend, NamingMode
+from tests.metadata.test_raw import write_raw
 
 class TestProcessor(TestCase):
     def setUp(self):
@@ -43,10 +52,9 @@ class TestProcessor(TestCase):
             Path(dst_file).with_name("replaced_" + Path(dst_file).name).touch()
             shutil.rmtree(Path(dst_file))
 
-    @patch.object(Processor, "add_metadata_inside_image")
+    @patch.object(Processor, "render_metadata", return_value=b"jpeg")
     @patch("src.core.processor.shutil.move")
     def test_copy_naming_metadata_with_in_image_true(self, mock_move, mock_add_metadata):
-        mock_add_metadata.side_effect = None
         mock_move.side_effect = self.fake_copy(
             str(self.file_copy_path)
         )
@@ -75,7 +83,7 @@ class TestProcessor(TestCase):
         self.assertTrue(self.file_copy_path.exists())
         self.assertTrue(self.file_copy_path.is_file())
 
-    @patch.object(Processor, "add_metadata_inside_image")
+    @patch.object(Processor, "render_metadata", return_value=b"jpeg")
     @patch.object(File, "__str__", return_value="replaced_test_file1.jpg")
     def test_replace_naming_metadata_with_in_image_true(self, mock_str, mock_add_metadata):
         Processor.replace_naming_metadata(
@@ -89,6 +97,7 @@ class TestProcessor(TestCase):
         replaced_file_path = Path(self.input_dir) / "subfolder_1" / "replaced_test_file1.jpg"
         self.assertTrue(replaced_file_path.exists())
         self.assertTrue(replaced_file_path.is_file())
+        self.assertEqual(replaced_file_path.read_bytes(), b"jpeg")
 
     def test_add_metadata_inside_image_correct_image(
         self
@@ -111,6 +120,23 @@ class TestProcessor(TestCase):
         self.assertTrue(self.file_copy_path.is_file())
         self.assertTrue(self.file_copy_path.stat().st_size > 0)
 
+    def test_render_metadata_strip_encoder(self):
+        pixels = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(self.file_path, "JPEG", restart_marker_rows=1)
+        image_file = File(name=self.file_path.name, directory=str(self.file_path), size=0)
+        source = self.file_path.read_bytes()
+
+        patched = Processor.render_metadata(image_file, EncoderBackend.STRIP)
+        self.assertNotEqual(patched, source)
+        self.assertTrue(patched.endswith(source[-len(source) // 2:]))
+
+        # Without restart markers the image is fully encoded again.
+        cv2.imwrite(str(self.file_path), pixels)
+        image_file.release()
+        encoded = Processor.render_metadata(image_file, EncoderBackend.STRIP)
+        decoded = cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(decoded.shape, pixels.shape)
+
     def test_add_metadata_inside_image_non_image_file(self):
         non_image_file = File(
             name="test_file.txt",
@@ -119,6 +145,303 @@ class TestProcessor(TestCase):
         )
         Path(non_image_file.directory).touch()
 
-        Processor.add_metadata_inside_image(non_image_file, str(self.file_copy_path))
+        with self.assertRaises(ValueError):
+            Processor.add_metadata_inside_image(non_image_file, str(self.file_copy_path))
         self.assertFalse(self.file_copy_path.exists())
         self.assertFalse(self.file_copy_path.is_file())
+
+    def test_build_jobs_copy_mode(self):
+        (Path(self.input_dir) / "empty").mkdir()
+        jobs = Processor.build_jobs(
+            Folder(directory=self.input_dir),
+            NamingMode.COPY,
+            False,
+            Path(self.input_dir),
+            Path(self.output_dir),
+        )
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].dest_dir, str(Path(self.output_dir) / "subfolder_1"))
+        self.assertTrue((Path(self.output_dir) / "empty").is_dir())
+
+    def test_build_jobs_replace_mode_sorted(self):
+        for name in ["c.jpg", "a.jpg", "b.jpg"]:
+            (Path(self.input_dir) / name).touch()
+        jobs = Processor.build_jobs(Folder(directory=self.input_dir), NamingMode.REPLACE, False)
+        self.assertEqual(
+            [job.file.name for job in jobs], ["a.jpg", "b.jpg", "c.jpg", "test_file1.jpg"]
+        )
+        self.assertEqual(jobs[0].dest_dir, self.input_dir)
+
+    @patch("src.core.processor.shutil.copy2", side_effect=OSError("disk full"))
+    def test_process_collects_errors(self, _):
+        job = Job(file=self.file, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=False)
+        result = Processor.process(job)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.source, str(self.file_path))
+        self.assertIn("disk full", result.error)
+
+    def test_copy_naming_metadata_with_workers(self):
+        for i in range(4):
+            cv2.imwrite(str(Path(self.input_dir) / f"image_{i}.jpg"), np.full((50, 50, 3), i, dtype=np.uint8))
+
+        results = Processor.copy_naming_metadata(
+            Folder(directory=self.input_dir),
+            Path(self.input_dir),
+            Path(self.output_dir),
+            False,
+            workers=2,
+        )
+        self.assertEqual([Path(result.source).name for result in results], [
+            "image_0.jpg", "image_1.jpg", "image_2.jpg", "image_3.jpg", "test_file1.jpg"
+        ])
+        for result in results:
+            self.assertTrue(result.ok)
+            self.assertTrue(Path(result.destination).exists())
+
+    def test_copy_naming_metadata_incremental(self):
+        folder = Folder(directory=self.input_dir)
+        first = Processor.copy_naming_metadata(
+            folder, Path(self.input_dir), Path(self.output_dir), False, incremental=True
+        )
+        self.assertFalse(first[0].skipped)
+
+        second = Processor.copy_naming_metadata(
+            Folder(directory=self.input_dir), Path(self.input_dir), Path(self.output_dir), False,
+            incremental=True
+        )
+        self.assertTrue(second[0].skipped)
+        self.assertTrue(second[0].ok)
+
+    def test_copy_naming_metadata_resume(self):
+        journal = Journal.in_directory(self.output_dir)
+        Processor.copy_naming_metadata(
+            Folder(directory=self.input_dir), Path(self.input_dir), Path(self.output_dir), False,
+            journal=journal
+        )
+        with patch("src.core.processor.shutil.copy2") as mock_copy:
+            results = Processor.copy_naming_metadata(
+                Folder(directory=self.input_dir), Path(self.input_dir), Path(self.output_dir), False,
+                journal=journal, resume=True
+            )
+            mock_copy.assert_not_called()
+        self.assertTrue(results[0].skipped)
+        journal.close()
+
+    @patch.object(File, "__str__", return_value="replaced_test_file1.jpg")
+    def test_replace_naming_metadata_resume(self, _):
+        journal = Journal.in_directory(self.input_dir)
+        Processor.replace_naming_metadata(Folder(directory=self.input_dir), False, journal=journal)
+        self.assertEqual(journal.state().latest[str(self.file_path)].status, "done")
+
+        with patch("src.core.processor.shutil.move") as mock_move:
+            results = Processor.replace_naming_metadata(
+                Folder(directory=self.input_dir), False, journal=journal, resume=True
+            )
+            mock_move.assert_not_called()
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].skipped)
+        journal.close()
+
+    @patch.object(Processor, "write_image", side_effect=OSError("disk full"))
+    @patch.object(Processor, "render_metadata", return_value=b"jpeg")
+    @patch.object(File, "__str__", return_value="replaced_test_file1.jpg")
+    def test_replace_in_image_does_not_touch_source_on_error(self, *_):
+        job = Job(file=self.file, dest_dir=str(self.file_path.parent), mode=NamingMode.REPLACE, in_image=True)
+        result = Processor.process(job)
+        self.assertFalse(result.ok)
+        self.assertTrue(self.file_path.exists())
+
+    def test_copy_naming_metadata_with_scanner(self):
+        (Path(self.input_dir) / "a.jpg").touch()
+        jobs = Processor.build_jobs(
+            Scanner(self.input_dir), NamingMode.COPY, False, Path(self.input_dir), Path(self.output_dir)
+        )
+        self.assertNotIsInstance(jobs, list)
+
+        results = Processor.copy_naming_metadata(
+            Scanner(self.input_dir), Path(self.input_dir), Path(self.output_dir), False
+        )
+        self.assertEqual([Path(result.source).name for result in results], ["a.jpg", "test_file1.jpg"])
+        self.assertTrue(all(Path(result.destination).exists() for result in results))
+
+    def test_link_naming_metadata(self):
+        self.file_path.write_bytes(b"raw bytes")
+        with patch("src.core.processor.shutil.copy2") as mock_copy:
+            results = Processor.link_naming_metadata(
+                Folder(directory=self.input_dir), Path(self.input_dir), Path(self.output_dir), False
+            )
+            mock_copy.assert_not_called()
+
+        destination = Path(results[0].destination)
+        self.assertTrue(results[0].ok)
+        self.assertEqual(destination.parent, Path(self.output_dir) / "subfolder_1")
+        self.assertEqual(destination.read_bytes(), b"raw bytes")
+        self.assertTrue(self.file_path.exists())
+
+    @patch.object(Processor, "render_metadata", return_value=b"jpeg")
+    def test_link_naming_metadata_in_image_writes_new_file(self, mock_add_metadata):
+        with patch("src.core.processor.link_file") as mock_link:
+            Processor.link_naming_metadata(
+                Folder(directory=self.input_dir), Path(self.input_dir), Path(self.output_dir), True
+            )
+            mock_link.assert_not_called()
+        mock_add_metadata.assert_called_once()
+
+    @patch.object(File, "__str__", return_value="replaced_test_file1.jpg")
+    def test_replace_in_image_keeps_undecodable_source(self, _):
+        job = Job(file=self.file, dest_dir=str(self.file_path.parent), mode=NamingMode.REPLACE, in_image=True)
+        result = Processor.process(job)
+        self.assertIn("Could not decode", result.error)
+        self.assertTrue(self.file_path.exists())
+
+    def test_stages_match_process(self):
+        cv2.imwrite(str(self.file_path), np.full((120, 160, 3), 90, dtype=np.uint8))
+        job = Job(file=self.file, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=True)
+
+        task = Processor.read(job)
+        self.assertTrue(self.file.is_loaded)
+        task = Processor.render(task)
+        self.assertFalse(self.file.is_loaded)
+        self.assertTrue(task.encoded.startswith(b"\xff\xd8"))
+
+        result = Processor.write(task)
+        self.assertTrue(result.ok)
+        self.assertIsNone(task.encoded)
+        self.assertEqual(Path(result.destination).read_bytes()[:2], b"\xff\xd8")
+
+    def test_copy_naming_metadata_with_pipeline(self):
+        for i in range(6):
+            cv2.imwrite(str(Path(self.input_dir) / f"image_{i}.jpg"), np.full((60, 80, 3), i * 40, dtype=np.uint8))
+
+        executor = PipelineExecutor(readers=2, workers=3, writers=2, depth=2)
+        results = Processor.copy_naming_metadata(
+            Scanner(self.input_dir), Path(self.input_dir), Path(self.output_dir), True, executor=executor
+        )
+        self.assertEqual([Path(result.source).name for result in results], [
+            "image_0.jpg", "image_1.jpg", "image_2.jpg", "image_3.jpg", "image_4.jpg", "image_5.jpg",
+            "test_file1.jpg"
+        ])
+        self.assertTrue(all(result.ok for result in results[:-1]))
+        self.assertFalse(results[-1].ok)
+        self.assertTrue(all(peak <= 2 for peak in executor.peaks))
+
+    def test_run_jobs_with_profiler(self):
+        cv2.imwrite(str(self.file_path), np.full((120, 160, 3), 90, dtype=np.uint8))
+        profiler = Profiler()
+        for executor in (Executor(workers=2), PipelineExecutor(depth=2)):
+            results = Processor.copy_naming_metadata(
+                Folder(directory=self.input_dir), Path(self.input_dir), Path(self.output_dir), True,
+                executor=executor, profiler=profiler
+            )
+            self.assertTrue(results[0].ok)
+            self.assertEqual(
+                set(results[0].profile.stages),
+                {"read", "exif", "decode", "overlay", "exif_dump", "encode", "write"}
+            )
+
+        report = profiler.report()
+        self.assertEqual(report["files"], 2)
+        self.assertEqual(report["stages"]["decode"]["count"], 2)
+        self.assertIn("scan", report["stages"])
+        self.assertEqual(report["bytes_read"], 2 * self.file_path.stat().st_size)
+
+    def test_process_without_profile(self):
+        result = Processor.process(
+            Job(file=self.file, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=False)
+        )
+        self.assertIsNone(result.profile)
+
+    def test_draw_metadata_overlay_matches_full_frame_blend(self):
+        def full_frame_overlay(image, lines):
+            _, w, _ = image.shape
+            font = cv2.FONT_HERSHEY_DUPLEX
+            font_scale = max(0.8, w / 1000)
+            thickness = max(2, w // 800)
+            line_height = int(40 * font_scale)
+            padding_internal = int(15 * font_scale)
+            padding_external = int(30 * font_scale)
+            sizes = [cv2.getTextSize(line, font, font_scale, thickness)[0] for line in lines]
+            x, y = padding_external, padding_external + sizes[0][1]
+            top_left = (x - padding_internal, y - sizes[0][1] - padding_internal)
+            bottom_right = (
+                x + max(size[0] for size in sizes) + padding_internal,
+                y + len(lines) * line_height - (line_height - sizes[0][1]) + padding_internal
+            )
+            overlay = image.copy()
+            cv2.rectangle(overlay, top_left, bottom_right, (0, 0, 0), -1)
+            cv2.addWeighted(overlay, 0.5, image, 0.5, 0, image)
+            cv2.rectangle(image, top_left, bottom_right, (255, 255, 255), max(3, int((4 * font_scale)/2)))
+            for i, line in enumerate(lines):
+                cv2.putText(image, line, (x, y + i * line_height), font, font_scale, (255, 255, 255), thickness)
+
+        lines = ["Exposure: 1/6000", "Aperture: 5.6f", "ISO: 800", "EV: -1/3"]
+        rng = np.random.default_rng(0)
+        shapes = [(100, 100), (50, 400), (480, 640), (300, 4000), (1000, 1601), (2000, 3000)]
+        shapes += 10 * [(600, 800), (100, 120)]
+        for height, width in shapes:
+            image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+            expected, actual = image.copy(), image.copy()
+            full_frame_overlay(expected, lines)
+            Processor.draw_metadata_overlay(actual, lines)
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_raw_naming(self):
+        raw_path = Path(self.input_dir) / "IMGP0001.PEF"
+        write_raw(raw_path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42", size=(60, 40))
+        raw = File(name=raw_path.name, size=raw_path.stat().st_size, directory=str(raw_path))
+
+        result = Processor.process(Job(file=raw, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=False))
+        self.assertEqual(Path(result.destination).name, "IMGP0001_1s250-2.8f-800.PEF")
+        self.assertEqual(Path(result.destination).read_bytes(), raw_path.read_bytes())
+
+        # The preview is annotated and written as a JPEG with the EXIF of the RAW.
+        job = Job(file=raw, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=True, encoder=EncoderBackend.STRIP)
+        result = Processor.process(job)
+        self.assertEqual(Path(result.destination).name, "IMGP0001_1s250-2.8f-800.jpg")
+        image = cv2.imread(result.destination)
+        self.assertEqual(image.shape[:2], (40, 60))
+        self.assertEqual(piexif.load(result.destination)["Exif"][piexif.ExifIFD.FNumber], (28, 10))
+
+    def test_replace_in_image_renames_raw(self):
+        raw_path = Path(self.input_dir) / "IMGP0001.PEF"
+        write_raw(raw_path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        content = raw_path.read_bytes()
+        raw = File(name=raw_path.name, size=raw_path.stat().st_size, directory=str(raw_path))
+        result = Processor.process(Job(file=raw, dest_dir=self.input_dir, mode=NamingMode.REPLACE, in_image=True))
+        self.assertTrue(result.ok)
+        self.assertEqual(Path(result.destination), Path(self.input_dir) / "IMGP0001_1s250-2.8f-800.jpg")
+        self.assertTrue(Path(result.destination).exists())
+        # The RAW is renamed next to its annotated preview, not left under its old name.
+        self.assertFalse(raw_path.exists())
+        self.assertEqual(Path(result.raw_destination), Path(self.input_dir) / "IMGP0001_1s250-2.8f-800.PEF")
+        self.assertEqual((Path(self.input_dir) / "IMGP0001_1s250-2.8f-800.PEF").read_bytes(), content)
+
+    def test_replace_in_image_raw_resume(self):
+        raw_dir = Path(self.tmpdir) / "raw"
+        raw_dir.mkdir()
+        write_raw(raw_dir / "IMGP0001.PEF", (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        journal = Journal.in_directory(str(raw_dir))
+        Processor.replace_naming_metadata(Folder(directory=str(raw_dir)), True, journal=journal)
+        named = sorted(path.name for path in raw_dir.glob("IMGP*"))
+        self.assertEqual(named, ["IMGP0001_1s250-2.8f-800.PEF", "IMGP0001_1s250-2.8f-800.jpg"])
+
+        # Both outputs were recorded: the renamed RAW is not renamed again.
+        results = Processor.replace_naming_metadata(Folder(directory=str(raw_dir)), True, journal=journal, resume=True)
+        self.assertTrue(all(result.skipped for result in results))
+        self.assertEqual(sorted(path.name for path in raw_dir.glob("IMGP*")), named)
+        journal.close()
+
+    def test_read_does_not_load_raw(self):
+        raw_path = Path(self.input_dir) / "IMGP0001.PEF"
+        write_raw(raw_path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        raw = File(name=raw_path.name, size=raw_path.stat().st_size, directory=str(raw_path))
+        task = Processor.read(Job(file=raw, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=True))
+        self.assertFalse(raw.is_loaded)
+        self.assertTrue(Processor.write(Processor.render(task)).ok)
+
+    def test_raw_without_preview(self):
+        raw_path = Path(self.input_dir) / "IMGP0002.DNG"
+        raw_path.write_bytes(b"II*\x00\x08\x00\x00\x00\x00\x00\x00\x00\x00\x00")
+        raw = File(name=raw_path.name, size=raw_path.stat().st_size, directory=str(raw_path))
+        result = Processor.process(Job(file=raw, dest_dir=self.output_dir, mode=NamingMode.COPY, in_image=True))
+        self.assertIn("Could not decode", result.error)
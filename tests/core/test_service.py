@@ -0,0 +1,136 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from src.core.service import AnnotationRequest, AnnotationService, ServiceBusy, annotate, annotate_batch
+from tests.metadata.test_index import write_photo
+from tests.metadata.test_raw import write_raw
+
+
+class TestAnnotate(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = Path(self.tmpdir) / "photo.jpg"
+        write_photo(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        self.data = path.read_bytes()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_metadata(self):
+        result = annotate(AnnotationRequest(name="IMG001.jpg", data=self.data))
+        self.assertTrue(result.ok)
+        self.assertEqual(result.name, "IMG001_1s250-2.8f-800.jpg")
+        self.assertEqual(result.metadata["iso"], "800")
+        self.assertIsNone(result.image)
+
+    def test_annotated_image(self):
+        result = annotate(AnnotationRequest(name="IMG001.jpg", data=self.data, annotate=True, preview=8))
+        self.assertTrue(result.ok)
+        image = cv2.imdecode(np.frombuffer(result.image, dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(image.shape[:2], (8, 8))
+
+    def test_raw(self):
+        path = Path(self.tmpdir) / "IMGP0001.PEF"
+        write_raw(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        self.assertEqual(annotate(AnnotationRequest(name=path.name, data=path.read_bytes())).name, "IMGP0001_1s250-2.8f-800.PEF")
+        result = annotate(AnnotationRequest(name=path.name, data=path.read_bytes(), annotate=True))
+        self.assertEqual(result.name, "IMGP0001_1s250-2.8f-800.jpg")
+        image = cv2.imdecode(np.frombuffer(result.image, dtype=np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(image.shape[:2], (32, 48))
+
+    def test_errors(self):
+        result = annotate(AnnotationRequest(name="notes.jpg", data=b"not an image", annotate=True))
+        self.assertFalse(result.ok)
+        self.assertEqual(result.name, "notes.jpg")
+        self.assertIn("could not be decoded", result.error)
+
+    def test_batch(self):
+        results = annotate_batch([AnnotationRequest(name=f"{i}.jpg", data=self.data) for i in range(3)])
+        self.assertEqual([result.name for result in results], [f"{i}_1s250-2.8f-800.jpg" for i in range(3)])
+
+
+class TestWarmUp(TestCase):
+    def test_warm_up_imports_pixel_libraries(self):
+        # In a fresh interpreter, as in a new worker process.
+        code = (
+            "import sys; from src.core.service import warm_up; assert 'cv2' not in sys.modules; "
+            "warm_up(); print(all(name in sys.modules for name in ('cv2', 'numpy', 'src.core.encoder', 'src.core.overlay')))"
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[2], capture_output=True, text=True
+        )
+        self.assertEqual(process.stdout.strip(), "True", process.stderr)
+
+
+class TestAnnotationService(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        path = Path(self.tmpdir) / "photo.jpg"
+        write_photo(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+        self.request = AnnotationRequest(name="photo.jpg", data=path.read_bytes())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_inline(self):
+        with AnnotationService(workers=1, batch_size=4) as service:
+            futures = [service.submit(self.request) for _ in range(10)]
+            results = [future.result(timeout=10) for future in futures]
+        self.assertTrue(all(result.name == "photo_1s250-2.8f-800.jpg" for result in results))
+        stats = service.stats()
+        self.assertEqual((stats["requests"], stats["errors"], stats["queued"]), (10, 0, 0))
+        self.assertLessEqual(stats["batches"], 10)
+
+    def test_pool(self):
+        with AnnotationService(workers=2, batch_size=3, queue_depth=32) as service:
+            self.assertIsNotNone(service.pool)
+            futures = [service.submit(self.request) for _ in range(12)]
+            results = [future.result(timeout=30) for future in futures]
+        self.assertTrue(all(result.ok for result in results))
+        self.assertIsNone(service.pool)
+
+    def test_batches(self):
+        batches = []
+
+        def record(requests):
+            batches.append(len(requests))
+            return annotate_batch(requests)
+
+        service = AnnotationService(workers=1, batch_size=4, batch_wait=0.2)
+        with patch("src.core.service.annotate_batch", side_effect=record):
+            # Requests queued before the dispatcher starts are batched together.
+            futures = [service.submit(self.request) for _ in range(6)]
+            with service:
+                for future in futures:
+                    future.result(timeout=10)
+        self.assertEqual(batches, [4, 2])
+
+    def test_back_pressure(self):
+        release = threading.Event()
+
+        def blocked(requests):
+            release.wait(10)
+            return annotate_batch(requests)
+
+        with patch("src.core.service.annotate_batch", side_effect=blocked):
+            with AnnotationService(workers=1, batch_size=1, batch_wait=0, queue_depth=2) as service:
+                futures = [service.submit(self.request)]
+                # Wait until the dispatcher is blocked on the first request.
+                while service.queue.qsize():
+                    time.sleep(0.01)
+                futures += [service.submit(self.request) for _ in range(2)]
+                with self.assertRaises(ServiceBusy):
+                    service.submit(self.request)
+                release.set()
+                self.assertTrue(all(future.result(timeout=10).ok for future in futures))
+        self.assertEqual(service.stats()["rejected"], 1)
@@ -0,0 +1,99 @@
+import math
+from unittest import TestCase
+
+import numpy as np
+
+from src.common.enums import StatsGroup
+from src.core.stats import ExposureStats, distribution, ev100, histogram, split_groups, split_sessions
+from src.metadata.record import PhotoRecord
+
+HOUR = 3600.0
+
+
+def record(exposure: float, aperture: float, iso: int, bias: float = 0.0, timestamp: float = math.nan) -> PhotoRecord:
+    return PhotoRecord("PENTAX K-50", exposure, aperture, iso, 50.0, bias, timestamp)
+
+
+class TestStatsFunctions(TestCase):
+    def test_ev100(self):
+        ev = ev100(
+            np.array([1.0, 1 / 125, 1 / 125, math.nan, 1 / 60]),
+            np.array([1.0, 16.0, 16.0, 2.8, 2.8]),
+            np.array([100.0, 100.0, 400.0, 100.0, 0.0]),
+        )
+        self.assertEqual(ev[0], 0.0)
+        self.assertAlmostEqual(ev[1], math.log2(256 * 125))
+        self.assertAlmostEqual(ev[1] - ev[2], 2.0)
+        self.assertTrue(np.isnan(ev[3:]).all())
+
+    def test_split_sessions(self):
+        timestamps = np.array([5 * HOUR, 0.0, math.nan, 0.5 * HOUR, 2 * HOUR, 5.1 * HOUR])
+        self.assertEqual(split_sessions(timestamps, gap=HOUR).tolist(), [2, 0, -1, 0, 1, 2])
+        self.assertEqual(split_sessions(np.array([math.nan])).tolist(), [-1])
+        self.assertEqual(split_sessions(np.empty(0)).tolist(), [])
+
+    def test_split_groups(self):
+        groups = [(label, indices.tolist()) for label, indices in split_groups(np.array([2, 0, 2, 1, 0]))]
+        self.assertEqual(groups, [(0, [1, 4]), (1, [3]), (2, [0, 2])])
+
+    def test_distribution(self):
+        summary = distribution(np.array([1.0, 2.0, 3.0, math.nan, -0.001]))
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual((summary["min"], summary["p50"], summary["max"]), (0.0, 1.5, 3.0))
+        self.assertEqual(str(summary["min"]), "0.0")
+        self.assertEqual(distribution(np.array([math.nan])), {"count": 0})
+
+    def test_histogram(self):
+        values = np.array([0.3333, -0.3333, 0.0, -0.1, math.nan, 1.0])
+        self.assertEqual(
+            histogram(values, lambda value: f"{value:+.1f}", step=1 / 3),
+            {"-0.3": 1, "+0.0": 2, "+0.3": 1, "+1.0": 1},
+        )
+        self.assertEqual(histogram(np.array([200.0, 100.0, 200.0]), str), {"100.0": 1, "200.0": 2})
+
+
+class TestExposureStats(TestCase):
+    def setUp(self):
+        self.stats = ExposureStats.from_records([
+            ("/photos/b/1.jpg", record(1 / 125, 16.0, 100, 0.0, 10 * HOUR), None),
+            ("/photos/a/1.jpg", record(1.0, 1.0, 100, -1 / 3, 0.0), None),
+            ("/photos/a/2.jpg", record(1 / 4, 2.0, 400, 1 / 3, 0.5 * HOUR), None),
+            ("/photos/a/3.jpg", None, "ValueError: broken"),
+            ("/photos/b/2.jpg", record(math.nan, 2.8, 0), None),
+        ])
+
+    def test_from_records(self):
+        self.assertEqual(len(self.stats), 4)
+        self.assertEqual(self.stats.folders, ["/photos/b", "/photos/a"])
+        self.assertEqual(self.stats.folder_ids.tolist(), [0, 1, 1, 0])
+        self.assertEqual(self.stats.errors, [("/photos/a/3.jpg", "ValueError: broken")])
+        self.assertEqual(self.stats.column("iso").tolist(), [100, 100, 400, 0])
+
+    def test_groups(self):
+        folders = [(name, indices.tolist()) for name, indices in self.stats.groups(StatsGroup.FOLDER)]
+        self.assertEqual(folders, [("/photos/a", [1, 2]), ("/photos/b", [0, 3])])
+
+        sessions = [(name, indices.tolist()) for name, indices in self.stats.groups(StatsGroup.SESSION, gap=HOUR)]
+        self.assertEqual(sessions, [
+            ("1970-01-01 00:00 → 1970-01-01 00:30", [1, 2]),
+            ("1970-01-01 10:00 → 1970-01-01 10:00", [0]),
+            ("undated", [3]),
+        ])
+
+    def test_report(self):
+        report = self.stats.report(StatsGroup.FOLDER)
+        total = report["total"]
+        self.assertEqual(total["photos"], 4)
+        self.assertEqual(total["ev100"]["count"], 3)
+        self.assertEqual(total["ev100"]["histogram"], {"0": 1, "2": 1, "15": 1})
+        self.assertEqual(total["exposure_bias"], {"-0.3": 1, "+0.0": 2, "+0.3": 1})
+        self.assertEqual(total["iso"], {"100": 2, "400": 1})
+        self.assertEqual(total["aperture"], {"f/1": 1, "f/2": 1, "f/2.8": 1, "f/16": 1})
+        self.assertEqual([group["name"] for group in report["groups"]], ["/photos/a", "/photos/b"])
+        self.assertEqual(report["groups"][0]["ev100"]["mean"], 1.0)
+
+    def test_empty(self):
+        report = ExposureStats.from_records([]).report(StatsGroup.SESSION)
+        self.assertEqual(report["total"]["photos"], 0)
+        self.assertEqual(report["total"]["ev100"], {"count": 0, "histogram": {}})
+        self.assertEqual(report["groups"], [])
@@ -0,0 +1,84 @@
+from io import BytesIO
+from unittest import TestCase
+
+import cv2
+import numpy as np
+from PIL import Image
+import piexif
+
+from src.core.overlay import draw_overlay, overlay_layout
+from src.core.strip import find_restart, patch_jpeg, read_frame
+
+LINES = ["Exposure: 1/250", "Aperture: 5.6f", "ISO: 200", "EV: 0"]
+
+
+def jpeg(width: int, height: int, exif: bytes = b"", **options) -> bytes:
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    pixels = np.clip(x[None, :, None] + rng.normal(0, 8, (height, width, 3)), 0, 255).astype(np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=85, exif=exif, **options)
+    return buffer.getvalue()
+
+
+def decode(data: bytes) -> np.ndarray:
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class TestStrip(TestCase):
+    def test_read_frame(self):
+        frame = read_frame(jpeg(1001, 777, subsampling=2, restart_marker_rows=1))
+        self.assertEqual((frame.width, frame.height, frame.restart_interval), (1001, 777, 63))
+        self.assertEqual(frame.mcu_size, (16, 16))
+        self.assertEqual(frame.mcus_per_row, 63)
+        self.assertEqual(sorted(frame.quantization), [0, 1])
+        self.assertEqual(frame.orientation, 1)
+
+    def test_read_frame_unsupported(self):
+        self.assertIsNone(read_frame(jpeg(320, 240)))
+        self.assertIsNone(read_frame(jpeg(320, 240, progressive=True, restart_marker_rows=1)))
+        self.assertIsNone(read_frame(cv2.imencode(".png", np.zeros((8, 8, 3), dtype=np.uint8))[1].tobytes()))
+        self.assertIsNone(read_frame(b"\xff\xd8\xff"))
+
+    def test_strip_rows_ends_on_restart_marker(self):
+        frame = read_frame(jpeg(640, 480, subsampling=0, restart_marker_blocks=160))
+        # 80 MCUs per row: intervals of 160 MCUs end every other row.
+        self.assertEqual(frame.strip_rows(8), 2)
+        self.assertEqual(frame.strip_rows(17), 4)
+        self.assertIsNone(frame.strip_rows(475))
+
+    def test_find_restart(self):
+        data = jpeg(640, 480, restart_marker_rows=1)
+        frame = read_frame(data)
+        position = find_restart(data, frame.scan_start, 3)
+        self.assertEqual(data[position:position + 2], b"\xff\xd2")
+        self.assertIsNone(find_restart(data, frame.scan_start, 10_000))
+
+    def test_patch_jpeg(self):
+        for subsampling in (0, 1, 2):
+            data = jpeg(1280, 960, exif=piexif.dump({"0th": {piexif.ImageIFD.Model: b"K-50"}}),
+                        subsampling=subsampling, restart_marker_rows=1)
+            patched = patch_jpeg(data, LINES)
+            self.assertIsNotNone(patched)
+
+            # Everything after the re-encoded rows is copied byte for byte.
+            frame = read_frame(data)
+            layout = overlay_layout(1280, tuple(LINES))
+            rows = frame.strip_rows(layout.origin[1] + layout.size[0])
+            end = find_restart(data, frame.scan_start, rows * frame.mcus_per_row // frame.restart_interval)
+            self.assertTrue(patched.endswith(data[end:]))
+            self.assertTrue(patched.startswith(data[:frame.scan_start]))
+
+            expected, actual = decode(data), decode(patched)
+            draw_overlay(expected, LINES)
+            height = rows * frame.mcu_size[1]
+            # Chroma upsampling blends the first rows below the strip with it.
+            np.testing.assert_array_equal(actual[height + 16:], expected[height + 16:])
+            self.assertLess(np.abs(actual[:height].astype(int) - expected[:height]).mean(), 2)
+
+    def test_patch_jpeg_falls_back(self):
+        self.assertIsNone(patch_jpeg(jpeg(640, 480), LINES))
+        rotated = piexif.dump({"0th": {piexif.ImageIFD.Orientation: 6}})
+        self.assertIsNone(patch_jpeg(jpeg(640, 480, exif=rotated, restart_marker_rows=1), LINES))
+        # The box covers the whole image: nothing would be copied.
+        self.assertIsNone(patch_jpeg(jpeg(400, 120, restart_marker_rows=1), LINES))
@@ -0,0 +1,105 @@
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+from unittest import TestCase, skipUnless
+
+from src.common.enums import WatchBackend
+from src.core.watcher import Batch, FolderWatcher, Inotify
+from src.data.file import File
+
+
+def write(path: Path, data: bytes = b"image") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+class WatcherTests:
+    backend = WatchBackend.POLLING
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = Path(self.tmpdir) / "ingest"
+        write(self.root / "old.jpg")
+        self.watcher = FolderWatcher(
+            str(self.root), backend=self.backend, settle=0.1, interval=0.05, exclude=(str(self.root / "out"),)
+        )
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def names(self, timeout: float = 1.0) -> list[str]:
+        return sorted(os.path.relpath(file.directory, self.root) for file in self.watcher.poll(timeout))
+
+    def test_reports_new_files_once(self):
+        write(self.root / "a.jpg")
+        write(self.root / "notes.txt")
+        self.assertEqual(self.names(), ["a.jpg"])
+        self.assertEqual(self.names(timeout=0.3), [])
+
+    def test_files_of_new_directories(self):
+        write(self.root / "card" / "b.jpg")
+        self.assertEqual(self.names(), [os.path.join("card", "b.jpg")])
+        write(self.root / "card" / "c.jpg")
+        self.assertEqual(self.names(), [os.path.join("card", "c.jpg")])
+
+    def test_waits_for_partial_writes(self):
+        path = self.root / "slow.jpg"
+        start = time.monotonic()
+        with open(path, "wb") as file:
+            for _ in range(4):
+                file.write(b"chunk")
+                file.flush()
+                time.sleep(0.05)
+        files = self.watcher.poll(timeout=1.0)
+        self.assertEqual(len(files), 1)
+        self.assertEqual(files[0].size, 20)
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+    def test_rewritten_files_and_ignored_files(self):
+        write(self.root / "a.jpg")
+        self.assertEqual(self.names(), ["a.jpg"])
+        write(self.root / "a.jpg", b"a new version")
+        self.assertEqual(self.names(), ["a.jpg"])
+
+        write(self.root / "renamed.jpg")
+        self.watcher.ignore([str(self.root / "renamed.jpg")])
+        self.assertEqual(self.names(timeout=0.3), [])
+
+    def test_excluded_directories(self):
+        write(self.root / "out" / "a.jpg")
+        self.assertEqual(self.names(timeout=0.3), [])
+
+
+class TestPollingWatcher(WatcherTests, TestCase):
+    backend = WatchBackend.POLLING
+
+    def test_uses_polling(self):
+        self.assertFalse(self.watcher.uses_inotify)
+
+
+@skipUnless(Inotify.available(), "inotify is not available")
+class TestInotifyWatcher(WatcherTests, TestCase):
+    backend = WatchBackend.INOTIFY
+
+    def test_uses_inotify(self):
+        self.assertTrue(self.watcher.uses_inotify)
+
+    def test_latency(self):
+        write(self.root / "a.jpg")
+        start = time.monotonic()
+        self.assertEqual(self.names(), ["a.jpg"])
+        self.assertLess(time.monotonic() - start, 0.5)
+
+
+class TestBatch(TestCase):
+    def test_of(self):
+        files = [File(name=name, size=1, directory=f"/ingest/{name}") for name in ("b.jpg", "card/c.jpg", "a.jpg")]
+        batch = Batch.of("/ingest", files)
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(
+            [(directory, [file.name for file in files]) for directory, files in batch.walk()],
+            [("/ingest", ["a.jpg", "b.jpg"]), ("/ingest/card", ["card/c.jpg"])]
+        )
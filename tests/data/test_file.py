@@ -4,8 +4,14 @@ import tempfile
 from unittest import TestCase
 from unittest.mock import patch
 
+import cv2
+import numpy as np
+import piexif
+
+from src.common.profiling import JobProfile, activate
 from src.metadata.photo import PhotoMetadata
 from src.data.file import File
+from tests.metadata.test_raw import write_raw
 
 
 class TestFile(TestCase):
@@ -40,8 +46,8 @@ class TestFile(TestCase):
         )
         self.assertEqual(str(file), f"{Path(file.name).stem}_metadata{file.extension}")
 
-    @patch("src.data.file.piexif.dump", return_value=b"exif_bytes")
-    @patch("src.data.file.piexif.load", return_value={})
+    @patch("piexif.dump", return_value=b"exif_bytes")
+    @patch("piexif.load", return_value={})
     def test_file_exif_metadata(self, mock_load, mock_dump):
         file = File(
             name=str(Path(self.input_file_dir).name),
@@ -60,5 +66,104 @@ class TestFile(TestCase):
         self.assertEqual(metadata.description, "")
         self.assertEqual(metadata.exposure_bias, "")
         self.assertEqual(file.exif_bytes, b"exif_bytes")
-        mock_load.assert_called_once_with(file.directory)
+        mock_load.assert_called_once_with(file.data)
         mock_dump.assert_called_once_with({})
+
+    def test_file_data_read_once(self):
+        Path(self.input_file_dir).write_bytes(b"content")
+        file = File(
+            name=str(Path(self.input_file_dir).name),
+            size=Path(self.input_file_dir).stat().st_size,
+            directory=str(Path(self.input_file_dir))
+        )
+        self.assertFalse(file.is_loaded)
+        with patch.object(Path, "read_bytes", return_value=b"content") as mock_read:
+            self.assertIs(file.load(), file)
+            self.assertEqual(file.data, b"content")
+            mock_read.assert_called_once()
+        self.assertTrue(file.is_loaded)
+
+        file.release()
+        self.assertFalse(file.is_loaded)
+
+    @patch("src.data.file.read_exif_tags", return_value={})
+    def test_file_photo_metadata_from_buffer(self, mock_read_exif_tags):
+        file = File(
+            name=str(Path(self.input_file_dir).name),
+            size=Path(self.input_file_dir).stat().st_size,
+            directory=str(Path(self.input_file_dir))
+        ).load()
+        with patch("builtins.open") as mock_open:
+            file.photo_metadata
+            mock_open.assert_not_called()
+        self.assertEqual(mock_read_exif_tags.call_args.args[0].getvalue(), file.data)
+
+    def test_file_photo_record(self):
+        cv2.imwrite(self.input_file_dir, np.zeros((16, 16, 3), dtype=np.uint8))
+        piexif.insert(piexif.dump({"Exif": {
+            piexif.ExifIFD.ExposureTime: (1, 125), piexif.ExifIFD.FNumber: (56, 10), piexif.ExifIFD.ISOSpeedRatings: 800,
+        }}), self.input_file_dir)
+        file = File(
+            name=str(Path(self.input_file_dir).name),
+            size=Path(self.input_file_dir).stat().st_size,
+            directory=str(Path(self.input_file_dir))
+        )
+        self.assertEqual((file.photo_record.exposure_time, file.photo_record.aperture), (1 / 125, 5.6))
+        self.assertEqual(str(file.photo_record), str(file.photo_metadata))
+        self.assertFalse(file.is_loaded)
+
+    def test_file_image_header(self):
+        cv2.imwrite(self.input_file_dir, np.zeros((30, 40, 3), dtype=np.uint8))
+        file = File(
+            name=str(Path(self.input_file_dir).name),
+            size=Path(self.input_file_dir).stat().st_size,
+            directory=str(Path(self.input_file_dir))
+        )
+        self.assertEqual((file.image_header.width, file.image_header.height), (40, 30))
+        self.assertFalse(file.is_loaded)
+
+    def test_file_from_bytes(self):
+        cv2.imwrite(self.input_file_dir, np.zeros((30, 40, 3), dtype=np.uint8))
+        piexif.insert(piexif.dump({"Exif": {piexif.ExifIFD.ISOSpeedRatings: 400}}), self.input_file_dir)
+        file = File.from_bytes("upload.jpg", Path(self.input_file_dir).read_bytes())
+        self.assertTrue(file.is_loaded)
+        self.assertEqual(file.size, Path(self.input_file_dir).stat().st_size)
+        self.assertEqual(file.photo_metadata.iso, "400")
+        self.assertEqual((file.image_header.width, file.image_header.height), (40, 30))
+        self.assertEqual(str(file), "upload_-f-400.jpg")
+
+    def test_file_raw(self):
+        path = Path(self.input_dir) / "IMGP0001.PEF"
+        preview = write_raw(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42", size=(60, 40))
+        file = File(name=path.name, size=path.stat().st_size, directory=str(path))
+        self.assertTrue(file.is_raw)
+        self.assertEqual(file.annotated_extension, ".jpg")
+        self.assertEqual(str(file), "IMGP0001_1s250-2.8f-800.PEF")
+        self.assertEqual((file.image_header.width, file.image_header.height), (60, 40))
+        self.assertEqual(file.image_data, preview)
+        self.assertFalse(file.is_loaded)
+
+        exif = piexif.load(file.exif_bytes)
+        self.assertEqual(exif["0th"][piexif.ImageIFD.Model], b"PENTAX K-50")
+        self.assertNotIn(piexif.ImageIFD.Compression, exif["0th"])
+        self.assertEqual(exif["Exif"][piexif.ExifIFD.ExposureTime], (1, 250))
+        self.assertEqual(file.load().image_data, preview)
+
+    def test_file_raw_reads_exif_and_preview_only(self):
+        path = Path(self.input_dir) / "IMGP0001.PEF"
+        preview = write_raw(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42", size=(60, 40))
+        with open(path, "ab") as f:
+            f.write(bytes(2**20))
+        file = File(name=path.name, size=path.stat().st_size, directory=str(path))
+        profile = JobProfile()
+        with activate(profile):
+            exif = piexif.load(file.exif_bytes)
+            self.assertEqual(file.image_data, preview)
+        self.assertEqual(exif["Exif"][piexif.ExifIFD.ISOSpeedRatings], 800)
+        self.assertFalse(file.is_loaded)
+        self.assertLess(profile.bytes_read, 2 * len(preview) + 4096)
+
+        jpeg = File(name=Path(self.input_file_dir).name, size=0, directory=self.input_file_dir)
+        self.assertFalse(jpeg.is_raw)
+        self.assertIsNone(jpeg.raw_preview)
+        self.assertEqual(jpeg.annotated_extension, ".jpg")
@@ -0,0 +1,73 @@
+from pathlib import Path
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.data.file import File
+from src.data.folder import Folder
+from src.data.scanner import Scanner, scan_directory
+
+
+class TestScanner(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.input_dir = str(Path(self.tmpdir) / "test_input")
+
+        # test_input/
+        # ├── b.jpg
+        # ├── a.jpg
+        # ├── notes.txt
+        # ├── subfolder_1
+        # │   ├── nested
+        # │   │   └── d.png
+        # │   └── c.jpg
+        # └── subfolder_0
+        #     └── e.JPG
+        Path(self.input_dir, "subfolder_1", "nested").mkdir(parents=True)
+        Path(self.input_dir, "subfolder_0").mkdir(parents=True)
+        for name in ["b.jpg", "a.jpg", "notes.txt", "subfolder_1/c.jpg",
+                     "subfolder_1/nested/d.png", "subfolder_0/e.JPG"]:
+            Path(self.input_dir, name).write_bytes(b"content")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_scan_directory(self):
+        folders, files = scan_directory(self.input_dir)
+        self.assertEqual([Path(folder).name for folder in folders], ["subfolder_0", "subfolder_1"])
+        self.assertEqual([file.name for file in files], ["a.jpg", "b.jpg"])
+        for file in files:
+            self.assertIsInstance(file, File)
+            self.assertEqual(file.size, len(b"content"))
+            self.assertEqual(file.mtime_ns, Path(file.directory).stat().st_mtime_ns)
+
+    def test_walk_breadth_first(self):
+        directories = [Path(directory).relative_to(self.input_dir) for directory, _ in Scanner(self.input_dir).walk()]
+        self.assertEqual(directories, [
+            Path("."), Path("subfolder_0"), Path("subfolder_1"), Path("subfolder_1/nested")
+        ])
+
+    def test_iter_files(self):
+        names = [file.name for file in Scanner(self.input_dir)]
+        self.assertEqual(names, ["a.jpg", "b.jpg", "e.JPG", "c.jpg", "d.png"])
+
+    def test_concurrent_walk_keeps_order(self):
+        self.assertEqual(
+            [file.directory for file in Scanner(self.input_dir, workers=4)],
+            [file.directory for file in Scanner(self.input_dir)],
+        )
+
+    def test_exclude(self):
+        scanner = Scanner(self.input_dir, exclude=(str(Path(self.input_dir) / "subfolder_1"),))
+        self.assertEqual([file.name for file in scanner.files_recursive], ["a.jpg", "b.jpg", "e.JPG"])
+
+    def test_same_files_as_folder(self):
+        self.assertEqual(
+            sorted(file.directory for file in Scanner(self.input_dir)),
+            sorted(file.directory for file in Folder(self.input_dir).files_recursive),
+        )
+
+    def test_folder_walk(self):
+        walked = {directory: files for directory, files in Folder(self.input_dir).walk()}
+        self.assertEqual(len(walked), 4)
+        self.assertEqual([file.name for file in walked[self.input_dir]], ["a.jpg", "b.jpg"])
@@ -0,0 +1,126 @@
+from pathlib import Path
+import pickle
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+from src.core.executor import Executor
+from src.core.grouping import read_metadata
+from src.data.file import File
+from src.metadata.cache import CACHE_FILENAME, MetadataCache
+from src.metadata.photo import PhotoMetadata
+
+
+class TestMetadataCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = MetadataCache.in_directory(self.tmpdir)
+        self.file_path = Path(self.tmpdir) / "test_file.jpg"
+        self.file_path.write_bytes(b"content")
+        self.file = self.make_file(self.file_path)
+        self.metadata = PhotoMetadata(
+            camera_model="PENTAX K-50",
+            exposure_time="1/250",
+            aperture="28/10",
+            iso="100",
+            focal_length="50",
+            date_taken="2025:08:15 10:45:42",
+            location="",
+            description="",
+            exposure_bias="0",
+        )
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    @staticmethod
+    def make_file(path: Path) -> File:
+        stat = path.stat()
+        return File(name=path.name, size=stat.st_size, directory=str(path), mtime_ns=stat.st_mtime_ns)
+
+    def test_in_directory(self):
+        self.assertEqual(self.cache.path, str(Path(self.tmpdir) / CACHE_FILENAME))
+
+    def test_metadata_roundtrip(self):
+        self.assertIsNone(self.cache.get_metadata(self.file))
+        self.cache.put_metadata(self.file, self.metadata)
+        cached = self.cache.get_metadata(self.file)
+        self.assertEqual(cached, self.metadata)
+        self.assertEqual(str(cached), "1s250-2.8f-100")
+
+    def test_exif_roundtrip(self):
+        self.assertIsNone(self.cache.get_exif(self.file))
+        self.cache.put_metadata(self.file, self.metadata)
+        self.assertIsNone(self.cache.get_exif(self.file))
+        self.cache.put_exif(self.file, b"exif")
+        self.assertEqual(self.cache.get_exif(self.file), b"exif")
+        self.assertEqual(self.cache.get_metadata(self.file), self.metadata)
+
+    def test_stale_entry_is_invalidated(self):
+        self.cache.put_metadata(self.file, self.metadata)
+        self.file_path.write_bytes(b"new content")
+        self.assertIsNone(self.cache.get_metadata(self.make_file(self.file_path)))
+        self.assertIsNone(self.cache.get_metadata(self.file))
+
+    def test_unknown_mtime_is_read_from_disk(self):
+        self.cache.put_metadata(self.file, self.metadata)
+        file = File(name=self.file.name, size=self.file.size, directory=self.file.directory)
+        self.assertEqual(self.cache.get_metadata(file), self.metadata)
+
+    def test_eviction(self):
+        cache = MetadataCache(path=self.cache.path, max_entries=2, evict_every=1)
+        for i in range(4):
+            path = Path(self.tmpdir) / f"file_{i}.jpg"
+            path.write_bytes(b"content")
+            cache.put_exif(self.make_file(path), b"exif")
+        count = cache.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        self.assertEqual(count, 2)
+        self.assertIsNone(cache.get_exif(self.make_file(Path(self.tmpdir) / "file_0.jpg")))
+        self.assertEqual(cache.get_exif(self.make_file(Path(self.tmpdir) / "file_3.jpg")), b"exif")
+        cache.close()
+
+    def test_eviction_with_workers(self):
+        cache = MetadataCache(path=self.cache.path, max_entries=5, evict_every=3)
+        files = []
+        for i in range(40):
+            path = Path(self.tmpdir) / f"file_{i}.jpg"
+            path.write_bytes(b"content")
+            files.append(self.make_file(path))
+            files[-1].cache = cache
+
+        # Every job unpickles its own copy of the cache in a worker.
+        list(Executor(workers=2).map(read_metadata, files))
+        with sqlite3.connect(cache.path) as connection:
+            count = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        # The workers evicted as they wrote, each one every `evict_every` writes.
+        self.assertLess(count, 40)
+
+        # The parent never wrote, but closing still enforces the bound.
+        cache.close()
+        with sqlite3.connect(cache.path) as connection:
+            count = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        self.assertEqual(count, 5)
+
+    def test_pickle_without_connection(self):
+        self.cache.put_exif(self.file, b"exif")
+        restored = pickle.loads(pickle.dumps(self.cache))
+        self.assertNotIn("connection", restored.__dict__)
+        self.assertEqual(restored.get_exif(self.file), b"exif")
+        restored.close()
+
+    def test_file_uses_cache(self):
+        self.cache.put_metadata(self.file, self.metadata)
+        self.cache.put_exif(self.file, b"exif")
+        file = self.make_file(self.file_path)
+        file.cache = self.cache
+        self.assertEqual(file.photo_metadata, self.metadata)
+        self.assertEqual(file.exif_bytes, b"exif")
+        self.assertFalse(file.is_loaded)
+
+    def test_file_fills_cache(self):
+        file = self.make_file(self.file_path)
+        file.cache = self.cache
+        file.photo_metadata
+        self.assertEqual(self.cache.get_metadata(self.file), file.photo_metadata)
@@ -0,0 +1,53 @@
+from io import BytesIO
+import struct
+from unittest import TestCase
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.metadata.dimensions import ImageHeader, read_image_header
+
+
+def encode(image: np.ndarray, extension: str) -> BytesIO:
+    return BytesIO(cv2.imencode(extension, image)[1].tobytes())
+
+
+class TestDimensions(TestCase):
+    def setUp(self):
+        self.image = np.zeros((37, 53, 3), dtype=np.uint8)
+
+    def test_read_image_header_formats(self):
+        for extension in [".jpg", ".png", ".tiff", ".bmp"]:
+            self.assertEqual(
+                read_image_header(encode(self.image, extension)), ImageHeader(width=53, height=37), extension
+            )
+
+        gif = BytesIO()
+        Image.fromarray(self.image).save(gif, "GIF")
+        self.assertEqual(read_image_header(gif), ImageHeader(width=53, height=37))
+
+    def test_read_image_header_skips_jpeg_segments(self):
+        data = encode(self.image, ".jpg").getvalue()
+        app1 = b"\xff\xe1" + struct.pack(">H", 1002) + b"Exif\x00\x00" + b"\x00" * 994
+        header = read_image_header(BytesIO(data[:2] + app1 + b"\xff" + data[2:]))
+        self.assertEqual((header.width, header.height), (53, 37))
+
+    def test_read_image_header_bit_depth_and_channels(self):
+        header = read_image_header(encode(np.zeros((37, 53, 3), dtype=np.uint16), ".tiff"))
+        self.assertEqual((header.channels, header.bit_depth), (3, 16))
+        header = read_image_header(encode(np.zeros((37, 53, 4), dtype=np.uint8), ".png"))
+        self.assertEqual((header.channels, header.bit_depth), (4, 8))
+        header = read_image_header(encode(np.zeros((37, 53), dtype=np.uint8), ".tiff"))
+        self.assertEqual((header.channels, header.bit_depth), (1, 8))
+
+    def test_read_image_header_unknown_or_truncated(self):
+        for data in [b"", b"not an image", b"\xff\xd8\xff", b"II*\x00", b"\x89PNG\r\n\x1a\n"]:
+            self.assertIsNone(read_image_header(BytesIO(data)), data)
+
+    def test_decoded_size(self):
+        self.assertEqual(ImageHeader(width=6000, height=4000).decoded_size, 6000 * 4000 * 3)
+        self.assertEqual(
+            ImageHeader(width=100, height=10, channels=3, bit_depth=16).decoded_size, 1000 * 3 + 1000 * 6
+        )
+        self.assertEqual(ImageHeader(width=100, height=10, channels=1).decoded_size, 1000 * 3 + 1000)
@@ -0,0 +1,70 @@
+from io import BytesIO
+from pathlib import Path
+import shutil
+import struct
+import tempfile
+from unittest import TestCase
+
+import cv2
+import exifread
+import numpy as np
+import piexif
+
+from src.metadata.exif import read_exif_tags, read_jpeg_app1
+from src.metadata.photo import PhotoMetadata
+
+ASSETS_DIR = Path(__file__).parents[2] / "assets" / "images"
+
+
+class TestExif(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.image_path = str(Path(self.tmpdir) / "image.jpg")
+        cv2.imwrite(self.image_path, np.zeros((16, 16, 3), dtype=np.uint8))
+        piexif.insert(piexif.dump({
+            "0th": {piexif.ImageIFD.Model: b"PENTAX K-50"},
+            "Exif": {
+                piexif.ExifIFD.ExposureTime: (1, 250),
+                piexif.ExifIFD.FNumber: (28, 10),
+                piexif.ExifIFD.ISOSpeedRatings: 400,
+                piexif.ExifIFD.MakerNote: b"\x00" * 64,
+            },
+        }), self.image_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_read_exif_tags_same_metadata_as_process_file(self):
+        for path in [self.image_path, *map(str, ASSETS_DIR.glob("*.JPG"))]:
+            with open(path, "rb") as f:
+                expected = PhotoMetadata.from_tags(exifread.process_file(f))
+            with open(path, "rb") as f:
+                self.assertEqual(PhotoMetadata.from_tags(read_exif_tags(f)), expected)
+
+    def test_read_exif_tags_skips_maker_note(self):
+        with open(self.image_path, "rb") as f:
+            tags = read_exif_tags(f)
+        self.assertEqual(str(tags["EXIF ISOSpeedRatings"]), "400")
+        self.assertNotIn("EXIF MakerNote", tags)
+
+    def test_read_exif_tags_without_exif(self):
+        cv2.imwrite(self.image_path, np.zeros((16, 16, 3), dtype=np.uint8))
+        with open(self.image_path, "rb") as f:
+            self.assertEqual(read_exif_tags(f), {})
+
+    def test_read_exif_tags_non_jpeg(self):
+        png_path = str(Path(self.tmpdir) / "image.png")
+        cv2.imwrite(png_path, np.zeros((16, 16, 3), dtype=np.uint8))
+        with open(png_path, "rb") as f:
+            self.assertEqual(read_exif_tags(f), {})
+
+    def test_read_jpeg_app1_skips_fill_bytes_and_other_segments(self):
+        app0 = b"\xff\xe0" + struct.pack(">H", 6) + b"JFIF"
+        app1 = b"\xff\xe1" + struct.pack(">H", 10) + b"Exif\x00\x00II"
+        stream = BytesIO(app0 + b"\xff" + app1 + b"\xff\xda")
+        self.assertEqual(read_jpeg_app1(stream), app1)
+
+    def test_read_jpeg_app1_stops_at_image_data(self):
+        stream = BytesIO(b"\xff\xda\x00\x04\xff\xe1")
+        self.assertIsNone(read_jpeg_app1(stream))
+        self.assertIsNone(read_jpeg_app1(BytesIO(b"")))
@@ -0,0 +1,148 @@
+from pathlib import Path
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+import piexif
+
+from src.data.scanner import Scanner
+from src.metadata.index import INDEX_FILENAME, MetadataIndex, parse_filter, parse_order
+from src.metadata.photo import parse_date
+
+
+def write_photo(path: Path, exposure: tuple[int, int], aperture: tuple[int, int], iso: int, date: str) -> None:
+    cv2.imwrite(str(path), np.zeros((16, 16, 3), dtype=np.uint8))
+    piexif.insert(piexif.dump({
+        "0th": {piexif.ImageIFD.Model: b"PENTAX K-50"},
+        "Exif": {
+            piexif.ExifIFD.ExposureTime: exposure,
+            piexif.ExifIFD.FNumber: aperture,
+            piexif.ExifIFD.ISOSpeedRatings: iso,
+            piexif.ExifIFD.FocalLength: (50, 1),
+            piexif.ExifIFD.ExposureBiasValue: (-1, 3),
+            piexif.ExifIFD.DateTimeOriginal: date.encode(),
+        },
+    }), str(path))
+
+
+class TestMetadataIndex(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = Path(self.tmpdir) / "photos"
+        (self.root / "night").mkdir(parents=True)
+        write_photo(self.root / "day.jpg", (1, 500), (80, 10), 100, "2025:08:15 10:45:42")
+        write_photo(self.root / "night" / "street.jpg", (1, 60), (28, 10), 3200, "2025:08:15 22:10:00")
+        write_photo(self.root / "night" / "stars.jpg", (30, 1), (18, 10), 6400, "2025:08:16 01:30:00")
+        self.index = MetadataIndex.in_directory(self.tmpdir)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def update(self):
+        return self.index.update(Scanner(str(self.root)), root=str(self.root))
+
+    def test_in_directory(self):
+        self.assertEqual(self.index.path, str(Path(self.tmpdir) / INDEX_FILENAME))
+
+    def test_entry_numeric_columns(self):
+        self.update()
+        entry = self.index.query(["iso=3200"])[0]
+        self.assertEqual(entry.path, str(self.root / "night" / "street.jpg"))
+        self.assertEqual(entry.camera_model, "PENTAX K-50")
+        self.assertAlmostEqual(entry.exposure_time, 1 / 60)
+        self.assertEqual(entry.aperture, 2.8)
+        self.assertEqual(entry.iso, 3200)
+        self.assertEqual(entry.focal_length, 50.0)
+        self.assertAlmostEqual(entry.exposure_bias, -1 / 3)
+        self.assertEqual(entry.date_taken, parse_date("2025-08-15 22:10:00"))
+        self.assertEqual(entry.token, "1s60-2.8f-3200")
+
+    def test_query(self):
+        self.update()
+        names = lambda entries: [Path(entry.path).name for entry in entries]
+        self.assertEqual(names(self.index.query(["iso>=3200", "aperture<=2.8"])), ["stars.jpg", "street.jpg"])
+        self.assertEqual(names(self.index.query(order="-exposure")), ["stars.jpg", "street.jpg", "day.jpg"])
+        self.assertEqual(names(self.index.query(["exposure<1/100"])), ["day.jpg"])
+        self.assertEqual(names(self.index.query(["date>=2025-08-16"])), ["stars.jpg"])
+        self.assertEqual(names(self.index.query(["path~night"], order="iso", limit=1)), ["street.jpg"])
+        self.assertEqual(self.index.query(["camera!=PENTAX K-50"]), [])
+
+    def test_query_contains_escapes_wildcards(self):
+        for name in ("IMG_1.jpg", "IMGX1.jpg", "100%.jpg", "1000.jpg"):
+            write_photo(self.root / name, (1, 500), (80, 10), 100, "2025:08:15 10:45:42")
+        self.update()
+        names = lambda entries: [Path(entry.path).name for entry in entries]
+        self.assertEqual(names(self.index.query(["path~IMG_1"])), ["IMG_1.jpg"])
+        self.assertEqual(names(self.index.query(["path~100%"])), ["100%.jpg"])
+        self.assertEqual(names(self.index.query(["path~\\"])), [])
+
+    def test_entries(self):
+        self.update()
+        self.assertEqual([Path(entry.path).name for entry in self.index.entries()], ["day.jpg", "stars.jpg", "street.jpg"])
+        entries = list(self.index.entries(str(self.root / "night")))
+        self.assertEqual([Path(entry.path).name for entry in entries], ["stars.jpg", "street.jpg"])
+        self.assertEqual(list(self.index.entries(str(self.root / "nig"))), [])
+        self.assertEqual(str(entries[1].record), entries[1].token)
+        self.assertEqual(entries[1].record.iso, 3200)
+
+    def test_update_is_incremental(self):
+        self.assertEqual((self.update().added, len(self.index)), (3, 3))
+
+        outcome = self.update()
+        self.assertEqual((outcome.added, outcome.updated, outcome.unchanged, outcome.removed), (0, 0, 3, 0))
+
+        write_photo(self.root / "day.jpg", (1, 500), (80, 10), 200, "2025:08:15 10:45:42")
+        os.utime(self.root / "day.jpg", ns=(1, 1))
+        os.remove(self.root / "night" / "stars.jpg")
+        write_photo(self.root / "night" / "moon.jpg", (1, 250), (80, 10), 100, "2025:08:16 02:00:00")
+        outcome = self.update()
+        self.assertEqual((outcome.added, outcome.updated, outcome.unchanged, outcome.removed), (1, 1, 1, 1))
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.query(["path~day"])[0].iso, 200)
+
+    def test_update_keeps_entries_outside_root(self):
+        self.update()
+        outcome = self.index.update(Scanner(str(self.root / "night")), root=str(self.root / "night"))
+        self.assertEqual((outcome.unchanged, outcome.removed), (2, 0))
+        self.assertEqual(len(self.index), 3)
+
+    def test_update_without_metadata(self):
+        (self.root / "blank.jpg").write_bytes(b"\xff\xd8 no exif")
+        self.assertEqual(self.update().added, 4)
+        entry = self.index.query(["path~blank"])[0]
+        self.assertEqual((entry.iso, entry.exposure_time, entry.token), (None, None, "-f-"))
+        # Missing values never match filters and are sorted last.
+        self.assertEqual(len(self.index.query(["iso<100000"])), 3)
+        self.assertEqual(Path(self.index.query(order="-iso")[-1].path).name, "blank.jpg")
+
+    def test_update_reports_errors(self):
+        files = list(Scanner(str(self.root)))
+        os.remove(self.root / "day.jpg")
+        outcome = self.index.update(files)
+        self.assertEqual(outcome.added, 2)
+        self.assertEqual([(path, error.split(":")[0]) for path, error in outcome.errors], [
+            (str(self.root / "day.jpg"), "FileNotFoundError")
+        ])
+        self.assertEqual(len(self.index), 2)
+
+class TestParsing(TestCase):
+    def test_parse_filter(self):
+        self.assertEqual(parse_filter("iso>=3200"), ("iso", ">=", 3200.0))
+        self.assertEqual(parse_filter(" exposure < 1/60 "), ("exposure_time", "<", 1 / 60))
+        self.assertEqual(parse_filter("date>2025-01-01"), ("date_taken", ">", parse_date("2025-01-01")))
+        self.assertEqual(parse_filter("camera~PENTAX K"), ("camera_model", "~", "PENTAX K"))
+
+    def test_parse_filter_invalid(self):
+        for expression in ("iso", "shutter>1", "iso~100", "camera<b", "aperture<=wide", "date>yesterday"):
+            with self.assertRaises(ValueError):
+                parse_filter(expression)
+
+    def test_parse_order(self):
+        self.assertEqual(parse_order("path"), ("path", False))
+        self.assertEqual(parse_order("-ev"), ("exposure_bias", True))
+        with self.assertRaises(ValueError):
+            parse_order("-shutter")
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from src.metadata.photo import PhotoMetadata
+from src.metadata.photo import PhotoMetadata, parse_date, parse_ratio
 
 
 class TestPhotoMetadata(TestCase):
@@ -49,3 +49,40 @@ class TestPhotoMetadata(TestCase):
             exposure_bias=self.exposure_bias
         )
         self.assertEqual(str(metadata), "1s125-2.7f-100")
+
+    def test_photo_metadata_from_tags(self):
+        metadata = PhotoMetadata.from_tags({
+            "Image Model": "PENTAX K-50        ",
+            "EXIF ExposureTime": "1/500",
+            "EXIF FNumber": "28/5",
+            "EXIF ISOSpeedRatings": "200",
+            "EXIF ExposureBiasValue": "-1/3",
+        })
+        self.assertEqual(metadata.camera_model, "PENTAX K-50")
+        self.assertEqual(metadata.exposure_bias, "-1/3")
+        self.assertEqual(metadata.location, "")
+        self.assertEqual(str(metadata), "1s500-5.6f-200")
+
+
+class TestParseRatio(TestCase):
+    def test_parse_ratio(self):
+        self.assertEqual(parse_ratio("-1/3"), -1 / 3)
+        self.assertEqual(parse_ratio("1s125"), 1 / 125)
+        self.assertEqual(parse_ratio("2.8f"), 2.8)
+        self.assertEqual(parse_ratio("30"), 30.0)
+
+    def test_parse_ratio_invalid(self):
+        self.assertIsNone(parse_ratio(""))
+        self.assertIsNone(parse_ratio("abc"))
+        self.assertIsNone(parse_ratio("1/0"))
+
+
+class TestParseDate(TestCase):
+    def test_parse_date(self):
+        self.assertEqual(parse_date("1970:01:02 00:00:00"), 86400.0)
+        self.assertEqual(parse_date("2025:08:15 10:45:42"), parse_date("2025-08-15T10:45:42"))
+        self.assertEqual(parse_date("2025-08-15"), parse_date("2025:08:15 00:00:00"))
+
+    def test_parse_date_invalid(self):
+        self.assertIsNone(parse_date(""))
+        self.assertIsNone(parse_date("0000:00:00 00:00:00"))
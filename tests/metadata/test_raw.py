@@ -0,0 +1,172 @@
+from io import BytesIO
+from pathlib import Path
+import shutil
+import struct
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+import piexif
+
+from src.metadata.raw import exif_extent, find_raw_previews, raw_exif, read_raw_preview
+
+
+def encode_jpeg(width: int, height: int) -> bytes:
+    return cv2.imencode(".jpg", np.full((height, width, 3), 128, dtype=np.uint8))[1].tobytes()
+
+
+def write_raw(
+    path: Path, exposure: tuple[int, int], aperture: tuple[int, int], iso: int, date: str, size: tuple[int, int] = (48, 32)
+) -> bytes:
+    """
+    Write a PEF-like RAW: a big-endian TIFF whose IFD0 points to a JPEG
+    preview of `size` after the EXIF, with a smaller thumbnail in IFD1.
+    Returns the preview.
+    """
+    preview = encode_jpeg(*size)
+    exif = {
+        "0th": {
+            piexif.ImageIFD.Make: b"PENTAX",
+            piexif.ImageIFD.Model: b"PENTAX K-50",
+            piexif.ImageIFD.Compression: 65535,
+            piexif.ImageIFD.JPEGInterchangeFormat: 0,
+            piexif.ImageIFD.JPEGInterchangeFormatLength: len(preview),
+        },
+        "Exif": {
+            piexif.ExifIFD.ExposureTime: exposure,
+            piexif.ExifIFD.FNumber: aperture,
+            piexif.ExifIFD.ISOSpeedRatings: iso,
+            piexif.ExifIFD.FocalLength: (50, 1),
+            piexif.ExifIFD.ExposureBiasValue: (-1, 3),
+            piexif.ExifIFD.DateTimeOriginal: date.encode(),
+        },
+        "1st": {},
+        "thumbnail": encode_jpeg(8, 6),
+    }
+    # The preview goes right after the TIFF structure, whose size does not
+    # depend on the value of its offset.
+    exif["0th"][piexif.ImageIFD.JPEGInterchangeFormat] = len(piexif.dump(exif)) - 6
+    path.write_bytes(piexif.dump(exif)[6:] + preview)
+    return preview
+
+
+def ifd(byte_order: str, entries: list[tuple[int, int, int, int]], next_offset: int = 0) -> bytes:
+    """
+    Build an IFD of (tag, type, count, value) entries whose value is a SHORT
+    (type 3) or a LONG/offset.
+    """
+    data = struct.pack(f"{byte_order}H", len(entries))
+    for tag, kind, count, value in sorted(entries):
+        packed = struct.pack(f"{byte_order}H2x", value) if kind == 3 else struct.pack(f"{byte_order}I", value)
+        data += struct.pack(f"{byte_order}HHI", tag, kind, count) + packed
+    return data + struct.pack(f"{byte_order}I", next_offset)
+
+
+def tiff(byte_order: str, chunks: dict[int, bytes]) -> BytesIO:
+    """
+    Build a TIFF stream whose first IFD is at offset 8, with every chunk at its offset.
+    """
+    buffer = bytearray((b"II*\x00" if byte_order == "<" else b"MM\x00*") + struct.pack(f"{byte_order}I", 8))
+    for offset, chunk in sorted(chunks.items()):
+        buffer.extend(bytes(offset + len(chunk) - len(buffer)))
+        buffer[offset:offset + len(chunk)] = chunk
+    return BytesIO(bytes(buffer))
+
+
+class TestRaw(TestCase):
+    def test_sub_ifds(self):
+        # NEF/DNG layout: the preview is in a SubIFD, next to lossless sensor data.
+        preview, thumbnail = encode_jpeg(64, 48), encode_jpeg(16, 12)
+        lossless = b"\xff\xd8\xff\xc3\x00\x0b\x10" + struct.pack(">HH", 2000, 3000) + b"\x01\x01\x11\x00"
+        stream = tiff("<", {
+            8: ifd("<", [(330, 4, 2, 100), (259, 3, 1, 1)], next_offset=400),
+            100: struct.pack("<2I", 200, 300),
+            200: ifd("<", [(513, 4, 1, 1000), (514, 4, 1, len(preview))]),
+            300: ifd("<", [(259, 3, 1, 7), (273, 4, 1, 3000), (279, 4, 1, len(lossless))]),
+            400: ifd("<", [(259, 3, 1, 6), (273, 4, 1, 5000), (279, 4, 1, len(thumbnail))]),
+            1000: preview,
+            3000: lossless,
+            5000: thumbnail,
+        })
+        self.assertEqual(
+            sorted(find_raw_previews(stream)), [(1000, len(preview)), (3000, len(lossless)), (5000, len(thumbnail))]
+        )
+        raw_preview = read_raw_preview(stream)
+        self.assertEqual((raw_preview.offset, raw_preview.length), (1000, len(preview)))
+        self.assertEqual((raw_preview.header.width, raw_preview.header.height), (64, 48))
+
+    def test_pentax_maker_note(self):
+        preview = encode_jpeg(40, 30)
+        maker_note = b"AOC\x00MM" + ifd(">", [(4, 4, 1, len(preview)), (5, 4, 1, 1000)])
+        stream = tiff(">", {
+            8: ifd(">", [(34665, 4, 1, 100)]),
+            100: ifd(">", [(37500, 7, len(maker_note), 200)]),
+            200: maker_note,
+            1000: preview,
+        })
+        raw_preview = read_raw_preview(stream)
+        self.assertEqual((raw_preview.offset, raw_preview.header.width), (1000, 40))
+
+    def test_write_raw(self):
+        tmpdir = tempfile.mkdtemp()
+        path = Path(tmpdir) / "IMGP0001.PEF"
+        try:
+            preview = write_raw(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+            with open(path, "rb") as f:
+                raw_preview = read_raw_preview(f)
+            self.assertEqual(path.read_bytes()[raw_preview.offset:][:raw_preview.length], preview)
+            self.assertEqual((raw_preview.header.width, raw_preview.header.height), (48, 32))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def test_no_preview(self):
+        self.assertIsNone(read_raw_preview(BytesIO(encode_jpeg(8, 8))))
+        self.assertIsNone(read_raw_preview(tiff("<", {8: ifd("<", [(259, 3, 1, 1)])})))
+        # Truncated IFDs and an IFD chained to itself.
+        self.assertIsNone(read_raw_preview(BytesIO(b"II*\x00\x08\x00\x00\x00\x05\x00")))
+        self.assertIsNone(read_raw_preview(tiff("<", {8: ifd("<", [(259, 3, 1, 1)], next_offset=8)})))
+        # A preview offset past the end of the file.
+        self.assertIsNone(read_raw_preview(tiff("<", {8: ifd("<", [(513, 4, 1, 9000), (514, 4, 1, 10)])})))
+
+    def test_raw_exif(self):
+        exif = raw_exif({
+            "0th": {271: b"PENTAX", 274: 1, 273: (1000,), 330: 100, 50706: (1, 4, 0, 0)},
+            "Exif": {33434: (1, 250), 37500: b"AOC\x00"},
+            "GPS": {1: b"N"},
+            "Interop": {},
+            "1st": {513: 0},
+            "thumbnail": b"\xff\xd8",
+        })
+        self.assertEqual(exif["0th"], {271: b"PENTAX", 274: 1})
+        self.assertEqual(exif["Exif"], {33434: (1, 250)})
+        self.assertEqual(exif["GPS"], {1: b"N"})
+        self.assertNotIn("thumbnail", exif)
+
+    def test_exif_extent(self):
+        tmpdir = tempfile.mkdtemp()
+        path = Path(tmpdir) / "IMGP0001.PEF"
+        try:
+            write_raw(path, (1, 250), (28, 10), 800, "2025:08:15 10:45:42")
+            with open(path, "rb") as f:
+                extent = exif_extent(f)
+                preview = read_raw_preview(f)
+            # The EXIF ends before the thumbnail and the preview, and parses as
+            # the whole file does.
+            self.assertLess(extent, preview.offset)
+            data = path.read_bytes()
+            self.assertEqual(raw_exif(piexif.load(data[:extent])), raw_exif(piexif.load(data)))
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def test_exif_extent_skips_maker_note(self):
+        maker_note = b"AOC\x00MM" + bytes(2000)
+        stream = tiff(">", {
+            8: ifd(">", [(34665, 4, 1, 100), (271, 2, 8, 60)]),
+            60: b"PENTAX\x00\x00",
+            100: ifd(">", [(37500, 7, len(maker_note), 5000), (33434, 5, 1, 200)]),
+            200: struct.pack(">2I", 1, 250),
+            5000: maker_note,
+        })
+        self.assertEqual(exif_extent(stream), 208)
+        self.assertEqual(exif_extent(BytesIO(encode_jpeg(8, 8))), 0)
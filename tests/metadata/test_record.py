@@ -0,0 +1,132 @@
+from pathlib import Path
+import math
+import shutil
+import sys
+import tempfile
+from unittest import TestCase
+
+import cv2
+import numpy as np
+import piexif
+
+from src.metadata.exif import read_exif_tags
+from src.metadata.photo import PhotoMetadata, parse_date
+from src.data.file import File
+from src.metadata.record import PhotoRecord, PhotoRecords, read_record, tag_number
+
+ASSETS_DIR = Path(__file__).parents[2] / "assets" / "images"
+
+
+class TestPhotoRecord(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def read_tags(self, exif: dict) -> dict:
+        path = str(Path(self.tmpdir) / "image.jpg")
+        cv2.imwrite(path, np.zeros((16, 16, 3), dtype=np.uint8))
+        piexif.insert(piexif.dump({"0th": {piexif.ImageIFD.Model: b"PENTAX K-50  "}, "Exif": exif}), path)
+        with open(path, "rb") as f:
+            return read_exif_tags(f)
+
+    def test_from_tags(self):
+        record = PhotoRecord.from_tags(self.read_tags({
+            piexif.ExifIFD.ExposureTime: (10, 2500),
+            piexif.ExifIFD.FNumber: (28, 10),
+            piexif.ExifIFD.ISOSpeedRatings: 3200,
+            piexif.ExifIFD.FocalLength: (50, 1),
+            piexif.ExifIFD.ExposureBiasValue: (-2, 3),
+            piexif.ExifIFD.DateTimeOriginal: b"2025:08:15 10:45:42",
+        }))
+        self.assertEqual(record.camera_model, "PENTAX K-50")
+        self.assertEqual(record.exposure_time, 1 / 250)
+        self.assertEqual(record.aperture, 2.8)
+        self.assertEqual(record.iso, 3200)
+        self.assertEqual(record.focal_length, 50.0)
+        self.assertEqual(record.exposure_bias, -2 / 3)
+        self.assertEqual(record.timestamp, parse_date("2025:08:15 10:45:42"))
+        self.assertEqual(str(record), "1s250-2.8f-3200")
+
+    def test_missing_values(self):
+        record = PhotoRecord.from_tags({})
+        self.assertEqual(record.camera_model, "")
+        self.assertTrue(math.isnan(record.exposure_time))
+        self.assertTrue(math.isnan(record.timestamp))
+        self.assertEqual(record.iso, 0)
+        self.assertEqual(str(record), str(PhotoMetadata.from_tags({})))
+
+    def test_same_token_as_photo_metadata(self):
+        settings = [
+            ((1, 8000), (14, 10), 100), ((13, 10), (8, 1), 6400), ((30, 1), (56, 10), 400),
+            ((1, 3), (71, 10), 12800), ((2, 5), (45, 10), 200),
+        ]
+        for exposure, aperture, iso in settings:
+            tags = self.read_tags({
+                piexif.ExifIFD.ExposureTime: exposure,
+                piexif.ExifIFD.FNumber: aperture,
+                piexif.ExifIFD.ISOSpeedRatings: iso,
+            })
+            self.assertEqual(str(PhotoRecord.from_tags(tags)), str(PhotoMetadata.from_tags(tags)))
+
+        for path in ASSETS_DIR.glob("*.JPG"):
+            with open(path, "rb") as f:
+                tags = read_exif_tags(f)
+            self.assertEqual(str(PhotoRecord.from_tags(tags)), str(PhotoMetadata.from_tags(tags)))
+
+    def test_read_record(self):
+        path = Path(self.tmpdir) / "image.jpg"
+        self.read_tags({piexif.ExifIFD.ISOSpeedRatings: 400})
+        path_str, record, error = read_record(File(name=path.name, size=path.stat().st_size, directory=str(path)))
+        self.assertEqual((path_str, record.iso, error), (str(path), 400, None))
+
+        missing = Path(self.tmpdir) / "missing.jpg"
+        path_str, record, error = read_record(File(name=missing.name, size=0, directory=str(missing), mtime_ns=1))
+        self.assertIsNone(record)
+        self.assertTrue(error.startswith("FileNotFoundError"))
+
+    def test_tag_number(self):
+        self.assertEqual(tag_number("1/250"), 1 / 250)
+        self.assertEqual(tag_number("8"), 8.0)
+        self.assertTrue(math.isnan(tag_number(None)))
+        self.assertTrue(math.isnan(tag_number("n/a")))
+
+    def test_slots(self):
+        record = PhotoRecord.from_tags({})
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertLess(sys.getsizeof(record), sys.getsizeof(PhotoMetadata.from_tags({}).__dict__))
+
+
+class TestPhotoRecords(TestCase):
+    def setUp(self):
+        self.records = [
+            PhotoRecord("PENTAX K-50", 1 / 250, 2.8, 100, 50.0, 0.0, 1.0),
+            PhotoRecord("PENTAX K-50", 2.0, 8.0, 3200, math.nan, -1.0, 2.0),
+            PhotoRecord("X100V", 1 / 60, 2.0, 0, 23.0, 1 / 3, math.nan),
+        ]
+        self.batch = PhotoRecords(self.records)
+
+    def test_roundtrip(self):
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(self.batch[0], self.records[0])
+        self.assertEqual(self.batch[-1].camera_model, "X100V")
+        self.assertEqual([str(record) for record in self.batch], [str(record) for record in self.records])
+        with self.assertRaises(IndexError):
+            self.batch[3]
+
+    def test_columns(self):
+        self.assertEqual(list(self.batch.column("iso")), [100, 3200, 0])
+        self.assertEqual(self.batch.cameras, ["PENTAX K-50", "X100V"])
+        self.assertEqual(list(self.batch.camera_ids), [0, 0, 1])
+
+        apertures = np.frombuffer(self.batch.column("aperture"), dtype=np.float64)
+        self.assertEqual(apertures.tolist(), [2.8, 8.0, 2.0])
+        self.assertEqual(int(np.isnan(np.frombuffer(self.batch.column("timestamp"))).sum()), 1)
+
+    def test_append(self):
+        batch = PhotoRecords()
+        batch.append(self.records[2])
+        batch.extend(self.records[:2])
+        self.assertEqual([record.iso for record in batch], [0, 100, 3200])
+        self.assertEqual(batch.cameras, ["X100V", "PENTAX K-50"])